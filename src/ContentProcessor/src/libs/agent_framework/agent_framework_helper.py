@@ -21,11 +21,6 @@ from typing import TYPE_CHECKING, Any, overload
 from libs.utils.credential_util import get_bearer_token_provider
 
 from .agent_framework_settings import AgentFrameworkSettings
-from .azure_openai_response_retry import (
-    AzureOpenAIChatClientWithRetry,
-    AzureOpenAIResponseClientWithRetry,
-    RateLimitRetryConfig,
-)
 
 if TYPE_CHECKING:
     from agent_framework.openai import (
@@ -33,6 +28,12 @@ if TYPE_CHECKING:
         OpenAIChatCompletionClient,
     )
 
+    from .azure_openai_response_retry import (
+        AzureOpenAIChatClientWithRetry,
+        AzureOpenAIResponseClientWithRetry,
+        RateLimitRetryConfig,
+    )
+
 
 class ClientType(Enum):
     """Supported Agent Framework client types."""
@@ -162,8 +163,8 @@ class AgentFrameworkHelper:
         env_file_path: str | None = None,
         env_file_encoding: str | None = None,
         instruction_role: str | None = None,
-        retry_config: RateLimitRetryConfig | None = None,
-    ) -> AzureOpenAIChatClientWithRetry:
+        retry_config: "RateLimitRetryConfig | None" = None,
+    ) -> "AzureOpenAIChatClientWithRetry":
         pass
 
     @overload
@@ -231,8 +232,8 @@ class AgentFrameworkHelper:
         env_file_path: str | None = None,
         env_file_encoding: str | None = None,
         instruction_role: str | None = None,
-        retry_config: RateLimitRetryConfig | None = None,
-    ) -> AzureOpenAIResponseClientWithRetry:
+        retry_config: "RateLimitRetryConfig | None" = None,
+    ) -> "AzureOpenAIResponseClientWithRetry":
         pass
 
     @overload
@@ -272,7 +273,7 @@ class AgentFrameworkHelper:
         env_file_encoding: str | None = None,
         # Chat & Response specific
         instruction_role: str | None = None,
-        retry_config: RateLimitRetryConfig | None = None,
+        retry_config: "RateLimitRetryConfig | None" = None,
         # Assistant specific
         assistant_id: str | None = None,
         assistant_name: str | None = None,
@@ -398,6 +399,8 @@ class AgentFrameworkHelper:
                 instruction_role=instruction_role,
             )
         elif client_type == ClientType.AzureOpenAIChatCompletionWithRetry:
+            from .azure_openai_response_retry import AzureOpenAIChatClientWithRetry
+
             return AzureOpenAIChatClientWithRetry(
                 model=deployment_name,
                 api_key=api_key,
@@ -434,6 +437,8 @@ class AgentFrameworkHelper:
                 instruction_role=instruction_role,
             )
         elif client_type == ClientType.AzureOpenAIResponseWithRetry:
+            from .azure_openai_response_retry import AzureOpenAIResponseClientWithRetry
+
             return AzureOpenAIResponseClientWithRetry(
                 model=deployment_name,
                 api_key=api_key,
@@ -25,6 +25,8 @@ from tenacity import (
 )
 from tenacity.wait import wait_base
 
+from libs.utils import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -415,6 +417,7 @@ async def _retry_call(coro_factory, *, config: RateLimitRetryConfig):
         attempt = getattr(retry_state, "attempt_number", None)
         max_attempts = config.max_retries + 1
 
+        metrics.record_retry("openai")
         logger.warning(
             "[AOAI_RETRY] attempt %s/%s; sleeping=%ss; retry_after=%s; status=%s; error=%s",
             attempt,
@@ -523,6 +526,7 @@ class AzureOpenAIResponseClientWithRetry(OpenAIChatClient):
                 raise
 
             trimmed = _trim_messages(messages, cfg=self._context_trim_config)
+            metrics.record_retry("openai_context_trim")
             logger.warning(
                 "[AOAI_CTX_TRIM] retrying after context-length error; count=%s -> %s",
                 len(messages),
@@ -599,6 +603,7 @@ class AzureOpenAIChatClientWithRetry(OpenAIChatCompletionClient):
                 raise
 
             trimmed = _trim_messages(messages, cfg=self._context_trim_config)
+            metrics.record_retry("openai_context_trim")
             logger.warning(
                 "[AOAI_CTX_TRIM] retrying chat after context-length error; count=%s -> %s",
                 len(messages),
@@ -11,6 +11,17 @@ from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 from typing_extensions import Annotated
 
+from libs.pipeline.priority_lanes import DEFAULT_LANE_WEIGHTS, parse_lane_weights
+from libs.process_host.worker_pool import (
+    AutoscaleSettings,
+    WorkerPoolSettings,
+    parse_worker_pools,
+    pool_for,
+)
+from libs.process_host.worker_recycling import RecycleSettings
+from libs.utils.compression import encoding_for, parse_encoding_map
+from libs.utils.profiling import ProfilingSettings, parse_targets
+
 
 class _configuration_base(BaseSettings):
     """Shared Pydantic-settings base that reads from .env files."""
@@ -53,6 +64,55 @@ class AppConfiguration(_configuration_base):
         app_cosmos_database: Cosmos DB database name.
         app_cosmos_container_process: Cosmos DB container for process data.
         app_cosmos_container_schema: Cosmos DB container for schema data.
+        app_evaluate_max_workers: Worker processes for confidence evaluation
+            (0 or 1 evaluates in a single background thread).
+        app_evaluate_parallel_min_values: Minimum number of extracted values
+            before evaluation is spread over worker processes.
+        app_slim_persistence: Store step outputs and evaluation details as
+            blob references instead of embedding them in Cosmos DB and
+            ``step_outputs.json``.
+        app_blob_compression: Content-Encoding for JSON artifacts per
+            artifact type, e.g. ``gzip`` for all or
+            ``extracted_content=zstd,*=gzip``. Empty disables compression.
+        app_step_workers: Worker pool bounds per step as
+            ``step=min:max[:target]`` pairs, e.g. ``map=1:8:2,*=1:1``.
+            Steps without an entry run a single worker.
+        app_autoscale_interval: Seconds between queue depth samples.
+        app_autoscale_messages_per_worker: Queued messages per worker
+            before an elastic pool grows.
+        app_autoscale_max_cpu_percent: Host CPU use above which no
+            workers are added.
+        app_autoscale_min_free_memory_mb: Available memory below which no
+            workers are added.
+        app_worker_restart_backoff: Initial delay in seconds before a
+            crashed worker is restarted; doubles on repeated crashes.
+        app_worker_restart_backoff_max: Upper bound of the restart delay.
+        app_worker_max_messages: Messages a worker processes before it
+            exits and is replaced (0 disables recycling by count).
+        app_worker_max_rss_mb: Resident set size in MiB after which a
+            worker exits and is replaced (0 disables recycling by memory).
+        app_metrics_port: First port of the local Prometheus metrics
+            endpoints; each worker binds the next free port (0 disables).
+        app_queue_monitor_enabled: Sample depth, oldest message age and
+            dead-letter depth of every step queue on each autoscale interval
+            and publish them as ``cps.queue.*`` gauges.
+        app_profile_steps: Comma-separated steps whose messages are
+            profiled with cProfile (``*`` for all; empty disables).
+        app_profile_schema_ids: Comma-separated schema ids whose messages
+            are profiled in every step.
+        app_profile_sample_rate: Share of the targeted messages that are
+            profiled; each profile is stored as a ``.prof`` artifact.
+        app_step_idempotency: Forward the persisted output of a step
+            instead of executing it again when its message is redelivered.
+        app_step_lease_seconds: Duration of the blob lease a worker holds
+            on a step while executing it, 15 to 60 (0 disables leasing).
+        app_priority_lane_weights: Share of the polls of each priority
+            lane as ``lane=weight`` pairs, e.g. ``high=6,normal=3,low=1``.
+        app_priority_small_document_pages: Largest page count for which
+            the extract step moves a document without a priority to the
+            ``high`` lane (0 disables promotion).
+        app_status_events_queue: Queue the status-change events of the
+            processes are sent to for the API (empty disables them).
     """
 
     app_storage_queue_url: str
@@ -75,6 +135,91 @@ class AppConfiguration(_configuration_base):
     app_cosmos_container_process: str
     app_cosmos_container_schema: str
     applicationinsights_connection_string: str = ""
+    app_evaluate_max_workers: int = 0
+    app_evaluate_parallel_min_values: int = 1000
+    app_slim_persistence: bool = False
+    app_blob_compression: str = ""
+    app_step_workers: str = ""
+    app_autoscale_interval: float = 15.0
+    app_autoscale_messages_per_worker: int = 5
+    app_autoscale_max_cpu_percent: float = 85.0
+    app_autoscale_min_free_memory_mb: int = 512
+    app_worker_restart_backoff: float = 1.0
+    app_worker_restart_backoff_max: float = 60.0
+    app_worker_max_messages: int = 0
+    app_worker_max_rss_mb: int = 0
+    app_metrics_port: int = 0
+    app_queue_monitor_enabled: bool = True
+    app_profile_steps: str = ""
+    app_profile_schema_ids: str = ""
+    app_profile_sample_rate: float = Field(default=0.1, ge=0.0, le=1.0)
+    app_step_idempotency: bool = True
+    app_step_lease_seconds: int = 0
+    app_priority_lane_weights: str = DEFAULT_LANE_WEIGHTS
+    app_priority_small_document_pages: int = Field(default=2, ge=0)
+    app_status_events_queue: str = "status-events-queue"
+
+    @field_validator("app_blob_compression")
+    @classmethod
+    def validate_blob_compression(cls, v: str) -> str:
+        parse_encoding_map(v)
+        return v
+
+    @field_validator("app_step_lease_seconds")
+    @classmethod
+    def validate_step_lease_seconds(cls, v: int) -> int:
+        if v != 0 and not 15 <= v <= 60:
+            raise ValueError("app_step_lease_seconds must be 0 or between 15 and 60.")
+        return v
+
+    @field_validator("app_priority_lane_weights")
+    @classmethod
+    def validate_priority_lane_weights(cls, v: str) -> str:
+        parse_lane_weights(v)
+        return v
+
+    def content_encoding_for(self, artifact_type: str) -> str | None:
+        """Return the Content-Encoding configured for *artifact_type*, or None."""
+        return encoding_for(
+            parse_encoding_map(self.app_blob_compression), artifact_type
+        )
+
+    @field_validator("app_step_workers")
+    @classmethod
+    def validate_step_workers(cls, v: str) -> str:
+        parse_worker_pools(v)
+        return v
+
+    def worker_pool_for(self, step_name: str) -> WorkerPoolSettings:
+        """Return the worker pool bounds configured for *step_name*."""
+        return pool_for(parse_worker_pools(self.app_step_workers), step_name)
+
+    def autoscale_settings(self) -> AutoscaleSettings:
+        """Return the process host's autoscaler and restart settings."""
+        return AutoscaleSettings(
+            interval_seconds=self.app_autoscale_interval,
+            messages_per_worker=self.app_autoscale_messages_per_worker,
+            max_cpu_percent=self.app_autoscale_max_cpu_percent,
+            min_free_memory_mb=self.app_autoscale_min_free_memory_mb,
+            restart_backoff_seconds=self.app_worker_restart_backoff,
+            restart_backoff_max_seconds=self.app_worker_restart_backoff_max,
+            stop_timeout_seconds=self.app_message_queue_process_timeout,
+        )
+
+    def recycle_settings(self) -> RecycleSettings:
+        """Return the limits after which a handler worker is recycled."""
+        return RecycleSettings(
+            max_messages=self.app_worker_max_messages,
+            max_rss_mb=self.app_worker_max_rss_mb,
+        )
+
+    def profiling_settings(self) -> ProfilingSettings:
+        """Return which messages the handlers profile."""
+        return ProfilingSettings(
+            steps=parse_targets(self.app_profile_steps),
+            schema_ids=parse_targets(self.app_profile_schema_ids),
+            sample_rate=self.app_profile_sample_rate,
+        )
 
     @field_validator("app_process_steps", mode="before")
     @classmethod
@@ -7,11 +7,23 @@ Provides a convenience wrapper around ``BlobServiceClient`` for the
 pipeline to read and write document blobs, schemas, and configuration.
 """
 
-from typing import IO, Union
+from typing import IO, Optional, Union
 
-from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+from azure.storage.blob import BlobLeaseClient, BlobServiceClient, ContentSettings
 
+from libs.utils import metrics
 from libs.utils.azure_credential_utils import get_azure_credential
+from libs.utils.compression import compress, decompress
+
+
+def _payload_size(data: Union[str, IO, bytes]) -> int:
+    """Return the size in bytes of an upload payload, 0 for streams."""
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    return 0
 
 
 class StorageBlobHelper:
@@ -21,6 +33,7 @@ class StorageBlobHelper:
         1. Authenticate using the shared Azure credential.
         2. Auto-create containers when they do not exist.
         3. Expose upload / download / delete for files, streams, and text.
+        4. Check blob existence and take leases on marker blobs.
 
     Attributes:
         blob_service_client: The underlying SDK ``BlobServiceClient``.
@@ -91,40 +104,106 @@ class StorageBlobHelper:
             blob_name
         )
 
-        blob_client.upload_blob(stream, overwrite=True)
+        with metrics.phase("blob_upload"):
+            blob_client.upload_blob(stream, overwrite=True)
+        metrics.record_bytes("upload", _payload_size(stream))
 
-    def upload_text(self, container_name: str, blob_name: str, text: str):
+    def upload_text(
+        self,
+        container_name: str,
+        blob_name: str,
+        text: str,
+        content_encoding: Optional[str] = None,
+    ):
+        """Upload *text*, optionally compressed and tagged with ``Content-Encoding``."""
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
         )
-        blob_client.upload_blob(text, overwrite=True)
+        if not content_encoding:
+            with metrics.phase("blob_upload"):
+                blob_client.upload_blob(text, overwrite=True)
+            metrics.record_bytes("upload", _payload_size(text))
+            return
+
+        payload = compress(text.encode("utf-8"), content_encoding)
+        with metrics.phase("blob_upload"):
+            blob_client.upload_blob(
+                payload,
+                overwrite=True,
+                content_settings=ContentSettings(
+                    content_type="application/json", content_encoding=content_encoding
+                ),
+            )
+        metrics.record_bytes("upload", len(payload))
 
     def download_file(self, container_name: str, blob_name: str, download_path: str):
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
         )
+        with metrics.phase("blob_download"):
+            data = blob_client.download_blob().readall()
         with open(download_path, "wb") as download_file:
-            download_file.write(blob_client.download_blob().readall())
+            download_file.write(data)
+        metrics.record_bytes("download", len(data))
 
     def download_stream(self, container_name: str, blob_name: str) -> bytes:
+        """Download a blob, decoding gzip / zstd encoded content."""
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
         )
-        stream = blob_client.download_blob().readall()
-        return stream
+        # Decompression is done here rather than by the transport so that
+        # chunked downloads of encoded blobs stay consistent.
+        with metrics.phase("blob_download"):
+            downloader = blob_client.download_blob(decompress=False)
+            stream = downloader.readall()
+        metrics.record_bytes("download", len(stream))
+        return decompress(
+            stream, downloader.properties.content_settings.content_encoding
+        )
 
     def download_text(self, container_name: str, blob_name: str) -> str:
+        """Download a blob as UTF-8 text, decoding gzip / zstd encoded content."""
+        return self.download_stream(container_name, blob_name).decode("utf-8")
+
+    def delete_blob(self, container_name: str, blob_name: str):
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
         )
-        text = blob_client.download_blob().content_as_text()
-        return text
+        blob_client.delete_blob()
 
-    def delete_blob(self, container_name: str, blob_name: str):
+    def blob_exists(self, container_name: str, blob_name: str) -> bool:
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
         )
-        blob_client.delete_blob()
+        return blob_client.exists()
+
+    def acquire_lease(
+        self, container_name: str, blob_name: str, lease_duration: int
+    ) -> Optional[BlobLeaseClient]:
+        """Lease a marker blob, creating it if it does not exist.
+
+        Args:
+            container_name: Sub-container of the marker blob.
+            blob_name: Name of the marker blob.
+            lease_duration: Lease duration in seconds (15 to 60, or -1).
+
+        Returns:
+            Optional[BlobLeaseClient]: The lease, or None if another client
+            holds one.
+        """
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        try:
+            blob_client.upload_blob(b"", overwrite=False)
+        except ResourceExistsError:
+            pass
+        try:
+            return blob_client.acquire_lease(lease_duration=lease_duration)
+        except HttpResponseError as e:
+            if e.status_code == 409:
+                return None
+            raise
 
     def update_blob(
         self, container_name: str, blob_name: str, data: Union[str, IO, bytes]
@@ -137,11 +216,8 @@ class StorageBlobHelper:
         blob_client = self._get_container_client(container_name).get_blob_client(
             blob_name
         )
-        if isinstance(data, str):
-            blob_client.upload_blob(data, overwrite=True)
-        elif isinstance(data, bytes):
-            blob_client.upload_blob(data, overwrite=True)
-        elif hasattr(data, "read"):
-            blob_client.upload_blob(data, overwrite=True)
-        else:
+        if not isinstance(data, (str, bytes)) and not hasattr(data, "read"):
             raise ValueError("Unsupported data type for upload")
+        with metrics.phase("blob_upload"):
+            blob_client.upload_blob(data, overwrite=True)
+        metrics.record_bytes("upload", _payload_size(data))
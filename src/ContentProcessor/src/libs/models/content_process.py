@@ -4,19 +4,46 @@
 """Domain models for per-document processing lifecycle.
 
 Defines `ContentProcess` and `Step_Outputs` which track the execution state
-of a single document through the pipeline and persist results to Cosmos DB.
+of a single document through the pipeline and persist results to Cosmos DB,
+and `ArtifactReference` which points at a step artifact kept in blob storage.
 """
 
 import datetime
+import hashlib
 from typing import Any, Optional
 
-from pydantic import BaseModel, SkipValidation
+from pydantic import BaseModel, Field, SkipValidation
 
 from libs.azure_helper.comsos_mongo import CosmosMongDBHelper
 from libs.pipeline.entities.schema import Schema
 from libs.pipeline.handlers.logics.evaluate_handler.comparison import (
     ExtractionComparisonData,
 )
+from libs.utils import metrics
+
+
+class ArtifactReference(BaseModel):
+    """Pointer to a step artifact stored in the process blob folder.
+
+    Attributes:
+        blob_name: Blob name relative to the process folder.
+        size: Size of the artifact in bytes.
+        sha256: Hex SHA-256 digest of the artifact content.
+    """
+
+    blob_name: str
+    size: int
+    sha256: str
+
+    @staticmethod
+    def from_text(blob_name: str, text: str) -> "ArtifactReference":
+        """Build a reference for *text* stored (UTF-8 encoded) as *blob_name*."""
+        content = text.encode("utf-8")
+        return ArtifactReference(
+            blob_name=blob_name,
+            size=len(content),
+            sha256=hashlib.sha256(content).hexdigest(),
+        )
 
 
 class Step_Outputs(BaseModel):
@@ -25,12 +52,16 @@ class Step_Outputs(BaseModel):
     Attributes:
         step_name: Identifier of the pipeline step (e.g. 'extract', 'map').
         processed_time: Formatted elapsed time for the step.
-        step_result: Arbitrary result payload produced by the step.
+        step_result: Arbitrary result payload produced by the step, or None
+            when the payload is only referenced.
+        step_result_reference: Blob holding the full payload, set instead of
+            ``step_result`` in slim persistence mode.
     """
 
     step_name: str
     processed_time: Optional[str] = None
-    step_result: SkipValidation[Any]
+    step_result: SkipValidation[Any] = None
+    step_result_reference: Optional[ArtifactReference] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -57,6 +88,9 @@ class ContentProcess(BaseModel):
         completion_tokens: Token count produced by the LLM completion.
         process_output: Per-step output snapshots.
         extracted_comparison_data: Side-by-side comparison of fields.
+        evaluation_reference: Blob holding the full evaluation result
+            (per-field confidence and comparison data). When set,
+            ``confidence`` only carries the summary scores.
     """
 
     process_id: str
@@ -64,7 +98,10 @@ class ContentProcess(BaseModel):
     processed_file_mime_type: Optional[str] = None
     processed_time: Optional[str] = None
     imported_time: datetime.datetime = datetime.datetime.now(datetime.UTC)
-    last_modified_time: datetime.datetime = datetime.datetime.now(datetime.UTC)
+    # Stamped on every write: the API derives the ETag of a process from it.
+    last_modified_time: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.UTC)
+    )
     last_modified_by: Optional[str] = None
     status: str
     entity_score: Optional[float] = 0.0
@@ -78,6 +115,7 @@ class ContentProcess(BaseModel):
 
     process_output: list[Step_Outputs] = []
     extracted_comparison_data: Optional[ExtractionComparisonData] = None
+    evaluation_reference: Optional[ArtifactReference] = None
 
     comment: Optional[str] = None
 
@@ -97,28 +135,29 @@ class ContentProcess(BaseModel):
             database_name: Target database name.
             collection_name: Target collection name.
         """
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=["process_id"],
-        )
-
-        existing_process = mongo_helper.find_document({"process_id": self.process_id})
-        if existing_process:
-            mongo_helper.update_document(
-                {"process_id": self.process_id},
-                {
-                    "status": self.status,
-                    "processed_file_name": self.processed_file_name,
-                    "processed_file_mime_type": self.processed_file_mime_type,
-                    "last_modified_time": self.last_modified_time,
-                    "imported_time": self.imported_time,
-                    "last_modified_by": self.last_modified_by,
-                },
+        with metrics.phase("cosmos"):
+            mongo_helper = CosmosMongDBHelper(
+                connection_string=connection_string,
+                db_name=database_name,
+                container_name=collection_name,
+                indexes=["process_id"],
             )
-        else:
-            mongo_helper.insert_document(self.model_dump())
+
+            existing_process = mongo_helper.find_document({"process_id": self.process_id})
+            if existing_process:
+                mongo_helper.update_document(
+                    {"process_id": self.process_id},
+                    {
+                        "status": self.status,
+                        "processed_file_name": self.processed_file_name,
+                        "processed_file_mime_type": self.processed_file_mime_type,
+                        "last_modified_time": self.last_modified_time,
+                        "imported_time": self.imported_time,
+                        "last_modified_by": self.last_modified_by,
+                    },
+                )
+            else:
+                mongo_helper.insert_document(self.model_dump())
 
     def update_status_to_cosmos(
         self, connection_string: str, database_name: str, collection_name: str
@@ -130,20 +169,21 @@ class ContentProcess(BaseModel):
             database_name: Target database name.
             collection_name: Target collection name.
         """
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=["process_id"],
-        )
-
-        existing_process = mongo_helper.find_document({"process_id": self.process_id})
-        if existing_process:
-            mongo_helper.update_document(
-                {"process_id": self.process_id}, self.model_dump()
+        with metrics.phase("cosmos"):
+            mongo_helper = CosmosMongDBHelper(
+                connection_string=connection_string,
+                db_name=database_name,
+                container_name=collection_name,
+                indexes=["process_id"],
             )
-        else:
-            mongo_helper.insert_document(self.model_dump())
+
+            existing_process = mongo_helper.find_document({"process_id": self.process_id})
+            if existing_process:
+                mongo_helper.update_document(
+                    {"process_id": self.process_id}, self.model_dump()
+                )
+            else:
+                mongo_helper.insert_document(self.model_dump())
 
     class Config:
         arbitrary_types_allowed = True
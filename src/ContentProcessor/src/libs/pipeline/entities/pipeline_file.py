@@ -28,6 +28,7 @@ class ArtifactType(str, Enum):
     ScoreMergedData = "score_merged_data"
     SourceContent = "source_content"
     SavedContent = "saved_content"
+    Profile = "profile"
 
 
 class PipelineLogEntry(AppModelBase):
@@ -104,12 +105,23 @@ class FileDetails(FileDetailBase):
         )
         self.size = len(stream)
 
-    def upload_json_text(self, account_url: str, container_name: str, text: str):
+    def upload_json_text(
+        self,
+        account_url: str,
+        container_name: str,
+        text: str,
+        content_encoding: Optional[str] = None,
+    ):
         """
-        Upload the json text to the blob
+        Upload the json text to the blob, compressed when content_encoding is set
         """
         StorageBlobHelper(
             account_url=account_url, container_name=container_name
-        ).upload_text(container_name=self.process_id, blob_name=self.name, text=text)
+        ).upload_text(
+            container_name=self.process_id,
+            blob_name=self.name,
+            text=text,
+            content_encoding=content_encoding,
+        )
         self.size = len(text)
         self.mime_type = "application/json"
@@ -28,6 +28,8 @@ class PipelineStatus(PipelineMessageBase):
         remaining_steps: Steps not yet completed.
         completed_steps: Steps that have finished.
         process_results: Accumulated per-step result objects.
+        priority: Queue lane of the document (``high``, ``normal`` or
+            ``low``); None until set by the submitter or by promotion.
     """
 
     completed: bool = Field(default=False, alias="Completed")
@@ -43,6 +45,7 @@ class PipelineStatus(PipelineMessageBase):
     process_results: Optional[List[StepResult]] = Field(
         default_factory=list, alias="ProcessResults"
     )
+    priority: Optional[str] = Field(default=None, alias="Priority")
 
     def update_step(self):
         """
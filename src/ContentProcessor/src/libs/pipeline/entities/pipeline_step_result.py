@@ -7,7 +7,7 @@ Each completed pipeline step produces a ``StepResult`` that captures
 the step name, arbitrary result payload, and elapsed time.
 """
 
-from typing import Any
+from typing import Any, Optional
 
 from pydantic import Field
 
@@ -28,7 +28,7 @@ class StepResult(PipelineMessageBase):
     process_id: str = Field(default=None)
     step_name: str = Field(default=None)
     result: Any = Field(default=None)
-    elapsed: str = Field(default=None)
+    elapsed: Optional[str] = Field(default=None)
 
     def save_to_persistent_storage(self, account_url: str, container_name: str):
         if self.process_id is None:
@@ -7,15 +7,21 @@ Merges confidence signals from Azure Content Understanding OCR and
 OpenAI logprobs to produce per-field and overall confidence scores.
 """
 
+import asyncio
 import json
+from typing import Optional
 
 from libs.application.application_context import AppContext
-from libs.azure_helper.model.content_understanding import AnalyzedResult
+from libs.azure_helper.model.content_understanding import (
+    AnalyzedResult,
+    DocumentContent,
+)
 from libs.pipeline.entities.mime_types import MimeTypes
 from libs.pipeline.entities.pipeline_file import ArtifactType, PipelineLogEntry
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
 from libs.pipeline.handlers.logics.evaluate_handler.comparison import (
+    ExtractionComparisonData,
     get_extraction_comparison_data,
 )
 from libs.pipeline.handlers.logics.evaluate_handler.confidence import (
@@ -28,7 +34,15 @@ from libs.pipeline.handlers.logics.evaluate_handler.model import DataExtractionR
 from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (
     evaluate_confidence as gpt_confidence,
 )
+from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (
+    load_encoding,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.parallel_confidence import (
+    ConfidencePool,
+    count_leaf_values,
+)
 from libs.pipeline.queue_handler_base import HandlerBase
+from libs.utils import metrics
 
 
 class EvaluateHandler(HandlerBase):
@@ -40,9 +54,20 @@ class EvaluateHandler(HandlerBase):
         3. Merge scores and produce field-level comparison data.
     """
 
+    confidence_pool: Optional[ConfidencePool] = None
+
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(appContext, step_name, **data)
 
+    async def prewarm(self):
+        """Load the GPT tokenizer used to score logprobs."""
+        await asyncio.to_thread(load_encoding)
+
+    def shutdown(self):
+        """Stop the confidence worker processes."""
+        if self.confidence_pool is not None:
+            self.confidence_pool.shutdown()
+
     async def execute(self, context: MessageContext) -> StepResult:
         source_mime_type = context.data_pipeline.get_source_files()[0].mime_type
         content_understanding_result: AnalyzedResult | None = None
@@ -77,37 +102,22 @@ class EvaluateHandler(HandlerBase):
         # Convert the parsed message to a dictionary
         gpt_evaluate_confidence_dict = parsed_message_from_gpt
 
-        # Evaluate Confidence Score - Content Understanding
-        content_understanding_confidence_score = None
-        if content_understanding_result is not None:
-            content_understanding_confidence_score = content_understanding_confidence(
-                gpt_evaluate_confidence_dict,
-                content_understanding_result.result.contents[0],
-            )
-
-        # Evaluate Confidence Score - GPT
-        gpt_confidence_score = gpt_confidence(
-            gpt_evaluate_confidence_dict, gpt_result["choices"][0]
+        document = (
+            content_understanding_result.result.contents[0]
+            if content_understanding_result is not None
+            else None
         )
 
-        # Merge the confidence scores - Content Understanding and GPT results.
-        if content_understanding_confidence_score is None:
-            # For images (or missing extract output), compute summary stats from GPT confidence only.
-            merged_confidence_score = merge_confidence_values(
-                gpt_confidence_score, gpt_confidence_score
-            )
-        else:
-            merged_confidence_score = merge_confidence_values(
-                content_understanding_confidence_score, gpt_confidence_score
+        # Scoring is CPU-bound; run it off the event loop so the handler
+        # stays responsive while large extraction results are evaluated.
+        with metrics.phase("confidence"):
+            merged_confidence_score, result_data = await asyncio.to_thread(
+                self._score_extraction,
+                gpt_evaluate_confidence_dict,
+                document,
+                gpt_result["choices"][0],
             )
 
-        # Flatten extracted data and confidence score
-        result_data = get_extraction_comparison_data(
-            actual=gpt_evaluate_confidence_dict,
-            confidence=merged_confidence_score,
-            threads_hold=0.8,  # TODO: Get this from config
-        )
-
         # Put all results in a single object
         all_results = DataExtractionResult(
             extracted_result=gpt_evaluate_confidence_dict,
@@ -133,6 +143,9 @@ class EvaluateHandler(HandlerBase):
             account_url=self.application_context.configuration.app_storage_blob_url,
             container_name=self.application_context.configuration.app_cps_processes,
             text=all_results.model_dump_json(),
+            content_encoding=self.application_context.configuration.content_encoding_for(
+                result_file.artifact_type
+            ),
         )
 
         return StepResult(
@@ -140,3 +153,58 @@ class EvaluateHandler(HandlerBase):
             step_name=self.handler_name,
             result={"result": "success", "file_name": result_file.name},
         )
+
+    def _score_extraction(
+        self,
+        extracted: dict,
+        document: Optional[DocumentContent],
+        choice: dict,
+    ) -> tuple[dict, ExtractionComparisonData]:
+        """Evaluate, merge and flatten confidence for the extracted fields.
+
+        Large results are evaluated in a process pool when
+        ``app_evaluate_max_workers`` is above one; otherwise both evaluators
+        run sequentially in the calling thread. The pool is started by the
+        first large result and reused until the handler stops.
+        """
+        max_workers = self.application_context.configuration.app_evaluate_max_workers
+        min_values = (
+            self.application_context.configuration.app_evaluate_parallel_min_values
+        )
+
+        if max_workers > 1 and count_leaf_values(extracted) >= min_values:
+            if self.confidence_pool is None:
+                self.confidence_pool = ConfidencePool(max_workers)
+            content_understanding_confidence_score, gpt_confidence_score = (
+                self.confidence_pool.evaluate(extracted, document, choice)
+            )
+        else:
+            # Evaluate Confidence Score - Content Understanding
+            content_understanding_confidence_score = None
+            if document is not None:
+                content_understanding_confidence_score = (
+                    content_understanding_confidence(extracted, document)
+                )
+
+            # Evaluate Confidence Score - GPT
+            gpt_confidence_score = gpt_confidence(extracted, choice)
+
+        # Merge the confidence scores - Content Understanding and GPT results.
+        if content_understanding_confidence_score is None:
+            # For images (or missing extract output), compute summary stats from GPT confidence only.
+            merged_confidence_score = merge_confidence_values(
+                gpt_confidence_score, gpt_confidence_score
+            )
+        else:
+            merged_confidence_score = merge_confidence_values(
+                content_understanding_confidence_score, gpt_confidence_score
+            )
+
+        # Flatten extracted data and confidence score
+        result_data = get_extraction_comparison_data(
+            actual=extracted,
+            confidence=merged_confidence_score,
+            threads_hold=0.8,  # TODO: Get this from config
+        )
+
+        return merged_confidence_score, result_data
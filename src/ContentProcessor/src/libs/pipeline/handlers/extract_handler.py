@@ -4,9 +4,12 @@
 """Extract handler — document content extraction via Azure Content Understanding.
 
 Processes PDF files through the Content Understanding pre-built layout
-analyzer. Image files bypass extraction entirely.
+analyzer. Image files bypass extraction entirely. Small documents submitted
+without a priority continue in the ``high`` lane.
 """
 
+import logging
+
 from libs.application.application_context import AppContext
 from libs.azure_helper.content_understanding import AzureContentUnderstandingHelper
 from libs.azure_helper.model.content_understanding import AnalyzedResult
@@ -14,7 +17,9 @@ from libs.pipeline.entities.mime_types import MimeTypes
 from libs.pipeline.entities.pipeline_file import ArtifactType, PipelineLogEntry
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
+from libs.pipeline.priority_lanes import promote_small_document
 from libs.pipeline.queue_handler_base import HandlerBase
+from libs.utils import metrics
 
 
 class ExtractHandler(HandlerBase):
@@ -24,6 +29,7 @@ class ExtractHandler(HandlerBase):
         1. Route by MIME type (skip images, process PDFs).
         2. Invoke Azure Content Understanding for layout analysis.
         3. Persist extracted results to blob storage.
+        4. Promote documents without a priority by page count.
     """
 
     def __init__(self, appContext: AppContext, step_name: str, **data):
@@ -35,6 +41,7 @@ class ExtractHandler(HandlerBase):
             MimeTypes.ImagePng,
             MimeTypes.ImageJpeg,
         ]:
+            self._promote_small_document(context, pages=1)
             return StepResult(
                 process_id=context.data_pipeline.pipeline_status.process_id,
                 step_name=self.handler_name,
@@ -51,18 +58,23 @@ class ExtractHandler(HandlerBase):
                 content_understanding_helper = scope.get_service(
                     AzureContentUnderstandingHelper
                 )
-                response = content_understanding_helper.begin_analyze_stream(
-                    analyzer_id="prebuilt-layout",
-                    file_stream=context.data_pipeline.get_source_files()[
-                        0
-                    ].download_stream(
-                        self.application_context.configuration.app_storage_blob_url,
-                        self.application_context.configuration.app_cps_processes,
-                    ),
+                file_stream = context.data_pipeline.get_source_files()[
+                    0
+                ].download_stream(
+                    self.application_context.configuration.app_storage_blob_url,
+                    self.application_context.configuration.app_cps_processes,
                 )
-
-                response = content_understanding_helper.poll_result(response)
+                with metrics.phase("content_understanding"):
+                    response = content_understanding_helper.begin_analyze_stream(
+                        analyzer_id="prebuilt-layout",
+                        file_stream=file_stream,
+                    )
+                    response = content_understanding_helper.poll_result(response)
                 result: AnalyzedResult = AnalyzedResult(**response)
+            self._promote_small_document(
+                context,
+                pages=sum(len(content.pages) for content in result.result.contents),
+            )
 
             # Save Result as a file
             # Create File Entity to add
@@ -84,6 +96,9 @@ class ExtractHandler(HandlerBase):
                 account_url=self.application_context.configuration.app_storage_blob_url,
                 container_name=self.application_context.configuration.app_cps_processes,
                 text=result.model_dump_json(),
+                content_encoding=self.application_context.configuration.content_encoding_for(
+                    result_file.artifact_type
+                ),
             )
 
             return StepResult(
@@ -104,3 +119,18 @@ class ExtractHandler(HandlerBase):
                 "reason": "Content type not supported for extraction.",
             },
         )
+
+    def _promote_small_document(self, context: MessageContext, pages: int):
+        """Move a document without a priority to the ``high`` lane if it is small."""
+        promoted = promote_small_document(
+            context.data_pipeline.pipeline_status,
+            pages,
+            self.application_context.configuration.app_priority_small_document_pages,
+        )
+        if promoted is not None:
+            logging.info(
+                "Document promoted to the %s lane: process_id=%s, pages=%s",
+                promoted.value,
+                context.data_pipeline.pipeline_status.process_id,
+                pages,
+            )
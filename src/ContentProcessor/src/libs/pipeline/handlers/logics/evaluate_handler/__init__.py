@@ -8,7 +8,10 @@ Sub-modules:
     confidence: Confidence score merging and lookup utilities.
     content_understanding_confidence_evaluator: Confidence scoring
         against Azure Content Understanding OCR results.
+    geometry: Vectorized polygon normalization and bounding boxes.
     model: Result container models for extraction and classification.
     openai_confidence_evaluator: Confidence scoring via OpenAI
         logprobs token analysis.
+    parallel_confidence: Process-pool execution of both evaluators
+        for large extraction results.
 """
@@ -9,7 +9,6 @@ scores and threshold checks, used by the evaluate and save handlers.
 
 from typing import Any, List, Optional
 
-import pandas as pd
 from pydantic import BaseModel
 
 from libs.utils.utils import flatten_dict
@@ -92,6 +91,10 @@ def get_extraction_comparison(
         pd.DataFrame: The DataFrame comparing the extracted fields with the expected fields.
     """
 
+    # pandas is only needed for this report; importing it lazily keeps it out
+    # of every handler process that imports the comparison models.
+    import pandas as pd
+
     expected_flat = flatten_dict(expected)
     extracted_flat = flatten_dict(actual)
     confidence_flat = flatten_dict(confidence)
@@ -206,3 +206,32 @@ def merge_confidence_values(confidence_a: dict, confidence_b: dict):
         merged_confidence["zero_confidence_fields_count"] = 0
 
     return merged_confidence
+
+
+CONFIDENCE_SUMMARY_KEYS = (
+    "overall",
+    "total_evaluated_fields_count",
+    "overall_confidence",
+    "min_extracted_field_confidence",
+    "min_extracted_field_confidence_field",
+    "zero_confidence_fields",
+    "zero_confidence_fields_count",
+)
+
+
+def summarize_confidence(merged_confidence: dict) -> dict:
+    """
+    Keeps only the summary scores of a merged confidence evaluation.
+
+    Args:
+        merged_confidence: The merged confidence evaluation.
+
+    Returns:
+        dict: The summary entries added by merge_confidence_values, without per-field details.
+    """
+
+    return {
+        key: merged_confidence[key]
+        for key in CONFIDENCE_SUMMARY_KEYS
+        if key in merged_confidence
+    }
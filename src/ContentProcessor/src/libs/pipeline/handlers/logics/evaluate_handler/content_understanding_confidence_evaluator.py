@@ -8,9 +8,10 @@ per-field confidence based on word-level recognition scores.
 """
 
 import copy
+from functools import cached_property
 from typing import Iterable, Optional
 
-from pydantic import Field
+from pydantic import Field, computed_field
 
 from libs.azure_helper.model.content_understanding import (
     DocumentContent,
@@ -21,6 +22,12 @@ from libs.azure_helper.model.content_understanding import (
 from libs.pipeline.handlers.logics.evaluate_handler.confidence import (
     get_confidence_values,
 )
+from libs.pipeline.handlers.logics.evaluate_handler.geometry import (
+    bounding_box_union,
+    normalize_page_lines,
+    normalize_polygons,
+    to_point_dicts,
+)
 from libs.utils.utils import value_contains, value_match
 
 
@@ -29,17 +36,23 @@ class DIDocumentLine(Line):
     A class representing a line in a document extracted by Azure AI Document Intelligence with additional attributes.
 
     Attributes:
-        normalized_polygon (Optional[list[dict[str, int]]]): The normalized polygon coordinates of the document line.
+        normalized_points (Optional[list[list[float]]]): The normalized polygon coordinates of the document line as [x, y] pairs.
+        normalized_polygon (Optional[list[dict[str, float]]]): The normalized polygon coordinates as dictionaries, built on first access.
         confidence (float): The confidence score of the document line.
         page_number (int): The page number where the document line is located.
         contained_words (list[DocumentWord]): The list of words contained in the document line.
     """
 
-    normalized_polygon: Optional[list[dict[str, int]]] = Field(default=None)
+    normalized_points: Optional[list[list[float]]] = Field(default=None, exclude=True)
     confidence: Optional[float] = Field(default=None)
     page_number: Optional[int] = Field(default=None)
     contained_words: Optional[list[Word]] = Field(default=None)
 
+    @computed_field
+    @cached_property
+    def normalized_polygon(self) -> Optional[list[dict[str, float]]]:
+        return to_point_dicts(self.normalized_points)
+
     def to_dict(self):
         """
         Converts the DIDocumentLine instance to a dictionary.
@@ -98,19 +111,7 @@ def normalize_polygon(page: Page, polygon: list[float]) -> list[dict[str, int]]:
         list: The normalized polygon coordinates as a list of dictionaries with 'x' and 'y' keys.
     """
 
-    result = list()
-
-    for i in range(0, len(polygon), 2):
-        x = polygon[i]
-        y = polygon[i + 1]
-
-        # Normalize the coordinates to the page dimensions
-        x = round(x / page.width, 3)
-        y = round(y / page.height, 3)
-
-        result.append({"x": x, "y": y})
-
-    return result
+    return to_point_dicts(normalize_polygons([polygon], page.width, page.height)[0])
 
 
 def extract_lines(
@@ -129,7 +130,9 @@ def extract_lines(
 
     di_lines = list()
     for page_number, page in enumerate(analyze_result.pages):
-        for line in page.lines:
+        # All line polygons of the page are normalized in one operation.
+        page_line_points = normalize_page_lines(page)
+        for line, line_points in zip(page.lines, page_line_points):
             line_copy = copy.copy(line)
             contained_words = list()
             # for span in line_copy.spans:
@@ -151,7 +154,7 @@ def extract_lines(
             di_line.contained_words = contained_words
             di_line.page_number = page_number
             di_line.confidence = multiple_score_resolver(contained_words_conf_scores)
-            di_line.normalized_polygon = normalize_polygon(page, line_copy.polygon)
+            di_line.normalized_points = line_points
 
             di_lines.append(di_line)
     return di_lines
@@ -162,6 +165,7 @@ def find_matching_lines(
     analyze_result: DocumentContent,
     value_matcher: callable = value_match,
     multiple_score_resolver: callable = min,
+    di_lines: Optional[list[DIDocumentLine]] = None,
 ) -> list[DIDocumentLine]:
     """
     Find lines in the  Content Understanding Service result that match a given value.
@@ -171,6 +175,7 @@ def find_matching_lines(
         analyze_result: The  Content Understanding Service result to search for matching lines.
         value_matcher: The function to use for matching values.
         multiple_score_resolver: The function to resolve multiple confidence scores of contained words.
+        di_lines: Lines already extracted from analyze_result. When omitted they are extracted on every call.
 
     Returns:
         list: The list of DIDocumentLine instances that match the given value.
@@ -182,7 +187,8 @@ def find_matching_lines(
     if not isinstance(value, str):
         value = str(value)
 
-    di_lines = extract_lines(analyze_result, multiple_score_resolver)
+    if di_lines is None:
+        di_lines = extract_lines(analyze_result, multiple_score_resolver)
 
     matching_lines = [line for line in di_lines if value_matcher(value, line.content)]
 
@@ -213,18 +219,32 @@ def get_field_confidence_score(
     return multiple_score_resolver(scores)
 
 
-def evaluate_confidence(extract_result: dict, analyze_result: DocumentContent):
+def evaluate_confidence(
+    extract_result: dict,
+    analyze_result: DocumentContent,
+    di_lines: Optional[list[DIDocumentLine]] = None,
+):
     """
     Evaluate the confidence of extracted fields based on the  Content Understanding Service result.
 
     Args:
         extract_result: The extracted fields to evaluate.
         analyze_result: The  Content Understanding Service result to evaluate against.
+        di_lines: Lines already extracted from analyze_result, shared across calls evaluating the same document.
 
     Returns:
         dict: The confidence evaluation of the extracted fields.
     """
 
+    # Lines are extracted once per document and reused for every field value.
+    document_lines = di_lines
+
+    def get_document_lines() -> list[DIDocumentLine]:
+        nonlocal document_lines
+        if document_lines is None:
+            document_lines = extract_lines(analyze_result)
+        return document_lines
+
     def evaluate_field_value_confidence(
         value: any,
     ) -> dict[str, any]:
@@ -249,11 +269,17 @@ def evaluate_confidence(extract_result: dict, analyze_result: DocumentContent):
         else:
             # Find lines that match the value exactly or contain the value
             matching_lines = find_matching_lines(
-                value, analyze_result, value_matcher=value_match
+                value,
+                analyze_result,
+                value_matcher=value_match,
+                di_lines=get_document_lines() if value else None,
             )
             if not matching_lines:
                 matching_lines = find_matching_lines(
-                    value, analyze_result, value_matcher=value_contains
+                    value,
+                    analyze_result,
+                    value_matcher=value_contains,
+                    di_lines=get_document_lines() if value else None,
                 )
 
             # Calculate the confidence score based on the matching lines
@@ -265,10 +291,22 @@ def evaluate_confidence(extract_result: dict, analyze_result: DocumentContent):
 
             normalized_polygons = [line.normalized_polygon for line in matching_lines]
 
+            # A value spanning several lines is highlighted with one rectangle.
+            bounding_polygon = (
+                to_point_dicts(
+                    bounding_box_union(
+                        line.normalized_points for line in matching_lines
+                    )
+                )
+                if len(matching_lines) > 1
+                else None
+            )
+
             return {
                 "confidence": field_confidence_score,
                 "matching_lines": matching_lines,
                 "normalized_polygons": normalized_polygons,
+                "bounding_polygon": bounding_polygon,
                 "value": value,
             }
 
@@ -0,0 +1,116 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Vectorized polygon helpers for Content Understanding layouts.
+
+Normalizes all line polygons of a page in a single NumPy operation and
+keeps the result as plain coordinate pairs; the ``{"x": .., "y": ..}``
+form consumed by the UI is produced only for lines that are emitted.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from libs.azure_helper.model.content_understanding import Page
+
+POLYGON_PRECISION = 3
+
+
+def normalize_polygons(
+    polygons: Iterable[Optional[list[float]]], width: float, height: float
+) -> list[Optional[list[list[float]]]]:
+    """
+    Normalize many polygons to page dimensions at once.
+
+    Polygons are flat ``[x1, y1, x2, y2, ...]`` lists in page units. Polygons
+    sharing the same point count are stacked and scaled together; missing
+    or empty polygons are returned unchanged.
+
+    Args:
+        polygons: The polygons to normalize.
+        width: The page width.
+        height: The page height.
+
+    Returns:
+        list: For every input polygon, its ``[x, y]`` points rounded to three decimals.
+    """
+
+    polygons = list(polygons)
+    result: list[Optional[list[list[float]]]] = [
+        None if polygon is None else [] for polygon in polygons
+    ]
+    scale = np.array([width, height], dtype=np.float64)
+
+    by_length: dict[int, list[int]] = {}
+    for index, polygon in enumerate(polygons):
+        if polygon:
+            by_length.setdefault(len(polygon), []).append(index)
+
+    for length, indices in by_length.items():
+        points = np.asarray([polygons[i] for i in indices], dtype=np.float64)
+        points = np.round(
+            points.reshape(len(indices), length // 2, 2) / scale, POLYGON_PRECISION
+        )
+        for index, normalized in zip(indices, points.tolist()):
+            result[index] = normalized
+
+    return result
+
+
+def normalize_page_lines(page: Page) -> list[Optional[list[list[float]]]]:
+    """
+    Normalize the polygons of every line on a page in one pass.
+
+    Args:
+        page: The page whose line polygons are normalized.
+
+    Returns:
+        list: The normalized points of each line, in ``page.lines`` order.
+    """
+
+    return normalize_polygons(
+        (line.polygon for line in page.lines), page.width, page.height
+    )
+
+
+def to_point_dicts(points: Optional[list[list[float]]]) -> Optional[list[dict]]:
+    """
+    Convert ``[x, y]`` points into the serialized ``{"x": .., "y": ..}`` form.
+
+    Args:
+        points: The normalized points.
+
+    Returns:
+        list: The points as dictionaries, or None when no points are given.
+    """
+
+    if points is None:
+        return None
+    return [{"x": x, "y": y} for x, y in points]
+
+
+def bounding_box_union(
+    polygons: Iterable[Optional[list[list[float]]]],
+) -> Optional[list[list[float]]]:
+    """
+    Compute the axis-aligned box enclosing several normalized polygons.
+
+    Used to highlight a value that spans multiple matching lines with a
+    single rectangle.
+
+    Args:
+        polygons: Normalized ``[x, y]`` points of each polygon.
+
+    Returns:
+        list: The four corners of the enclosing box, clockwise from the top-left, or None when there are no points.
+    """
+
+    points = [point for polygon in polygons if polygon for point in polygon]
+    if not points:
+        return None
+
+    stacked = np.asarray(points, dtype=np.float64)
+    x_min, y_min = stacked.min(axis=0).tolist()
+    x_max, y_max = stacked.max(axis=0).tolist()
+    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
@@ -16,7 +16,60 @@ from libs.pipeline.handlers.logics.evaluate_handler.confidence import (
 )
 
 
-def evaluate_confidence(extract_result: dict, choice: dict, model: str = "gpt-4o"):
+def advance_value_offset(value: any, generated_text: str, substr_offset: int = 0) -> int:
+    """
+    Walk a field value the same way evaluate_confidence does and return the text offset after it.
+
+    Values are located in the generated text in document order, each search starting where the
+    previous value ended. This reproduces that walk without the token work, so a later slice of the
+    fields can be evaluated independently with the correct start_offset.
+
+    Args:
+        value: The field value (scalar, dict or list) to walk.
+        generated_text: The original text of the response.
+        substr_offset: The offset to start searching from.
+
+    Returns:
+        int: The offset after the last value that was found.
+    """
+
+    if isinstance(value, dict):
+        for val in value.values():
+            substr_offset = advance_value_offset(val, generated_text, substr_offset)
+        return substr_offset
+    if isinstance(value, list):
+        for item in value:
+            substr_offset = advance_value_offset(item, generated_text, substr_offset)
+        return substr_offset
+
+    value_str = str(value)
+    start_index = generated_text.find(value_str, substr_offset)
+    if start_index == -1:
+        return substr_offset
+    return start_index + len(value_str)
+
+
+def load_encoding(model: str = "gpt-4o"):
+    """
+    Load the tokenizer encoding for a model.
+
+    tiktoken caches encodings per process, so calling this once at worker
+    startup keeps the download and parse of the BPE ranks off the first
+    evaluation.
+
+    Args:
+        model: The model used for the response.
+
+    Returns:
+        tiktoken.Encoding: The encoding used by the model.
+    """
+
+    return tiktoken.encoding_for_model(model)
+
+
+def evaluate_confidence(
+    extract_result: dict, choice: dict, model: str = "gpt-4o", start_offset: int = 0
+):
     """
     Evaluate confidence for each field value in the extracted result based on the logprobs of the response from Azure AI Foundry.
 
@@ -24,6 +77,7 @@ def evaluate_confidence(extract_result: dict, choice: dict, model: str = "gpt-4o
         extract_result: The extraction result.
         choice: The choice dictionary from the Azure AI Foundry response.
         model: The model used for the response.
+        start_offset: The offset in the generated text where the first field value is searched from.
 
     Returns:
         dict: The confidence evaluation of the extraction result.
@@ -56,7 +110,7 @@ def evaluate_confidence(extract_result: dict, choice: dict, model: str = "gpt-4o
         token_offsets.append((current_pos, current_pos + token_length))
         current_pos += token_length
 
-    substr_offset = 0
+    substr_offset = start_offset
 
     def find_token_indices(substring: str, start_char: int):
         """
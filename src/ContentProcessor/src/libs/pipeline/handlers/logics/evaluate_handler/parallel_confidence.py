@@ -0,0 +1,270 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Process-pool execution of the confidence evaluators.
+
+Splits an extraction result into chunks of top-level fields (and slices
+of very long list fields), evaluates each chunk in a worker process
+against a document index built once per worker, and reassembles the
+partial confidence trees in field order so the merged result is
+identical to a sequential evaluation.
+
+The pool outlives the documents: ``ConfidencePool`` starts its worker
+processes on the first document and keeps them until the handler stops.
+Each document is written once to a temporary file; a worker loads it on
+the first chunk it evaluates for that document instead of receiving it
+pickled with every chunk.
+"""
+
+import math
+import os
+import pickle
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+from libs.azure_helper.model.content_understanding import DocumentContent
+from libs.pipeline.handlers.logics.evaluate_handler.confidence import (
+    get_confidence_values,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.content_understanding_confidence_evaluator import (
+    DIDocumentLine,
+    extract_lines,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.content_understanding_confidence_evaluator import (
+    evaluate_confidence as content_understanding_confidence,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (
+    advance_value_offset,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (
+    evaluate_confidence as gpt_confidence,
+)
+
+# A chunk unit is (field name, value, is_list_slice).
+ChunkUnit = tuple[str, Any, bool]
+
+# Per-worker state of the document being evaluated, loaded by _load_document.
+_worker_key: Optional[str] = None
+_worker_document: Optional[DocumentContent] = None
+_worker_lines: Optional[list[DIDocumentLine]] = None
+_worker_choice: Optional[dict] = None
+_worker_model: str = "gpt-4o"
+
+
+def count_leaf_values(value: Any) -> int:
+    """Return the number of scalar values in a nested extraction value."""
+    if isinstance(value, dict):
+        return sum(count_leaf_values(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(count_leaf_values(v) for v in value)
+    return 1
+
+
+def split_into_chunks(extract_result: dict, chunk_count: int) -> list[list[ChunkUnit]]:
+    """
+    Split the extraction result into roughly equal chunks of leaf values.
+
+    Top-level fields are kept whole unless they are lists larger than the
+    target chunk size, in which case the list is sliced by item. Units keep
+    their original order and every field appears at most once per chunk.
+
+    Args:
+        extract_result: The extraction result to split.
+        chunk_count: The desired number of chunks.
+
+    Returns:
+        list: The chunks, each a list of (field, value, is_list_slice) units.
+    """
+
+    total = count_leaf_values(extract_result)
+    target = max(1, math.ceil(total / max(1, chunk_count)))
+
+    chunks: list[list[ChunkUnit]] = []
+    current: list[ChunkUnit] = []
+    current_size = 0
+
+    def close_chunk():
+        nonlocal current, current_size
+        if current:
+            chunks.append(current)
+        current = []
+        current_size = 0
+
+    for field, value in extract_result.items():
+        size = count_leaf_values(value)
+        if isinstance(value, list) and size > target:
+            items: list = []
+            for item in value:
+                item_size = count_leaf_values(item)
+                if current_size + item_size > target and (items or current):
+                    if items:
+                        current.append((field, items, True))
+                    close_chunk()
+                    items = []
+                items.append(item)
+                current_size += item_size
+            if items:
+                current.append((field, items, True))
+            continue
+
+        if current_size + size > target and current:
+            close_chunk()
+        current.append((field, value, False))
+        current_size += size
+
+    close_chunk()
+    return chunks
+
+
+def _load_document(key: str, path: str) -> None:
+    """Build the per-process document index of the document *key* once."""
+    global _worker_key, _worker_document, _worker_lines, _worker_choice, _worker_model
+    if key == _worker_key:
+        return
+    with open(path, "rb") as payload:
+        document, choice, model = pickle.load(payload)
+    _worker_document = document
+    _worker_lines = extract_lines(document) if document is not None else None
+    _worker_choice = choice
+    _worker_model = model
+    _worker_key = key
+
+
+def _evaluate_chunk(
+    key: str, path: str, fields: dict, start_offset: int
+) -> tuple[Optional[dict], Optional[dict]]:
+    """Evaluate one chunk of the document *key* in a worker process."""
+    _load_document(key, path)
+    cu_result = None
+    gpt_result = None
+    if _worker_document is not None:
+        cu_result = content_understanding_confidence(
+            fields, _worker_document, di_lines=_worker_lines
+        )
+        cu_result.pop("_overall", None)
+    if _worker_choice is not None:
+        gpt_result = gpt_confidence(
+            fields, _worker_choice, model=_worker_model, start_offset=start_offset
+        )
+        gpt_result.pop("_overall", None)
+    return cu_result, gpt_result
+
+
+def _assemble(chunks: list[list[ChunkUnit]], partials: list[Optional[dict]]) -> dict:
+    """Reassemble per-chunk confidence trees in the original field order."""
+    confidence: dict = {}
+    for chunk, partial in zip(chunks, partials):
+        for field, _, is_list_slice in chunk:
+            if is_list_slice:
+                confidence.setdefault(field, []).extend(partial[field])
+            else:
+                confidence[field] = partial[field]
+
+    confidence_scores = get_confidence_values(confidence)
+    if confidence_scores:
+        confidence["_overall"] = sum(confidence_scores) / len(confidence_scores)
+    else:
+        confidence["_overall"] = 0.0
+    return confidence
+
+
+class ConfidencePool:
+    """Worker processes evaluating confidence chunks, reused across documents.
+
+    Attributes:
+        max_workers: The number of worker processes.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def evaluate(
+        self,
+        extract_result: dict,
+        analyze_result: Optional[DocumentContent],
+        choice: dict,
+        model: str = "gpt-4o",
+    ) -> tuple[Optional[dict], dict]:
+        """
+        Run the Content Understanding and GPT confidence evaluators in the pool.
+
+        Args:
+            extract_result: The extracted fields to evaluate.
+            analyze_result: The Content Understanding document, or None for images.
+            choice: The choice dictionary from the Azure AI Foundry response.
+            model: The model used for the response.
+
+        Returns:
+            tuple: The Content Understanding confidence (None when analyze_result is None)
+            and the GPT confidence, each identical to the sequential evaluators' output.
+        """
+
+        if choice.get("logprobs") is None:
+            # Nothing to score from logprobs; let the evaluator produce its default.
+            gpt_choice = None
+            gpt_result = gpt_confidence(extract_result, choice, model=model)
+        else:
+            gpt_choice = choice
+            gpt_result = None
+
+        chunks = split_into_chunks(extract_result, self.max_workers * 2)
+
+        # The GPT evaluator searches values in document order; compute the text
+        # offset at which each chunk starts so chunks can run independently.
+        generated_text = choice["message"]["content"]
+        start_offsets = []
+        offset = 0
+        for chunk in chunks:
+            start_offsets.append(offset)
+            for _, value, _ in chunk:
+                offset = advance_value_offset(value, generated_text, offset)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        key = uuid.uuid4().hex
+        handle, path = tempfile.mkstemp(prefix="confidence-", suffix=".pickle")
+        try:
+            with os.fdopen(handle, "wb") as payload:
+                pickle.dump(
+                    (analyze_result, gpt_choice, model),
+                    payload,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            futures = [
+                self._executor.submit(
+                    _evaluate_chunk,
+                    key,
+                    path,
+                    {field: value for field, value, _ in chunk},
+                    start_offset,
+                )
+                for chunk, start_offset in zip(chunks, start_offsets)
+            ]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died; the next document starts a fresh pool.
+            self.shutdown()
+            raise
+        finally:
+            os.remove(path)
+
+        cu_result = (
+            _assemble(chunks, [cu for cu, _ in results])
+            if analyze_result is not None
+            else None
+        )
+        if gpt_result is None:
+            gpt_result = _assemble(chunks, [gpt for _, gpt in results])
+
+        return cu_result, gpt_result
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on the next document."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -7,6 +7,7 @@ Prepares multi-modal prompts (text + images) and invokes a GPT model
 with structured output to extract schema-conforming data from documents.
 """
 
+import asyncio
 import base64
 import io
 import json
@@ -28,6 +29,7 @@ from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
 from libs.pipeline.entities.schema import Schema
 from libs.pipeline.queue_handler_base import HandlerBase
+from libs.utils import metrics
 from libs.utils.remote_schema_loader import load_schema_from_blob_json
 
 logger = logging.getLogger(__name__)
@@ -75,6 +77,12 @@ class MapHandler(HandlerBase):
     def __init__(self, appContext: AppContext, step_name: str, **data):
         super().__init__(appContext, step_name, **data)
 
+    async def prewarm(self):
+        """Create the Agent Framework clients before the first document arrives."""
+        await asyncio.to_thread(
+            self.application_context.get_service, AgentFrameworkHelper
+        )
+
     async def execute(self, context: MessageContext) -> StepResult:
         # Check file type : PDF
         if context.data_pipeline.get_source_files()[0].mime_type == MimeTypes.Pdf:
@@ -100,7 +108,8 @@ class MapHandler(HandlerBase):
             )
 
             pdf_stream = io.BytesIO(pdf_bytes)
-            images = convert_from_bytes(pdf_stream.read())
+            with metrics.phase("render_pages"):
+                images = convert_from_bytes(pdf_stream.read())
 
             # Optionally limit the number of page images included
             if MAP_MAX_IMAGES > 0:
@@ -262,13 +271,14 @@ Return ONLY valid JSON matching this schema:
         else:
             run_options = {"logprobs": True, "top_logprobs": 5}
 
-        gpt_response = await agent.run(
-            Message(
-                "user",
-                contents=self._to_agent_framework_contents(user_content),
-            ),
-            options=run_options,
-        )
+        with metrics.phase("llm"):
+            gpt_response = await agent.run(
+                Message(
+                    "user",
+                    contents=self._to_agent_framework_contents(user_content),
+                ),
+                options=run_options,
+            )
 
         response_content = gpt_response.text  # Json format string
 
@@ -345,6 +355,11 @@ Return ONLY valid JSON matching this schema:
             },
         }
 
+        metrics.record_tokens(
+            response_dict["usage"]["input_tokens"],
+            response_dict["usage"]["completion_tokens"],
+        )
+
         # Save Result as a file
         result_file = context.data_pipeline.add_file(
             file_name="gpt_output.json",
@@ -360,6 +375,9 @@ Return ONLY valid JSON matching this schema:
             account_url=self.application_context.configuration.app_storage_blob_url,
             container_name=self.application_context.configuration.app_cps_processes,
             text=json.dumps(response_dict),
+            content_encoding=self.application_context.configuration.content_encoding_for(
+                result_file.artifact_type
+            ),
         )
 
         return StepResult(
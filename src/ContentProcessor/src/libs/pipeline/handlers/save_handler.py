@@ -12,12 +12,23 @@ import datetime
 import json
 
 from libs.application.application_context import AppContext
-from libs.models.content_process import ContentProcess, Step_Outputs
+from libs.models.content_process import (
+    ArtifactReference,
+    ContentProcess,
+    Step_Outputs,
+)
 from libs.pipeline.entities.mime_types import MimeTypes
-from libs.pipeline.entities.pipeline_file import ArtifactType, PipelineLogEntry
+from libs.pipeline.entities.pipeline_file import (
+    ArtifactType,
+    FileDetails,
+    PipelineLogEntry,
+)
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
 from libs.pipeline.entities.schema import Schema
+from libs.pipeline.handlers.logics.evaluate_handler.confidence import (
+    summarize_confidence,
+)
 from libs.pipeline.handlers.logics.evaluate_handler.model import DataExtractionResult
 from libs.pipeline.queue_handler_base import HandlerBase
 
@@ -30,6 +41,10 @@ class SaveHandler(HandlerBase):
         2. Compute aggregate scores (entity, schema, min confidence).
         3. Write the ContentProcess record to Cosmos DB.
         4. Save step-output history to blob storage.
+
+    With ``app_slim_persistence`` enabled, step outputs and the detailed
+    evaluation are stored as references to the blobs written by earlier
+    steps; only scores and summaries are kept inline.
     """
 
     def __init__(self, appContext: AppContext, step_name: str, **data):
@@ -76,41 +91,57 @@ class SaveHandler(HandlerBase):
                 None,
             )
 
-        process_outputs: list[Step_Outputs] = []
-
-        if output_file_json_string_from_extract:
-            extract_step_result_obj = json.loads(output_file_json_string_from_extract)
-        else:
-            extract_step_result_obj = {
-                "result": "skipped",
-                "reason": "Content type is image, skipping extraction.",
-            }
+        slim_persistence = (
+            self.application_context.configuration.app_slim_persistence
+        )
 
-        process_outputs.append(
-            Step_Outputs(
-                step_name="extract",
+        def step_output(
+            step_name: str, artifact_type: ArtifactType, json_string: str, fallback
+        ) -> Step_Outputs:
+            process_result = find_process_result(step_name)
+            output = Step_Outputs(
+                step_name=step_name,
                 processed_time=(
-                    find_process_result("extract").elapsed
-                    if find_process_result("extract") is not None
-                    else ""
+                    process_result.elapsed if process_result is not None else ""
                 ),
-                step_result=extract_step_result_obj,
-            )
-        )
-        process_outputs.append(
-            Step_Outputs(
-                step_name="map",
-                processed_time=find_process_result("map").elapsed,
-                step_result=json.loads(output_file_json_string_from_map),
-            )
-        )
-        process_outputs.append(
-            Step_Outputs(
-                step_name="evaluate",
-                processed_time=find_process_result("evaluate").elapsed,
-                step_result=json.loads(output_file_json_string_from_evaluate),
+                step_result=fallback,
             )
-        )
+            if not json_string:
+                return output
+
+            output_file = self._find_output_file(context, step_name, artifact_type)
+            if slim_persistence and output_file is not None:
+                output.step_result = None
+                output.step_result_reference = ArtifactReference.from_text(
+                    output_file.name, json_string
+                )
+            else:
+                output.step_result = json.loads(json_string)
+            return output
+
+        process_outputs: list[Step_Outputs] = [
+            step_output(
+                "extract",
+                ArtifactType.ExtractedContent,
+                output_file_json_string_from_extract,
+                {
+                    "result": "skipped",
+                    "reason": "Content type is image, skipping extraction.",
+                },
+            ),
+            step_output(
+                "map",
+                ArtifactType.SchemaMappedData,
+                output_file_json_string_from_map,
+                None,
+            ),
+            step_output(
+                "evaluate",
+                ArtifactType.ScoreMergedData,
+                output_file_json_string_from_evaluate,
+                None,
+            ),
+        ]
 
         # Compute the aggregate scores. Successful (Completed) processing
         # always yields numeric scores: when probabilistic confidence is
@@ -153,6 +184,20 @@ class SaveHandler(HandlerBase):
             comment="",
         )
 
+        evaluate_output_file = self._find_output_file(
+            context, "evaluate", ArtifactType.ScoreMergedData
+        )
+        if slim_persistence and evaluate_output_file is not None:
+            # Per-field confidence (with matching lines) and the comparison
+            # table stay in the evaluate output blob.
+            processed_result.confidence = summarize_confidence(
+                evaluated_result.confidence
+            )
+            processed_result.extracted_comparison_data = None
+            processed_result.evaluation_reference = ArtifactReference.from_text(
+                evaluate_output_file.name, output_file_json_string_from_evaluate
+            )
+
         # Save Result to Cosmos DB
         processed_result.update_status_to_cosmos(
             connection_string=self.application_context.configuration.app_cosmos_connstr,
@@ -174,6 +219,9 @@ class SaveHandler(HandlerBase):
             account_url=self.application_context.configuration.app_storage_blob_url,
             container_name=self.application_context.configuration.app_cps_processes,
             text=json.dumps([step.model_dump() for step in process_outputs]),
+            content_encoding=self.application_context.configuration.content_encoding_for(
+                processed_history.artifact_type
+            ),
         )
 
         # Save Result as a file
@@ -190,6 +238,9 @@ class SaveHandler(HandlerBase):
             account_url=self.application_context.configuration.app_storage_blob_url,
             container_name=self.application_context.configuration.app_cps_processes,
             text=processed_result.model_dump_json(),
+            content_encoding=self.application_context.configuration.content_encoding_for(
+                result_file.artifact_type
+            ),
         )
 
         # Console out
@@ -203,6 +254,21 @@ class SaveHandler(HandlerBase):
             result={"result": result_file.name},
         )
 
+    @staticmethod
+    def _find_output_file(
+        context: MessageContext, processed_by: str, artifact_type: ArtifactType
+    ) -> FileDetails | None:
+        """Return the first pipeline file produced by *processed_by* with *artifact_type*."""
+        return next(
+            (
+                file
+                for file in context.data_pipeline.files
+                if file.processed_by == processed_by
+                and file.artifact_type == artifact_type
+            ),
+            None,
+        )
+
     def _summarize_processed_time(self, step_results: list[StepResult]) -> str:
         """
         Summarize the processed time of all steps in the pipeline.
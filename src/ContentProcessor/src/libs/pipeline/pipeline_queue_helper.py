@@ -4,7 +4,7 @@
 """Azure Storage Queue helpers for the processing pipeline.
 
 Provides queue lifecycle management (create-if-missing), message routing
-between pipeline steps, and dead-letter queue handling.
+between pipeline steps and priority lanes, and dead-letter queue handling.
 """
 
 import logging
@@ -14,12 +14,22 @@ from azure.storage.queue import QueueClient, QueueMessage
 
 from libs.pipeline import pipeline_step_helper
 from libs.pipeline.entities.pipeline_data import DataPipeline
+from libs.pipeline.priority_lanes import Priority, priority_of
 from libs.utils.azure_credential_utils import get_azure_credential
 
 
-def create_queue_client_name(step_name: str) -> str:
-    """Return the canonical queue name for a pipeline step."""
-    return f"content-pipeline-{step_name}-queue"
+def create_queue_client_name(step_name: str, priority: Priority = None) -> str:
+    """Return the queue name of a pipeline step's lane (default: normal)."""
+    if priority is None or priority == Priority.Normal:
+        return f"content-pipeline-{step_name}-queue"
+    return f"content-pipeline-{step_name}-{Priority(priority).value}-queue"
+
+
+def create_lane_queue_client_names(step_name: str) -> dict[Priority, str]:
+    """Return the queue name of every priority lane of a pipeline step."""
+    return {
+        priority: create_queue_client_name(step_name, priority) for priority in Priority
+    }
 
 
 def create_dead_letter_queue_client_name(step_name: str) -> str:
@@ -70,7 +80,7 @@ def has_messages(queue_client: QueueClient) -> bool:
 def pass_data_pipeline_to_next_step(
     data_pipeline: DataPipeline, account_url: str, credential: get_azure_credential
 ):
-    """Enqueue the pipeline payload to the next step's queue."""
+    """Enqueue the pipeline payload to the next step's queue in its lane."""
     next_step_name = pipeline_step_helper.get_next_step_name(
         data_pipeline.pipeline_status, data_pipeline.pipeline_status.active_step
     )
@@ -78,7 +88,11 @@ def pass_data_pipeline_to_next_step(
         return
 
     _create_queue_client(
-        account_url, create_queue_client_name(next_step_name), credential
+        account_url,
+        create_queue_client_name(
+            next_step_name, priority_of(data_pipeline.pipeline_status)
+        ),
+        credential,
     ).send_message(data_pipeline.model_dump_json())
 
 
@@ -12,6 +12,7 @@ import base64
 import datetime
 import json
 import logging
+import time
 from abc import ABC, abstractmethod
 
 from azure.storage.queue import QueueClient
@@ -19,12 +20,22 @@ from opentelemetry import trace
 from libs.application.application_context import AppContext
 from libs.base.application_models import AppModelBase
 from libs.models.content_process import ContentProcess, Step_Outputs
-from libs.pipeline import pipeline_queue_helper
+from libs.pipeline import (
+    pipeline_queue_helper,
+    priority_lanes,
+    status_events,
+    step_checkpoint,
+)
 from libs.pipeline.entities.pipeline_data import DataPipeline
 from libs.pipeline.entities.pipeline_file import ArtifactType, PipelineLogEntry
 from libs.pipeline.entities.pipeline_message_context import MessageContext
 from libs.pipeline.entities.pipeline_step_result import StepResult
-from libs.utils import base64_util, stopwatch
+from libs.process_host.worker_recycling import (
+    current_rss_mb,
+    peak_rss_mb,
+    recycle_reason,
+)
+from libs.utils import base64_util, metrics, profiling, stopwatch
 
 
 class HandlerBase(AppModelBase, ABC):
@@ -35,16 +46,23 @@ class HandlerBase(AppModelBase, ABC):
         2. Deserialize messages into ``DataPipeline`` payloads.
         3. Delegate to the concrete ``execute()`` method.
         4. Persist results, advance the pipeline, and handle errors.
+        5. Profile a sample of the messages when profiling is configured.
+        6. Serve the step's priority lanes by weighted round-robin.
 
     Attributes:
         handler_name: Pipeline step name (e.g. 'extract', 'map').
-        queue_client: Azure Storage Queue client for the step.
+        queue_client: Azure Storage Queue client of the lane the current
+            message was received from.
+        lane_queue_clients: Queue clients of the step's priority lanes.
+        lane_scheduler: Picks the lane polled for the next message.
         application_context: Shared application context / DI container.
     """
 
     handler_name: str = None
     queue_client: QueueClient = None
     queue_name: str = None
+    lane_queue_clients: dict[priority_lanes.Priority, QueueClient] = None
+    lane_scheduler: priority_lanes.LaneScheduler = None
     application_context: AppContext = None
     dead_letter_queue_client: QueueClient = None
     dead_letter_queue_name: str = None
@@ -58,11 +76,31 @@ class HandlerBase(AppModelBase, ABC):
         show_information: bool = True,
         app_context: AppContext = None,
         step_name: str = None,
+        stop_event=None,
+        stats=None,
     ):
         # Initialize the handler
         self.__initialize_handler(app_context, step_name)
 
-        while True:
+        with stopwatch.Stopwatch() as timer:
+            try:
+                await self.prewarm()
+            except Exception as e:
+                # Prewarming only moves work off the first message; the
+                # handler can still serve without it.
+                logging.warning(f"Prewarm failed for {self.handler_name}: {e}")
+        logging.info(
+            f"Handler {self.handler_name} ready (prewarm {timer.elapsed_string})"
+        )
+
+        configuration = self.application_context.configuration
+        recycle = configuration.recycle_settings()
+        profiling_settings = configuration.profiling_settings()
+        messages_processed = 0
+
+        # The process host sets stop_event to retire this worker; the current
+        # message is always finished first.
+        while stop_event is None or not stop_event.is_set():
             checking_message: str = """Checking Message.... at {datetime} by {queue_name}
             """
             checking_message = checking_message.format(
@@ -76,11 +114,10 @@ class HandlerBase(AppModelBase, ABC):
             logging.info(checking_message) if show_information else None
 
             # Check if queue is available in the storage account or not
-            pipeline_queue_helper.invalidate_queue(self.queue_client)
             pipeline_queue_helper.invalidate_queue(self.dead_letter_queue_client)
 
-            # Check if there are any messages in the queue
-            if not pipeline_queue_helper.has_messages(self.queue_client):
+            # Check if there are any messages in the lanes of the step
+            if not self._select_lane():
                 print(
                     f"No messages found. - {self.queue_name}"
                 ) if show_information else None
@@ -99,6 +136,8 @@ class HandlerBase(AppModelBase, ABC):
                 logging.info(
                     f"Message dequeued {self.queue_name}: {queue_message.content}"
                 ) if show_information else None
+                dequeued_at = time.perf_counter()
+                metrics.record_queue_wait(queue_message.inserted_on)
 
                 # Check if the message content is Base64 encoded string
                 if base64_util.is_base64_encoded(queue_message.content):
@@ -140,107 +179,61 @@ class HandlerBase(AppModelBase, ABC):
                             self.handler_name,
                         )
 
-                        # Update status to the currently running step BEFORE execution
-                        # so the UI reflects real-time progress.
-                        ContentProcess(
-                            process_id=process_id,
-                            processed_file_name=document_name,
-                            processed_file_mime_type=self._current_message_context.data_pipeline.files[
-                                0
-                            ].mime_type,
-                            status=step_name,
-                            imported_time=datetime.datetime.strptime(
-                                self._current_message_context.data_pipeline.pipeline_status.creation_time,
-                                "%Y-%m-%dT%H:%M:%S.%fZ",
-                            ),
-                            last_modified_time=datetime.datetime.now(datetime.UTC),
-                            last_modified_by=step_name,
-                        ).update_process_status_to_cosmos(
-                            connection_string=self.application_context.configuration.app_cosmos_connstr,
-                            database_name=self.application_context.configuration.app_cosmos_database,
-                            collection_name=self.application_context.configuration.app_cosmos_container_process,
-                        )
-
-                        print(
-                            f"Start Processing : {self.handler_name}"
-                        ) if show_information else None
-                        tracer = trace.get_tracer(__name__)
-                        with tracer.start_as_current_span(
-                            f"pipeline.{self.handler_name}",
-                            attributes={
-                                "process_id": process_id,
-                                "document_name": document_name,
-                                "pipeline_stage": self.handler_name,
-                            },
-                        ):
-                            with stopwatch.Stopwatch() as timer:
-                                step_result = await self.execute(
-                                    self._current_message_context
-                                )
-                        print(
-                            f"Completed : {self.handler_name} - Elapsed :{timer.elapsed_string}"
-                        ) if show_information else None
-
-                        logging.info(
-                            "Pipeline stage completed: process_id=%s, document=%s, stage=%s, elapsed=%s",
-                            process_id,
-                            document_name,
-                            self.handler_name,
-                            timer.elapsed_string,
-                        )
-                        step_result.elapsed = timer.elapsed_string
-
-                        step_result.save_to_persistent_storage(
-                            self.application_context.configuration.app_storage_blob_url,
-                            self.application_context.configuration.app_cps_processes,
-                        )
-
-                        self._current_message_context.data_pipeline.pipeline_status.add_step_result(
-                            step_result
-                        )
-
-                        self._current_message_context.data_pipeline.save_to_persistent_storage(
-                            self.application_context.configuration.app_storage_blob_url,
-                            self.application_context.configuration.app_cps_processes,
-                        )
-
-                        pipeline_queue_helper.pass_data_pipeline_to_next_step(
-                            self._current_message_context.data_pipeline,
-                            self.application_context.configuration.app_storage_queue_url,
-                            self.application_context.credential,
+                        checkpoint = (
+                            self._find_checkpoint(step_name)
+                            if configuration.app_step_idempotency
+                            else None
                         )
-
-                        pipeline_queue_helper.delete_queue_message(
-                            queue_message, self.queue_client
-                        )
-
-                        # Update Process Status to Cosmos DB
-                        ContentProcess(
-                            process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
-                            processed_file_name=self._current_message_context.data_pipeline.files[
-                                0
-                            ].name,
-                            processed_file_mime_type=self._current_message_context.data_pipeline.files[
-                                0
-                            ].mime_type,
-                            status="Completed"
-                            if self._current_message_context.data_pipeline.pipeline_status.completed
-                            else step_name,
-                            imported_time=datetime.datetime.strptime(
-                                self._current_message_context.data_pipeline.pipeline_status.creation_time,
-                                "%Y-%m-%dT%H:%M:%S.%fZ",
-                            ),
-                            last_modified_time=datetime.datetime.now(datetime.UTC),
-                            last_modified_by=step_name,
-                        ).update_process_status_to_cosmos(
-                            connection_string=self.application_context.configuration.app_cosmos_connstr,
-                            database_name=self.application_context.configuration.app_cosmos_database,
-                            collection_name=self.application_context.configuration.app_cosmos_container_process,
+                        if checkpoint is None:
+                            async with step_checkpoint.step_lease(
+                                configuration.app_storage_blob_url,
+                                configuration.app_cps_processes,
+                                process_id,
+                                step_name,
+                                configuration.app_step_lease_seconds,
+                            ) as leased:
+                                if leased:
+                                    await self._execute_step(
+                                        step_name, show_information, profiling_settings
+                                    )
+                                    self._forward_step(queue_message, step_name)
+                                else:
+                                    logging.info(
+                                        "Pipeline stage is executed by another worker: process_id=%s, stage=%s",
+                                        process_id,
+                                        self.handler_name,
+                                    )
+                                    self.queue_client.update_message(
+                                        queue_message,
+                                        visibility_timeout=configuration.app_step_lease_seconds,
+                                    )
+                        elif checkpoint.data_pipeline is not None:
+                            logging.info(
+                                "Pipeline stage already completed, forwarding its output: process_id=%s, stage=%s",
+                                process_id,
+                                self.handler_name,
+                            )
+                            self._current_message_context.data_pipeline = (
+                                checkpoint.data_pipeline
+                            )
+                            self._forward_step(queue_message, step_name)
+                        else:
+                            logging.info(
+                                "Pipeline stage already completed and forwarded: process_id=%s, stage=%s",
+                                process_id,
+                                self.handler_name,
+                            )
+                            pipeline_queue_helper.delete_queue_message(
+                                queue_message, self.queue_client
+                            )
+                        metrics.record_message(
+                            "success", time.perf_counter() - dequeued_at
                         )
                     else:
                         logging.error("Message is not a valid model.")
                         self._move_to_dead_letter_queue(queue_message)
                 except Exception as e:
+                    metrics.record_message("error", time.perf_counter() - dequeued_at)
                     logging.error(
                         "Pipeline error: process_id=%s, stage=%s, error=%s",
                         data_pipeline.pipeline_status.process_id if data_pipeline else "unknown",
@@ -315,6 +308,7 @@ class HandlerBase(AppModelBase, ABC):
                             database_name=self.application_context.configuration.app_cosmos_database,
                             collection_name=self.application_context.configuration.app_cosmos_container_process,
                         )
+                        self._publish_status("Error")
 
                         process_outputs: list[Step_Outputs] = []
 
@@ -381,6 +375,7 @@ class HandlerBase(AppModelBase, ABC):
                                 database_name=self.application_context.configuration.app_cosmos_database,
                                 collection_name=self.application_context.configuration.app_cosmos_container_process,
                             )
+                            self._publish_status("Error")
 
                             process_outputs.append(
                                 Step_Outputs(
@@ -423,8 +418,24 @@ class HandlerBase(AppModelBase, ABC):
                             text=json.dumps([
                                 step.model_dump() for step in process_outputs
                             ]),
+                            content_encoding=self.application_context.configuration.content_encoding_for(
+                                processed_history.artifact_type
+                            ),
                         )
 
+                messages_processed += 1
+
+            if stats is not None:
+                stats.record(messages_processed, peak_rss_mb())
+            reason = recycle_reason(recycle, messages_processed, current_rss_mb())
+            if reason is not None:
+                # Exit cleanly between messages; the process host starts a
+                # fresh worker in this one's place.
+                logging.info(
+                    f"Recycling handler {self.handler_name}: {reason}, peak RSS {peak_rss_mb():.0f} MiB"
+                )
+                return
+
     def __initialize_handler(self, appContext: AppContext, step_name: str):
         """Set up queue clients and handler metadata for a pipeline step."""
         self.handler_name = step_name
@@ -440,11 +451,22 @@ class HandlerBase(AppModelBase, ABC):
             )
         )
 
-        self.queue_client = pipeline_queue_helper.create_or_get_queue_client(
-            self.queue_name,
-            self.application_context.configuration.app_storage_queue_url,
-            self.application_context.credential,
+        self.lane_queue_clients = {
+            priority: pipeline_queue_helper.create_or_get_queue_client(
+                queue_name,
+                self.application_context.configuration.app_storage_queue_url,
+                self.application_context.credential,
+            )
+            for priority, queue_name in pipeline_queue_helper.create_lane_queue_client_names(
+                self.handler_name
+            ).items()
+        }
+        self.lane_scheduler = priority_lanes.LaneScheduler(
+            priority_lanes.parse_lane_weights(
+                self.application_context.configuration.app_priority_lane_weights
+            )
         )
+        self.queue_client = self.lane_queue_clients[priority_lanes.Priority.Normal]
         self.dead_letter_queue_client = (
             pipeline_queue_helper.create_or_get_queue_client(
                 self.dead_letter_queue_name,
@@ -472,6 +494,220 @@ class HandlerBase(AppModelBase, ABC):
         logging.info(queue_statue_message)
         print(queue_statue_message)
 
+    def _select_lane(self) -> bool:
+        """Point ``queue_client`` at the next lane that has a message.
+
+        Lanes are tried in the order of the lane scheduler. The message is
+        then received, deleted, re-hidden and dead-lettered through
+        ``queue_client``, so it always refers to the lane it came from.
+
+        Returns:
+            bool: False if every lane is empty.
+        """
+        for priority in self.lane_scheduler.order():
+            queue_client = self.lane_queue_clients[priority]
+            pipeline_queue_helper.invalidate_queue(queue_client)
+            if pipeline_queue_helper.has_messages(queue_client):
+                self.queue_client = queue_client
+                self.queue_name = queue_client.queue_name
+                return True
+        return False
+
+    async def _execute_step(
+        self, step_name: str, show_information: bool, profiling_settings
+    ):
+        """Execute the step for the current message and persist its output.
+
+        Persists ``{step}-result.json``, the step's artifacts and finally
+        ``process-status.json``, which marks the step as completed for
+        ``step_checkpoint.find_completed_step()``.
+        """
+        data_pipeline = self._current_message_context.data_pipeline
+        process_id = data_pipeline.pipeline_status.process_id
+        document_name = data_pipeline.files[0].name
+
+        # Update status to the currently running step BEFORE execution
+        # so the UI reflects real-time progress.
+        ContentProcess(
+            process_id=process_id,
+            processed_file_name=document_name,
+            processed_file_mime_type=data_pipeline.files[0].mime_type,
+            status=step_name,
+            imported_time=datetime.datetime.strptime(
+                data_pipeline.pipeline_status.creation_time,
+                "%Y-%m-%dT%H:%M:%S.%fZ",
+            ),
+            last_modified_time=datetime.datetime.now(datetime.UTC),
+            last_modified_by=step_name,
+        ).update_process_status_to_cosmos(
+            connection_string=self.application_context.configuration.app_cosmos_connstr,
+            database_name=self.application_context.configuration.app_cosmos_database,
+            collection_name=self.application_context.configuration.app_cosmos_container_process,
+        )
+        self._publish_status(step_name)
+
+        print(f"Start Processing : {self.handler_name}") if show_information else None
+        profile_message = profiling.should_profile(
+            profiling_settings,
+            self.handler_name,
+            data_pipeline.pipeline_status.schema_id,
+        )
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span(
+            f"pipeline.{self.handler_name}",
+            attributes={
+                "process_id": process_id,
+                "document_name": document_name,
+                "pipeline_stage": self.handler_name,
+            },
+        ):
+            with (
+                stopwatch.Stopwatch() as timer,
+                metrics.phase("execute"),
+                profiling.profiled(profile_message) as profiler,
+            ):
+                step_result = await self.execute(self._current_message_context)
+        print(
+            f"Completed : {self.handler_name} - Elapsed :{timer.elapsed_string}"
+        ) if show_information else None
+
+        logging.info(
+            "Pipeline stage completed: process_id=%s, document=%s, stage=%s, elapsed=%s",
+            process_id,
+            document_name,
+            self.handler_name,
+            timer.elapsed_string,
+        )
+        step_result.elapsed = timer.elapsed_string
+
+        if profiler is not None:
+            self._save_profile(profiler)
+
+        step_result.save_to_persistent_storage(
+            self.application_context.configuration.app_storage_blob_url,
+            self.application_context.configuration.app_cps_processes,
+        )
+
+        data_pipeline.pipeline_status.add_step_result(step_result)
+
+        data_pipeline.save_to_persistent_storage(
+            self.application_context.configuration.app_storage_blob_url,
+            self.application_context.configuration.app_cps_processes,
+        )
+
+    def _forward_step(self, queue_message, step_name: str):
+        """Pass the current pipeline to the next step and complete the message."""
+        with metrics.phase("enqueue"):
+            pipeline_queue_helper.pass_data_pipeline_to_next_step(
+                self._current_message_context.data_pipeline,
+                self.application_context.configuration.app_storage_queue_url,
+                self.application_context.credential,
+            )
+
+        pipeline_queue_helper.delete_queue_message(queue_message, self.queue_client)
+
+        # Update Process Status to Cosmos DB
+        ContentProcess(
+            process_id=self._current_message_context.data_pipeline.pipeline_status.process_id,
+            processed_file_name=self._current_message_context.data_pipeline.files[
+                0
+            ].name,
+            processed_file_mime_type=self._current_message_context.data_pipeline.files[
+                0
+            ].mime_type,
+            status="Completed"
+            if self._current_message_context.data_pipeline.pipeline_status.completed
+            else step_name,
+            imported_time=datetime.datetime.strptime(
+                self._current_message_context.data_pipeline.pipeline_status.creation_time,
+                "%Y-%m-%dT%H:%M:%S.%fZ",
+            ),
+            last_modified_time=datetime.datetime.now(datetime.UTC),
+            last_modified_by=step_name,
+        ).update_process_status_to_cosmos(
+            connection_string=self.application_context.configuration.app_cosmos_connstr,
+            database_name=self.application_context.configuration.app_cosmos_database,
+            collection_name=self.application_context.configuration.app_cosmos_container_process,
+        )
+        self._publish_status(
+            "Completed"
+            if self._current_message_context.data_pipeline.pipeline_status.completed
+            else step_name
+        )
+
+    def _publish_status(self, status: str):
+        """Announce the status just written to Cosmos DB to the API."""
+        configuration = self.application_context.configuration
+        status_events.publish_status(
+            configuration.app_storage_queue_url,
+            configuration.app_status_events_queue,
+            self.application_context.credential,
+            self._current_message_context.data_pipeline.pipeline_status.process_id,
+            status,
+        )
+
+    def _find_checkpoint(self, step_name: str):
+        """Return the persisted output of the step for a redelivered message.
+
+        Returns None, and so executes the step, when the output cannot be
+        read.
+        """
+        try:
+            return step_checkpoint.find_completed_step(
+                self._current_message_context.data_pipeline,
+                step_name,
+                self.application_context.configuration.app_storage_blob_url,
+                self.application_context.configuration.app_cps_processes,
+            )
+        except Exception as e:
+            logging.warning(f"Unable to check for completed {step_name} output: {e}")
+            return None
+
+    def _save_profile(self, profiler):
+        """Store the profile of the current message as a pipeline artifact.
+
+        A profile that cannot be stored is logged and dropped; it never
+        fails the message.
+        """
+        data_pipeline = self._current_message_context.data_pipeline
+        profile_file = data_pipeline.add_file(
+            file_name=f"{self.handler_name}_profile.prof",
+            artifact_type=ArtifactType.Profile,
+        )
+        profile_file.mime_type = "application/octet-stream"
+        try:
+            profile_file.upload_stream(
+                account_url=self.application_context.configuration.app_storage_blob_url,
+                container_name=self.application_context.configuration.app_cps_processes,
+                stream=profiling.to_bytes(profiler),
+            )
+        except Exception as e:
+            data_pipeline.files.remove(profile_file)
+            logging.warning(f"Unable to store profile of {self.handler_name}: {e}")
+            return
+        logging.info(
+            f"Profile of {self.handler_name} stored as {profile_file.process_id}/{profile_file.name}"
+        )
+        logging.debug(profiling.summary(profiler))
+
+    async def prewarm(self):
+        """
+        Load expensive resources before the handler starts consuming messages.
+
+        Called once per worker process before it reports ready. The default
+        does nothing; handlers override it to build clients, load models or
+        fill caches that would otherwise slow down the first message.
+        """
+
+    def shutdown(self):
+        """
+        Release resources held across messages once the handler stops.
+
+        Called once per worker process after its message loop ends, whether
+        it was stopped, recycled or failed. The default does nothing;
+        handlers override it to stop pools or close clients they keep open.
+        """
+
     @abstractmethod
     async def execute(self, context: MessageContext) -> StepResult:
         raise NotImplementedError("execute method is not implemented")
@@ -481,6 +717,8 @@ class HandlerBase(AppModelBase, ABC):
         show_information: bool = True,
         app_context: AppContext = None,
         step_name: str = None,
+        stop_event=None,
+        stats=None,
     ):
         """
         Entry point for handlers to be hosted by process host and runs asynchronously.
@@ -489,14 +727,22 @@ class HandlerBase(AppModelBase, ABC):
             show_information (bool, optional): If True, displays information about the connection process. Defaults to True.
             app_context (AppContext, optional): The application context to use for the connection. Defaults to None.
             step_name (str, optional): The name of the step in the pipeline. Defaults to None.
+            stop_event (multiprocessing.Event, optional): When set, the handler exits after its current message. Defaults to None.
+            stats (WorkerStats, optional): Shared counters the handler publishes its message count and memory high-water mark to. Defaults to None.
         """
-        asyncio.run(
-            self._connect_async(
-                show_information=show_information,
-                app_context=app_context,
-                step_name=step_name,
-            )
-        )
+        with metrics.stage(step_name):
+            try:
+                asyncio.run(
+                    self._connect_async(
+                        show_information=show_information,
+                        app_context=app_context,
+                        step_name=step_name,
+                        stop_event=stop_event,
+                        stats=stats,
+                    )
+                )
+            finally:
+                self.shutdown()
 
     def download_output_file_to_json_string(
         self, processed_by: str, artifact_type: ArtifactType
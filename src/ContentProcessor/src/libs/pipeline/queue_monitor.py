@@ -0,0 +1,208 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Backlog and flow telemetry for the pipeline step queues.
+
+Samples the depth of the priority lanes of every step and of its
+dead-letter queue together with the age of the oldest message, and
+estimates per step:
+
+- arrival rate, by Little's law: the messages waiting in a FIFO queue
+  arrived during the age of the oldest one, so ``depth / oldest_age``
+  summed over the lanes;
+- service rate, the arrival rate minus the change in depth;
+- drain time, the backlog divided by the net service rate.
+
+Azure Storage queues expose no dequeue counters, so these estimates are
+independent of how many replicas consume the queue. Samples are published
+as ``cps.queue.*`` gauges.
+"""
+
+import asyncio
+import datetime
+import logging
+from typing import Optional
+
+from azure.storage.queue import QueueClient
+from pydantic import BaseModel
+
+from libs.application.application_context import AppContext
+from libs.pipeline import pipeline_queue_helper
+from libs.utils import metrics
+
+
+class QueueStats(BaseModel):
+    """One backlog sample of a step queue.
+
+    Attributes:
+        step: Pipeline step the queue feeds.
+        depth: Approximate number of messages in the step's lanes.
+        dead_letter_depth: Approximate number of messages in the dead-letter queue.
+        oldest_message_age: Seconds the oldest visible message of any lane has waited.
+        arrival_rate: Estimated messages per second arriving.
+        service_rate: Estimated messages per second leaving (None on the first sample).
+        drain_time: Estimated seconds until the queue is empty (None while not draining).
+    """
+
+    step: str
+    depth: int
+    dead_letter_depth: int = 0
+    oldest_message_age: Optional[float] = None
+    arrival_rate: float = 0.0
+    service_rate: Optional[float] = None
+    drain_time: Optional[float] = None
+
+
+def estimate_flow(
+    depth: int,
+    oldest_message_age: Optional[float],
+    previous_depth: Optional[int],
+    elapsed: float,
+    arrival_rate: Optional[float] = None,
+) -> tuple[float, Optional[float], Optional[float]]:
+    """
+    Estimate arrival rate, service rate and drain time of a queue.
+
+    Args:
+        depth: The current queue depth.
+        oldest_message_age: Seconds the oldest message has waited, if any.
+        previous_depth: The depth at the previous sample, if any.
+        elapsed: Seconds since the previous sample.
+        arrival_rate: The arrival rate, when it is known better than from
+            the depth and oldest message age (e.g. summed over lanes).
+
+    Returns:
+        tuple: ``(arrival_rate, service_rate, drain_time)``. Service rate is
+        None without a previous sample; drain time is None when the queue
+        is not shrinking.
+    """
+
+    if arrival_rate is None:
+        arrival_rate = 0.0
+        if depth > 0 and oldest_message_age:
+            arrival_rate = depth / oldest_message_age
+
+    service_rate = None
+    if previous_depth is not None and elapsed > 0:
+        service_rate = max(0.0, arrival_rate - (depth - previous_depth) / elapsed)
+
+    if depth == 0:
+        return arrival_rate, service_rate, 0.0
+    if service_rate is None or service_rate <= arrival_rate:
+        return arrival_rate, service_rate, None
+    return arrival_rate, service_rate, depth / (service_rate - arrival_rate)
+
+
+class QueueMonitor:
+    """Samples the step queues and dead-letter queues of the pipeline.
+
+    Attributes:
+        steps: Pipeline steps whose queues are sampled.
+        application_context: Provides the queue account URL and credential.
+        latest: Most recent sample per step.
+    """
+
+    def __init__(self, steps: list[str], application_context: AppContext):
+        self.steps = list(steps)
+        self.application_context = application_context
+        self.latest: dict[str, QueueStats] = {}
+        self._sampled_at: dict[str, float] = {}
+        self._clients: dict[str, tuple[list[QueueClient], QueueClient]] = {}
+
+    def _queue_clients(self, step: str) -> tuple[list[QueueClient], QueueClient]:
+        """Return the (lane queues, dead-letter queue) clients of *step*."""
+        if step not in self._clients:
+            account_url = self.application_context.configuration.app_storage_queue_url
+            credential = self.application_context.credential
+            self._clients[step] = (
+                [
+                    pipeline_queue_helper.create_or_get_queue_client(
+                        queue_name, account_url, credential
+                    )
+                    for queue_name in pipeline_queue_helper.create_lane_queue_client_names(
+                        step
+                    ).values()
+                ],
+                pipeline_queue_helper.create_or_get_queue_client(
+                    pipeline_queue_helper.create_dead_letter_queue_client_name(step),
+                    account_url,
+                    credential,
+                ),
+            )
+        return self._clients[step]
+
+    @staticmethod
+    def _read_lane(queue_client: QueueClient) -> tuple[int, Optional[float]]:
+        """Return depth and oldest message age of one lane queue."""
+        depth = queue_client.get_queue_properties().approximate_message_count
+        if depth:
+            peeked = queue_client.peek_messages(max_messages=1)
+            if peeked and peeked[0].inserted_on is not None:
+                return depth, max(
+                    0.0,
+                    (
+                        datetime.datetime.now(datetime.UTC) - peeked[0].inserted_on
+                    ).total_seconds(),
+                )
+        return depth, None
+
+    def _read(self, step: str) -> tuple[int, int, Optional[float], float]:
+        """Return depth, dead-letter depth, oldest message age and arrival rate of *step*."""
+        queue_clients, dead_letter_queue_client = self._queue_clients(step)
+        lanes = [self._read_lane(queue_client) for queue_client in queue_clients]
+        dead_letter_depth = (
+            dead_letter_queue_client.get_queue_properties().approximate_message_count
+        )
+        ages = [age for _, age in lanes if age is not None]
+        arrival_rate = sum(depth / age for depth, age in lanes if depth and age)
+        return (
+            sum(depth for depth, _ in lanes),
+            dead_letter_depth,
+            max(ages) if ages else None,
+            arrival_rate,
+        )
+
+    async def sample(self, now: float) -> dict[str, QueueStats]:
+        """Sample every step queue and publish the results.
+
+        Args:
+            now: Monotonic time of the sample.
+
+        Returns:
+            dict[str, QueueStats]: The latest sample per step. Steps whose
+            queues could not be read keep their previous sample.
+        """
+        for step in self.steps:
+            try:
+                (
+                    depth,
+                    dead_letter_depth,
+                    oldest_message_age,
+                    arrival_rate,
+                ) = await asyncio.to_thread(self._read, step)
+            except Exception as e:
+                logging.warning(f"Unable to sample queue of {step}: {e}")
+                continue
+
+            previous = self.latest.get(step)
+            arrival_rate, service_rate, drain_time = estimate_flow(
+                depth,
+                oldest_message_age,
+                previous.depth if previous else None,
+                now - self._sampled_at.get(step, now),
+                arrival_rate=arrival_rate,
+            )
+            stats = QueueStats(
+                step=step,
+                depth=depth,
+                dead_letter_depth=dead_letter_depth,
+                oldest_message_age=oldest_message_age,
+                arrival_rate=arrival_rate,
+                service_rate=service_rate,
+                drain_time=drain_time,
+            )
+            self.latest[step] = stats
+            self._sampled_at[step] = now
+            metrics.record_queue_stats(step, stats.model_dump(exclude={"step"}))
+            logging.debug(f"Queue {step}: {stats.model_dump_json()}")
+        return self.latest
@@ -0,0 +1,58 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Status-change events of content processes.
+
+Whenever a handler writes a new process status to Cosmos DB it also
+sends a small event to the status-events queue. The API consumes that
+queue and pushes the change to the clients that follow the process over
+Server-Sent Events, WebSocket or long polling, so they no longer poll
+Cosmos DB for it.
+
+Events are best effort: they expire after ``EVENT_TTL_SECONDS`` and a
+failure to send one is logged, never raised, since Cosmos DB remains the
+source of truth.
+"""
+
+import datetime
+import json
+import logging
+
+from azure.storage.queue import QueueClient
+
+from libs.pipeline import pipeline_queue_helper
+
+# Events older than this are of no use to a client that follows a process.
+EVENT_TTL_SECONDS = 600
+
+_queue_clients: dict[tuple[str, str], QueueClient] = {}
+
+
+def status_event(process_id: str, status: str) -> str:
+    """Return the event payload of a process status change."""
+    return json.dumps({
+        "kind": "process",
+        "id": process_id,
+        "status": status,
+        "time": datetime.datetime.now(datetime.UTC).isoformat(),
+    })
+
+
+def publish_status(
+    account_url: str, queue_name: str, credential, process_id: str, status: str
+):
+    """Send a status-change event of *process_id* (no-op if *queue_name* is empty)."""
+    if not queue_name:
+        return
+    try:
+        queue_client = _queue_clients.get((account_url, queue_name))
+        if queue_client is None:
+            queue_client = pipeline_queue_helper.create_or_get_queue_client(
+                queue_name, account_url, credential
+            )
+            _queue_clients[(account_url, queue_name)] = queue_client
+        queue_client.send_message(
+            content=status_event(process_id, status), time_to_live=EVENT_TTL_SECONDS
+        )
+    except Exception as e:
+        logging.warning(f"Unable to publish status event of {process_id}: {e}")
@@ -0,0 +1,176 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Idempotent step execution for redelivered queue messages.
+
+A step persists its ``{step}-result.json``, its artifacts and finally
+``process-status.json`` before it forwards the pipeline and deletes its
+message. A message redelivered after a crash or an expired visibility
+timeout therefore finds the step's output already in the process
+container. ``find_completed_step()`` recognises that output, so the
+handler forwards it instead of executing the step (and paying for its
+model calls) again.
+
+The output is accepted only for the same attempt of the pipeline: the
+persisted status must have the message's creation time and continue the
+message's completed steps with this step, and every artifact the step
+recorded must exist.
+
+``step_lease()`` optionally guards execution with a blob lease on
+``{process_id}/{step}.lease``, so a message that becomes visible while a
+slow worker still executes it is not executed a second time.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from azure.core.exceptions import ResourceNotFoundError
+from pydantic import BaseModel
+
+from libs.azure_helper.storage_blob import StorageBlobHelper
+from libs.pipeline.entities.pipeline_data import DataPipeline
+from libs.pipeline.entities.pipeline_status import PipelineStatus
+
+# Step results recorded by the error path of ``HandlerBase``.
+_FAILED_RESULTS = ("error", "moved to Dead Letter Queue")
+
+STATUS_BLOB = "process-status.json"
+
+
+class StepCheckpoint(BaseModel):
+    """Output of a step that completed before its message was redelivered.
+
+    Attributes:
+        data_pipeline: The pipeline persisted by the step, to forward to
+            the next step. None when a later step has already persisted
+            its own status, which proves the step's output was forwarded.
+    """
+
+    data_pipeline: Optional[DataPipeline] = None
+
+
+def _load_status(
+    helper: StorageBlobHelper, process_id: str
+) -> tuple[Optional[PipelineStatus], Optional[DataPipeline]]:
+    """Read the persisted status and, if it is a full pipeline, the pipeline."""
+    try:
+        payload = json.loads(helper.download_stream(process_id, STATUS_BLOB))
+    except ResourceNotFoundError:
+        return None, None
+    # Successful steps persist the pipeline, failed ones the bare status.
+    if "pipeline_status" in payload or "PipelineStatus" in payload:
+        data_pipeline = DataPipeline(**payload)
+        return data_pipeline.pipeline_status, data_pipeline
+    return PipelineStatus(**payload), None
+
+
+def _succeeded(status: PipelineStatus, step_name: str) -> bool:
+    result = status.get_step_result(step_name)
+    if result is None:
+        return False
+    return not (
+        isinstance(result.result, dict)
+        and result.result.get("result") in _FAILED_RESULTS
+    )
+
+
+def find_completed_step(
+    data_pipeline: DataPipeline,
+    step_name: str,
+    account_url: str,
+    container_name: str,
+) -> Optional[StepCheckpoint]:
+    """Look for the output of *step_name* for the pipeline of a message.
+
+    Args:
+        data_pipeline: The pipeline carried by the (redelivered) message.
+        step_name: The step about to execute.
+        account_url: The blob storage account URL.
+        container_name: The container holding the process folders.
+
+    Returns:
+        Optional[StepCheckpoint]: The completed output, or None when the
+        step has to execute.
+    """
+    message_status = data_pipeline.pipeline_status
+    helper = StorageBlobHelper(account_url=account_url, container_name=container_name)
+    status, persisted = _load_status(helper, message_status.process_id)
+    if status is None:
+        return None
+
+    expected = [*message_status.completed_steps, step_name]
+    if (
+        status.creation_time != message_status.creation_time
+        or status.completed_steps[: len(expected)] != expected
+        or not _succeeded(status, step_name)
+    ):
+        return None
+
+    if len(status.completed_steps) > len(expected):
+        return StepCheckpoint()
+    if persisted is None:
+        return None
+
+    for file in persisted.files:
+        if file.processed_by == step_name and not helper.blob_exists(
+            file.process_id, file.name
+        ):
+            logging.info(
+                f"Artifact {file.name} of {step_name} is missing for {file.process_id}"
+            )
+            return None
+    return StepCheckpoint(data_pipeline=persisted)
+
+
+async def _renew(lease, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(lease.renew)
+        except Exception as e:
+            logging.warning(f"Unable to renew step lease: {e}")
+            return
+
+
+@asynccontextmanager
+async def step_lease(
+    account_url: str,
+    container_name: str,
+    process_id: str,
+    step_name: str,
+    lease_duration: int,
+) -> AsyncIterator[bool]:
+    """Hold a lease on the step of a process for the duration of the block.
+
+    The lease is renewed in the background and released on exit. A
+    *lease_duration* of 0 disables leasing.
+
+    Yields:
+        bool: False if another worker holds the lease; the block must not
+        execute the step then.
+    """
+    if not lease_duration:
+        yield True
+        return
+
+    helper = StorageBlobHelper(account_url=account_url, container_name=container_name)
+    lease = await asyncio.to_thread(
+        helper.acquire_lease, process_id, f"{step_name}.lease", lease_duration
+    )
+    if lease is None:
+        yield False
+        return
+
+    renewal = asyncio.create_task(_renew(lease, lease_duration / 3))
+    try:
+        yield True
+    finally:
+        renewal.cancel()
+        try:
+            await asyncio.to_thread(lease.release)
+        except Exception as e:
+            # The lease expires on its own.
+            logging.warning(f"Unable to release step lease: {e}")
@@ -4,8 +4,9 @@
 """Process-host layer for running pipeline handlers as OS processes.
 
 Sub-modules:
-    handler_process_host: Manager that spawns, monitors, and restarts
-        handler processes.
+    handler_process_host: Manager that spawns, monitors, scales, and
+        restarts handler process pools.
     handler_type_loader: Dynamic loader that resolves step names to
         handler classes at runtime.
+    worker_pool: Worker pool bounds and autoscaling rules.
 """
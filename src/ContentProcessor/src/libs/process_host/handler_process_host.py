@@ -3,17 +3,31 @@
 
 """Multi-process host for pipeline queue handlers.
 
-Spawns each pipeline handler in a separate OS process and monitors them
-for crashes, automatically restarting any that exit unexpectedly.
+Runs each pipeline handler as a pool of OS processes, sizes elastic pools
+from their queue backlog, replaces workers that recycle themselves and
+restarts crashed workers with backoff.
 """
 
+import asyncio
 import logging
+import multiprocessing
+import time
 from multiprocessing import Process
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 
+from azure.storage.queue import QueueClient
 from pydantic import BaseModel
 
 from libs.application.application_context import AppContext
+from libs.pipeline.queue_monitor import QueueMonitor
+from libs.process_host.worker_pool import (
+    AutoscaleSettings,
+    WorkerPoolSettings,
+    desired_worker_count,
+    has_resource_headroom,
+    restart_delay,
+)
+from libs.process_host.worker_recycling import WorkerStats
 
 
 class HandlerInfo(BaseModel):
@@ -23,86 +37,329 @@ class HandlerInfo(BaseModel):
         handler: The OS process running the handler.
         target_function: Callable entry-point for the handler.
         args: Positional arguments forwarded to the process.
+        stop_event: Set to ask the worker to exit after its current message.
+        started_at: Monotonic time the process was started.
+        retiring_since: Monotonic time the worker was asked to stop, if retiring.
+        stats: Message count and memory high-water mark shared by the worker.
     """
 
     handler: Process = None
     target_function: object = None
     args: Tuple[Any, AppContext, str] = None
+    stop_event: object = None
+    started_at: float = 0.0
+    retiring_since: Optional[float] = None
+    stats: Optional[WorkerStats] = None
 
     class Config:
         arbitrary_types_allowed = True
 
 
+class HandlerPool(BaseModel):
+    """Workers and autoscaling state of one pipeline step.
+
+    Attributes:
+        handler_name: Pipeline step name, used as the worker name prefix.
+        target_function: Callable entry-point for each worker.
+        args: Positional arguments forwarded to each worker.
+        settings: Worker count bounds.
+        queue_clients: Lane queues of the step, sampled for their backlog
+            (elastic pools only).
+        workers: Running and retiring workers.
+        target_workers: Worker count the pool is converging to.
+        last_backlog: Queue depth at the previous sample.
+        last_sampled_at: Monotonic time of the previous sample.
+        consecutive_failures: Crashes since a worker last ran stably.
+        restart_at: Monotonic time before which no worker is (re)started.
+        spawned: Number of workers started so far, used for naming.
+        recycled: Number of workers that exited at their recycling limit.
+        peak_rss_mb: Highest resident set size any worker of the step reached.
+        reported_peak_rss_mb: High-water mark at the last memory report.
+    """
+
+    handler_name: str
+    target_function: object = None
+    args: Tuple[Any, AppContext, str] = None
+    settings: WorkerPoolSettings = WorkerPoolSettings()
+    queue_clients: list[QueueClient] = []
+    workers: list[HandlerInfo] = []
+    target_workers: int = 1
+    last_backlog: Optional[int] = None
+    last_sampled_at: float = 0.0
+    consecutive_failures: int = 0
+    restart_at: float = 0.0
+    spawned: int = 0
+    recycled: int = 0
+    peak_rss_mb: float = 0.0
+    reported_peak_rss_mb: float = 0.0
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def active_workers(self) -> list[HandlerInfo]:
+        return [w for w in self.workers if w.retiring_since is None]
+
+
 class HandlerHostManager:
     """Lifecycle manager for pipeline handler processes.
 
     Responsibilities:
-        1. Register handler functions as named OS processes.
-        2. Start all processes and continuously monitor liveness.
-        3. Restart any process that exits unexpectedly.
+        1. Register handler functions as pools of named OS processes.
+        2. Start all pools and continuously monitor liveness.
+        3. Replace workers that exit at their recycling limit.
+        4. Restart any process that exits unexpectedly, with backoff.
+        5. Grow or shrink elastic pools from their queue backlog.
+        6. Report the memory high-water mark of every step.
+        7. Sample queue backlog telemetry through the optional queue monitor.
+        8. Stop all workers gracefully on shutdown.
     """
 
-    handlers: list[dict[str, HandlerInfo]] = []
+    handlers: list[HandlerPool] = []
 
-    def __init__(self, **data):
+    def __init__(
+        self,
+        autoscale: Optional[AutoscaleSettings] = None,
+        monitor: Optional[QueueMonitor] = None,
+        **data,
+    ):
         super().__init__(**data)
         self.handlers = []
+        self.autoscale = autoscale or AutoscaleSettings()
+        self.monitor = monitor
 
     def add_handlers_as_process(
         self,
         target_function: object,
         process_name: str,
         args: Tuple[Any, AppContext, str],
+        settings: Optional[WorkerPoolSettings] = None,
+        queue_clients: Optional[list[QueueClient]] = None,
     ):
-        """Register a handler function to be run as a named OS process."""
-        handler_process = Process(target=target_function, name=process_name, args=args)
+        """Register a handler function to be run as a pool of named OS processes.
 
-        self.handlers.append({
-            "handler_name": process_name,
-            "handler_info": HandlerInfo(
-                handler=handler_process, target_function=target_function, args=args
-            ),
-        })
+        Args:
+            target_function: Callable entry-point for each worker.
+            process_name: Pipeline step name.
+            args: Positional arguments forwarded to each worker.
+            settings: Worker count bounds; defaults to a single worker.
+            queue_clients: Lane queues of the step to sample for elastic pools.
+        """
+        settings = settings or WorkerPoolSettings()
+        self.handlers.append(
+            HandlerPool(
+                handler_name=process_name,
+                target_function=target_function,
+                args=args,
+                settings=settings,
+                queue_clients=(queue_clients or []) if settings.is_elastic else [],
+                target_workers=settings.target_workers,
+            )
+        )
 
     async def start_handler_processes(self, test_mode: bool = False):
-        """Start all registered handlers and monitor for crashes.
+        """Start all registered pools and supervise them.
 
-        Runs an infinite supervision loop that restarts any process whose
-        exit code is set or that is no longer alive.  Set *test_mode* to
-        ``True`` to skip the supervision loop (useful in unit tests).
+        Runs an infinite supervision loop that restarts crashed workers and
+        resizes elastic pools.  Set *test_mode* to ``True`` to skip the
+        supervision loop (useful in unit tests).
         """
-        for handler in self.handlers:
-            handler["handler_info"].handler.start()
+        for pool in self.handlers:
+            self._reconcile(pool, time.monotonic())
 
+        next_sample = time.monotonic() + self.autoscale.interval_seconds
         while not test_mode:
-            for handler in self.handlers:
-                handler["handler_info"].handler.join(timeout=1)
+            await asyncio.sleep(1)
+            now = time.monotonic()
+            for pool in self.handlers:
+                self._reap(pool, now)
+                self._reconcile(pool, now)
+            if now >= next_sample:
+                if self.monitor is not None:
+                    await self.monitor.sample(now)
+                await self._sample_backlogs(now)
+                self._report_memory()
+                next_sample = now + self.autoscale.interval_seconds
+
+    async def stop_handler_processes(self, timeout: Optional[float] = None):
+        """Ask every worker to exit after its current message and wait for it.
+
+        Cancel the supervision loop first, or it restarts the workers that
+        exit. Workers still running after *timeout* seconds (default: the
+        autoscale stop timeout) are terminated.
+        """
+        if timeout is None:
+            timeout = self.autoscale.stop_timeout_seconds
+        workers = [worker for pool in self.handlers for worker in pool.workers]
+        for worker in workers:
+            worker.stop_event.set()
+
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            await asyncio.to_thread(
+                worker.handler.join, max(0.0, deadline - time.monotonic())
+            )
+            if worker.handler.is_alive():
+                logging.warning(
+                    f"Terminating {worker.handler.name}: did not stop within {timeout}s"
+                )
+                worker.handler.terminate()
+                await asyncio.to_thread(worker.handler.join)
+
+        for pool in self.handlers:
+            for worker in pool.workers:
+                if worker.stats is not None:
+                    pool.peak_rss_mb = max(pool.peak_rss_mb, worker.stats.peak_rss_mb)
+            pool.workers = []
+        logging.info(f"Stopped {len(workers)} handler processes")
+
+    def memory_high_water(self) -> dict[str, float]:
+        """Return the highest worker RSS in MiB observed for each step."""
+        return {pool.handler_name: pool.peak_rss_mb for pool in self.handlers}
+
+    def _report_memory(self):
+        """Log the per-step memory high-water marks when any of them grew."""
+        if all(pool.peak_rss_mb <= pool.reported_peak_rss_mb for pool in self.handlers):
+            return
+        for pool in self.handlers:
+            pool.reported_peak_rss_mb = pool.peak_rss_mb
+        logging.info(
+            "Worker memory high-water: "
+            + ", ".join(
+                f"{name}={peak:.0f} MiB"
+                for name, peak in self.memory_high_water().items()
+            )
+        )
+
+    async def _sample_backlogs(self, now: float):
+        """Update the target size of every elastic pool from its queue depth.
+
+        The backlog of a pool is the depth summed over its lanes. Uses the
+        queue monitor's sample when one is available, so the queue is not
+        read twice per interval.
+        """
+        for pool in self.handlers:
+            if not pool.queue_clients:
+                continue
+            if self.monitor is not None and pool.handler_name in self.monitor.latest:
+                self._scale(pool, self.monitor.latest[pool.handler_name].depth, now)
+                continue
+            try:
+                backlog = 0
+                for queue_client in pool.queue_clients:
+                    properties = await asyncio.to_thread(
+                        queue_client.get_queue_properties
+                    )
+                    backlog += properties.approximate_message_count
+            except Exception as e:
+                logging.warning(
+                    f"Unable to read queue depth for {pool.handler_name}: {e}"
+                )
+                continue
+            self._scale(pool, backlog, now)
+
+    def _scale(self, pool: HandlerPool, backlog: int, now: float):
+        """Apply the autoscaling rule to *pool* for a new backlog sample."""
+        drain_rate = 0.0
+        if pool.last_backlog is not None and now > pool.last_sampled_at:
+            drain_rate = (pool.last_backlog - backlog) / (now - pool.last_sampled_at)
+        pool.last_backlog = backlog
+        pool.last_sampled_at = now
+
+        desired = desired_worker_count(
+            pool.settings, pool.target_workers, backlog, drain_rate, self.autoscale
+        )
+        if desired > pool.target_workers and not has_resource_headroom(self.autoscale):
+            logging.info(
+                f"Not scaling {pool.handler_name} to {desired} workers: host is at its CPU or memory limit"
+            )
+            return
+        if desired != pool.target_workers:
+            logging.info(
+                f"Scaling {pool.handler_name} from {pool.target_workers} to {desired} workers (backlog {backlog})"
+            )
+            pool.target_workers = desired
+
+    def _reap(self, pool: HandlerPool, now: float):
+        """Drop exited workers and schedule restarts for crashed ones."""
+        for worker in list(pool.workers):
+            if worker.stats is not None:
+                pool.peak_rss_mb = max(pool.peak_rss_mb, worker.stats.peak_rss_mb)
+            if worker.handler.is_alive():
                 if (
-                    not handler["handler_info"].handler.is_alive()
-                    or handler["handler_info"].handler.exitcode is not None
+                    worker.retiring_since is not None
+                    and now - worker.retiring_since
+                    > self.autoscale.stop_timeout_seconds
                 ):
-                    print(f"Restarting the handler => {handler['handler_name']}")
-                    self.handlers.remove(handler)
-                    print(
-                        f"Handler {handler['handler_name']} has stopped with exit code {handler['handler_info'].handler.exitcode}"
-                    )
-                    new_handler = self._restart_handler(
-                        handler["handler_name"],
-                        handler["handler_info"].target_function,
-                        handler["handler_info"].args,
+                    logging.warning(
+                        f"Terminating {worker.handler.name}: did not stop within {self.autoscale.stop_timeout_seconds}s"
                     )
-                    self.handlers.append({
-                        "handler_name": handler["handler_name"],
-                        "handler_info": HandlerInfo(
-                            handler=new_handler,
-                            target_function=handler["handler_info"].target_function,
-                            args=handler["handler_info"].args,
-                        ),
-                    })
-
-    def _restart_handler(self, handler_name, target_function, args):
-        """Spawn a replacement process for a crashed handler."""
-        new_handler = Process(target=target_function, name=handler_name, args=args)
-        new_handler.start()
-        logging.info(f"Handler process {new_handler.name} has been restarted")
-        return new_handler
+                    worker.handler.terminate()
+                continue
+
+            pool.workers.remove(worker)
+            if worker.retiring_since is not None:
+                logging.info(f"Handler process {worker.handler.name} has retired")
+                continue
+
+            if worker.handler.exitcode == 0:
+                # The worker reached its message or memory limit between
+                # messages; replace it without backoff.
+                pool.recycled += 1
+                messages = worker.stats.messages if worker.stats else 0
+                peak = worker.stats.peak_rss_mb if worker.stats else 0.0
+                logging.info(
+                    f"Handler process {worker.handler.name} recycled after {messages} messages, peak RSS {peak:.0f} MiB ({pool.handler_name} high-water {pool.peak_rss_mb:.0f} MiB)"
+                )
+                continue
+
+            if now - worker.started_at >= self.autoscale.stable_after_seconds:
+                pool.consecutive_failures = 1
+            else:
+                pool.consecutive_failures += 1
+            delay = restart_delay(pool.consecutive_failures, self.autoscale)
+            pool.restart_at = max(pool.restart_at, now + delay)
+            print(
+                f"Handler {worker.handler.name} has stopped with exit code {worker.handler.exitcode}"
+            )
+            logging.warning(
+                f"Handler {worker.handler.name} stopped with exit code {worker.handler.exitcode}, restarting in {delay:.1f}s"
+            )
+
+    def _reconcile(self, pool: HandlerPool, now: float):
+        """Start or retire workers until the pool matches its target size."""
+        active = pool.active_workers
+        if len(active) > pool.target_workers:
+            # Retire the newest workers first; they hold the least warm state.
+            for worker in active[pool.target_workers :]:
+                worker.stop_event.set()
+                worker.retiring_since = now
+                logging.info(f"Retiring handler process {worker.handler.name}")
+            return
+
+        if now < pool.restart_at:
+            return
+        for _ in range(pool.target_workers - len(active)):
+            pool.workers.append(self._start_worker(pool, now))
+
+    def _start_worker(self, pool: HandlerPool, now: float) -> HandlerInfo:
+        """Spawn one worker process for *pool*."""
+        pool.spawned += 1
+        stop_event = multiprocessing.Event()
+        stats = WorkerStats()
+        handler_process = Process(
+            target=pool.target_function,
+            name=f"{pool.handler_name}-{pool.spawned}",
+            args=(*pool.args, stop_event),
+            kwargs={"stats": stats},
+        )
+        handler_process.start()
+        logging.info(f"Handler process {handler_process.name} has been started")
+        return HandlerInfo(
+            handler=handler_process,
+            target_function=pool.target_function,
+            args=pool.args,
+            stop_event=stop_event,
+            started_at=now,
+            stats=stats,
+        )
@@ -4,15 +4,32 @@
 """Dynamic handler class loader for pipeline steps.
 
 Resolves a step name (e.g. ``'extract'``) to its corresponding handler
-class (``ExtractHandler``) via importlib convention-based lookup.
+class (``ExtractHandler``) via importlib convention-based lookup, and
+provides the worker-process entry point that imports a step's handler
+only inside the process that runs it.
 """
 
 import importlib
+import importlib.util
+import logging
+from typing import TYPE_CHECKING
 
-from libs.pipeline.queue_handler_base import HandlerBase
+from libs.utils import metrics
+from libs.utils.stopwatch import Stopwatch
 
+if TYPE_CHECKING:
+    from libs.application.application_context import AppContext
+    from libs.pipeline.queue_handler_base import HandlerBase
 
-def load(process_step: str) -> HandlerBase:
+
+def _names(process_step: str) -> tuple[str, str]:
+    return (
+        f"libs.pipeline.handlers.{process_step}_handler",
+        f"{process_step.capitalize()}Handler",
+    )
+
+
+def load(process_step: str) -> "HandlerBase":
     """Import and return the handler class for a pipeline step.
 
     Follows the naming convention ``libs.pipeline.handlers.<step>_handler``
@@ -28,8 +45,7 @@ def load(process_step: str) -> HandlerBase:
         Exception: If the module or class cannot be found.
     """
 
-    module_name = f"libs.pipeline.handlers.{process_step}_handler"
-    class_name = f"{process_step.capitalize()}Handler"
+    module_name, class_name = _names(process_step)
 
     try:
         module = importlib.import_module(module_name)
@@ -37,3 +53,44 @@ def load(process_step: str) -> HandlerBase:
         return dynamic_class
     except (ModuleNotFoundError, AttributeError) as e:
         raise Exception(f"Error loading processor {class_name}: {e}")
+
+
+def ensure_exists(process_step: str) -> None:
+    """Check that a step's handler module exists without importing it.
+
+    Raises:
+        Exception: If the module cannot be found.
+    """
+
+    module_name, class_name = _names(process_step)
+    if importlib.util.find_spec(module_name) is None:
+        raise Exception(
+            f"Error loading processor {class_name}: No module named '{module_name}'"
+        )
+
+
+def run(
+    show_information: bool,
+    app_context: "AppContext",
+    step_name: str,
+    stop_event=None,
+    stats=None,
+):
+    """Worker-process entry point: load the step's handler and consume its queue.
+
+    Args:
+        show_information: Forwarded to ``HandlerBase.connect_queue``.
+        app_context: The shared application context.
+        step_name: The pipeline step to run.
+        stop_event: Set by the process host to retire the worker.
+        stats: Shared counters the worker reports its message count and
+            memory high-water mark to.
+    """
+
+    metrics.serve(app_context.configuration.app_metrics_port)
+    with Stopwatch() as timer:
+        handler = load(step_name)(appContext=app_context, step_name=step_name)
+    logging.info(f"Handler {step_name} loaded in {timer.elapsed_string}")
+    handler.connect_queue(
+        show_information, app_context, step_name, stop_event, stats=stats
+    )
@@ -0,0 +1,172 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Sizing rules for elastic per-step handler worker pools.
+
+Each pipeline step runs between ``min_workers`` and ``max_workers``
+handler processes. The autoscaler sizes a pool from its queue's
+approximate message count and drain rate, and only adds workers while
+the host has CPU and memory headroom. Crashed workers are restarted
+with exponential backoff.
+"""
+
+import math
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
+
+try:
+    import psutil
+except ImportError:  # optional, resource checks are skipped without it
+    psutil = None
+
+# Wildcard key in a worker pool map that applies to every step.
+ANY_STEP = "*"
+
+
+class WorkerPoolSettings(BaseModel):
+    """Worker count bounds for one pipeline step.
+
+    Attributes:
+        min_workers: Workers kept running even when the queue is empty.
+        max_workers: Upper bound the autoscaler may grow the pool to.
+        target_workers: Workers started initially (defaults to min_workers).
+    """
+
+    min_workers: int = 1
+    max_workers: int = 1
+    target_workers: Optional[int] = None
+
+    @model_validator(mode="after")
+    def validate_bounds(self) -> "WorkerPoolSettings":
+        if self.target_workers is None:
+            self.target_workers = self.min_workers
+        if not 0 <= self.min_workers <= self.target_workers <= self.max_workers:
+            raise ValueError(
+                "Worker pool bounds must satisfy 0 <= min <= target <= max, "
+                f"got {self.min_workers}:{self.max_workers}:{self.target_workers}."
+            )
+        if self.max_workers < 1:
+            raise ValueError("Worker pool max_workers must be at least 1.")
+        return self
+
+    @property
+    def is_elastic(self) -> bool:
+        """True when the autoscaler may change the pool size."""
+        return self.max_workers > self.min_workers
+
+
+class AutoscaleSettings(BaseModel):
+    """Host-wide autoscaler and restart settings.
+
+    Attributes:
+        interval_seconds: Seconds between queue depth samples.
+        messages_per_worker: Backlog one worker is expected to absorb per interval.
+        max_cpu_percent: No workers are added while host CPU use is above this.
+        min_free_memory_mb: No workers are added while less memory is available.
+        restart_backoff_seconds: Delay before restarting a crashed worker.
+        restart_backoff_max_seconds: Upper bound of the doubling restart delay.
+        stable_after_seconds: Uptime after which a crash no longer counts as repeated.
+        stop_timeout_seconds: Time a retiring worker gets to finish its message.
+    """
+
+    interval_seconds: float = 15.0
+    messages_per_worker: int = 5
+    max_cpu_percent: float = 85.0
+    min_free_memory_mb: int = 512
+    restart_backoff_seconds: float = 1.0
+    restart_backoff_max_seconds: float = 60.0
+    stable_after_seconds: float = 60.0
+    stop_timeout_seconds: float = 300.0
+
+
+def parse_worker_pools(value: str) -> dict[str, WorkerPoolSettings]:
+    """Parse a step to worker pool map.
+
+    Entries are comma-separated ``step=min:max[:target]`` pairs, where ``*``
+    matches any step (``"map=1:8:2,*=1:2"``).
+
+    Raises:
+        ValueError: If an entry is malformed or its bounds are inconsistent.
+    """
+    pools: dict[str, WorkerPoolSettings] = {}
+    for entry in (part.strip() for part in value.split(",")):
+        if not entry:
+            continue
+        step, separator, bounds = entry.partition("=")
+        counts = bounds.split(":")
+        if not separator or len(counts) not in (2, 3):
+            raise ValueError(
+                f"Invalid worker pool '{entry}', expected 'step=min:max[:target]'."
+            )
+        try:
+            numbers = [int(count) for count in counts]
+        except ValueError as e:
+            raise ValueError(f"Invalid worker pool '{entry}': {e}") from e
+        pools[step.strip() or ANY_STEP] = WorkerPoolSettings(
+            min_workers=numbers[0],
+            max_workers=numbers[1],
+            target_workers=numbers[2] if len(numbers) == 3 else None,
+        )
+    return pools
+
+
+def pool_for(
+    pools: dict[str, WorkerPoolSettings], step_name: str
+) -> WorkerPoolSettings:
+    """Return the pool configured for *step_name*, defaulting to one worker."""
+    return pools.get(step_name, pools.get(ANY_STEP, WorkerPoolSettings()))
+
+
+def desired_worker_count(
+    settings: WorkerPoolSettings,
+    current: int,
+    backlog: int,
+    drain_rate: float,
+    autoscale: AutoscaleSettings,
+) -> int:
+    """
+    Compute the worker count a pool should converge to.
+
+    The pool grows to one worker per ``messages_per_worker`` queued messages,
+    unless the backlog already drains within one interval at the observed
+    rate. It shrinks by at most one worker per interval so short lulls do
+    not cause churn.
+
+    Args:
+        settings: The pool's bounds.
+        current: The number of workers the pool is currently sized for.
+        backlog: The queue's approximate message count.
+        drain_rate: Messages per second the backlog shrank by since the last sample.
+        autoscale: The autoscaler settings.
+
+    Returns:
+        int: The desired worker count, within the pool's bounds.
+    """
+
+    wanted = math.ceil(backlog / max(1, autoscale.messages_per_worker))
+    if drain_rate > 0 and backlog / drain_rate <= autoscale.interval_seconds:
+        wanted = min(wanted, current)
+    if wanted < current:
+        wanted = current - 1
+    return max(settings.min_workers, min(settings.max_workers, wanted))
+
+
+def has_resource_headroom(autoscale: AutoscaleSettings) -> bool:
+    """Return True when the host has CPU and memory to spare for another worker."""
+    if psutil is None:
+        return True
+    if psutil.cpu_percent(interval=None) > autoscale.max_cpu_percent:
+        return False
+    available_mb = psutil.virtual_memory().available / (1024 * 1024)
+    return available_mb >= autoscale.min_free_memory_mb
+
+
+def restart_delay(consecutive_failures: int, autoscale: AutoscaleSettings) -> float:
+    """Return the backoff before restarting after *consecutive_failures* crashes."""
+    if consecutive_failures <= 0:
+        return 0.0
+    return min(
+        autoscale.restart_backoff_seconds * 2 ** (consecutive_failures - 1),
+        autoscale.restart_backoff_max_seconds,
+    )
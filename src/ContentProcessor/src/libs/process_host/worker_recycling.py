@@ -0,0 +1,106 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Recycling limits for long-lived handler worker processes.
+
+Large documents leave fragmented heaps behind (PIL images, base64 strings,
+parsed layout models), so a worker's resident set only grows. A worker
+that reaches its message or memory limit finishes its current message,
+exits with status 0 and is replaced by the process host, instead of being
+OOM-killed mid-message. Workers share their message count and memory
+high-water mark with the host through ``WorkerStats``.
+"""
+
+import resource
+import sys
+from multiprocessing import RawValue
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+try:
+    import psutil
+except ImportError:  # optional, /proc is read instead
+    psutil = None
+
+_MIB = 1024 * 1024
+
+
+class RecycleSettings(BaseModel):
+    """Limits after which a worker exits to be replaced.
+
+    Attributes:
+        max_messages: Messages a worker processes before it is recycled (0 = no limit).
+        max_rss_mb: Resident set size in MiB that triggers recycling (0 = no limit).
+    """
+
+    max_messages: int = Field(default=0, ge=0)
+    max_rss_mb: int = Field(default=0, ge=0)
+
+
+def current_rss_mb() -> float:
+    """Return the resident set size of the current process in MiB."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / _MIB
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / _MIB
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak / _MIB if sys.platform == "darwin" else peak / 1024
+
+
+def recycle_reason(
+    settings: RecycleSettings, messages: int, rss_mb: float
+) -> Optional[str]:
+    """Return why a worker should be recycled, or None to keep it running.
+
+    Args:
+        settings: The recycling limits.
+        messages: Messages the worker has processed so far.
+        rss_mb: The worker's current resident set size in MiB.
+
+    Returns:
+        Optional[str]: A human readable reason, or None.
+    """
+
+    if messages == 0:
+        # A fresh worker would start over at the same footprint.
+        return None
+    if settings.max_messages and messages >= settings.max_messages:
+        return f"processed {messages} messages (limit {settings.max_messages})"
+    if settings.max_rss_mb and rss_mb >= settings.max_rss_mb:
+        return f"RSS {rss_mb:.0f} MiB (limit {settings.max_rss_mb} MiB)"
+    return None
+
+
+class WorkerStats:
+    """Counters a worker process shares with the process host.
+
+    Backed by shared memory, so the host reads them without messaging the
+    worker. Only the worker writes them.
+    """
+
+    def __init__(self):
+        self._messages = RawValue("q", 0)
+        self._peak_rss_mb = RawValue("d", 0.0)
+
+    @property
+    def messages(self) -> int:
+        return self._messages.value
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return self._peak_rss_mb.value
+
+    def record(self, messages: int, rss_mb: float):
+        """Publish the worker's message count and memory high-water mark."""
+        self._messages.value = messages
+        self._peak_rss_mb.value = max(self._peak_rss_mb.value, rss_mb)
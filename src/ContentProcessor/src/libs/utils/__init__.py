@@ -6,6 +6,7 @@
 Sub-modules:
     azure_credential_utils: Azure credential selection for sync and async SDKs.
     base64_util: Base-64 encoding detection.
+    compression: gzip / zstd Content-Encoding for blob artifacts.
     credential_util: Convenience re-export of credential and token-provider
         helpers (mirrors azure_credential_utils).
     remote_schema_loader: Materialise Pydantic models from JSON Schema
@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Content-Encoding helpers for JSON artifacts stored in blob storage.
+
+Artifacts are compressed with ``gzip`` (standard library) or ``zstd``
+(requires the optional ``zstandard`` package) and tagged with the
+matching ``Content-Encoding``. Blobs without a supported encoding,
+including everything written before compression was enabled, are
+returned unchanged.
+"""
+
+import gzip
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for zstd
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+SUPPORTED_ENCODINGS = (GZIP, ZSTD)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Wildcard key in an encoding map that applies to every artifact type.
+ANY_ARTIFACT = "*"
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ValueError(
+            "zstd content encoding requires the 'zstandard' package to be installed."
+        )
+    return zstandard
+
+
+def compress(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """Compress *data* with *content_encoding* (None leaves it unchanged)."""
+    if not content_encoding:
+        return data
+    if content_encoding == GZIP:
+        return gzip.compress(data, compresslevel=6)
+    if content_encoding == ZSTD:
+        return _require_zstandard().ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unsupported content encoding '{content_encoding}'.")
+
+
+def decompress(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """Decode *data* stored with *content_encoding*; other encodings are returned unchanged."""
+    if content_encoding == GZIP:
+        return gzip.decompress(data)
+    if content_encoding == ZSTD:
+        return _require_zstandard().ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def detect_content_encoding(data: bytes) -> Optional[str]:
+    """Infer the encoding of *data* from its magic bytes, for readers without blob properties."""
+    if data[:2] == _GZIP_MAGIC:
+        return GZIP
+    if data[:4] == _ZSTD_MAGIC:
+        return ZSTD
+    return None
+
+
+def parse_encoding_map(value: str) -> dict[str, str]:
+    """Parse an artifact-type to encoding map.
+
+    Accepts a single encoding applied to every artifact (``"gzip"``) or a
+    comma-separated list of ``artifact_type=encoding`` pairs, where ``*``
+    matches any artifact type (``"extracted_content=zstd,*=gzip"``).
+
+    Raises:
+        ValueError: If an encoding is not supported.
+    """
+    encodings: dict[str, str] = {}
+    for entry in (part.strip() for part in value.split(",")):
+        if not entry:
+            continue
+        artifact_type, _, encoding = entry.rpartition("=")
+        artifact_type = artifact_type.strip() or ANY_ARTIFACT
+        encoding = encoding.strip().lower()
+        if encoding in ("", "none", "identity"):
+            # Explicitly uncompressed; overrides a wildcard entry.
+            encodings[artifact_type] = ""
+            continue
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported content encoding '{encoding}'.")
+        encodings[artifact_type] = encoding
+    return encodings
+
+
+def encoding_for(encodings: dict[str, str], artifact_type: str) -> Optional[str]:
+    """Return the encoding configured for *artifact_type*, or None."""
+    return encodings.get(artifact_type, encodings.get(ANY_ARTIFACT)) or None
@@ -0,0 +1,250 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""OpenTelemetry metrics for pipeline stages.
+
+Instruments are created on the global meter provider, so they are exported
+wherever telemetry is configured (Azure Monitor, and optionally a local
+Prometheus endpoint). Every measurement is tagged with the pipeline step
+set by ``stage()``; code below a handler times its work with ``phase()``
+and does not need to know which step it runs in.
+
+Instruments:
+    cps.pipeline.queue.wait: Seconds from enqueue to dequeue of a message.
+    cps.pipeline.step.duration: Seconds a step spent on one message.
+    cps.pipeline.messages: Messages processed, by outcome.
+    cps.pipeline.phase.duration: Seconds spent in a phase (blob, cosmos, llm, ...).
+    cps.pipeline.bytes: Bytes transferred to and from blob storage.
+    cps.pipeline.tokens: LLM tokens consumed, by token type.
+    cps.pipeline.retries: Retried calls to downstream services.
+    cps.queue.*: Backlog gauges per step queue, see ``record_queue_stats()``.
+"""
+
+import datetime
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Literal, Optional
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+try:
+    from opentelemetry.exporter.prometheus import PrometheusMetricReader
+    from prometheus_client import start_http_server
+except ImportError:  # optional, the local /metrics endpoint is unavailable without it
+    PrometheusMetricReader = None
+    start_http_server = None
+
+logger = logging.getLogger(__name__)
+
+# Workers on one host bind the first free port from APP_METRICS_PORT on.
+PORT_RANGE = 64
+
+_DURATION_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600]
+
+_step: ContextVar[str] = ContextVar("pipeline_step", default="unknown")
+
+# Queue gauge name -> (unit, description); values come from record_queue_stats().
+_QUEUE_GAUGES = {
+    "depth": ("{message}", "Approximate number of messages in the step queue."),
+    "dead_letter_depth": (
+        "{message}",
+        "Approximate number of messages in the step's dead-letter queue.",
+    ),
+    "oldest_message_age": ("s", "Age of the oldest visible message in the queue."),
+    "arrival_rate": ("{message}/s", "Estimated rate messages arrive at the queue."),
+    "service_rate": ("{message}/s", "Estimated rate messages leave the queue."),
+    "drain_time": ("s", "Estimated time until the backlog is drained."),
+}
+
+# Latest queue sample per step; read by the observable gauges on collection.
+_queue_stats: dict[str, dict[str, Optional[float]]] = {}
+
+
+def _observe_queue(key: str):
+    def callback(options: CallbackOptions) -> Iterable[Observation]:
+        for step, values in list(_queue_stats.items()):
+            value = values.get(key)
+            if value is not None:
+                yield Observation(value, {"step": step})
+
+    return callback
+
+
+class _Instruments:
+    """The pipeline instruments created on one meter."""
+
+    def __init__(self, meter: metrics.Meter):
+        self.queue_wait = meter.create_histogram(
+            "cps.pipeline.queue.wait",
+            unit="s",
+            description="Time from enqueue to dequeue of a pipeline message.",
+            explicit_bucket_boundaries_advisory=_DURATION_BUCKETS,
+        )
+        self.step_duration = meter.create_histogram(
+            "cps.pipeline.step.duration",
+            unit="s",
+            description="Time a pipeline step spent on one message.",
+            explicit_bucket_boundaries_advisory=_DURATION_BUCKETS,
+        )
+        self.messages = meter.create_counter(
+            "cps.pipeline.messages",
+            unit="{message}",
+            description="Pipeline messages processed.",
+        )
+        self.phase_duration = meter.create_histogram(
+            "cps.pipeline.phase.duration",
+            unit="s",
+            description="Time spent in one phase of a pipeline step.",
+            explicit_bucket_boundaries_advisory=_DURATION_BUCKETS,
+        )
+        self.bytes = meter.create_counter(
+            "cps.pipeline.bytes",
+            unit="By",
+            description="Bytes transferred to and from blob storage.",
+        )
+        self.tokens = meter.create_counter(
+            "cps.pipeline.tokens",
+            unit="{token}",
+            description="LLM tokens consumed.",
+        )
+        self.retries = meter.create_counter(
+            "cps.pipeline.retries",
+            unit="{retry}",
+            description="Retried calls to downstream services.",
+        )
+        self.queue_gauges = [
+            meter.create_observable_gauge(
+                f"cps.queue.{key}",
+                callbacks=[_observe_queue(key)],
+                unit=unit,
+                description=description,
+            )
+            for key, (unit, description) in _QUEUE_GAUGES.items()
+        ]
+
+
+# Created on the global (proxy) meter, so they follow whichever meter
+# provider is configured later.
+_instruments = _Instruments(metrics.get_meter("libs.pipeline"))
+
+
+def current_step() -> str:
+    """Return the pipeline step measurements are attributed to."""
+    return _step.get()
+
+
+@contextmanager
+def stage(step_name: str) -> Iterator[None]:
+    """Attribute measurements within the block to *step_name*."""
+    token = _step.set(step_name)
+    try:
+        yield
+    finally:
+        _step.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the duration of the block as phase *name* of the current step.
+
+    Works around ``await`` as well; the outcome attribute is ``error`` when
+    the block raises.
+    """
+    outcome = "success"
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        _instruments.phase_duration.record(
+            time.perf_counter() - start,
+            {"step": _step.get(), "phase": name, "outcome": outcome},
+        )
+
+
+def record_queue_wait(inserted_on: Optional[datetime.datetime]):
+    """Record the time a message waited in the queue since *inserted_on*."""
+    if inserted_on is None:
+        return
+    if inserted_on.tzinfo is None:
+        inserted_on = inserted_on.replace(tzinfo=datetime.UTC)
+    waited = (datetime.datetime.now(datetime.UTC) - inserted_on).total_seconds()
+    _instruments.queue_wait.record(max(waited, 0.0), {"step": _step.get()})
+
+
+def record_message(outcome: Literal["success", "error"], seconds: float):
+    """Count one processed message and record the step's duration for it."""
+    attributes = {"step": _step.get(), "outcome": outcome}
+    _instruments.messages.add(1, attributes)
+    _instruments.step_duration.record(seconds, attributes)
+
+
+def record_bytes(direction: Literal["download", "upload"], size: int):
+    """Count bytes transferred to or from blob storage."""
+    _instruments.bytes.add(size, {"step": _step.get(), "direction": direction})
+
+
+def record_tokens(prompt_tokens: int, completion_tokens: int):
+    """Count LLM tokens consumed by the current step."""
+    step = _step.get()
+    _instruments.tokens.add(prompt_tokens, {"step": step, "type": "prompt"})
+    _instruments.tokens.add(completion_tokens, {"step": step, "type": "completion"})
+
+
+def record_retry(operation: str):
+    """Count one retry of a call to a downstream service."""
+    _instruments.retries.add(1, {"step": _step.get(), "operation": operation})
+
+
+def record_queue_stats(step: str, values: dict[str, Optional[float]]):
+    """Publish the latest backlog sample of a step queue to the gauges.
+
+    Args:
+        step: The pipeline step the queue belongs to.
+        values: Gauge values keyed like ``depth`` or ``drain_time``; None
+            leaves the gauge unreported (e.g. a backlog that is not draining).
+    """
+    _queue_stats[step] = {key: values.get(key) for key in _QUEUE_GAUGES}
+
+
+def metric_readers(port: int) -> list:
+    """Return the local metric readers to register with the meter provider.
+
+    A Prometheus reader is returned when *port* is set and the
+    ``opentelemetry-exporter-prometheus`` package is installed.
+    """
+    if not port:
+        return []
+    if PrometheusMetricReader is None:
+        logger.warning(
+            "APP_METRICS_PORT is set but opentelemetry-exporter-prometheus is not installed; local metrics endpoint disabled."
+        )
+        return []
+    return [PrometheusMetricReader()]
+
+
+def serve(port: int) -> Optional[int]:
+    """Expose the Prometheus metrics of this process over HTTP.
+
+    Called in each worker process; binds the first free port in
+    ``[port, port + PORT_RANGE)``.
+
+    Returns:
+        Optional[int]: The bound port, or None if the endpoint is disabled.
+    """
+    if not port or start_http_server is None:
+        return None
+    for candidate in range(port, port + PORT_RANGE):
+        try:
+            start_http_server(candidate)
+        except OSError:
+            continue
+        logger.info(f"Serving metrics on port {candidate}")
+        return candidate
+    logger.warning(f"No free metrics port in {port}-{port + PORT_RANGE - 1}")
+    return None
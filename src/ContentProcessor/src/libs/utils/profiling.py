@@ -0,0 +1,112 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Opt-in ``cProfile`` sampling of pipeline messages.
+
+A handler profiles its ``execute()`` call for a sampled share of the
+messages of the targeted steps or schemas. The profile is stored next to
+the process as a ``.prof`` artifact in ``pstats`` format, which
+``python -m pstats``, snakeviz, flameprof or ``gprof2dot -f pstats`` read
+to produce call trees and flamegraphs of real documents.
+
+Only the worker's event-loop thread is profiled; work handed to thread or
+process pools appears as the time spent waiting for it.
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import random
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Step name that targets every step.
+ANY_STEP = "*"
+
+
+class ProfilingSettings(BaseModel):
+    """Which messages are profiled.
+
+    Attributes:
+        steps: Steps whose messages are sampled (``*`` for all).
+        schema_ids: Schemas whose messages are sampled, in any step.
+        sample_rate: Share of the targeted messages that are profiled.
+    """
+
+    steps: list[str] = []
+    schema_ids: list[str] = []
+    sample_rate: float = Field(default=0.1, ge=0.0, le=1.0)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.steps or self.schema_ids) and self.sample_rate > 0
+
+
+def parse_targets(spec: str) -> list[str]:
+    """Split a comma-separated list of step names or schema ids."""
+    return [target.strip() for target in spec.split(",") if target.strip()]
+
+
+def should_profile(
+    settings: ProfilingSettings,
+    step_name: str,
+    schema_id: Optional[str],
+    draw: Callable[[], float] = random.random,
+) -> bool:
+    """Decide whether the current message is profiled.
+
+    Args:
+        settings: The profiling targets and sample rate.
+        step_name: The step processing the message.
+        schema_id: The schema the document is processed with, if known.
+        draw: Returns a uniform number in ``[0, 1)``; replaceable in tests.
+    """
+    if not settings.enabled:
+        return False
+    targeted = (
+        ANY_STEP in settings.steps
+        or step_name in settings.steps
+        or (schema_id is not None and schema_id in settings.schema_ids)
+    )
+    return targeted and draw() < settings.sample_rate
+
+
+@contextmanager
+def profiled(enabled: bool) -> Iterator[Optional[cProfile.Profile]]:
+    """Profile the block when *enabled*.
+
+    Yields the profiler, or None when profiling is disabled or another
+    profiler is already active in this thread.
+    """
+    if not enabled:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        logger.warning(f"Profiling skipped: {e}")
+        yield None
+        return
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+
+def to_bytes(profiler: cProfile.Profile) -> bytes:
+    """Serialize a finished profile in the format of ``Profile.dump_stats()``."""
+    return marshal.dumps(pstats.Stats(profiler).stats)
+
+
+def summary(profiler: cProfile.Profile, limit: int = 15) -> str:
+    """Return the *limit* costliest functions by cumulative time as text."""
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
@@ -13,14 +13,14 @@ import logging
 import os
 import sys
 
-from azure.monitor.opentelemetry import configure_azure_monitor
-from opentelemetry.sdk.resources import Resource
-
 from libs.agent_framework.agent_framework_helper import AgentFrameworkHelper
 from libs.azure_helper.content_understanding import AzureContentUnderstandingHelper
 from libs.base.application_main import AppMainBase
+from libs.pipeline import pipeline_queue_helper
+from libs.pipeline.queue_monitor import QueueMonitor
 from libs.process_host import handler_type_loader
 from libs.process_host.handler_process_host import HandlerHostManager
+from libs.utils import metrics
 from libs.utils.azure_credential_utils import get_azure_credential
 
 logger = logging.getLogger(__name__)
@@ -34,7 +34,7 @@ class Application(AppMainBase):
     Responsibilities:
         1. Initialize Azure credentials and shared services.
         2. Dynamically load pipeline step handlers from configuration.
-        3. Start all handlers as concurrent queue-consuming processes.
+        3. Start all handlers as concurrent queue-consuming process pools.
 
     Attributes:
         application_context: Shared context carrying configuration, credentials,
@@ -54,17 +54,16 @@ class Application(AppMainBase):
         Steps:
             1. Configure Azure Monitor telemetry if connection string is available.
             2. Set Azure credential on the application context.
-            3. Register AgentFrameworkHelper and initialize it with LLM settings.
+            3. Register a lazily initialized AgentFrameworkHelper for the LLM settings.
             4. Register an async factory for AzureContentUnderstandingHelper.
         """
         self._configure_telemetry()
         self.application_context.set_credential(get_azure_credential())
 
+        # Created on first use, so only the worker processes that need LLM
+        # clients import the agent framework.
         self.application_context.add_singleton(
-            AgentFrameworkHelper, AgentFrameworkHelper()
-        )
-        self.application_context.get_service(AgentFrameworkHelper).initialize(
-            self.application_context.llm_settings
+            AgentFrameworkHelper, self._create_agent_framework_helper
         )
 
         self.application_context.add_async_singleton(
@@ -74,20 +73,44 @@ class Application(AppMainBase):
             ),
         )
 
+    def _create_agent_framework_helper(self) -> AgentFrameworkHelper:
+        """Build the AgentFrameworkHelper with clients for the configured LLM services."""
+        agent_framework_helper = AgentFrameworkHelper()
+        agent_framework_helper.initialize(self.application_context.llm_settings)
+        return agent_framework_helper
+
     def _configure_telemetry(self):
-        """Configure Azure Monitor for OpenTelemetry if connection string is set."""
-        connection_string = self.application_context.configuration.applicationinsights_connection_string
+        """Configure Azure Monitor for OpenTelemetry if connection string is set.
+
+        The local Prometheus metric reader, when enabled, is registered on the
+        same meter provider. Worker processes inherit it and serve it over
+        HTTP themselves.
+        """
+        configuration = self.application_context.configuration
+        connection_string = configuration.applicationinsights_connection_string
+        metric_readers = metrics.metric_readers(configuration.app_metrics_port)
         if connection_string:
+            from azure.monitor.opentelemetry import configure_azure_monitor
+            from opentelemetry.sdk.resources import Resource
+
             configure_azure_monitor(
                 connection_string=connection_string,
                 resource=Resource.create({"service.name": "ContentProcessor"}),
                 logger_name="libs",
+                metric_readers=metric_readers,
             )
             logger.info("Application Insights configured for ContentProcessor")
         else:
             logger.warning(
                 "No Application Insights connection string found. Telemetry disabled."
             )
+            if metric_readers:
+                from opentelemetry import metrics as otel_metrics
+                from opentelemetry.sdk.metrics import MeterProvider
+
+                otel_metrics.set_meter_provider(
+                    MeterProvider(metric_readers=metric_readers)
+                )
 
     async def run(self, test_mode: bool = False):
         """Load pipeline step handlers and start them as concurrent processes.
@@ -95,19 +118,44 @@ class Application(AppMainBase):
         Args:
             test_mode: When True, handlers run a single iteration then exit.
         """
-        steps = self.application_context.configuration.app_process_steps
+        configuration = self.application_context.configuration
+        steps = configuration.app_process_steps
+
+        monitor = None
+        if configuration.app_queue_monitor_enabled:
+            monitor = QueueMonitor(steps, self.application_context)
+        # The host serves the queue gauges; workers bind the following ports.
+        metrics.serve(configuration.app_metrics_port)
 
-        handler_host_manager = HandlerHostManager()
+        handler_host_manager = HandlerHostManager(
+            autoscale=configuration.autoscale_settings(), monitor=monitor
+        )
         for step in steps:
-            loaded_handler = handler_type_loader.load(step)(
-                appContext=self.application_context,
-                step_name=step,
-            )
+            # Handler modules are imported inside each worker process, so a
+            # worker only loads the dependencies of its own step.
+            handler_type_loader.ensure_exists(step)
+
+            pool = configuration.worker_pool_for(step)
+            queue_clients = []
+            if pool.is_elastic:
+                # The host samples the depth of the step's lanes to size the pool.
+                queue_clients = [
+                    pipeline_queue_helper.create_or_get_queue_client(
+                        queue_name,
+                        configuration.app_storage_queue_url,
+                        self.application_context.credential,
+                    )
+                    for queue_name in pipeline_queue_helper.create_lane_queue_client_names(
+                        step
+                    ).values()
+                ]
 
             handler_host_manager.add_handlers_as_process(
-                target_function=loaded_handler.connect_queue,
-                process_name=loaded_handler.handler_name,
+                target_function=handler_type_loader.run,
+                process_name=step,
                 args=(False, self.application_context, step),
+                settings=pool,
+                queue_clients=queue_clients,
             )
 
         await handler_host_manager.start_handler_processes(test_mode)
@@ -0,0 +1,764 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""In-memory stand-ins for the Azure services the pipeline talks to.
+
+Storage queues, blob containers and the Cosmos DB (Mongo API) collections
+live in one ``StandInState`` served by a ``multiprocessing`` manager, so
+the process host and every forked handler worker see the same queues and
+blobs. ``installed()`` swaps the SDK clients used by the pipeline modules
+for thin clients of that state.
+
+Content Understanding and Azure OpenAI are replaced by stubs whose
+latency follows a ``LatencyModel`` and which answer a share of requests
+with HTTP 429. The OpenAI stub is an ``httpx`` transport behind a real
+``AsyncAzureOpenAI`` client, so the OpenAI SDK, the Agent Framework and
+the pipeline's own 429 retry layer run unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.managers import BaseManager
+from typing import Any, Iterator, Optional
+from unittest import mock
+
+import httpx
+import mongomock
+import requests
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobProperties, ContentSettings
+from azure.storage.queue import QueueClient, QueueMessage, QueueProperties
+from pymongo.results import InsertOneResult, UpdateResult
+
+from libs.agent_framework.agent_framework_helper import (
+    AgentFrameworkHelper,
+    ClientType,
+)
+from libs.azure_helper import comsos_mongo, storage_blob
+from libs.pipeline import pipeline_queue_helper
+from libs.utils import remote_schema_loader
+
+OPENAI_ENDPOINT = "https://stand-in.openai.azure.com"
+OPENAI_API_VERSION = "2024-10-21"
+OPENAI_MODEL = "gpt-4o"
+
+_MESSAGE_TTL = datetime.timedelta(days=7)
+
+# Proxy to the shared state, set by installed() and inherited by forked workers.
+_state = None
+
+
+# ── Latency and throttling ──────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Distribution of a stubbed service's response time in seconds.
+
+    Specs accepted by ``parse()``:
+
+    - ``0.8`` or ``fixed:0.8``: always 0.8s;
+    - ``uniform:0.5:1.5``: uniform between 0.5s and 1.5s;
+    - ``lognormal:2:6``: log-normal with a 2s median and a 6s p95, the
+      long-tailed shape LLM and document analysis latencies usually have.
+    """
+
+    kind: str = "fixed"
+    low: float = 0.0
+    high: float = 0.0
+
+    @staticmethod
+    def parse(spec: str) -> "LatencyModel":
+        kind, _, rest = spec.partition(":")
+        if not rest:
+            kind, rest = "fixed", kind
+        try:
+            values = [float(value) for value in rest.split(":")]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec '{spec}'")
+        if kind == "fixed" and len(values) == 1 and values[0] >= 0:
+            return LatencyModel("fixed", values[0], values[0])
+        if kind in ("uniform", "lognormal") and len(values) == 2:
+            low, high = values
+            if 0 <= low <= high and (kind == "uniform" or low > 0):
+                return LatencyModel(kind, low, high)
+        raise ValueError(f"Invalid latency spec '{spec}'")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.kind == "lognormal":
+            # low is the median, high the 95th percentile (z = 1.645).
+            sigma = math.log(self.high / self.low) / 1.645
+            return rng.lognormvariate(math.log(self.low), sigma)
+        return self.low
+
+    def __str__(self) -> str:
+        if self.kind == "fixed":
+            return f"{self.low:g}"
+        return f"{self.kind}:{self.low:g}:{self.high:g}"
+
+
+@dataclass(frozen=True)
+class ServiceProfile:
+    """Behaviour of a stubbed downstream service.
+
+    Attributes:
+        latency: Response time of a successful call.
+        throttle_rate: Share of calls answered with HTTP 429 (0-1).
+        retry_after: ``Retry-After`` seconds sent with a 429.
+    """
+
+    latency: LatencyModel = LatencyModel()
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+
+
+_process_rng: Optional[tuple[int, random.Random]] = None
+
+
+def _rng() -> random.Random:
+    """Return a random generator private to the current process."""
+    global _process_rng
+    if _process_rng is None or _process_rng[0] != os.getpid():
+        # Forked workers would otherwise replay the parent's sequence.
+        _process_rng = (os.getpid(), random.Random())
+    return _process_rng[1]
+
+
+# ── Shared state ────────────────────────────────────────────────────────
+
+
+class StandInState:
+    """Queues, blobs and Mongo collections shared by all pipeline processes.
+
+    Lives in the manager's server process; every public method is called
+    through a proxy and takes and returns plain, picklable values. Queue
+    messages follow Azure Storage semantics: received messages stay in
+    the queue, invisible until their visibility timeout expires, and are
+    counted by ``queue_length`` until they are deleted.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._queues: dict[str, list[dict]] = {}
+        self._containers: set[str] = set()
+        self._blobs: dict[str, tuple[bytes, Optional[str]]] = {}
+        # Identical payloads (e.g. the same synthetic document uploaded for
+        # thousands of processes) are stored once.
+        self._contents: dict[bytes, bytes] = {}
+        self._mongo = mongomock.MongoClient()
+        self._counters: Counter = Counter()
+
+    # Queues
+
+    def create_queue(self, name: str):
+        with self._lock:
+            self._queues.setdefault(name, [])
+
+    def queue_length(self, name: str) -> Optional[int]:
+        """Return the number of messages, visible or not; None if the queue is missing."""
+        with self._lock:
+            queue = self._queues.get(name)
+            return None if queue is None else len(queue)
+
+    def send_message(self, name: str, content: str) -> dict:
+        now = datetime.datetime.now(datetime.UTC)
+        message = {
+            "id": str(uuid.uuid4()),
+            "content": content,
+            "inserted_on": now,
+            "expires_on": now + _MESSAGE_TTL,
+            "dequeue_count": 0,
+            "pop_receipt": None,
+            "next_visible_on": now,
+        }
+        with self._lock:
+            self._queues.setdefault(name, []).append(message)
+            return dict(message)
+
+    def _visible(self, name: str, limit: int) -> list[dict]:
+        now = datetime.datetime.now(datetime.UTC)
+        messages = (
+            m for m in self._queues.get(name, []) if m["next_visible_on"] <= now
+        )
+        return list(itertools.islice(messages, limit))
+
+    def receive_messages(
+        self, name: str, max_messages: int, visibility_timeout: float
+    ) -> list[dict]:
+        with self._lock:
+            received = self._visible(name, max_messages)
+            for message in received:
+                message["dequeue_count"] += 1
+                message["pop_receipt"] = str(uuid.uuid4())
+                message["next_visible_on"] = datetime.datetime.now(
+                    datetime.UTC
+                ) + datetime.timedelta(seconds=visibility_timeout)
+            return [dict(message) for message in received]
+
+    def peek_messages(self, name: str, max_messages: int) -> list[dict]:
+        with self._lock:
+            return [dict(message) for message in self._visible(name, max_messages)]
+
+    def _find(self, name: str, message_id: str, pop_receipt: str) -> Optional[dict]:
+        for message in self._queues.get(name, []):
+            if message["id"] == message_id and message["pop_receipt"] == pop_receipt:
+                return message
+        return None
+
+    def delete_message(self, name: str, message_id: str, pop_receipt: str) -> bool:
+        with self._lock:
+            message = self._find(name, message_id, pop_receipt)
+            if message is None:
+                return False
+            self._queues[name].remove(message)
+            return True
+
+    def update_message(
+        self,
+        name: str,
+        message_id: str,
+        pop_receipt: str,
+        visibility_timeout: float,
+        content: Optional[str] = None,
+    ) -> Optional[dict]:
+        with self._lock:
+            message = self._find(name, message_id, pop_receipt)
+            if message is None:
+                return None
+            message["pop_receipt"] = str(uuid.uuid4())
+            message["next_visible_on"] = datetime.datetime.now(
+                datetime.UTC
+            ) + datetime.timedelta(seconds=visibility_timeout)
+            if content is not None:
+                message["content"] = content
+            return dict(message)
+
+    # Blobs
+
+    def container_exists(self, name: str) -> bool:
+        with self._lock:
+            return name in self._containers
+
+    def create_container(self, name: str):
+        with self._lock:
+            self._containers.add(name)
+
+    def upload_blob(self, path: str, data: bytes, content_encoding: Optional[str]):
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        with self._lock:
+            data = self._contents.setdefault(digest, data)
+            self._blobs[path] = (data, content_encoding)
+
+    def blob_exists(self, path: str) -> bool:
+        with self._lock:
+            return path in self._blobs
+
+    def download_blob(self, path: str) -> Optional[tuple[bytes, Optional[str]]]:
+        with self._lock:
+            return self._blobs.get(path)
+
+    def delete_blob(self, path: str) -> bool:
+        with self._lock:
+            return self._blobs.pop(path, None) is not None
+
+    # Mongo
+
+    def list_collection_names(self, database: str) -> list[str]:
+        with self._lock:
+            return self._mongo[database].list_collection_names()
+
+    def create_collection(self, database: str, collection: str):
+        with self._lock:
+            self._mongo[database].create_collection(collection)
+
+    def index_information(self, database: str, collection: str) -> dict:
+        with self._lock:
+            return self._mongo[database][collection].index_information()
+
+    def create_index(self, database: str, collection: str, keys: list) -> str:
+        with self._lock:
+            return self._mongo[database][collection].create_index(keys)
+
+    def find(
+        self, database: str, collection: str, query: dict, sort: Any = None
+    ) -> list[dict]:
+        with self._lock:
+            cursor = self._mongo[database][collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            return list(cursor)
+
+    def insert_one(self, database: str, collection: str, document: dict) -> Any:
+        with self._lock:
+            return self._mongo[database][collection].insert_one(document).inserted_id
+
+    def update_one(
+        self, database: str, collection: str, query: dict, update: dict, upsert: bool
+    ) -> dict:
+        with self._lock:
+            result = self._mongo[database][collection].update_one(
+                query, update, upsert=upsert
+            )
+            return result.raw_result
+
+    def delete_one(self, database: str, collection: str, query: dict) -> dict:
+        with self._lock:
+            return self._mongo[database][collection].delete_one(query).raw_result
+
+    # Service call counters
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+class StandInManager(BaseManager):
+    """Serves one ``StandInState`` to the runner and every worker process."""
+
+
+StandInManager.register("StandInState", StandInState)
+
+
+# ── Storage queue ───────────────────────────────────────────────────────
+
+
+def _queue_message(message: dict) -> QueueMessage:
+    return QueueMessage(
+        content=message["content"],
+        id=message["id"],
+        inserted_on=message["inserted_on"],
+        expires_on=message["expires_on"],
+        dequeue_count=message["dequeue_count"],
+        pop_receipt=message["pop_receipt"],
+        next_visible_on=message["next_visible_on"],
+    )
+
+
+class StandInQueueClient(QueueClient):
+    """The subset of ``azure.storage.queue.QueueClient`` used by the pipeline.
+
+    Subclasses the SDK client only to pass the pipeline's type checks; no
+    SDK state is initialised.
+    """
+
+    def __init__(self, account_url: str, queue_name: str, credential=None, **kwargs):
+        self.queue_name = queue_name
+        self._url = f"{account_url.rstrip('/')}/{queue_name}"
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def close(self):
+        pass
+
+    def get_queue_properties(self, **kwargs) -> QueueProperties:
+        length = _state.queue_length(self.queue_name)
+        if length is None:
+            raise ResourceNotFoundError("The specified queue does not exist.")
+        properties = QueueProperties()
+        properties.name = self.queue_name
+        properties.approximate_message_count = length
+        return properties
+
+    def create_queue(self, **kwargs):
+        _state.create_queue(self.queue_name)
+
+    def send_message(self, content: Any, **kwargs) -> QueueMessage:
+        return _queue_message(_state.send_message(self.queue_name, content))
+
+    def receive_messages(
+        self,
+        max_messages: Optional[int] = None,
+        visibility_timeout: Optional[int] = None,
+        **kwargs,
+    ) -> list[QueueMessage]:
+        messages = _state.receive_messages(
+            self.queue_name,
+            max_messages or 1,
+            30 if visibility_timeout is None else visibility_timeout,
+        )
+        return [_queue_message(message) for message in messages]
+
+    def peek_messages(self, max_messages: Optional[int] = None, **kwargs):
+        return [
+            _queue_message(message)
+            for message in _state.peek_messages(self.queue_name, max_messages or 1)
+        ]
+
+    def delete_message(self, message: QueueMessage, pop_receipt=None, **kwargs):
+        if not _state.delete_message(
+            self.queue_name, message.id, pop_receipt or message.pop_receipt
+        ):
+            raise ResourceNotFoundError("The specified message does not exist.")
+
+    def update_message(
+        self,
+        message: QueueMessage,
+        pop_receipt=None,
+        content=None,
+        visibility_timeout: Optional[int] = None,
+        **kwargs,
+    ) -> QueueMessage:
+        updated = _state.update_message(
+            self.queue_name,
+            message.id,
+            pop_receipt or message.pop_receipt,
+            visibility_timeout or 0,
+            content,
+        )
+        if updated is None:
+            raise ResourceNotFoundError("The specified message does not exist.")
+        return _queue_message(updated)
+
+
+# ── Blob storage ────────────────────────────────────────────────────────
+
+
+def _payload_bytes(data: Any) -> bytes:
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    return data.read()
+
+
+class _Downloader:
+    """The subset of ``StorageStreamDownloader`` used by the pipeline."""
+
+    def __init__(self, data: bytes, content_encoding: Optional[str]):
+        self._data = data
+        self.properties = BlobProperties()
+        self.properties.size = len(data)
+        self.properties.content_settings = ContentSettings(
+            content_encoding=content_encoding
+        )
+
+    def readall(self) -> bytes:
+        return self._data
+
+
+class StandInBlobClient:
+    def __init__(self, container: str, blob: str):
+        self.container_name = container
+        self.blob_name = blob
+        self.path = f"{container}/{blob}"
+
+    def upload_blob(
+        self, data: Any, overwrite: bool = False, content_settings=None, **kwargs
+    ):
+        _state.upload_blob(
+            self.path,
+            _payload_bytes(data),
+            content_settings.content_encoding if content_settings else None,
+        )
+
+    def download_blob(self, **kwargs) -> _Downloader:
+        stored = _state.download_blob(self.path)
+        if stored is None:
+            raise ResourceNotFoundError(
+                f"The specified blob does not exist: {self.path}"
+            )
+        return _Downloader(*stored)
+
+    def exists(self, **kwargs) -> bool:
+        return _state.blob_exists(self.path)
+
+    def delete_blob(self, **kwargs):
+        if not _state.delete_blob(self.path):
+            raise ResourceNotFoundError(
+                f"The specified blob does not exist: {self.path}"
+            )
+
+
+class StandInContainerClient:
+    def __init__(self, container: str):
+        self.container_name = container
+
+    def exists(self, **kwargs) -> bool:
+        return _state.container_exists(self.container_name)
+
+    def create_container(self, **kwargs):
+        _state.create_container(self.container_name)
+
+    def get_blob_client(self, blob: str) -> StandInBlobClient:
+        return StandInBlobClient(self.container_name, blob)
+
+
+class StandInBlobServiceClient:
+    """The subset of ``azure.storage.blob.BlobServiceClient`` used by the pipeline.
+
+    Container names may carry a folder prefix (``processes/<process_id>``),
+    as they do for the real client; blobs are keyed by the full path.
+    """
+
+    def __init__(self, account_url: str, credential=None, **kwargs):
+        self.url = account_url
+
+    def get_container_client(self, container: str) -> StandInContainerClient:
+        return StandInContainerClient(container)
+
+    def get_blob_client(self, container: str, blob: str) -> StandInBlobClient:
+        return StandInBlobClient(container, blob)
+
+
+# ── Cosmos DB (Mongo API) ───────────────────────────────────────────────
+
+
+class _Cursor:
+    def __init__(self, database: str, collection: str, query: dict):
+        self._args = (database, collection, query)
+        self._sort = None
+
+    def sort(self, fields) -> "_Cursor":
+        self._sort = fields
+        return self
+
+    def __iter__(self):
+        return iter(_state.find(*self._args, self._sort))
+
+
+class StandInCollection:
+    def __init__(self, database: str, name: str):
+        self._database = database
+        self.name = name
+
+    def find(self, query: Optional[dict] = None) -> _Cursor:
+        return _Cursor(self._database, self.name, query or {})
+
+    def insert_one(self, document: dict) -> InsertOneResult:
+        inserted_id = _state.insert_one(self._database, self.name, document)
+        document.setdefault("_id", inserted_id)
+        return InsertOneResult(inserted_id, acknowledged=True)
+
+    def update_one(
+        self, query: dict, update: dict, upsert: bool = False
+    ) -> UpdateResult:
+        raw_result = _state.update_one(self._database, self.name, query, update, upsert)
+        return UpdateResult(raw_result, acknowledged=True)
+
+    def delete_one(self, query: dict):
+        return _state.delete_one(self._database, self.name, query)
+
+    def index_information(self) -> dict:
+        return _state.index_information(self._database, self.name)
+
+    def create_index(self, keys, **kwargs) -> str:
+        return _state.create_index(self._database, self.name, keys)
+
+
+class StandInDatabase:
+    def __init__(self, name: str):
+        self.name = name
+
+    def list_collection_names(self) -> list[str]:
+        return _state.list_collection_names(self.name)
+
+    def create_collection(self, name: str) -> StandInCollection:
+        _state.create_collection(self.name, name)
+        return StandInCollection(self.name, name)
+
+    def __getitem__(self, name: str) -> StandInCollection:
+        return StandInCollection(self.name, name)
+
+
+class StandInMongoClient:
+    """The subset of ``pymongo.MongoClient`` used by ``CosmosMongDBHelper``."""
+
+    def __init__(self, connection_string: str = None, **kwargs):
+        self.connection_string = connection_string
+
+    def __getitem__(self, name: str) -> StandInDatabase:
+        return StandInDatabase(name)
+
+
+@contextmanager
+def installed(state) -> Iterator[None]:
+    """Route the pipeline's queue, blob and Mongo clients to *state*.
+
+    Enter before the process host starts its workers; forked workers
+    inherit the patched modules and the proxy.
+    """
+    global _state
+    previous, _state = _state, state
+    try:
+        with (
+            mock.patch.object(pipeline_queue_helper, "QueueClient", StandInQueueClient),
+            mock.patch.object(
+                storage_blob, "BlobServiceClient", StandInBlobServiceClient
+            ),
+            mock.patch.object(
+                remote_schema_loader, "BlobServiceClient", StandInBlobServiceClient
+            ),
+            mock.patch.object(comsos_mongo, "MongoClient", StandInMongoClient),
+        ):
+            yield
+    finally:
+        _state = previous
+
+
+# ── Content Understanding ───────────────────────────────────────────────
+
+
+class _AnalyzeOperation:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.headers = {
+            "operation-location": f"stand-in://analyzerResults/{uuid.uuid4()}"
+        }
+
+
+def _throttled_response(retry_after: float) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = "Too Many Requests"
+    response.headers["Retry-After"] = str(math.ceil(retry_after))
+    return response
+
+
+class ContentUnderstandingStub:
+    """Stand-in for ``AzureContentUnderstandingHelper`` in the extract step.
+
+    Returns *analyzed_result* for every document. Like the service, the
+    operation completes after the sampled latency and is picked up by the
+    next poll, so latency is rounded up to the polling interval.
+    """
+
+    def __init__(self, profile: ServiceProfile, analyzed_result: dict):
+        self.profile = profile
+        self.analyzed_result = analyzed_result
+
+    def begin_analyze_stream(self, analyzer_id: str, file_stream: bytes):
+        _state.count("content_understanding.requests")
+        rng = _rng()
+        if rng.random() < self.profile.throttle_rate:
+            _state.count("content_understanding.throttled")
+            raise requests.HTTPError(
+                "429 Client Error: Too Many Requests",
+                response=_throttled_response(self.profile.retry_after),
+            )
+        return _AnalyzeOperation(self.profile.latency.sample(rng))
+
+    def poll_result(
+        self,
+        response: _AnalyzeOperation,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: int = 2,
+    ) -> dict:
+        polls = math.ceil(response.latency / polling_interval_seconds)
+        if polls * polling_interval_seconds > timeout_seconds:
+            time.sleep(timeout_seconds)
+            raise TimeoutError(
+                f"Operation timed out after {timeout_seconds:.2f} seconds."
+            )
+        time.sleep(polls * polling_interval_seconds)
+        return json.loads(json.dumps(self.analyzed_result))
+
+    async def close(self):
+        pass
+
+
+# ── Azure OpenAI ────────────────────────────────────────────────────────
+
+
+class OpenAIStubTransport(httpx.AsyncBaseTransport):
+    """Answers chat completion requests with a fixed structured response.
+
+    Prompt tokens are estimated from the request size (about four bytes a
+    token), so larger documents cost proportionally more, as they do in
+    the service.
+    """
+
+    def __init__(self, profile: ServiceProfile, content: str, logprobs: list[dict]):
+        self.profile = profile
+        self.content = content
+        self.logprobs = logprobs
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        _state.count("openai.requests")
+        rng = _rng()
+        if rng.random() < self.profile.throttle_rate:
+            _state.count("openai.throttled")
+            return httpx.Response(
+                429,
+                headers={
+                    "retry-after-ms": str(int(self.profile.retry_after * 1000)),
+                    "retry-after": str(math.ceil(self.profile.retry_after)),
+                },
+                json={"error": {"code": "429", "message": "Rate limit is exceeded."}},
+            )
+
+        await asyncio.sleep(self.profile.latency.sample(rng))
+        prompt_tokens = len(body) // 4
+        completion_tokens = len(self.logprobs)
+        return httpx.Response(
+            200,
+            json={
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": OPENAI_MODEL,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": self.content},
+                        "logprobs": {"content": self.logprobs},
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+
+def openai_stub_helper(
+    profile: ServiceProfile, content: str, logprobs: list[dict]
+) -> AgentFrameworkHelper:
+    """Build an ``AgentFrameworkHelper`` whose chat client talks to the stub.
+
+    Uses the same client class as production (``AzureOpenAIChatClientWithRetry``)
+    with the retry settings from the ``AOAI_429_*`` environment variables.
+    """
+    from openai import AsyncAzureOpenAI
+
+    helper = AgentFrameworkHelper()
+    helper.ai_clients["default_chat_completion"] = AgentFrameworkHelper.create_client(
+        client_type=ClientType.AzureOpenAIChatCompletionWithRetry,
+        deployment_name=OPENAI_MODEL,
+        endpoint=OPENAI_ENDPOINT,
+        api_version=OPENAI_API_VERSION,
+        async_client=AsyncAzureOpenAI(
+            azure_endpoint=OPENAI_ENDPOINT,
+            api_key="stand-in",
+            api_version=OPENAI_API_VERSION,
+            http_client=httpx.AsyncClient(
+                transport=OpenAIStubTransport(profile, content, logprobs)
+            ),
+        ),
+    )
+    return helper
@@ -0,0 +1,299 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Micro-benchmarks for the evaluate-step logic.
+
+Times ``content_understanding_confidence_evaluator.evaluate_confidence``,
+``openai_confidence_evaluator.evaluate_confidence``,
+``merge_confidence_values`` and ``get_extraction_comparison_data`` on
+synthetic documents of increasing size, records wall time and peak
+traced memory, and compares the results against a saved baseline.
+
+Run from ``src/ContentProcessor``::
+
+    python tests/benchmarks/evaluate_benchmark.py --scenario small medium
+    python tests/benchmarks/evaluate_benchmark.py --save-baseline baseline.json
+    python tests/benchmarks/evaluate_benchmark.py --baseline baseline.json
+
+The process exits with status 1 when any benchmark regresses past the
+tolerance relative to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+)
+
+from libs.pipeline.handlers.logics.evaluate_handler.comparison import (  # noqa: E402
+    get_extraction_comparison_data,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.confidence import (  # noqa: E402
+    merge_confidence_values,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.content_understanding_confidence_evaluator import (  # noqa: E402
+    evaluate_confidence as content_understanding_confidence,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (  # noqa: E402
+    evaluate_confidence as gpt_confidence,
+)
+from synthetic_documents import (  # noqa: E402
+    DocumentShape,
+    build_analyzed_result,
+    build_analyzed_result_dict,
+    build_extraction,
+    build_map_choice,
+    count_leaves,
+)
+
+SCENARIOS: dict[str, DocumentShape] = {
+    "small": DocumentShape(pages=1, lines_per_page=30, words_per_line=6, fields=6),
+    "medium": DocumentShape(
+        pages=5, lines_per_page=40, words_per_line=8, fields=12, list_size=5
+    ),
+    "large": DocumentShape(
+        pages=20, lines_per_page=50, words_per_line=8, fields=16, list_size=8
+    ),
+}
+
+BENCHMARKS = [
+    "content_understanding_confidence",
+    "openai_confidence",
+    "merge_confidence_values",
+    "get_extraction_comparison_data",
+]
+
+DEFAULT_SCENARIOS = ["small", "medium"]
+DEFAULT_TOLERANCE = 1.25
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory summary for one function on one scenario.
+
+    Attributes:
+        scenario: Scenario name (key of ``SCENARIOS``).
+        benchmark: Benchmarked function name.
+        repeat: Number of timed runs.
+        min_seconds: Fastest run.
+        median_seconds: Median run.
+        peak_memory_bytes: Peak traced allocation during a single run.
+    """
+
+    scenario: str
+    benchmark: str
+    repeat: int
+    min_seconds: float
+    median_seconds: float
+    peak_memory_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}/{self.benchmark}"
+
+
+def _measure(
+    scenario: str, benchmark: str, func: Callable[[], object], repeat: int
+) -> BenchmarkResult:
+    """Run *func* ``repeat`` times for timing, then once under tracemalloc."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate run so tracing overhead does not
+    # distort the timings.
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        scenario=scenario,
+        benchmark=benchmark,
+        repeat=repeat,
+        min_seconds=min(timings),
+        median_seconds=statistics.median(timings),
+        peak_memory_bytes=peak,
+    )
+
+
+def run_scenario(
+    name: str,
+    shape: DocumentShape,
+    repeat: int = 3,
+    only: list[str] | None = None,
+) -> list[BenchmarkResult]:
+    """Benchmark the evaluate functions against one synthetic document.
+
+    Args:
+        name: Scenario name used to key the results.
+        shape: Dimensions of the synthetic document.
+        repeat: Number of timed runs per benchmark.
+        only: Optional subset of benchmark names to run.
+    """
+    analyzed_result_dict = build_analyzed_result_dict(shape)
+    analyzed_result = build_analyzed_result(shape)
+    document = analyzed_result.result.contents[0]
+    extraction = build_extraction(shape, analyzed_result_dict)
+    choice = build_map_choice(extraction)
+
+    # Downstream inputs are computed once, outside the timed region, and
+    # only when a selected benchmark needs them.
+    inputs: dict[str, dict] = {}
+
+    def cu_confidence() -> dict:
+        if "cu" not in inputs:
+            inputs["cu"] = content_understanding_confidence(extraction, document)
+        return inputs["cu"]
+
+    def openai_confidence() -> dict:
+        if "gpt" not in inputs:
+            inputs["gpt"] = gpt_confidence(extraction, choice)
+        return inputs["gpt"]
+
+    def merged_confidence() -> dict:
+        if "merged" not in inputs:
+            inputs["merged"] = merge_confidence_values(
+                cu_confidence(), openai_confidence()
+            )
+        return inputs["merged"]
+
+    benchmarks: dict[str, Callable[[], object]] = {
+        "content_understanding_confidence": lambda: content_understanding_confidence(
+            extraction, document
+        ),
+        "openai_confidence": lambda: gpt_confidence(extraction, choice),
+        "merge_confidence_values": lambda: merge_confidence_values(
+            cu_confidence(), openai_confidence()
+        ),
+        "get_extraction_comparison_data": lambda: get_extraction_comparison_data(
+            actual=extraction, confidence=merged_confidence(), threads_hold=0.8
+        ),
+    }
+    selected = {
+        benchmark: func
+        for benchmark, func in benchmarks.items()
+        if only is None or benchmark in only
+    }
+    if "merge_confidence_values" in selected:
+        cu_confidence()
+        openai_confidence()
+    if "get_extraction_comparison_data" in selected:
+        merged_confidence()
+
+    print(
+        f"[{name}] pages={shape.pages} lines/page={shape.lines_per_page} "
+        f"words/line={shape.words_per_line} leaves={count_leaves(extraction)}"
+    )
+    return [
+        _measure(name, benchmark, func, repeat) for benchmark, func in selected.items()
+    ]
+
+
+def check_regressions(
+    results: list[BenchmarkResult], baseline: dict, tolerance: float
+) -> list[str]:
+    """Return a message for every result slower than ``baseline * tolerance``.
+
+    Benchmarks missing from the baseline are ignored so new scenarios can
+    be added without invalidating existing baselines.
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.key)
+        if reference is None:
+            continue
+        limit = reference["median_seconds"] * tolerance
+        if result.median_seconds > limit:
+            regressions.append(
+                f"{result.key}: median {result.median_seconds:.4f}s exceeds "
+                f"{limit:.4f}s (baseline {reference['median_seconds']:.4f}s "
+                f"x {tolerance})"
+            )
+    return regressions
+
+
+def format_report(results: list[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table."""
+    header = f"{'benchmark':<55} {'min (s)':>10} {'median (s)':>11} {'peak (KiB)':>11}"
+    rows = [header, "-" * len(header)]
+    for result in results:
+        rows.append(
+            f"{result.key:<55} {result.min_seconds:>10.4f} "
+            f"{result.median_seconds:>11.4f} "
+            f"{result.peak_memory_bytes / 1024:>11.1f}"
+        )
+    return "\n".join(rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=DEFAULT_SCENARIOS,
+        help="Scenarios to run (default: small medium).",
+    )
+    parser.add_argument(
+        "--benchmark",
+        nargs="+",
+        choices=BENCHMARKS,
+        help="Benchmarks to run (default: all).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown factor relative to the baseline.",
+    )
+    parser.add_argument("--save-baseline", help="Write results as a new baseline.")
+    args = parser.parse_args(argv)
+
+    results: list[BenchmarkResult] = []
+    for name in args.scenario:
+        results.extend(
+            run_scenario(name, SCENARIOS[name], repeat=args.repeat, only=args.benchmark)
+        )
+
+    print(format_report(results))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {result.key: asdict(result) for result in results},
+                baseline_file,
+                indent=2,
+            )
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = check_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,863 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""End-to-end load benchmark of the ContentProcessor pipeline.
+
+Runs the real process host (``HandlerHostManager``) with the extract, map,
+evaluate and save handlers against in-memory stand-ins for Storage
+Queue, Blob Storage and Cosmos DB, and against Content Understanding and
+Azure OpenAI stubs with configurable latency and 429 rates (see
+``azure_stand_ins``). Synthetic documents are submitted the way the API
+submits them, and the run reports:
+
+- documents per minute, from the first submission to the last completion;
+- p50 / p95 / p99 of every step's processing time (the ``elapsed`` the
+  handlers record), of the time spent queued and of end-to-end latency;
+- CPU seconds of the workers and the host, and each step's worker
+  memory high-water mark;
+- stub request and 429 counts.
+
+Run from ``src/ContentProcessor``::
+
+    python tests/benchmarks/pipeline_load_benchmark.py --documents 2000
+    python tests/benchmarks/pipeline_load_benchmark.py --openai-throttle 0.05 \\
+        --openai-latency lognormal:3:8 --step-workers "map=2:16:4,*=1:4"
+    python tests/benchmarks/pipeline_load_benchmark.py --save-baseline load.json
+    python tests/benchmarks/pipeline_load_benchmark.py --baseline load.json
+
+The process exits with status 1 when documents fail beyond
+``--max-failure-rate`` or when throughput, p95 latency or CPU per
+document regress past the tolerance relative to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import logging
+import os
+import resource
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+)
+
+from azure_stand_ins import (  # noqa: E402
+    OPENAI_ENDPOINT,
+    OPENAI_MODEL,
+    ContentUnderstandingStub,
+    LatencyModel,
+    ServiceProfile,
+    StandInManager,
+    installed,
+    openai_stub_helper,
+)
+from libs.agent_framework.agent_framework_helper import (  # noqa: E402
+    AgentFrameworkHelper,
+)
+from libs.application.application_configuration import (  # noqa: E402
+    AppConfiguration,
+)
+from libs.application.application_context import AppContext  # noqa: E402
+from libs.azure_helper.content_understanding import (  # noqa: E402
+    AzureContentUnderstandingHelper,
+)
+from libs.pipeline import pipeline_queue_helper  # noqa: E402
+from libs.pipeline.entities.mime_types import MimeTypes  # noqa: E402
+from libs.pipeline.entities.pipeline_data import DataPipeline  # noqa: E402
+from libs.pipeline.entities.pipeline_file import (  # noqa: E402
+    ArtifactType,
+    FileDetails,
+)
+from libs.pipeline.entities.pipeline_status import PipelineStatus  # noqa: E402
+from libs.pipeline.entities.schema import Schema  # noqa: E402
+from libs.pipeline.queue_monitor import QueueMonitor  # noqa: E402
+from libs.process_host import handler_type_loader  # noqa: E402
+from libs.process_host.handler_process_host import HandlerHostManager  # noqa: E402
+from synthetic_documents import (  # noqa: E402
+    DocumentShape,
+    build_analyzed_result_dict,
+    build_extraction,
+    build_map_choice,
+)
+
+STEPS = ["extract", "map", "evaluate", "save"]
+STAGES = [*STEPS, "queued", "end_to_end"]
+
+SCHEMA_ID = "load-benchmark"
+SCHEMA_CLASS = "LoadBenchmarkExtraction"
+SCHEMA_FILE = "load_benchmark_extraction.json"
+
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+DEFAULT_STEP_WORKERS = "map=2:8:2,*=1:4"
+DEFAULT_TOLERANCE = 1.25
+
+# Print and log output of the workers is discarded unless --verbose is set.
+_verbose = False
+
+
+@dataclass
+class LoadScenario:
+    """Workload, pipeline settings and stub behaviour of one run.
+
+    Attributes:
+        documents: Documents submitted.
+        pdf_ratio: Share of PDF documents; the rest are JPEG images.
+        pdf_pages: Pages per PDF, also the page count of the stubbed layout.
+        image_size: ``(width, height)`` of the synthetic images.
+        fields: Top-level fields of the schema and of the mapped result.
+        arrival_rate: Documents submitted per second (0 submits all at once).
+        step_workers: Worker pools in ``APP_STEP_WORKERS`` format.
+        autoscale_interval: Seconds between queue samples of the host.
+        poll_interval: Seconds a worker sleeps when its queue is empty.
+        retry_delay: Seconds a failed message stays invisible before a retry.
+        timeout: Seconds after which the run is stopped.
+        content_understanding: Content Understanding stub behaviour.
+        openai: Azure OpenAI stub behaviour.
+        seed: Seed of the synthetic layout and extraction.
+    """
+
+    documents: int = 200
+    pdf_ratio: float = 0.0
+    pdf_pages: int = 2
+    image_size: tuple[int, int] = (1024, 768)
+    fields: int = 10
+    arrival_rate: float = 0.0
+    step_workers: str = DEFAULT_STEP_WORKERS
+    autoscale_interval: float = 5.0
+    poll_interval: int = 1
+    retry_delay: int = 2
+    timeout: float = 1800.0
+    content_understanding: ServiceProfile = field(
+        default_factory=lambda: ServiceProfile(LatencyModel.parse("lognormal:4:10"))
+    )
+    openai: ServiceProfile = field(
+        default_factory=lambda: ServiceProfile(LatencyModel.parse("lognormal:3:8"))
+    )
+    seed: int = 42
+
+
+@dataclass
+class Corpus:
+    """Synthetic inputs shared by all documents of a run.
+
+    Attributes:
+        image: JPEG bytes of an image document.
+        pdf: Bytes of a PDF document.
+        analyzed_result: Content Understanding layout returned for PDFs.
+        schema: JSON Schema registered for the run.
+        content: Structured output returned by the OpenAI stub.
+        logprobs: Token logprobs returned with *content*.
+    """
+
+    image: bytes
+    pdf: bytes
+    analyzed_result: dict
+    schema: dict
+    content: str
+    logprobs: list[dict]
+
+
+@dataclass
+class LoadResult:
+    """Outcome of one load run.
+
+    Attributes:
+        documents: Documents submitted.
+        completed: Documents that passed every step.
+        failed: Documents that did not complete (including timeouts).
+        dead_lettered: Messages in the dead-letter queues at the end.
+        wall_seconds: Seconds from the first submission to the end of the run.
+        docs_per_minute: Completed documents per minute of pipeline time.
+        latency: ``{stage: {"p50", "p95", "p99"}}`` in seconds, for every
+            step plus ``queued`` and ``end_to_end``.
+        worker_cpu_seconds: User and system CPU time of all worker processes.
+        host_cpu_seconds: CPU time of the host (runner and supervisor).
+        cpu_seconds_per_document: Worker CPU time per completed document.
+        peak_rss_mb: Memory high-water mark of each step's workers.
+        service_calls: Stub request and 429 counts.
+    """
+
+    documents: int
+    completed: int
+    failed: int
+    dead_lettered: int
+    wall_seconds: float
+    docs_per_minute: float
+    latency: dict[str, dict[str, float]]
+    worker_cpu_seconds: float
+    host_cpu_seconds: float
+    cpu_seconds_per_document: float
+    peak_rss_mb: dict[str, float] = field(default_factory=dict)
+    service_calls: dict[str, int] = field(default_factory=dict)
+
+
+# ── Synthetic inputs ────────────────────────────────────────────────────
+
+
+def json_schema_for(value, title: str | None = None) -> dict:
+    """Return a JSON Schema that *value* (a mapped extraction) validates against."""
+    if isinstance(value, dict):
+        schema = {
+            "type": "object",
+            "properties": {key: json_schema_for(item) for key, item in value.items()},
+            "required": list(value),
+        }
+    elif isinstance(value, list):
+        schema = {"type": "array", "items": json_schema_for(value[0]) if value else {}}
+    else:
+        schema = {"type": "string"}
+    if title:
+        schema["title"] = title
+    return schema
+
+
+def _as_strings(value):
+    if isinstance(value, dict):
+        return {key: _as_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_as_strings(item) for item in value]
+    return str(value)
+
+
+def build_corpus(scenario: LoadScenario) -> Corpus:
+    """Generate the documents, layout, schema and model output of a run."""
+    from PIL import Image
+
+    image = Image.effect_noise(scenario.image_size, 48).convert("RGB")
+    image_bytes = io.BytesIO()
+    image.save(image_bytes, format="JPEG", quality=85)
+    pdf_bytes = io.BytesIO()
+    image.save(
+        pdf_bytes,
+        format="PDF",
+        save_all=True,
+        append_images=[image] * (scenario.pdf_pages - 1),
+    )
+
+    shape = DocumentShape(
+        pages=scenario.pdf_pages,
+        lines_per_page=40,
+        words_per_line=8,
+        fields=scenario.fields,
+        seed=scenario.seed,
+    )
+    analyzed_result = build_analyzed_result_dict(shape)
+    # The schema types every leaf as a string, so numbers are mapped as text.
+    extraction = _as_strings(build_extraction(shape, analyzed_result))
+    choice = build_map_choice(extraction)
+
+    return Corpus(
+        image=image_bytes.getvalue(),
+        pdf=pdf_bytes.getvalue(),
+        analyzed_result=analyzed_result,
+        schema=json_schema_for(extraction, title=SCHEMA_CLASS),
+        content=choice["message"]["content"],
+        logprobs=[
+            {**token, "bytes": None, "top_logprobs": []}
+            for token in choice["logprobs"]["content"]
+        ],
+    )
+
+
+# ── Pipeline wiring ─────────────────────────────────────────────────────
+
+
+def build_app_context(scenario: LoadScenario, corpus: Corpus) -> AppContext:
+    """Create the application context the workers run with.
+
+    Settings not covered by the scenario (blob compression, slim
+    persistence, worker recycling, ...) are read from the environment as
+    in production.
+    """
+    app_context = AppContext()
+    app_context.set_configuration(
+        AppConfiguration(
+            app_storage_queue_url="https://stand-in.queue.core.windows.net",
+            app_storage_blob_url="https://stand-in.blob.core.windows.net",
+            app_process_steps=STEPS,
+            app_message_queue_interval=scenario.poll_interval,
+            app_message_queue_visibility_timeout=scenario.retry_delay,
+            app_message_queue_process_timeout=300,
+            app_logging_level="WARNING",
+            azure_package_logging_level="WARNING",
+            azure_logging_packages="",
+            app_cps_processes="cps-processes",
+            app_cps_configuration="cps-configuration",
+            app_content_understanding_endpoint="https://stand-in.cognitiveservices.azure.com",
+            app_ai_project_endpoint="https://stand-in.services.ai.azure.com",
+            app_azure_openai_endpoint=OPENAI_ENDPOINT,
+            app_azure_openai_model=OPENAI_MODEL,
+            app_cosmos_connstr="mongodb://stand-in",
+            app_cosmos_database="ContentProcess",
+            app_cosmos_container_process="Processes",
+            app_cosmos_container_schema="Schemas",
+            app_step_workers=scenario.step_workers,
+            app_autoscale_interval=scenario.autoscale_interval,
+        )
+    )
+    app_context.set_credential(None)
+    app_context.add_singleton(
+        AgentFrameworkHelper,
+        lambda: openai_stub_helper(scenario.openai, corpus.content, corpus.logprobs),
+    )
+    app_context.add_async_singleton(
+        AzureContentUnderstandingHelper,
+        lambda: ContentUnderstandingStub(
+            scenario.content_understanding, corpus.analyzed_result
+        ),
+    )
+    return app_context
+
+
+def seed_schema(state, app_context: AppContext, corpus: Corpus):
+    """Register the run's schema in the schema collection and blob container."""
+    configuration = app_context.configuration
+    state.insert_one(
+        configuration.app_cosmos_database,
+        configuration.app_cosmos_container_schema,
+        Schema(
+            Id=SCHEMA_ID,
+            ClassName=SCHEMA_CLASS,
+            Description="Synthetic schema of the pipeline load benchmark",
+            FileName=SCHEMA_FILE,
+            ContentType="application/json",
+        ).model_dump(),
+    )
+    state.upload_blob(
+        f"{configuration.app_cps_configuration}/Schemas/{SCHEMA_ID}/{SCHEMA_FILE}",
+        json.dumps(corpus.schema).encode("utf-8"),
+        None,
+    )
+
+
+def is_pdf(index: int, pdf_ratio: float) -> bool:
+    """Spread PDFs evenly over the submission order."""
+    return int((index + 1) * pdf_ratio) > int(index * pdf_ratio)
+
+
+def submit_document(
+    state, app_context: AppContext, corpus: Corpus, index: int, pdf: bool
+) -> str:
+    """Upload a document and enqueue it for the first step, as the API does.
+
+    Returns:
+        str: The process id of the document.
+    """
+    configuration = app_context.configuration
+    process_id = str(uuid.uuid4())
+    name, mime_type, data = (
+        (f"document-{index:05}.pdf", MimeTypes.Pdf, corpus.pdf)
+        if pdf
+        else (f"document-{index:05}.jpg", MimeTypes.ImageJpeg, corpus.image)
+    )
+    state.upload_blob(
+        f"{configuration.app_cps_processes}/{process_id}/{name}", data, None
+    )
+
+    data_pipeline = DataPipeline(
+        process_id=process_id,
+        pipeline_status=PipelineStatus(
+            process_id=process_id,
+            schema_id=SCHEMA_ID,
+            creation_time=datetime.datetime.now(datetime.UTC).strftime(_TIME_FORMAT),
+            steps=list(STEPS),
+            remaining_steps=list(STEPS),
+        ),
+        files=[
+            FileDetails(
+                id=str(uuid.uuid4()),
+                process_id=process_id,
+                name=name,
+                size=len(data),
+                mime_type=mime_type,
+                artifact_type=ArtifactType.SourceContent,
+                processed_by="API",
+            )
+        ],
+    )
+    state.send_message(
+        pipeline_queue_helper.create_queue_client_name(STEPS[0]),
+        data_pipeline.model_dump_json(),
+    )
+    return process_id
+
+
+def _run_worker(
+    show_information: bool,
+    app_context: AppContext,
+    step_name: str,
+    stop_event=None,
+    stats=None,
+):
+    """Worker entry point: ``handler_type_loader.run`` with output discarded."""
+    if not _verbose:
+        sys.stdout = open(os.devnull, "w")
+    handler_type_loader.run(
+        show_information, app_context, step_name, stop_event, stats=stats
+    )
+
+
+def build_host(app_context: AppContext) -> HandlerHostManager:
+    """Register every step with a process host, as ``main.Application.run`` does."""
+    configuration = app_context.configuration
+    host = HandlerHostManager(
+        autoscale=configuration.autoscale_settings(),
+        monitor=QueueMonitor(STEPS, app_context),
+    )
+    for step in STEPS:
+        handler_type_loader.ensure_exists(step)
+        pool = configuration.worker_pool_for(step)
+        queue_clients = []
+        if pool.is_elastic:
+            queue_clients = [
+                pipeline_queue_helper.create_or_get_queue_client(
+                    queue_name,
+                    configuration.app_storage_queue_url,
+                    app_context.credential,
+                )
+                for queue_name in pipeline_queue_helper.create_lane_queue_client_names(
+                    step
+                ).values()
+            ]
+        host.add_handlers_as_process(
+            target_function=_run_worker,
+            process_name=step,
+            args=(False, app_context, step),
+            settings=pool,
+            queue_clients=queue_clients,
+        )
+    return host
+
+
+def _drained(state) -> bool:
+    """Return True when no step lane holds a message, visible or in flight."""
+    return all(
+        not state.queue_length(queue_name)
+        for step in STEPS
+        for queue_name in pipeline_queue_helper.create_lane_queue_client_names(
+            step
+        ).values()
+    )
+
+
+def _dead_lettered(state) -> int:
+    return sum(
+        state.queue_length(
+            pipeline_queue_helper.create_dead_letter_queue_client_name(step)
+        )
+        or 0
+        for step in STEPS
+    )
+
+
+async def _drive(
+    host: HandlerHostManager,
+    state,
+    app_context: AppContext,
+    scenario: LoadScenario,
+    corpus: Corpus,
+) -> list[str]:
+    """Submit the documents and supervise the workers until the queues drain."""
+    supervisor = asyncio.create_task(host.start_handler_processes())
+    started = time.monotonic()
+    process_ids = []
+    try:
+        for index in range(scenario.documents):
+            process_ids.append(
+                submit_document(
+                    state,
+                    app_context,
+                    corpus,
+                    index,
+                    is_pdf(index, scenario.pdf_ratio),
+                )
+            )
+            delay = 0.0
+            if scenario.arrival_rate:
+                delay = started + (index + 1) / scenario.arrival_rate - time.monotonic()
+            await asyncio.sleep(max(0.0, delay))
+
+        deadline = started + scenario.timeout
+        while not _drained(state):
+            if supervisor.done():
+                supervisor.result()
+            if time.monotonic() >= deadline:
+                logging.warning(f"Stopping the run after {scenario.timeout:.0f}s")
+                break
+            await asyncio.sleep(0.5)
+    finally:
+        supervisor.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await supervisor
+        await host.stop_handler_processes(
+            timeout=scenario.poll_interval + scenario.timeout * 0.01
+        )
+    return process_ids
+
+
+# ── Results ─────────────────────────────────────────────────────────────
+
+
+def elapsed_seconds(elapsed: str | None) -> float:
+    """Convert a ``Stopwatch`` string (``HH:MM:SS.mmm``) to seconds."""
+    if not elapsed:
+        return 0.0
+    hours, minutes, seconds = elapsed.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Return the nearest-rank p50, p95 and p99 of *values* (zeros when empty)."""
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def rank(percentile: int) -> float:
+        index = max(0, -(-percentile * len(ordered) // 100) - 1)
+        return ordered[index]
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99)}
+
+
+def _succeeded(status: PipelineStatus) -> bool:
+    results = {result.step_name: result.result for result in status.process_results}
+    return all(
+        step in results
+        and not (
+            isinstance(results[step], dict)
+            and results[step].get("result") in ("error", "moved to Dead Letter Queue")
+        )
+        for step in STEPS
+    )
+
+
+def read_statuses(
+    state, app_context: AppContext, process_ids: list[str]
+) -> list[PipelineStatus]:
+    """Read the last status every document's handlers persisted.
+
+    Documents that never reached a handler are skipped.
+    """
+    container = app_context.configuration.app_cps_processes
+    statuses = []
+    for process_id in process_ids:
+        stored = state.download_blob(f"{container}/{process_id}/process-status.json")
+        if stored is None:
+            continue
+        payload = json.loads(stored[0])
+        # Failed steps persist the bare status, successful ones the pipeline.
+        statuses.append(PipelineStatus(**payload.get("pipeline_status", payload)))
+    return statuses
+
+
+def summarize(
+    statuses: list[PipelineStatus],
+    documents: int,
+    dead_lettered: int,
+    wall_seconds: float,
+    worker_cpu_seconds: float,
+    host_cpu_seconds: float,
+    peak_rss_mb: dict[str, float],
+    service_calls: dict[str, int],
+) -> LoadResult:
+    """Aggregate the statuses of a run into a ``LoadResult``."""
+    samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    first_submitted = None
+    last_completed = None
+    completed = 0
+    for status in statuses:
+        submitted = datetime.datetime.strptime(status.creation_time, _TIME_FORMAT)
+        first_submitted = min(first_submitted or submitted, submitted)
+        if not _succeeded(status):
+            continue
+        completed += 1
+        finished = datetime.datetime.strptime(status.last_updated_time, _TIME_FORMAT)
+        last_completed = max(last_completed or finished, finished)
+
+        processing = 0.0
+        for result in status.process_results:
+            if result.step_name in STEPS:
+                seconds = elapsed_seconds(result.elapsed)
+                samples[result.step_name].append(seconds)
+                processing += seconds
+        end_to_end = (finished - submitted).total_seconds()
+        samples["end_to_end"].append(end_to_end)
+        samples["queued"].append(max(0.0, end_to_end - processing))
+
+    pipeline_seconds = (
+        (last_completed - first_submitted).total_seconds() if completed else 0.0
+    )
+    return LoadResult(
+        documents=documents,
+        completed=completed,
+        failed=documents - completed,
+        dead_lettered=dead_lettered,
+        wall_seconds=wall_seconds,
+        docs_per_minute=completed * 60 / pipeline_seconds if pipeline_seconds else 0.0,
+        latency={stage: percentiles(values) for stage, values in samples.items()},
+        worker_cpu_seconds=worker_cpu_seconds,
+        host_cpu_seconds=host_cpu_seconds,
+        cpu_seconds_per_document=worker_cpu_seconds / completed if completed else 0.0,
+        peak_rss_mb=peak_rss_mb,
+        service_calls=service_calls,
+    )
+
+
+def _cpu_seconds(who: int) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_load(scenario: LoadScenario) -> LoadResult:
+    """Run the pipeline against the stand-ins and return its results."""
+    corpus = build_corpus(scenario)
+    manager = StandInManager()
+    manager.start()
+    try:
+        state = manager.StandInState()
+        with installed(state):
+            app_context = build_app_context(scenario, corpus)
+            seed_schema(state, app_context, corpus)
+            host = build_host(app_context)
+
+            children_before = _cpu_seconds(resource.RUSAGE_CHILDREN)
+            self_before = _cpu_seconds(resource.RUSAGE_SELF)
+            started = time.monotonic()
+            process_ids = asyncio.run(
+                _drive(host, state, app_context, scenario, corpus)
+            )
+            wall_seconds = time.monotonic() - started
+            # Only the joined workers are counted; the manager still runs.
+            worker_cpu_seconds = (
+                _cpu_seconds(resource.RUSAGE_CHILDREN) - children_before
+            )
+            host_cpu_seconds = _cpu_seconds(resource.RUSAGE_SELF) - self_before
+
+            return summarize(
+                read_statuses(state, app_context, process_ids),
+                documents=scenario.documents,
+                dead_lettered=_dead_lettered(state),
+                wall_seconds=wall_seconds,
+                worker_cpu_seconds=worker_cpu_seconds,
+                host_cpu_seconds=host_cpu_seconds,
+                peak_rss_mb=host.memory_high_water(),
+                service_calls=state.counters(),
+            )
+    finally:
+        manager.shutdown()
+
+
+# ── Reporting and regression gate ───────────────────────────────────────
+
+
+def check_regressions(
+    result: LoadResult,
+    baseline: dict,
+    tolerance: float,
+    max_failure_rate: float = 0.0,
+) -> list[str]:
+    """Return a message for every gate *result* fails.
+
+    Failed documents are always checked. Against a baseline, throughput
+    may not drop below ``baseline / tolerance`` and p95 latencies and CPU
+    per document may not exceed ``baseline * tolerance``.
+    """
+    regressions = []
+    if result.documents and result.failed / result.documents > max_failure_rate:
+        regressions.append(
+            f"{result.failed} of {result.documents} documents failed "
+            f"(allowed {max_failure_rate:.1%})"
+        )
+    if not baseline:
+        return regressions
+
+    floor = baseline["docs_per_minute"] / tolerance
+    if result.docs_per_minute < floor:
+        regressions.append(
+            f"throughput {result.docs_per_minute:.1f} docs/min is below {floor:.1f} "
+            f"(baseline {baseline['docs_per_minute']:.1f} / {tolerance})"
+        )
+    for stage, reference in baseline.get("latency", {}).items():
+        if stage not in result.latency:
+            continue
+        limit = reference["p95"] * tolerance
+        if result.latency[stage]["p95"] > limit:
+            regressions.append(
+                f"{stage}: p95 {result.latency[stage]['p95']:.3f}s exceeds {limit:.3f}s "
+                f"(baseline {reference['p95']:.3f}s x {tolerance})"
+            )
+    limit = baseline["cpu_seconds_per_document"] * tolerance
+    if result.cpu_seconds_per_document > limit:
+        regressions.append(
+            f"CPU {result.cpu_seconds_per_document:.3f}s/document exceeds {limit:.3f}s "
+            f"(baseline {baseline['cpu_seconds_per_document']:.3f}s x {tolerance})"
+        )
+    return regressions
+
+
+def format_report(result: LoadResult) -> str:
+    """Render a run's throughput, latency table and resource usage."""
+    rows = [
+        f"documents {result.documents}, completed {result.completed}, "
+        f"failed {result.failed}, dead-lettered {result.dead_lettered}",
+        f"throughput {result.docs_per_minute:.1f} docs/min "
+        f"(wall time {result.wall_seconds:.1f}s)",
+        "",
+    ]
+    header = f"{'stage':<12} {'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9}"
+    rows += [header, "-" * len(header)]
+    for stage, values in result.latency.items():
+        rows.append(
+            f"{stage:<12} {values['p50']:>9.3f} {values['p95']:>9.3f} {values['p99']:>9.3f}"
+        )
+    rows += [
+        "",
+        f"CPU: workers {result.worker_cpu_seconds:.1f}s "
+        f"({result.cpu_seconds_per_document:.3f}s/document), "
+        f"host {result.host_cpu_seconds:.1f}s",
+        "Peak worker RSS: "
+        + (
+            ", ".join(f"{step}={mb:.0f} MiB" for step, mb in result.peak_rss_mb.items())
+            or "-"
+        ),
+        "Service calls: "
+        + (
+            ", ".join(
+                f"{name}={count}"
+                for name, count in sorted(result.service_calls.items())
+            )
+            or "-"
+        ),
+    ]
+    return "\n".join(rows)
+
+
+def _image_size(value: str) -> tuple[int, int]:
+    width, _, height = value.partition("x")
+    return int(width), int(height)
+
+
+def main(argv: list[str] | None = None) -> int:
+    global _verbose
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    workload = parser.add_argument_group("workload")
+    workload.add_argument("--documents", type=int, default=200)
+    workload.add_argument(
+        "--pdf-ratio",
+        type=float,
+        default=0.0,
+        help="Share of PDF documents; PDFs need poppler for the map step.",
+    )
+    workload.add_argument("--pdf-pages", type=int, default=2)
+    workload.add_argument(
+        "--image-size", type=_image_size, default=(1024, 768), help="WIDTHxHEIGHT"
+    )
+    workload.add_argument("--fields", type=int, default=10)
+    workload.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=0.0,
+        help="Documents submitted per second (0 submits all at once).",
+    )
+    workload.add_argument("--timeout", type=float, default=1800.0)
+
+    pipeline = parser.add_argument_group("pipeline")
+    pipeline.add_argument(
+        "--step-workers",
+        default=DEFAULT_STEP_WORKERS,
+        help="Worker pools in APP_STEP_WORKERS format.",
+    )
+    pipeline.add_argument("--autoscale-interval", type=float, default=5.0)
+    pipeline.add_argument("--poll-interval", type=int, default=1)
+    pipeline.add_argument("--retry-delay", type=int, default=2)
+
+    services = parser.add_argument_group(
+        "services", "Latency specs: SECONDS, uniform:LOW:HIGH or lognormal:MEDIAN:P95."
+    )
+    services.add_argument(
+        "--cu-latency", type=LatencyModel.parse, default="lognormal:4:10"
+    )
+    services.add_argument("--cu-throttle", type=float, default=0.0)
+    services.add_argument(
+        "--openai-latency", type=LatencyModel.parse, default="lognormal:3:8"
+    )
+    services.add_argument("--openai-throttle", type=float, default=0.0)
+    services.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After of a 429."
+    )
+
+    gate = parser.add_argument_group("gate")
+    gate.add_argument("--baseline", help="Baseline JSON to compare against.")
+    gate.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed regression factor relative to the baseline.",
+    )
+    gate.add_argument(
+        "--max-failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of documents allowed to fail.",
+    )
+    gate.add_argument("--save-baseline", help="Write results as a new baseline.")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show worker output and info logs."
+    )
+    args = parser.parse_args(argv)
+
+    _verbose = args.verbose
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    scenario = LoadScenario(
+        documents=args.documents,
+        pdf_ratio=args.pdf_ratio,
+        pdf_pages=args.pdf_pages,
+        image_size=args.image_size,
+        fields=args.fields,
+        arrival_rate=args.arrival_rate,
+        step_workers=args.step_workers,
+        autoscale_interval=args.autoscale_interval,
+        poll_interval=args.poll_interval,
+        retry_delay=args.retry_delay,
+        timeout=args.timeout,
+        content_understanding=ServiceProfile(
+            args.cu_latency, args.cu_throttle, args.retry_after
+        ),
+        openai=ServiceProfile(
+            args.openai_latency, args.openai_throttle, args.retry_after
+        ),
+    )
+    result = run_load(scenario)
+    print(format_report(result))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(asdict(result), baseline_file, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    regressions = check_regressions(
+        result, baseline, args.tolerance, args.max_failure_rate
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Import-time profile of the ContentProcessor host and worker processes.
+
+Starts a fresh interpreter per target with ``python -X importtime`` and
+reports the total import time, the resident set size after importing and
+the modules with the highest cumulative import cost. Targets are the host
+(``main``) and the handler module of each pipeline step, which is what a
+worker process imports before it starts consuming its queue.
+
+Run from ``src/ContentProcessor``::
+
+    python tests/benchmarks/startup_benchmark.py
+    python tests/benchmarks/startup_benchmark.py --target host map --top 15
+    python tests/benchmarks/startup_benchmark.py --save-baseline startup.json
+    python tests/benchmarks/startup_benchmark.py --baseline startup.json
+
+The process exits with status 1 when any target regresses past the
+tolerance relative to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+# Import statement executed for each target.
+TARGETS: dict[str, str] = {
+    "host": "import main",
+    "extract": "import libs.pipeline.handlers.extract_handler",
+    "map": "import libs.pipeline.handlers.map_handler",
+    "evaluate": "import libs.pipeline.handlers.evaluate_handler",
+    "save": "import libs.pipeline.handlers.save_handler",
+}
+
+# Heavy third-party packages and the targets that are expected to load them.
+HEAVY_MODULES: dict[str, set[str]] = {
+    "pandas": set(),
+    "agent_framework": {"map"},
+    "pdf2image": {"map"},
+    "tiktoken": {"evaluate"},
+    "numpy": {"evaluate"},
+    "azure.monitor.opentelemetry": set(),
+}
+
+DEFAULT_TOLERANCE = 1.25
+
+_PROBE = """
+import json, resource, sys
+{statement}
+print(json.dumps({{
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+
+@dataclass
+class ImportProfile:
+    """Import cost of one target in a fresh interpreter.
+
+    Attributes:
+        target: Target name (key of ``TARGETS``).
+        total_seconds: Cumulative time of all top-level imports.
+        rss_kib: Peak resident set size after importing.
+        heavy_modules: Heavy packages from ``HEAVY_MODULES`` that were loaded.
+        top_modules: ``(module, cumulative seconds)`` of the costliest imports.
+    """
+
+    target: str
+    total_seconds: float
+    rss_kib: int
+    heavy_modules: list[str] = field(default_factory=list)
+    top_modules: list[tuple[str, float]] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into ``(module, depth, cumulative_us)`` rows."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, raw_name = line.split("|", 2)
+        # The name column starts with one space, plus two per nesting level.
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        rows.append((raw_name.strip(), depth, int(cumulative_us)))
+    return rows
+
+
+def profile_target(target: str, top: int = 10) -> ImportProfile:
+    """Import *target* in a fresh interpreter and summarize its import cost."""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _PROBE.format(statement=TARGETS[target]),
+        ],
+        cwd=SRC_DIR,
+        env={**os.environ, "PYTHONPATH": SRC_DIR},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(completed.stderr)
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    loaded = set(probe["modules"])
+
+    return ImportProfile(
+        target=target,
+        total_seconds=sum(us for _, depth, us in rows if depth == 0) / 1e6,
+        rss_kib=probe["rss_kib"],
+        heavy_modules=sorted(name for name in HEAVY_MODULES if name in loaded),
+        top_modules=[
+            (name, us / 1e6)
+            for name, _, us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+        ],
+    )
+
+
+def unexpected_heavy_modules(profile: ImportProfile) -> list[str]:
+    """Return the heavy packages *profile* loaded although its target does not use them."""
+    return [
+        name
+        for name in profile.heavy_modules
+        if profile.target not in HEAVY_MODULES[name]
+    ]
+
+
+def check_regressions(
+    profiles: list[ImportProfile], baseline: dict, tolerance: float
+) -> list[str]:
+    """Return a message for every target slower than ``baseline * tolerance``.
+
+    Unexpected heavy imports are always reported; targets missing from the
+    baseline are otherwise ignored.
+    """
+    regressions = []
+    for profile in profiles:
+        for name in unexpected_heavy_modules(profile):
+            regressions.append(f"{profile.target}: imports {name}")
+        reference = baseline.get(profile.target)
+        if reference is None:
+            continue
+        limit = reference["total_seconds"] * tolerance
+        if profile.total_seconds > limit:
+            regressions.append(
+                f"{profile.target}: imports take {profile.total_seconds:.3f}s, "
+                f"exceeds {limit:.3f}s (baseline {reference['total_seconds']:.3f}s "
+                f"x {tolerance})"
+            )
+    return regressions
+
+
+def format_report(profiles: list[ImportProfile]) -> str:
+    """Render profiles as a summary table followed by the costliest imports."""
+    header = f"{'target':<10} {'imports (s)':>12} {'rss (MiB)':>10}  heavy modules"
+    rows = [header, "-" * len(header)]
+    for profile in profiles:
+        rows.append(
+            f"{profile.target:<10} {profile.total_seconds:>12.3f} "
+            f"{profile.rss_kib / 1024:>10.1f}  {', '.join(profile.heavy_modules) or '-'}"
+        )
+    for profile in profiles:
+        rows.append("")
+        rows.append(f"[{profile.target}] costliest imports (cumulative)")
+        for name, seconds in profile.top_modules:
+            rows.append(f"  {seconds:>8.3f}s  {name}")
+    return "\n".join(rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--target",
+        nargs="+",
+        choices=list(TARGETS),
+        default=list(TARGETS),
+        help="Targets to profile (default: all).",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Costliest imports to list per target."
+    )
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown factor relative to the baseline.",
+    )
+    parser.add_argument("--save-baseline", help="Write results as a new baseline.")
+    args = parser.parse_args(argv)
+
+    profiles = [profile_target(target, top=args.top) for target in args.target]
+    print(format_report(profiles))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {profile.target: asdict(profile) for profile in profiles},
+                baseline_file,
+                indent=2,
+            )
+        print(f"Baseline written to {args.save_baseline}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    regressions = check_regressions(profiles, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
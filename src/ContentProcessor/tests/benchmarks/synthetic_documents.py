@@ -0,0 +1,225 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Synthetic inputs for the evaluate-step benchmarks.
+
+Generates Content Understanding layouts (N pages x M lines x K words),
+schema-shaped extraction dicts whose leaf values are drawn from those
+layouts, and OpenAI ``choice`` payloads with per-token logprobs so every
+evaluate function can be driven without Azure resources.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+from dataclasses import dataclass
+
+from libs.azure_helper.model.content_understanding import AnalyzedResult
+
+_VOCABULARY = (
+    "invoice claim policy total amount due date vehicle damage bumper "
+    "insured address city state zip phone account number payment tax "
+    "subtotal item quantity price description repair estimate parts "
+    "labor hours rate deductible coverage limit premium agent office"
+).split()
+
+_TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+_PAGE_WIDTH = 8.5
+_PAGE_HEIGHT = 11.0
+
+
+@dataclass(frozen=True)
+class DocumentShape:
+    """Dimensions of a synthetic document and its extraction payload.
+
+    Attributes:
+        pages: Number of pages in the layout.
+        lines_per_page: Lines emitted on every page.
+        words_per_line: Words emitted on every line.
+        fields: Top-level fields in the extraction dict.
+        depth: Nesting depth of object-valued fields.
+        list_size: Items in every list-valued field.
+        seed: Random seed so runs are reproducible.
+    """
+
+    pages: int
+    lines_per_page: int
+    words_per_line: int
+    fields: int = 10
+    depth: int = 2
+    list_size: int = 5
+    seed: int = 42
+
+
+def _source(page_number: int, x: float, y: float, w: float, h: float) -> str:
+    """Return a ``D(page,x1,y1,...)`` source string for an axis-aligned box."""
+    coordinates = [x, y, x + w, y, x + w, y + h, x, y + h]
+    return f"D({page_number}," + ",".join(f"{c:.4f}" for c in coordinates) + ")"
+
+
+def build_analyzed_result_dict(shape: DocumentShape) -> dict:
+    """Build a JSON-shaped Content Understanding result for *shape*.
+
+    Word and line spans index into the generated markdown, exactly as the
+    service reports them, so span containment in the evaluator behaves as
+    it does for real documents.
+    """
+    rng = random.Random(shape.seed)
+    markdown_parts: list[str] = []
+    offset = 0
+    pages = []
+
+    line_height = _PAGE_HEIGHT / (shape.lines_per_page + 1)
+    for page_index in range(shape.pages):
+        page_number = page_index + 1
+        page_offset = offset
+        words = []
+        lines = []
+        for line_index in range(shape.lines_per_page):
+            y = line_height * (line_index + 0.5)
+            x = 0.5
+            line_offset = offset
+            line_words = []
+            for _ in range(shape.words_per_line):
+                content = rng.choice(_VOCABULARY)
+                if rng.random() < 0.3:
+                    content = f"{content}{rng.randint(0, 9999)}"
+                width = 0.08 * len(content)
+                words.append(
+                    {
+                        "content": content,
+                        "span": {"offset": offset, "length": len(content)},
+                        "confidence": round(rng.uniform(0.6, 1.0), 3),
+                        "source": _source(page_number, x, y, width, line_height * 0.8),
+                    }
+                )
+                line_words.append(content)
+                offset += len(content) + 1
+                x += width + 0.08
+            line_content = " ".join(line_words)
+            markdown_parts.append(line_content)
+            lines.append(
+                {
+                    "content": line_content,
+                    "span": {"offset": line_offset, "length": len(line_content)},
+                    "source": _source(page_number, 0.5, y, x - 0.5, line_height * 0.8),
+                }
+            )
+        pages.append(
+            {
+                "pageNumber": page_number,
+                "angle": 0.0,
+                "width": _PAGE_WIDTH,
+                "height": _PAGE_HEIGHT,
+                "spans": [{"offset": page_offset, "length": offset - page_offset}],
+                "words": words,
+                "lines": lines,
+            }
+        )
+
+    return {
+        "id": f"benchmark-{shape.seed}",
+        "status": "Succeeded",
+        "result": {
+            "analyzerId": "prebuilt-layout",
+            "apiVersion": "2025-11-01",
+            "createdAt": "2026-01-01T00:00:00Z",
+            "warnings": [],
+            "contents": [
+                {
+                    "markdown": "\n".join(markdown_parts),
+                    "kind": "document",
+                    "startPageNumber": 1,
+                    "endPageNumber": shape.pages,
+                    "unit": "inch",
+                    "pages": pages,
+                }
+            ],
+        },
+    }
+
+
+def build_analyzed_result(shape: DocumentShape) -> AnalyzedResult:
+    """Build and validate an ``AnalyzedResult`` for *shape*."""
+    return AnalyzedResult(**build_analyzed_result_dict(shape))
+
+
+def _line_contents(analyzed_result: dict) -> list[str]:
+    return [
+        line["content"]
+        for page in analyzed_result["result"]["contents"][0]["pages"]
+        for line in page["lines"]
+    ]
+
+
+def build_extraction(shape: DocumentShape, analyzed_result: dict) -> dict:
+    """Build a schema-shaped extraction dict whose values come from the layout.
+
+    Roughly half the leaves are whole lines (exact matches), a third are
+    word runs inside a line (``value_contains`` matches) and the rest are
+    numbers that never appear in the document, so every evaluator branch
+    is exercised.
+    """
+    rng = random.Random(shape.seed + 1)
+    line_contents = _line_contents(analyzed_result)
+
+    def leaf():
+        roll = rng.random()
+        if roll < 0.5:
+            return rng.choice(line_contents)
+        if roll < 0.85:
+            words = rng.choice(line_contents).split(" ")
+            start = rng.randrange(len(words))
+            return " ".join(words[start : start + rng.randint(1, 3)])
+        return rng.randint(100000, 999999)
+
+    def node(level: int, index: int):
+        kind = index % 3
+        if level >= shape.depth or kind == 0:
+            return leaf()
+        if kind == 1:
+            return {
+                f"field_{level}_{child}": node(level + 1, child)
+                for child in range(max(2, shape.fields // 3))
+            }
+        return [
+            {f"item_{level}_{child}": leaf() for child in range(3)}
+            for _ in range(shape.list_size)
+        ]
+
+    return {f"field_{index}": node(0, index) for index in range(shape.fields)}
+
+
+def build_map_choice(extraction: dict) -> dict:
+    """Build an OpenAI ``choice`` whose content is *extraction* with logprobs.
+
+    The content is split into word, whitespace and punctuation tokens.  The
+    evaluator only needs the tokens to concatenate back to the content, so
+    this avoids loading a model encoding while keeping a realistic token
+    count.
+    """
+    rng = random.Random(len(extraction))
+    content = json.dumps(extraction)
+    tokens = _TOKEN_PATTERN.findall(content)
+    return {
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": content, "parsed": extraction},
+        "logprobs": {
+            "content": [
+                {"token": token, "logprob": -rng.expovariate(20.0)} for token in tokens
+            ]
+        },
+    }
+
+
+def count_leaves(value) -> int:
+    """Return the number of scalar leaves in a nested extraction value."""
+    if isinstance(value, dict):
+        return sum(count_leaves(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(count_leaves(v) for v in value)
+    return 1
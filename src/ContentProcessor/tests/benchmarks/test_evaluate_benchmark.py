@@ -0,0 +1,121 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for tests/benchmarks (synthetic inputs and regression checks)."""
+
+from __future__ import annotations
+
+from evaluate_benchmark import (
+    BenchmarkResult,
+    _measure,
+    check_regressions,
+    format_report,
+    run_scenario,
+)
+from synthetic_documents import (
+    DocumentShape,
+    build_analyzed_result,
+    build_analyzed_result_dict,
+    build_extraction,
+    build_map_choice,
+    count_leaves,
+)
+
+_TINY = DocumentShape(pages=2, lines_per_page=5, words_per_line=4, fields=6)
+
+
+def _result(median: float, benchmark: str = "merge_confidence_values"):
+    return BenchmarkResult(
+        scenario="small",
+        benchmark=benchmark,
+        repeat=1,
+        min_seconds=median,
+        median_seconds=median,
+        peak_memory_bytes=0,
+    )
+
+
+# ── TestSyntheticDocuments ──────────────────────────────────────────────
+
+
+class TestSyntheticDocuments:
+    """Generated layouts and payloads are internally consistent."""
+
+    def test_dimensions(self):
+        document = build_analyzed_result(_TINY).result.contents[0]
+        assert len(document.pages) == 2
+        assert all(len(page.lines) == 5 for page in document.pages)
+        assert all(len(page.words) == 20 for page in document.pages)
+
+    def test_spans_index_markdown(self):
+        document = build_analyzed_result(_TINY).result.contents[0]
+        for page in document.pages:
+            for line in page.lines:
+                start = line.span.offset
+                assert document.markdown[start : start + line.span.length] == (
+                    line.content
+                )
+            for word in page.words:
+                start = word.span.offset
+                assert document.markdown[start : start + word.span.length] == (
+                    word.content
+                )
+
+    def test_polygons_parsed_from_source(self):
+        page = build_analyzed_result(_TINY).result.contents[0].pages[0]
+        assert len(page.lines[0].polygon) == 8
+        assert len(page.words[0].polygon) == 8
+
+    def test_deterministic(self):
+        assert build_analyzed_result_dict(_TINY) == build_analyzed_result_dict(_TINY)
+
+    def test_extraction_shape(self):
+        extraction = build_extraction(_TINY, build_analyzed_result_dict(_TINY))
+        assert len(extraction) == 6
+        assert any(isinstance(v, dict) for v in extraction.values())
+        assert any(isinstance(v, list) for v in extraction.values())
+        assert count_leaves(extraction) > 6
+
+    def test_choice_tokens_rebuild_content(self):
+        extraction = build_extraction(_TINY, build_analyzed_result_dict(_TINY))
+        choice = build_map_choice(extraction)
+        tokens = [t["token"] for t in choice["logprobs"]["content"]]
+        assert "".join(tokens) == choice["message"]["content"]
+        assert all(t["logprob"] <= 0 for t in choice["logprobs"]["content"])
+
+
+# ── TestBenchmarkRunner ─────────────────────────────────────────────────
+
+
+class TestBenchmarkRunner:
+    """Measurement, reporting and regression detection."""
+
+    def test_measure_records_time_and_memory(self):
+        result = _measure("small", "alloc", lambda: [0] * 10000, repeat=2)
+        assert result.repeat == 2
+        assert result.min_seconds <= result.median_seconds
+        assert result.peak_memory_bytes > 0
+
+    def test_run_scenario_subset(self):
+        results = run_scenario(
+            "tiny", _TINY, repeat=1, only=["content_understanding_confidence"]
+        )
+        assert [r.key for r in results] == ["tiny/content_understanding_confidence"]
+
+    def test_format_report_lists_every_result(self):
+        report = format_report([_result(0.5), _result(0.1, "other")])
+        assert "small/merge_confidence_values" in report
+        assert "small/other" in report
+
+    def test_regression_detected(self):
+        baseline = {"small/merge_confidence_values": {"median_seconds": 0.1}}
+        regressions = check_regressions([_result(0.2)], baseline, tolerance=1.25)
+        assert len(regressions) == 1
+        assert "small/merge_confidence_values" in regressions[0]
+
+    def test_within_tolerance(self):
+        baseline = {"small/merge_confidence_values": {"median_seconds": 0.1}}
+        assert check_regressions([_result(0.12)], baseline, tolerance=1.25) == []
+
+    def test_missing_baseline_entry_ignored(self):
+        assert check_regressions([_result(10.0)], {}, tolerance=1.0) == []
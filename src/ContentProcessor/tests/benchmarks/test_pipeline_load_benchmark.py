@@ -0,0 +1,172 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for the pipeline load benchmark (stand-ins, statistics and regression checks)."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+from azure_stand_ins import LatencyModel, StandInState
+from pipeline_load_benchmark import (
+    LoadResult,
+    check_regressions,
+    elapsed_seconds,
+    format_report,
+    is_pdf,
+    json_schema_for,
+    percentiles,
+)
+
+
+def _result(docs_per_minute: float = 100.0, map_p95: float = 2.0, failed: int = 0):
+    latency = {
+        stage: {"p50": 1.0, "p95": 1.0, "p99": 1.0}
+        for stage in ("extract", "evaluate", "save", "queued", "end_to_end")
+    }
+    latency["map"] = {"p50": 1.0, "p95": map_p95, "p99": map_p95}
+    return LoadResult(
+        documents=100,
+        completed=100 - failed,
+        failed=failed,
+        dead_lettered=failed,
+        wall_seconds=60.0,
+        docs_per_minute=docs_per_minute,
+        latency=latency,
+        worker_cpu_seconds=50.0,
+        host_cpu_seconds=1.0,
+        cpu_seconds_per_document=0.5,
+        peak_rss_mb={"map": 120.0},
+        service_calls={"openai.requests": 100},
+    )
+
+
+_BASELINE = {
+    "docs_per_minute": 100.0,
+    "latency": {"map": {"p50": 1.0, "p95": 2.0, "p99": 2.0}},
+    "cpu_seconds_per_document": 0.5,
+}
+
+
+# ── TestLatencyModel ────────────────────────────────────────────────────
+
+
+class TestLatencyModel:
+    """Latency specs of the service stubs."""
+
+    def test_parse(self):
+        assert LatencyModel.parse("0.8") == LatencyModel("fixed", 0.8, 0.8)
+        assert LatencyModel.parse("uniform:1:2") == LatencyModel("uniform", 1.0, 2.0)
+        assert LatencyModel.parse("lognormal:3:8").kind == "lognormal"
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            LatencyModel.parse("gamma:1:2")
+        with pytest.raises(ValueError):
+            LatencyModel.parse("uniform:2:1")
+
+    def test_lognormal_percentiles(self):
+        model = LatencyModel.parse("lognormal:2:6")
+        rng = random.Random(1)
+        samples = sorted(model.sample(rng) for _ in range(20000))
+        assert samples[len(samples) // 2] == pytest.approx(2.0, rel=0.1)
+        assert samples[int(len(samples) * 0.95)] == pytest.approx(6.0, rel=0.1)
+
+
+# ── TestStandInState ────────────────────────────────────────────────────
+
+
+class TestStandInState:
+    """Azure Storage queue and blob semantics of the shared state."""
+
+    def test_received_message_is_invisible_until_deleted(self):
+        state = StandInState()
+        state.send_message("q", "a")
+        state.send_message("q", "b")
+
+        first = state.receive_messages("q", 1, visibility_timeout=60)
+        assert [m["content"] for m in first] == ["a"]
+        assert first[0]["dequeue_count"] == 1
+        assert [m["content"] for m in state.peek_messages("q", 5)] == ["b"]
+        assert state.queue_length("q") == 2
+
+        assert not state.delete_message("q", first[0]["id"], "stale")
+        assert state.delete_message("q", first[0]["id"], first[0]["pop_receipt"])
+        assert state.queue_length("q") == 1
+        assert state.queue_length("missing") is None
+
+    def test_update_message_reschedules_visibility(self):
+        state = StandInState()
+        state.send_message("q", "a")
+        received = state.receive_messages("q", 1, visibility_timeout=60)[0]
+
+        updated = state.update_message(
+            "q", received["id"], received["pop_receipt"], visibility_timeout=0
+        )
+        assert updated["pop_receipt"] != received["pop_receipt"]
+        again = state.receive_messages("q", 1, visibility_timeout=60)
+        assert again[0]["dequeue_count"] == 2
+
+    def test_blob_round_trip(self):
+        state = StandInState()
+        state.upload_blob("c/p/a.json", b"{}", "gzip")
+        assert state.download_blob("c/p/a.json") == (b"{}", "gzip")
+        assert state.delete_blob("c/p/a.json")
+        assert state.download_blob("c/p/a.json") is None
+
+
+# ── TestStatistics ──────────────────────────────────────────────────────
+
+
+class TestStatistics:
+    """Helpers that turn persisted statuses into load results."""
+
+    def test_elapsed_seconds(self):
+        assert elapsed_seconds("01:02:03.500") == pytest.approx(3723.5)
+        assert elapsed_seconds(None) == 0.0
+
+    def test_percentiles(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentiles(values) == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+        assert percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def test_pdf_spread(self):
+        assert sum(is_pdf(i, 0.25) for i in range(100)) == 25
+        assert not any(is_pdf(i, 0.0) for i in range(10))
+
+    def test_json_schema_for(self):
+        schema = json_schema_for({"a": "1", "b": [{"c": "2"}]}, title="T")
+        assert schema["title"] == "T"
+        assert schema["required"] == ["a", "b"]
+        assert schema["properties"]["b"]["items"]["properties"]["c"] == {
+            "type": "string"
+        }
+
+
+# ── TestCheckRegressions ────────────────────────────────────────────────
+
+
+class TestCheckRegressions:
+    """Regression gate against a baseline."""
+
+    def test_within_tolerance(self):
+        assert check_regressions(_result(90.0, 2.4), _BASELINE, 1.25) == []
+
+    def test_throughput_and_latency(self):
+        regressions = check_regressions(_result(70.0, 3.0), _BASELINE, 1.25)
+        assert len(regressions) == 2
+        assert "throughput" in regressions[0]
+        assert regressions[1].startswith("map:")
+
+    def test_failures_without_baseline(self):
+        assert (
+            check_regressions(_result(failed=2), {}, 1.25, max_failure_rate=0.05) == []
+        )
+        regressions = check_regressions(_result(failed=2), {}, 1.25)
+        assert regressions == ["2 of 100 documents failed (allowed 0.0%)"]
+
+    def test_format_report(self):
+        report = format_report(_result())
+        assert "throughput 100.0 docs/min" in report
+        assert "map=120 MiB" in report
@@ -0,0 +1,83 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for tests/benchmarks/startup_benchmark (import-time profile)."""
+
+from __future__ import annotations
+
+from startup_benchmark import (
+    ImportProfile,
+    check_regressions,
+    format_report,
+    parse_importtime,
+    profile_target,
+    unexpected_heavy_modules,
+)
+
+_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |       1500 |     json.decoder
+import time:       200 |       2000 |   json
+import time:       900 |       5000 | main
+import time:        50 |         50 | site
+"""
+
+
+def _profile(target: str, total: float, heavy: list[str] | None = None):
+    return ImportProfile(
+        target=target, total_seconds=total, rss_kib=1024, heavy_modules=heavy or []
+    )
+
+
+# ── TestParseImporttime ─────────────────────────────────────────────────
+
+
+class TestParseImporttime:
+    """Parsing of ``-X importtime`` output."""
+
+    def test_rows_and_depth(self):
+        rows = parse_importtime(_IMPORTTIME)
+        assert rows[0] == ("_io", 1, 120)
+        assert rows[1] == ("json.decoder", 2, 1500)
+        assert ("main", 0, 5000) in rows
+        assert sum(us for _, depth, us in rows if depth == 0) == 5050
+
+
+# ── TestCheckRegressions ────────────────────────────────────────────────
+
+
+class TestCheckRegressions:
+    """Baseline comparison and heavy-module guard."""
+
+    def test_within_tolerance(self):
+        baseline = {"host": {"total_seconds": 1.0}}
+        assert check_regressions([_profile("host", 1.2)], baseline, 1.25) == []
+
+    def test_slower_than_baseline(self):
+        baseline = {"host": {"total_seconds": 1.0}}
+        regressions = check_regressions([_profile("host", 1.5)], baseline, 1.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("host:")
+
+    def test_unexpected_heavy_module(self):
+        assert unexpected_heavy_modules(_profile("map", 1.0, ["pdf2image"])) == []
+        assert unexpected_heavy_modules(_profile("save", 1.0, ["pandas"])) == ["pandas"]
+        assert check_regressions([_profile("host", 1.0, ["tiktoken"])], {}, 1.25) == [
+            "host: imports tiktoken"
+        ]
+
+    def test_format_report(self):
+        report = format_report([_profile("host", 0.5)])
+        assert "host" in report and "0.500" in report
+
+
+# ── TestStartupImports ──────────────────────────────────────────────────
+
+
+class TestStartupImports:
+    """The host process stays free of step-specific dependencies."""
+
+    def test_host_imports_no_heavy_modules(self):
+        profile = profile_target("host", top=0)
+        assert profile.heavy_modules == []
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from libs.application.application_configuration import AppConfiguration
 
 # ── TestAppConfiguration ────────────────────────────────────────────────
@@ -24,3 +26,122 @@ class TestAppConfiguration:
     def test_split_processes_passthrough_list(self):
         result = AppConfiguration.split_processes(["a", "b"])
         assert result == ["a", "b"]
+
+
+# ── TestBlobCompression ─────────────────────────────────────────────────
+
+
+class TestBlobCompression:
+    """Per-artifact Content-Encoding configuration."""
+
+    def test_content_encoding_for(self):
+        config = AppConfiguration.model_construct(
+            app_blob_compression="extracted_content=gzip"
+        )
+        assert config.content_encoding_for("extracted_content") == "gzip"
+        assert config.content_encoding_for("schema_mapped_data") is None
+
+    def test_disabled_by_default(self):
+        config = AppConfiguration.model_construct(app_blob_compression="")
+        assert config.content_encoding_for("extracted_content") is None
+
+    def test_rejects_unsupported_encoding(self):
+        with pytest.raises(ValueError, match="Unsupported content encoding"):
+            AppConfiguration.validate_blob_compression("br")
+
+
+# ── TestWorkerPools ─────────────────────────────────────────────────────
+
+
+class TestWorkerPools:
+    """Per-step worker pool and autoscaler configuration."""
+
+    def test_worker_pool_for(self):
+        config = AppConfiguration.model_construct(app_step_workers="map=1:8:2")
+        assert config.worker_pool_for("map").max_workers == 8
+        assert config.worker_pool_for("save").max_workers == 1
+
+    def test_autoscale_settings(self):
+        config = AppConfiguration.model_construct(
+            app_autoscale_interval=5.0,
+            app_autoscale_messages_per_worker=3,
+            app_autoscale_max_cpu_percent=70.0,
+            app_autoscale_min_free_memory_mb=256,
+            app_worker_restart_backoff=2.0,
+            app_worker_restart_backoff_max=30.0,
+            app_message_queue_process_timeout=120,
+        )
+        settings = config.autoscale_settings()
+        assert settings.interval_seconds == 5.0
+        assert settings.stop_timeout_seconds == 120
+
+    def test_recycle_settings(self):
+        config = AppConfiguration.model_construct(
+            app_worker_max_messages=50, app_worker_max_rss_mb=1536
+        )
+        settings = config.recycle_settings()
+        assert settings.max_messages == 50
+        assert settings.max_rss_mb == 1536
+
+    def test_recycling_disabled_by_default(self):
+        settings = AppConfiguration.model_construct().recycle_settings()
+        assert settings.max_messages == 0 and settings.max_rss_mb == 0
+
+    def test_rejects_invalid_pool(self):
+        with pytest.raises(ValueError, match="min <= target <= max"):
+            AppConfiguration.validate_step_workers("map=4:2")
+
+
+# ── TestProfiling ───────────────────────────────────────────────────────
+
+
+class TestProfiling:
+    """Per-step and per-schema profiling configuration."""
+
+    def test_profiling_settings(self):
+        config = AppConfiguration.model_construct(
+            app_profile_steps="map, evaluate",
+            app_profile_schema_ids="invoice",
+            app_profile_sample_rate=0.5,
+        )
+        settings = config.profiling_settings()
+        assert settings.steps == ["map", "evaluate"]
+        assert settings.schema_ids == ["invoice"]
+        assert settings.sample_rate == 0.5
+
+    def test_disabled_by_default(self):
+        assert not AppConfiguration.model_construct().profiling_settings().enabled
+
+
+# ── TestStepIdempotency ─────────────────────────────────────────────────
+
+
+class TestStepIdempotency:
+    """Redelivery checkpoints and step leases."""
+
+    def test_defaults(self):
+        config = AppConfiguration.model_construct()
+        assert config.app_step_idempotency is True
+        assert config.app_step_lease_seconds == 0
+
+    def test_rejects_invalid_lease(self):
+        assert AppConfiguration.validate_step_lease_seconds(30) == 30
+        with pytest.raises(ValueError, match="between 15 and 60"):
+            AppConfiguration.validate_step_lease_seconds(90)
+
+
+# ── TestPriorityLanes ───────────────────────────────────────────────────
+
+
+class TestPriorityLanes:
+    """Lane weights and small-document promotion."""
+
+    def test_defaults(self):
+        config = AppConfiguration.model_construct()
+        assert config.app_priority_lane_weights == "high=6,normal=3,low=1"
+        assert config.app_priority_small_document_pages == 2
+
+    def test_rejects_invalid_lane_weights(self):
+        assert AppConfiguration.validate_priority_lane_weights("high=2") == "high=2"
+        with pytest.raises(ValueError, match="Invalid lane weight"):
+            AppConfiguration.validate_priority_lane_weights("urgent=2")
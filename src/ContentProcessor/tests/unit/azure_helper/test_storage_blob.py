@@ -5,10 +5,12 @@
 
 from __future__ import annotations
 
+import gzip
 from io import BytesIO
 from unittest.mock import MagicMock, patch
 
 import pytest
+from azure.core.exceptions import ResourceExistsError
 
 with patch("libs.utils.azure_credential_utils.get_azure_credential") as _mock_cred:
     _mock_cred.return_value = MagicMock()
@@ -80,6 +82,18 @@ class TestStorageBlobHelper:
         storage_blob_helper.upload_text("testcontainer", "testblob", "test text")
         mock.upload_blob.assert_called_once_with("test text", overwrite=True)
 
+    def test_upload_text_with_content_encoding(
+        self, storage_blob_helper, mock_blob_service_client, mocker
+    ):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        storage_blob_helper.upload_text(
+            "testcontainer", "testblob", '{"a": 1}', content_encoding="gzip"
+        )
+        args, kwargs = mock.upload_blob.call_args
+        assert gzip.decompress(args[0]) == b'{"a": 1}'
+        assert kwargs["content_settings"].content_encoding == "gzip"
+        assert kwargs["content_settings"].content_type == "application/json"
+
     def test_download_file(self, storage_blob_helper, mock_blob_service_client, mocker):
         mock = _blob_client(mock_blob_service_client, mocker)
         mock.download_blob.return_value.readall.return_value = b"test data"
@@ -95,12 +109,34 @@ class TestStorageBlobHelper:
         stream = storage_blob_helper.download_stream("testcontainer", "testblob")
         assert stream == b"test data"
 
+    def test_download_stream_decodes_gzip(
+        self, storage_blob_helper, mock_blob_service_client, mocker
+    ):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        downloader = mock.download_blob.return_value
+        downloader.readall.return_value = gzip.compress(b"test data")
+        downloader.properties.content_settings.content_encoding = "gzip"
+        stream = storage_blob_helper.download_stream("testcontainer", "testblob")
+        assert stream == b"test data"
+        mock.download_blob.assert_called_once_with(decompress=False)
+
     def test_download_text(self, storage_blob_helper, mock_blob_service_client, mocker):
         mock = _blob_client(mock_blob_service_client, mocker)
-        mock.download_blob.return_value.content_as_text.return_value = "test text"
+        mock.download_blob.return_value.readall.return_value = b"test text"
         text = storage_blob_helper.download_text("testcontainer", "testblob")
         assert text == "test text"
 
+    def test_download_text_decodes_gzip(
+        self, storage_blob_helper, mock_blob_service_client, mocker
+    ):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        downloader = mock.download_blob.return_value
+        downloader.readall.return_value = gzip.compress("test text é".encode("utf-8"))
+        downloader.properties.content_settings.content_encoding = "gzip"
+        text = storage_blob_helper.download_text("testcontainer", "testblob")
+        assert text == "test text é"
+        mock.download_blob.assert_called_once_with(decompress=False)
+
     def test_delete_blob(self, storage_blob_helper, mock_blob_service_client, mocker):
         mock = _blob_client(mock_blob_service_client, mocker)
         storage_blob_helper.delete_blob("testcontainer", "testblob")
@@ -131,3 +167,27 @@ class TestStorageBlobHelper:
     def test_upload_blob_with_unsupported_type(self, storage_blob_helper):
         with pytest.raises(ValueError, match="Unsupported data type for upload"):
             storage_blob_helper.upload_blob("testcontainer", "testblob", 12345)
+
+    def test_blob_exists(self, storage_blob_helper, mock_blob_service_client, mocker):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        mock.exists.return_value = False
+        assert not storage_blob_helper.blob_exists("proc-1", "gpt_output.json")
+
+    def test_acquire_lease_creates_marker(
+        self, storage_blob_helper, mock_blob_service_client, mocker
+    ):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        mock.upload_blob.side_effect = ResourceExistsError("exists")
+        lease = storage_blob_helper.acquire_lease("proc-1", "map.lease", 30)
+        assert lease is mock.acquire_lease.return_value
+        mock.upload_blob.assert_called_once_with(b"", overwrite=False)
+        mock.acquire_lease.assert_called_once_with(lease_duration=30)
+
+    def test_acquire_lease_held_elsewhere(
+        self, storage_blob_helper, mock_blob_service_client, mocker
+    ):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        error = ResourceExistsError("LeaseAlreadyPresent")
+        error.status_code = 409
+        mock.acquire_lease.side_effect = error
+        assert storage_blob_helper.acquire_lease("proc-1", "map.lease", 30) is None
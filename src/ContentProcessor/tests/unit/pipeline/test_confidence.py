@@ -9,6 +9,7 @@ from libs.pipeline.handlers.logics.evaluate_handler.confidence import (
     find_keys_with_min_confidence,
     get_confidence_values,
     merge_confidence_values,
+    summarize_confidence,
 )
 
 # ── TestGetConfidenceValues ─────────────────────────────────────────────
@@ -126,3 +127,24 @@ class TestMergeConfidenceValues:
         result = merge_confidence_values(a, b)
         assert result["items"][0]["confidence"] == 0.7
         assert result["items"][1]["confidence"] == 0.6
+
+
+# ── TestSummarizeConfidence ─────────────────────────────────────────────
+
+
+class TestSummarizeConfidence:
+    """Summary scores are kept, per-field details are dropped."""
+
+    def test_keeps_summary_keys_only(self):
+        merged = merge_confidence_values(
+            {"f1": {"confidence": 0.9, "value": "x"}},
+            {"f1": {"confidence": 0.8, "value": "x"}},
+        )
+        summary = summarize_confidence(merged)
+        assert "f1" not in summary
+        assert summary["overall_confidence"] == 0.8
+        assert summary["total_evaluated_fields_count"] == 1
+        assert summary["zero_confidence_fields_count"] == 0
+
+    def test_empty(self):
+        assert summarize_confidence({}) == {}
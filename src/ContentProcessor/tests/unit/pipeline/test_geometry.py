@@ -0,0 +1,164 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.pipeline.handlers.logics.evaluate_handler.geometry (polygon helpers)."""
+
+from __future__ import annotations
+
+from libs.azure_helper.model.content_understanding import DocumentContent, Page
+from libs.pipeline.handlers.logics.evaluate_handler.content_understanding_confidence_evaluator import (
+    evaluate_confidence,
+    normalize_polygon,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.geometry import (
+    bounding_box_union,
+    normalize_page_lines,
+    normalize_polygons,
+    to_point_dicts,
+)
+
+
+def _page() -> Page:
+    return Page(
+        pageNumber=1,
+        width=8.5,
+        height=11.0,
+        lines=[
+            {
+                "content": "first",
+                "source": "D(1,1.0,1.0,4.25,1.0,4.25,2.2,1.0,2.2)",
+                "span": {"offset": 0, "length": 5},
+            },
+            {
+                "content": "second",
+                "source": "D(1,0.5,3.3,2.0,3.3)",
+                "span": {"offset": 6, "length": 6},
+            },
+            {
+                "content": "no polygon",
+                "source": "",
+                "span": {"offset": 13, "length": 10},
+            },
+        ],
+    )
+
+
+# ── TestNormalizePolygons ───────────────────────────────────────────────
+
+
+class TestNormalizePolygons:
+    """Batch normalization to page dimensions."""
+
+    def test_scales_and_rounds(self):
+        result = normalize_polygons([[8.5, 11.0, 1.0, 1.0]], 8.5, 11.0)
+        assert result == [[[1.0, 1.0], [0.118, 0.091]]]
+
+    def test_mixed_lengths_keep_order(self):
+        result = normalize_polygons(
+            [[2.0, 2.0, 4.0, 4.0], [1.0, 1.0], [4.0, 4.0, 2.0, 2.0]], 4.0, 4.0
+        )
+        assert result == [
+            [[0.5, 0.5], [1.0, 1.0]],
+            [[0.25, 0.25]],
+            [[1.0, 1.0], [0.5, 0.5]],
+        ]
+
+    def test_missing_and_empty_polygons(self):
+        assert normalize_polygons([None, []], 1.0, 1.0) == [None, []]
+
+    def test_page_lines(self):
+        page = _page()
+        result = normalize_page_lines(page)
+        assert len(result) == 3
+        assert result[0][1] == [0.5, 0.091]
+        assert result[2] == []
+
+    def test_matches_single_polygon_normalization(self):
+        page = _page()
+        for line, points in zip(page.lines, normalize_page_lines(page)):
+            assert to_point_dicts(points) == normalize_polygon(page, line.polygon)
+
+
+# ── TestToPointDicts ────────────────────────────────────────────────────
+
+
+class TestToPointDicts:
+    """Serialized point form."""
+
+    def test_converts_pairs(self):
+        assert to_point_dicts([[0.1, 0.2]]) == [{"x": 0.1, "y": 0.2}]
+
+    def test_none(self):
+        assert to_point_dicts(None) is None
+
+
+# ── TestBoundingBoxUnion ────────────────────────────────────────────────
+
+
+class TestBoundingBoxUnion:
+    """Enclosing box across multiple polygons."""
+
+    def test_union_of_lines(self):
+        result = bounding_box_union([
+            [[0.1, 0.2], [0.4, 0.2], [0.4, 0.3], [0.1, 0.3]],
+            [[0.2, 0.5], [0.6, 0.5], [0.6, 0.6], [0.2, 0.6]],
+        ])
+        assert result == [[0.1, 0.2], [0.6, 0.2], [0.6, 0.6], [0.1, 0.6]]
+
+    def test_skips_empty_polygons(self):
+        result = bounding_box_union([None, [], [[0.3, 0.4]]])
+        assert result == [[0.3, 0.4], [0.3, 0.4], [0.3, 0.4], [0.3, 0.4]]
+
+    def test_no_points(self):
+        assert bounding_box_union([None, []]) is None
+
+
+# ── TestMultiLineMatch ──────────────────────────────────────────────────
+
+
+def _document(*contents: str) -> DocumentContent:
+    """One line per content, each read as a single word."""
+    words, lines = [], []
+    offset = 0
+    for index, content in enumerate(contents):
+        x, y = 2.0 + index, 1.0 + index
+        source = f"D(1,1.0,{y},{x},{y},{x},{y + 0.5},1.0,{y + 0.5})"
+        span = {"offset": offset, "length": len(content)}
+        words.append({
+            "content": content,
+            "span": span,
+            "confidence": 0.9,
+            "source": source,
+        })
+        lines.append({"content": content, "source": source, "span": span})
+        offset += len(content) + 1
+    return DocumentContent(
+        markdown="\n".join(contents),
+        kind="document",
+        startPageNumber=1,
+        endPageNumber=1,
+        unit="inch",
+        pages=[Page(pageNumber=1, width=4.0, height=4.0, words=words, lines=lines)],
+    )
+
+
+class TestMultiLineMatch:
+    """Bounding polygon of values matching several lines."""
+
+    def test_union_of_matching_lines(self):
+        confidence = evaluate_confidence(
+            {"total": "250.00"}, _document("250.00", "Total", "250.00")
+        )
+        assert len(confidence["total"]["matching_lines"]) == 2
+        assert confidence["total"]["bounding_polygon"] == [
+            {"x": 0.25, "y": 0.25},
+            {"x": 1.0, "y": 0.25},
+            {"x": 1.0, "y": 0.875},
+            {"x": 0.25, "y": 0.875},
+        ]
+
+    def test_single_line_has_no_union(self):
+        confidence = evaluate_confidence(
+            {"total": "Total"}, _document("250.00", "Total")
+        )
+        assert confidence["total"]["bounding_polygon"] is None
@@ -0,0 +1,265 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.pipeline.handlers.logics.evaluate_handler.parallel_confidence."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from libs.azure_helper.model.content_understanding import DocumentContent
+from libs.pipeline.handlers.logics.evaluate_handler import (
+    openai_confidence_evaluator,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.content_understanding_confidence_evaluator import (
+    evaluate_confidence as content_understanding_confidence,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.content_understanding_confidence_evaluator import (
+    extract_lines,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (
+    advance_value_offset,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.openai_confidence_evaluator import (
+    evaluate_confidence as gpt_confidence,
+)
+from libs.pipeline.handlers.logics.evaluate_handler.parallel_confidence import (
+    ConfidencePool,
+    count_leaf_values,
+    split_into_chunks,
+)
+
+_LINES = [
+    "Invoice 1001",
+    "Total due 250.00",
+    "Customer Contoso Ltd",
+    "Ship to Redmond WA",
+    "Item widget 3",
+    "Item gadget 7",
+]
+
+
+def _box(page: int, x: float, y: float, w: float, h: float) -> str:
+    coordinates = [x, y, x + w, y, x + w, y + h, x, y + h]
+    return f"D({page}," + ",".join(str(c) for c in coordinates) + ")"
+
+
+def _document() -> DocumentContent:
+    offset = 0
+    words = []
+    lines = []
+    for index, content in enumerate(_LINES):
+        y = 0.5 + index
+        line_offset = offset
+        x = 0.5
+        for word in content.split(" "):
+            words.append({
+                "content": word,
+                "span": {"offset": offset, "length": len(word)},
+                "confidence": 0.5 + index / 20,
+                "source": _box(1, x, y, 0.1 * len(word), 0.4),
+            })
+            offset += len(word) + 1
+            x += 0.1 * len(word) + 0.1
+        lines.append({
+            "content": content,
+            "span": {"offset": line_offset, "length": len(content)},
+            "source": _box(1, 0.5, y, x - 0.5, 0.4),
+        })
+    return DocumentContent(**{
+        "markdown": "\n".join(_LINES),
+        "kind": "document",
+        "startPageNumber": 1,
+        "endPageNumber": 1,
+        "unit": "inch",
+        "pages": [
+            {
+                "pageNumber": 1,
+                "width": 8.5,
+                "height": 11.0,
+                "spans": [{"offset": 0, "length": offset}],
+                "words": words,
+                "lines": lines,
+            }
+        ],
+    })
+
+
+_EXTRACTION = {
+    "invoice": "Invoice 1001",
+    "total": "250.00",
+    "customer": {"name": "Contoso Ltd", "address": "Ship to Redmond WA"},
+    "items": [
+        {"name": "widget", "quantity": 3},
+        {"name": "gadget", "quantity": 7},
+        {"name": "gizmo", "quantity": 9},
+    ],
+    "missing": 123456,
+}
+
+
+def _choice(extraction: dict) -> dict:
+    content = json.dumps(extraction)
+    return {
+        "message": {"content": content, "parsed": extraction},
+        "logprobs": {
+            "content": [
+                {"token": ch, "logprob": -0.01 * (i % 7)}
+                for i, ch in enumerate(content)
+            ]
+        },
+    }
+
+
+class _CharacterEncoding:
+    """Stand-in encoding that maps every character to one token."""
+
+    def encode(self, text, disallowed_special=()):
+        return [ord(ch) for ch in text]
+
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.fixture
+def character_encoding(monkeypatch):
+    monkeypatch.setattr(
+        openai_confidence_evaluator.tiktoken,
+        "encoding_for_model",
+        lambda model: _CharacterEncoding(),
+    )
+
+
+@pytest.fixture
+def pool(character_encoding):
+    # Workers fork on first use, after the encoding is patched.
+    confidence_pool = ConfidencePool(max_workers=2)
+    yield confidence_pool
+    confidence_pool.shutdown()
+
+
+# ── TestSplitIntoChunks ─────────────────────────────────────────────────
+
+
+class TestSplitIntoChunks:
+    """Chunking keeps field order and slices long lists."""
+
+    def test_count_leaf_values(self):
+        assert count_leaf_values(_EXTRACTION) == 11
+
+    def test_preserves_order_and_values(self):
+        chunks = split_into_chunks(_EXTRACTION, 4)
+        rebuilt: dict = {}
+        for chunk in chunks:
+            for field, value, is_list_slice in chunk:
+                if is_list_slice:
+                    rebuilt.setdefault(field, []).extend(value)
+                else:
+                    rebuilt[field] = value
+        assert rebuilt == _EXTRACTION
+        assert list(rebuilt) == list(_EXTRACTION)
+
+    def test_slices_long_list(self):
+        chunks = split_into_chunks(_EXTRACTION, 4)
+        slices = [
+            value
+            for chunk in chunks
+            for field, value, is_list_slice in chunk
+            if field == "items" and is_list_slice
+        ]
+        assert len(slices) > 1
+
+    def test_field_at_most_once_per_chunk(self):
+        for chunk in split_into_chunks(_EXTRACTION, 3):
+            fields = [field for field, _, _ in chunk]
+            assert len(fields) == len(set(fields))
+
+    def test_single_chunk(self):
+        chunks = split_into_chunks(_EXTRACTION, 1)
+        assert len(chunks) == 1
+        assert [field for field, _, _ in chunks[0]] == list(_EXTRACTION)
+
+
+# ── TestAdvanceValueOffset ──────────────────────────────────────────────
+
+
+class TestAdvanceValueOffset:
+    """Offset walk matches the evaluator's in-order search."""
+
+    def test_scalar_found(self):
+        assert advance_value_offset("bc", "abcabc") == 3
+
+    def test_scalar_from_offset(self):
+        assert advance_value_offset("bc", "abcabc", 3) == 6
+
+    def test_missing_value_keeps_offset(self):
+        assert advance_value_offset("zz", "abcabc", 2) == 2
+
+    def test_nested_values(self):
+        text = json.dumps({"a": {"b": "x", "c": ["y", "z"]}})
+        assert advance_value_offset({"b": "x", "c": ["y", "z"]}, text) == (
+            text.index('"z"') + 2
+        )
+
+
+# ── TestParallelEvaluation ──────────────────────────────────────────────
+
+
+class TestParallelEvaluation:
+    """Process-pool evaluation matches the sequential evaluators."""
+
+    def test_shared_line_index_matches(self):
+        document = _document()
+        assert content_understanding_confidence(
+            _EXTRACTION, document, di_lines=extract_lines(document)
+        ) == content_understanding_confidence(_EXTRACTION, document)
+
+    def test_matches_sequential(self, pool):
+        document = _document()
+        choice = _choice(_EXTRACTION)
+
+        cu_result, gpt_result = pool.evaluate(_EXTRACTION, document, choice)
+
+        assert cu_result == content_understanding_confidence(_EXTRACTION, document)
+        assert gpt_result == gpt_confidence(_EXTRACTION, choice)
+        assert list(gpt_result) == list(_EXTRACTION) + ["_overall"]
+
+    def test_without_document(self, pool):
+        choice = _choice(_EXTRACTION)
+
+        cu_result, gpt_result = pool.evaluate(_EXTRACTION, None, choice)
+
+        assert cu_result is None
+        assert gpt_result == gpt_confidence(_EXTRACTION, choice)
+
+    def test_without_logprobs(self, pool):
+        choice = {"message": {"content": json.dumps(_EXTRACTION)}, "logprobs": None}
+
+        _, gpt_result = pool.evaluate(_EXTRACTION, _document(), choice)
+
+        assert gpt_result == {"_overall": 0.0}
+
+    def test_reuses_pool_across_documents(self, pool):
+        document = _document()
+        choice = _choice(_EXTRACTION)
+        other = {"invoice": "Invoice 1001", "items": _EXTRACTION["items"]}
+
+        pool.evaluate(_EXTRACTION, document, choice)
+        executor = pool._executor
+        cu_result, gpt_result = pool.evaluate(other, None, _choice(other))
+
+        assert pool._executor is executor
+        assert cu_result is None
+        assert gpt_result == gpt_confidence(other, _choice(other))
+
+    def test_shutdown_restarts_on_next_document(self, pool):
+        choice = _choice(_EXTRACTION)
+
+        pool.evaluate(_EXTRACTION, None, choice)
+        pool.shutdown()
+
+        assert pool._executor is None
+        _, gpt_result = pool.evaluate(_EXTRACTION, None, choice)
+        assert gpt_result == gpt_confidence(_EXTRACTION, choice)
@@ -15,6 +15,7 @@ from libs.pipeline.entities.pipeline_data import DataPipeline
 from libs.pipeline.pipeline_queue_helper import (
     _create_queue_client,
     create_dead_letter_queue_client_name,
+    create_lane_queue_client_names,
     create_or_get_queue_client,
     create_queue_client_name,
     delete_queue_message,
@@ -23,6 +24,7 @@ from libs.pipeline.pipeline_queue_helper import (
     move_to_dead_letter_queue,
     pass_data_pipeline_to_next_step,
 )
+from libs.pipeline.priority_lanes import Priority
 
 # ── TestQueueNaming ─────────────────────────────────────────────────────
 
@@ -33,6 +35,28 @@ class TestQueueNaming:
     def test_create_queue_client_name(self):
         assert create_queue_client_name("test") == "content-pipeline-test-queue"
 
+    def test_create_queue_client_name_normal_lane_keeps_name(self):
+        assert (
+            create_queue_client_name("test", Priority.Normal)
+            == "content-pipeline-test-queue"
+        )
+
+    def test_create_queue_client_name_priority_lanes(self):
+        assert (
+            create_queue_client_name("test", Priority.High)
+            == "content-pipeline-test-high-queue"
+        )
+        assert (
+            create_queue_client_name("test", "low") == "content-pipeline-test-low-queue"
+        )
+
+    def test_create_lane_queue_client_names(self):
+        assert create_lane_queue_client_names("test") == {
+            Priority.High: "content-pipeline-test-high-queue",
+            Priority.Normal: "content-pipeline-test-queue",
+            Priority.Low: "content-pipeline-test-low-queue",
+        }
+
     def test_create_dead_letter_queue_client_name(self):
         assert (
             create_dead_letter_queue_client_name("test")
@@ -114,6 +138,27 @@ class TestQueueOperations:
         )
         mock_create().send_message.assert_called_once_with('{"key": "value"}')
 
+    def test_pass_data_pipeline_to_next_step_keeps_lane(self, mocker):
+        mocker.patch(
+            "libs.pipeline.pipeline_step_helper.get_next_step_name",
+            return_value="next_step",
+        )
+        mock_create = mocker.patch(
+            "libs.pipeline.pipeline_queue_helper._create_queue_client"
+        )
+        data_pipeline = Mock(spec=DataPipeline)
+        data_pipeline.pipeline_status = Mock()
+        data_pipeline.pipeline_status.active_step = "current_step"
+        data_pipeline.pipeline_status.priority = "high"
+        credential = Mock(spec=DefaultAzureCredential)
+
+        pass_data_pipeline_to_next_step(
+            data_pipeline, "https://example.com", credential
+        )
+        mock_create.assert_called_once_with(
+            "https://example.com", "content-pipeline-next_step-high-queue", credential
+        )
+
     def test_create_queue_client(self, mocker):
         mocker.patch("azure.storage.queue.QueueClient")
         mock_queue_client = Mock(spec=QueueClient)
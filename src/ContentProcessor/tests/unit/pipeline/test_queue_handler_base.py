@@ -12,9 +12,14 @@ import pytest
 from azure.storage.queue import QueueClient
 
 from libs.application.application_context import AppContext
+from libs.pipeline.entities.pipeline_data import DataPipeline
+from libs.pipeline.entities.pipeline_file import ArtifactType, FileDetails
 from libs.pipeline.entities.pipeline_message_context import MessageContext
+from libs.pipeline.entities.pipeline_status import PipelineStatus
 from libs.pipeline.entities.pipeline_step_result import StepResult
+from libs.pipeline.priority_lanes import LaneScheduler, Priority, parse_lane_weights
 from libs.pipeline.queue_handler_base import HandlerBase
+from libs.utils import profiling
 
 
 class _MockHandler(HandlerBase):
@@ -81,3 +86,91 @@ class TestHandlerBase:
         )
         handler.queue_client = mock_queue_client
         handler._show_queue_information()
+
+
+# ── TestSelectLane ──────────────────────────────────────────────────────
+
+
+class TestSelectLane:
+    """Polling the priority lanes of the step."""
+
+    def _handler(self, mocker, depths: dict[Priority, int]):
+        mocker.patch("libs.pipeline.pipeline_queue_helper.invalidate_queue")
+        mocker.patch(
+            "libs.pipeline.pipeline_queue_helper.has_messages",
+            side_effect=lambda queue_client: depths[queue_client.priority] > 0,
+        )
+        handler = _MockHandler(appContext=MagicMock(), step_name="map")
+        lanes = {}
+        for priority in Priority:
+            lanes[priority] = MagicMock(spec=QueueClient)
+            lanes[priority].priority = priority
+            lanes[priority].queue_name = f"map-{priority.value}"
+        handler.lane_queue_clients = lanes
+        handler.lane_scheduler = LaneScheduler(
+            parse_lane_weights("high=6,normal=3,low=1")
+        )
+        return handler
+
+    def test_selects_scheduled_lane(self, mocker):
+        handler = self._handler(
+            mocker, {Priority.High: 1, Priority.Normal: 1, Priority.Low: 1}
+        )
+        assert handler._select_lane()
+        assert handler.queue_client is handler.lane_queue_clients[Priority.High]
+        assert handler.queue_name == "map-high"
+
+    def test_falls_through_empty_lanes(self, mocker):
+        handler = self._handler(
+            mocker, {Priority.High: 0, Priority.Normal: 0, Priority.Low: 2}
+        )
+        assert handler._select_lane()
+        assert handler.queue_client is handler.lane_queue_clients[Priority.Low]
+
+    def test_all_lanes_empty(self, mocker):
+        handler = self._handler(
+            mocker, {Priority.High: 0, Priority.Normal: 0, Priority.Low: 0}
+        )
+        assert not handler._select_lane()
+
+
+# ── TestSaveProfile ─────────────────────────────────────────────────────
+
+
+class TestSaveProfile:
+    """Profiles stored as pipeline artifacts."""
+
+    def _handler(self, mock_app_context):
+        handler = _MockHandler(appContext=mock_app_context, step_name="map")
+        handler.handler_name = "map"
+        handler.application_context = mock_app_context
+        handler._current_message_context = MessageContext.model_construct(
+            data_pipeline=DataPipeline(
+                process_id="proc-1",
+                PipelineStatus=PipelineStatus(process_id="proc-1", active_step="map"),
+            )
+        )
+        with profiling.profiled(True) as profiler:
+            sum(range(100))
+        return handler, profiler
+
+    def test_adds_and_uploads_artifact(self, mocker, mock_app_context):
+        upload = mocker.patch.object(FileDetails, "upload_stream")
+        handler, profiler = self._handler(mock_app_context)
+
+        handler._save_profile(profiler)
+
+        files = handler._current_message_context.data_pipeline.files
+        assert [(f.name, f.artifact_type) for f in files] == [
+            ("map_profile.prof", ArtifactType.Profile)
+        ]
+        assert upload.call_args.kwargs["container_name"] == "TestProcess"
+        assert upload.call_args.kwargs["stream"]
+
+    def test_upload_failure_drops_artifact(self, mocker, mock_app_context):
+        mocker.patch.object(FileDetails, "upload_stream", side_effect=OSError("down"))
+        handler, profiler = self._handler(mock_app_context)
+
+        handler._save_profile(profiler)
+
+        assert handler._current_message_context.data_pipeline.files == []
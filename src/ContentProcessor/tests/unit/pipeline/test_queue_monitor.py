@@ -0,0 +1,121 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.pipeline.queue_monitor (backlog telemetry)."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from azure.storage.queue import QueueClient
+
+from libs.application.application_context import AppContext
+from libs.pipeline.queue_monitor import QueueMonitor, estimate_flow
+from libs.utils import metrics
+
+# ── TestEstimateFlow ────────────────────────────────────────────────────
+
+
+class TestEstimateFlow:
+    """Arrival rate, service rate and drain time estimates."""
+
+    def test_arrival_rate_from_oldest_message(self):
+        arrival, service, drain = estimate_flow(30, 60.0, None, 0)
+        assert arrival == 0.5
+        assert service is None and drain is None
+
+    def test_draining_backlog(self):
+        # 30 waiting over 60s (0.5/s arriving), depth fell by 15 in 15s.
+        arrival, service, drain = estimate_flow(30, 60.0, 45, 15.0)
+        assert service == pytest.approx(1.5)
+        assert drain == pytest.approx(30.0)
+
+    def test_growing_backlog_has_no_drain_time(self):
+        _, service, drain = estimate_flow(60, 60.0, 30, 15.0)
+        assert service == 0.0
+        assert drain is None
+
+    def test_empty_queue_is_drained(self):
+        arrival, service, drain = estimate_flow(0, None, 10, 10.0)
+        assert arrival == 0.0
+        assert service == 1.0
+        assert drain == 0.0
+
+
+# ── TestQueueMonitor ────────────────────────────────────────────────────
+
+
+def _queue(depth: int, oldest_age: float | None = None):
+    queue = MagicMock(spec=QueueClient)
+    queue.get_queue_properties.return_value.approximate_message_count = depth
+    peeked = []
+    if oldest_age is not None:
+        message = MagicMock()
+        message.inserted_on = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+            seconds=oldest_age
+        )
+        peeked = [message]
+    queue.peek_messages.return_value = peeked
+    return queue
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = QueueMonitor(["extract", "map"], MagicMock(spec=AppContext))
+    queues = {
+        "extract": ([_queue(0)], _queue(0)),
+        "map": ([_queue(20, oldest_age=40)], _queue(3)),
+    }
+    monkeypatch.setattr(monitor, "_queue_clients", lambda step: queues[step])
+    monitor.queues = queues
+    return monitor
+
+
+class TestQueueMonitor:
+    """Sampling the step queues and dead-letter queues."""
+
+    def test_sample(self, monitor):
+        latest = asyncio.run(monitor.sample(0.0))
+        assert latest["extract"].depth == 0
+        assert latest["extract"].drain_time == 0.0
+        assert latest["map"].depth == 20
+        assert latest["map"].dead_letter_depth == 3
+        assert latest["map"].oldest_message_age == pytest.approx(40, abs=1)
+        assert latest["map"].arrival_rate == pytest.approx(0.5, rel=0.05)
+        monitor.queues["extract"][0][0].peek_messages.assert_not_called()
+
+    def test_second_sample_estimates_service_rate(self, monitor):
+        asyncio.run(monitor.sample(0.0))
+        monitor.queues["map"][0][
+            0
+        ].get_queue_properties.return_value.approximate_message_count = 10
+        latest = asyncio.run(monitor.sample(10.0))
+        assert latest["map"].service_rate == pytest.approx(1.25, rel=0.05)
+        assert latest["map"].drain_time == pytest.approx(10 / 1.0, rel=0.1)
+
+    def test_publishes_gauges(self, monitor):
+        asyncio.run(monitor.sample(0.0))
+        assert metrics._queue_stats["map"]["dead_letter_depth"] == 3
+        assert metrics._queue_stats["map"]["drain_time"] is None
+
+    def test_unreadable_queue_keeps_previous_sample(self, monitor):
+        asyncio.run(monitor.sample(0.0))
+        monitor.queues["map"][0][0].get_queue_properties.side_effect = RuntimeError(
+            "down"
+        )
+        latest = asyncio.run(monitor.sample(10.0))
+        assert latest["map"].depth == 20
+
+    def test_sums_priority_lanes(self, monitor):
+        monitor.queues["map"] = (
+            [_queue(20, oldest_age=40), _queue(6, oldest_age=3), _queue(0)],
+            _queue(0),
+        )
+        latest = asyncio.run(monitor.sample(0.0))
+        assert latest["map"].depth == 26
+        assert latest["map"].oldest_message_age == pytest.approx(40, abs=1)
+        # 20/40 + 6/3 messages per second arrive across the lanes.
+        assert latest["map"].arrival_rate == pytest.approx(2.5, rel=0.05)
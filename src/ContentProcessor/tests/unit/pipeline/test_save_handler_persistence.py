@@ -0,0 +1,218 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for ``SaveHandler.execute`` persistence modes (embedded vs. slim)."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from libs.application.application_context import AppContext
+from libs.models.content_process import ArtifactReference, ContentProcess
+from libs.pipeline.entities.pipeline_data import DataPipeline
+from libs.pipeline.entities.pipeline_file import ArtifactType, FileDetails
+from libs.pipeline.entities.pipeline_message_context import MessageContext
+from libs.pipeline.entities.pipeline_status import PipelineStatus
+from libs.pipeline.entities.pipeline_step_result import StepResult
+from libs.pipeline.entities.schema import Schema
+from libs.pipeline.handlers.save_handler import SaveHandler
+
+_EXTRACT_OUTPUT = json.dumps({"result": {"contents": [{"markdown": "Invoice 1"}]}})
+_MAP_OUTPUT = json.dumps({
+    "choices": [{"message": {"parsed": {"invoice": "1"}}}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+})
+_EVALUATE_OUTPUT = json.dumps({
+    "extracted_result": {"invoice": "1"},
+    "confidence": {
+        "invoice": {
+            "confidence": 0.9,
+            "matching_lines": [{"content": "Invoice 1"}],
+            "value": "1",
+        },
+        "total_evaluated_fields_count": 1,
+        "overall_confidence": 0.9,
+        "min_extracted_field_confidence": 0.9,
+        "min_extracted_field_confidence_field": ["invoice"],
+        "zero_confidence_fields": [],
+        "zero_confidence_fields_count": 0,
+    },
+    "comparison_result": {
+        "items": [
+            {
+                "Field": "invoice",
+                "Extracted": "1",
+                "Confidence": "90.00%",
+                "IsAboveThreshold": True,
+            }
+        ]
+    },
+    "prompt_tokens": 10,
+    "completion_tokens": 5,
+    "execution_time": 0,
+})
+
+
+def _pipeline() -> DataPipeline:
+    pipeline = DataPipeline(
+        process_id="p-1",
+        pipeline_status=PipelineStatus(
+            process_id="p-1",
+            schema_id="s-1",
+            creation_time="2026-01-01T00:00:00.000000Z",
+            active_step="save",
+            process_results=[
+                StepResult(step_name=step, elapsed="00:00:01.000")
+                for step in ("extract", "map", "evaluate")
+            ],
+        ),
+    )
+    pipeline.files.append(
+        FileDetails(
+            process_id="p-1",
+            name="invoice.pdf",
+            mime_type="application/pdf",
+            artifact_type=ArtifactType.SourceContent,
+            processed_by="upload",
+        )
+    )
+    for step, name, artifact_type in (
+        ("extract", "extract_output.json", ArtifactType.ExtractedContent),
+        ("map", "map_output.json", ArtifactType.SchemaMappedData),
+        ("evaluate", "evaluate_output.json", ArtifactType.ScoreMergedData),
+    ):
+        pipeline.files.append(
+            FileDetails(
+                process_id="p-1",
+                name=name,
+                artifact_type=artifact_type,
+                processed_by=step,
+            )
+        )
+    return pipeline
+
+
+@pytest.fixture
+def run_save(monkeypatch):
+    """Run SaveHandler.execute and capture what is written to Cosmos and blobs."""
+
+    outputs = {
+        "extract": _EXTRACT_OUTPUT,
+        "map": _MAP_OUTPUT,
+        "evaluate": _EVALUATE_OUTPUT,
+    }
+    saved: dict = {"blobs": {}}
+
+    monkeypatch.setattr(
+        SaveHandler,
+        "download_output_file_to_json_string",
+        lambda self, processed_by, artifact_type: outputs[processed_by],
+    )
+    monkeypatch.setattr(
+        Schema,
+        "get_schema",
+        staticmethod(
+            lambda **kwargs: Schema(
+                Id="s-1",
+                ClassName="Invoice",
+                Description="Invoice",
+                FileName="invoice.py",
+                ContentType="application/pdf",
+            )
+        ),
+    )
+
+    def _update_status_to_cosmos(self, **kwargs):
+        saved["cosmos"] = self
+
+    def _upload_json_text(
+        self, account_url, container_name, text, content_encoding=None
+    ):
+        saved["blobs"][self.name] = text
+
+    monkeypatch.setattr(
+        ContentProcess, "update_status_to_cosmos", _update_status_to_cosmos
+    )
+    monkeypatch.setattr(FileDetails, "upload_json_text", _upload_json_text)
+
+    def _run(slim_persistence: bool) -> dict:
+        app_context = MagicMock(spec=AppContext)
+        app_context.configuration = MagicMock()
+        app_context.configuration.app_slim_persistence = slim_persistence
+
+        handler = SaveHandler(appContext=app_context, step_name="save")
+        handler.handler_name = "save"
+        handler.application_context = app_context
+        context = MessageContext.model_construct(
+            data_pipeline=_pipeline(), queue_message=None
+        )
+        handler._current_message_context = context
+
+        asyncio.run(handler.execute(context))
+        return saved
+
+    return _run
+
+
+# ── TestEmbeddedPersistence ─────────────────────────────────────────────
+
+
+class TestEmbeddedPersistence:
+    """Default mode keeps full payloads inline."""
+
+    def test_step_outputs_embed_payloads(self, run_save):
+        saved = run_save(slim_persistence=False)
+        steps = json.loads(saved["blobs"]["step_outputs.json"])
+        assert [step["step_name"] for step in steps] == ["extract", "map", "evaluate"]
+        assert steps[0]["step_result"] == json.loads(_EXTRACT_OUTPUT)
+        assert all(step["step_result_reference"] is None for step in steps)
+
+    def test_cosmos_record_is_complete(self, run_save):
+        record = run_save(slim_persistence=False)["cosmos"]
+        assert "matching_lines" in record.confidence["invoice"]
+        assert record.extracted_comparison_data is not None
+        assert record.evaluation_reference is None
+
+
+# ── TestSlimPersistence ─────────────────────────────────────────────────
+
+
+class TestSlimPersistence:
+    """Slim mode stores references and summaries only."""
+
+    def test_step_outputs_reference_blobs(self, run_save):
+        saved = run_save(slim_persistence=True)
+        steps = json.loads(saved["blobs"]["step_outputs.json"])
+        assert all(step["step_result"] is None for step in steps)
+        assert [step["step_result_reference"]["blob_name"] for step in steps] == [
+            "extract_output.json",
+            "map_output.json",
+            "evaluate_output.json",
+        ]
+        assert steps[2]["step_result_reference"]["size"] == len(
+            _EVALUATE_OUTPUT.encode("utf-8")
+        )
+
+    def test_cosmos_record_keeps_scores_only(self, run_save):
+        record = run_save(slim_persistence=True)["cosmos"]
+        assert record.result == {"invoice": "1"}
+        assert record.entity_score == 0.9
+        assert record.confidence["overall_confidence"] == 0.9
+        assert "invoice" not in record.confidence
+        assert record.extracted_comparison_data is None
+        assert record.evaluation_reference.blob_name == "evaluate_output.json"
+
+
+# ── TestArtifactReference ───────────────────────────────────────────────
+
+
+class TestArtifactReference:
+    def test_from_text(self):
+        reference = ArtifactReference.from_text("a.json", "é")
+        assert reference.size == 2
+        assert reference.sha256 == hashlib.sha256("é".encode("utf-8")).hexdigest()
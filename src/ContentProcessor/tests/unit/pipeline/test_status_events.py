@@ -0,0 +1,64 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.pipeline.status_events (status-change event publishing)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from libs.pipeline import status_events
+
+
+@pytest.fixture(autouse=True)
+def _clear_clients():
+    status_events._queue_clients.clear()
+    yield
+    status_events._queue_clients.clear()
+
+
+def test_status_event_payload():
+    event = json.loads(status_events.status_event("p1", "Completed"))
+
+    assert event["kind"] == "process"
+    assert event["id"] == "p1"
+    assert event["status"] == "Completed"
+    assert event["time"]
+
+
+def test_publish_status_reuses_queue_client():
+    queue_client = Mock()
+    with patch(
+        "libs.pipeline.status_events.pipeline_queue_helper.create_or_get_queue_client",
+        return_value=queue_client,
+    ) as create:
+        status_events.publish_status("https://q", "events", None, "p1", "extract")
+        status_events.publish_status("https://q", "events", None, "p1", "map")
+
+    create.assert_called_once_with("events", "https://q", None)
+    assert queue_client.send_message.call_count == 2
+    kwargs = queue_client.send_message.call_args.kwargs
+    assert json.loads(kwargs["content"])["status"] == "map"
+    assert kwargs["time_to_live"] == status_events.EVENT_TTL_SECONDS
+
+
+def test_publish_status_disabled_without_queue():
+    with patch(
+        "libs.pipeline.status_events.pipeline_queue_helper.create_or_get_queue_client"
+    ) as create:
+        status_events.publish_status("https://q", "", None, "p1", "extract")
+
+    create.assert_not_called()
+
+
+def test_publish_status_swallows_errors():
+    queue_client = Mock()
+    queue_client.send_message.side_effect = RuntimeError("unavailable")
+    with patch(
+        "libs.pipeline.status_events.pipeline_queue_helper.create_or_get_queue_client",
+        return_value=queue_client,
+    ):
+        status_events.publish_status("https://q", "events", None, "p1", "extract")
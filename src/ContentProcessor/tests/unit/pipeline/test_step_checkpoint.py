@@ -0,0 +1,154 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.pipeline.step_checkpoint (idempotent step execution)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+
+from libs.pipeline import step_checkpoint
+from libs.pipeline.entities.pipeline_data import DataPipeline
+from libs.pipeline.entities.pipeline_file import ArtifactType, FileDetails
+from libs.pipeline.entities.pipeline_status import PipelineStatus
+from libs.pipeline.entities.pipeline_step_result import StepResult
+
+_CREATED = "2025-01-01T00:00:00.000000Z"
+_STEPS = ["extract", "map", "evaluate", "save"]
+
+
+def _pipeline(completed: list[str], results: dict | None = None, files=()):
+    status = PipelineStatus(
+        process_id="proc-1",
+        creation_time=_CREATED,
+        active_step=completed[-1] if completed else None,
+        steps=_STEPS,
+        remaining_steps=[s for s in _STEPS if s not in completed],
+        completed_steps=completed,
+        process_results=[
+            StepResult(process_id="proc-1", step_name=name, result=result)
+            for name, result in (results or {}).items()
+        ],
+    )
+    return DataPipeline(process_id="proc-1", PipelineStatus=status, Files=list(files))
+
+
+def _map_file():
+    return FileDetails(
+        process_id="proc-1",
+        name="gpt_output.json",
+        artifact_type=ArtifactType.SchemaMappedData,
+        processed_by="map",
+    )
+
+
+@pytest.fixture
+def blob_helper(mocker):
+    helper = MagicMock()
+    helper.blob_exists.return_value = True
+    mocker.patch.object(step_checkpoint, "StorageBlobHelper", return_value=helper)
+    return helper
+
+
+def _persist(blob_helper, payload):
+    blob_helper.download_stream.return_value = payload.model_dump_json().encode()
+
+
+def _find(message):
+    return step_checkpoint.find_completed_step(
+        message, "map", "https://account", "processes"
+    )
+
+
+# ── TestFindCompletedStep ───────────────────────────────────────────────
+
+
+class TestFindCompletedStep:
+    """Recognising a step's persisted output for a redelivered message."""
+
+    def test_completed_step_is_forwarded(self, blob_helper):
+        persisted = _pipeline(
+            ["extract", "map"], {"map": {"result": "success"}}, [_map_file()]
+        )
+        _persist(blob_helper, persisted)
+
+        checkpoint = _find(_pipeline(["extract"]))
+
+        assert checkpoint.data_pipeline.pipeline_status.completed_steps == [
+            "extract",
+            "map",
+        ]
+        blob_helper.blob_exists.assert_called_once_with("proc-1", "gpt_output.json")
+
+    def test_first_delivery_executes(self, blob_helper):
+        _persist(blob_helper, _pipeline(["extract"], {"extract": {}}))
+        assert _find(_pipeline(["extract"])) is None
+
+    def test_no_status_executes(self, blob_helper):
+        blob_helper.download_stream.side_effect = ResourceNotFoundError("missing")
+        assert _find(_pipeline([])) is None
+
+    def test_later_step_ran(self, blob_helper):
+        persisted = _pipeline(
+            ["extract", "map", "evaluate"],
+            {"map": {"result": "success"}, "evaluate": {"result": "error"}},
+        )
+        # Failed steps persist the bare status.
+        _persist(blob_helper, persisted.pipeline_status)
+
+        checkpoint = _find(_pipeline(["extract"]))
+
+        assert checkpoint is not None and checkpoint.data_pipeline is None
+
+    def test_failed_step_executes(self, blob_helper):
+        persisted = _pipeline(["extract", "map"], {"map": {"result": "error"}})
+        _persist(blob_helper, persisted.pipeline_status)
+        assert _find(_pipeline(["extract"])) is None
+
+    def test_other_attempt_executes(self, blob_helper):
+        persisted = _pipeline(["extract", "map"], {"map": {"result": "success"}})
+        persisted.pipeline_status.creation_time = "2025-02-01T00:00:00.000000Z"
+        _persist(blob_helper, persisted)
+        assert _find(_pipeline(["extract"])) is None
+
+    def test_missing_artifact_executes(self, blob_helper):
+        persisted = _pipeline(
+            ["extract", "map"], {"map": {"result": "success"}}, [_map_file()]
+        )
+        _persist(blob_helper, persisted)
+        blob_helper.blob_exists.return_value = False
+        assert _find(_pipeline(["extract"])) is None
+
+
+# ── TestStepLease ───────────────────────────────────────────────────────
+
+
+class TestStepLease:
+    """Blob lease guarding concurrent execution of a step."""
+
+    def _hold(self, duration: int):
+        async def _run():
+            async with step_checkpoint.step_lease(
+                "https://account", "processes", "proc-1", "map", duration
+            ) as leased:
+                return leased
+
+        return asyncio.run(_run())
+
+    def test_disabled(self, blob_helper):
+        assert self._hold(0) is True
+        blob_helper.acquire_lease.assert_not_called()
+
+    def test_acquired_and_released(self, blob_helper):
+        lease = blob_helper.acquire_lease.return_value
+        assert self._hold(30) is True
+        blob_helper.acquire_lease.assert_called_once_with("proc-1", "map.lease", 30)
+        lease.release.assert_called_once()
+
+    def test_held_by_another_worker(self, blob_helper):
+        blob_helper.acquire_lease.return_value = None
+        assert self._hold(30) is False
@@ -0,0 +1,257 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.process_host.handler_process_host (pool supervision)."""
+
+from __future__ import annotations
+
+import asyncio
+from multiprocessing import Process
+from unittest.mock import MagicMock
+
+import pytest
+from azure.storage.queue import QueueClient
+
+from libs.application.application_context import AppContext
+from libs.pipeline.queue_monitor import QueueMonitor, QueueStats
+from libs.process_host import handler_process_host
+from libs.process_host.handler_process_host import HandlerHostManager
+from libs.process_host.worker_pool import AutoscaleSettings, WorkerPoolSettings
+
+
+def _fake_process(target, name, args, kwargs=None):
+    """Stand-in for multiprocessing.Process that never forks."""
+    process = MagicMock(spec=Process)
+    process.name = name
+    process.args = args
+    process.kwargs = kwargs
+    process.exitcode = None
+    process.is_alive.return_value = False
+
+    def start():
+        process.is_alive.return_value = True
+
+    def terminate():
+        process.is_alive.return_value = False
+        process.exitcode = -15
+
+    process.start.side_effect = start
+    process.terminate.side_effect = terminate
+    return process
+
+
+def _crash(worker):
+    worker.handler.is_alive.return_value = False
+    worker.handler.exitcode = 1
+
+
+def _recycle(worker, messages, peak_rss_mb):
+    worker.stats.record(messages, peak_rss_mb)
+    worker.handler.is_alive.return_value = False
+    worker.handler.exitcode = 0
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(handler_process_host, "Process", _fake_process)
+    monkeypatch.setattr(handler_process_host, "has_resource_headroom", lambda a: True)
+    return HandlerHostManager(
+        autoscale=AutoscaleSettings(
+            interval_seconds=10,
+            messages_per_worker=5,
+            restart_backoff_seconds=2,
+            stable_after_seconds=60,
+            stop_timeout_seconds=30,
+        )
+    )
+
+
+_APP_CONTEXT = MagicMock(spec=AppContext)
+
+
+def _add_pool(manager, settings):
+    manager.add_handlers_as_process(
+        target_function=lambda *args: None,
+        process_name="map",
+        args=(False, _APP_CONTEXT, "map"),
+        settings=settings,
+        queue_clients=[MagicMock(spec=QueueClient), MagicMock(spec=QueueClient)],
+    )
+    return manager.handlers[0]
+
+
+# ── TestStart ───────────────────────────────────────────────────────────
+
+
+class TestStart:
+    """Initial pool sizing."""
+
+    def test_starts_target_workers(self, manager):
+        pool = _add_pool(
+            manager, WorkerPoolSettings(min_workers=1, max_workers=4, target_workers=2)
+        )
+        asyncio.run(manager.start_handler_processes(test_mode=True))
+        assert [w.handler.name for w in pool.workers] == ["map-1", "map-2"]
+        assert pool.workers[0].handler.args[:3] == (False, _APP_CONTEXT, "map")
+        assert pool.workers[0].stop_event is pool.workers[0].handler.args[3]
+        assert pool.workers[0].stats is pool.workers[0].handler.kwargs["stats"]
+
+    def test_fixed_pool_has_no_queue_sampling(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings())
+        assert pool.queue_clients == []
+
+
+# ── TestAutoscale ───────────────────────────────────────────────────────
+
+
+class TestAutoscale:
+    """Pools follow their queue backlog."""
+
+    def test_scale_up_and_retire(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings(min_workers=1, max_workers=4))
+        manager._reconcile(pool, 0)
+
+        manager._scale(pool, backlog=40, now=10)
+        manager._reconcile(pool, 10)
+        assert len(pool.active_workers) == 4
+
+        manager._scale(pool, backlog=40, now=20)
+        manager._scale(pool, backlog=0, now=30)
+        manager._reconcile(pool, 30)
+        assert len(pool.active_workers) == 3
+        retiring = [w for w in pool.workers if w.retiring_since is not None]
+        assert len(retiring) == 1 and retiring[0].stop_event.is_set()
+
+        retiring[0].handler.is_alive.return_value = False
+        manager._reap(pool, 31)
+        assert len(pool.workers) == 3
+        assert pool.consecutive_failures == 0
+
+    def test_no_scale_up_without_headroom(self, manager, monkeypatch):
+        monkeypatch.setattr(
+            handler_process_host, "has_resource_headroom", lambda a: False
+        )
+        pool = _add_pool(manager, WorkerPoolSettings(min_workers=1, max_workers=4))
+        manager._scale(pool, backlog=40, now=10)
+        assert pool.target_workers == 1
+
+    def test_retiring_worker_terminated_after_timeout(self, manager):
+        pool = _add_pool(
+            manager, WorkerPoolSettings(min_workers=1, max_workers=4, target_workers=2)
+        )
+        manager._reconcile(pool, 0)
+        pool.target_workers = 1
+        manager._reconcile(pool, 0)
+        manager._reap(pool, 31)
+        assert pool.workers[1].handler.exitcode == -15
+
+    def test_uses_queue_monitor_sample(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings(min_workers=1, max_workers=4))
+        manager.monitor = MagicMock(spec=QueueMonitor)
+        manager.monitor.latest = {"map": QueueStats(step="map", depth=20)}
+        asyncio.run(manager._sample_backlogs(10))
+        assert pool.target_workers == 4
+        pool.queue_clients[0].get_queue_properties.assert_not_called()
+
+    def test_samples_queue_depth(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings(min_workers=1, max_workers=4))
+        high, normal = pool.queue_clients
+        high.get_queue_properties.return_value.approximate_message_count = 4
+        normal.get_queue_properties.return_value.approximate_message_count = 8
+        asyncio.run(manager._sample_backlogs(10))
+        assert pool.target_workers == 3
+        assert pool.last_backlog == 12
+
+
+# ── TestRestart ─────────────────────────────────────────────────────────
+
+
+class TestRestart:
+    """Crashed workers are restarted with backoff."""
+
+    def test_restart_with_backoff(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings())
+        manager._reconcile(pool, 0)
+
+        _crash(pool.workers[0])
+        manager._reap(pool, 5)
+        manager._reconcile(pool, 5)
+        assert pool.workers == []
+        assert pool.restart_at == 7
+
+        manager._reconcile(pool, 7)
+        assert [w.handler.name for w in pool.workers] == ["map-2"]
+
+        _crash(pool.workers[0])
+        manager._reap(pool, 8)
+        assert pool.restart_at == 12
+
+    def test_stable_worker_resets_backoff(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings())
+        pool.consecutive_failures = 5
+        manager._reconcile(pool, 0)
+        _crash(pool.workers[0])
+        manager._reap(pool, 100)
+        assert pool.consecutive_failures == 1
+        assert pool.restart_at == 102
+
+
+# ── TestRecycle ─────────────────────────────────────────────────────────
+
+
+class TestRecycle:
+    """Workers exiting at their recycling limit are replaced immediately."""
+
+    def test_recycled_worker_replaced_without_backoff(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings())
+        manager._reconcile(pool, 0)
+
+        _recycle(pool.workers[0], messages=50, peak_rss_mb=900.0)
+        manager._reap(pool, 5)
+        manager._reconcile(pool, 5)
+
+        assert [w.handler.name for w in pool.workers] == ["map-2"]
+        assert pool.recycled == 1
+        assert pool.consecutive_failures == 0
+        assert pool.restart_at == 0
+
+    def test_tracks_memory_high_water(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings(min_workers=2, max_workers=2))
+        manager._reconcile(pool, 0)
+        pool.workers[0].stats.record(3, 400.0)
+        pool.workers[1].stats.record(1, 650.0)
+        manager._reap(pool, 1)
+        assert manager.memory_high_water() == {"map": 650.0}
+
+        _recycle(pool.workers[1], messages=2, peak_rss_mb=300.0)
+        manager._reap(pool, 2)
+        assert pool.peak_rss_mb == 650.0
+
+    def test_reports_memory_only_when_grown(self, manager, caplog):
+        pool = _add_pool(manager, WorkerPoolSettings())
+        pool.peak_rss_mb = 512.0
+        with caplog.at_level("INFO"):
+            manager._report_memory()
+            manager._report_memory()
+        assert caplog.text.count("map=512 MiB") == 1
+
+
+# ── TestStop ────────────────────────────────────────────────────────────
+
+
+class TestStop:
+    """Shutdown stops every worker after its current message."""
+
+    def test_stops_and_terminates_stragglers(self, manager):
+        pool = _add_pool(manager, WorkerPoolSettings(min_workers=2, max_workers=2))
+        manager._reconcile(pool, 0)
+        finished, straggler = pool.workers
+        _recycle(finished, messages=4, peak_rss_mb=700.0)
+
+        asyncio.run(manager.stop_handler_processes(timeout=0))
+
+        assert finished.stop_event.is_set() and straggler.stop_event.is_set()
+        finished.handler.terminate.assert_not_called()
+        straggler.handler.terminate.assert_called_once()
+        assert pool.workers == []
+        assert manager.memory_high_water() == {"map": 700.0}
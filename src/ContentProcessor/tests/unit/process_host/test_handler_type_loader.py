@@ -8,7 +8,7 @@ from __future__ import annotations
 import pytest
 
 from libs.pipeline.queue_handler_base import HandlerBase
-from libs.process_host.handler_type_loader import load
+from libs.process_host.handler_type_loader import ensure_exists, load, run
 
 # ── TestLoad ────────────────────────────────────────────────────────────
 
@@ -33,3 +33,41 @@ class TestLoad:
             Exception, match="Error loading processor NonexistentHandler"
         ):
             load("nonexistent")
+
+
+# ── TestEnsureExists ────────────────────────────────────────────────────
+
+
+class TestEnsureExists:
+    """Handler module lookup without importing it."""
+
+    def test_existing_step(self):
+        ensure_exists("save")
+
+    def test_missing_step(self):
+        with pytest.raises(
+            Exception, match="Error loading processor NonexistentHandler"
+        ):
+            ensure_exists("nonexistent")
+
+
+# ── TestRun ─────────────────────────────────────────────────────────────
+
+
+class TestRun:
+    """Worker entry point loads the handler inside the worker process."""
+
+    def test_run_connects_loaded_handler(self, mocker):
+        handler_class = mocker.Mock()
+        mocker.patch(
+            "libs.process_host.handler_type_loader.load", return_value=handler_class
+        )
+        app_context = mocker.Mock()
+        stop_event = mocker.Mock()
+
+        run(False, app_context, "map", stop_event)
+
+        handler_class.assert_called_once_with(appContext=app_context, step_name="map")
+        handler_class.return_value.connect_queue.assert_called_once_with(
+            False, app_context, "map", stop_event, stats=None
+        )
@@ -0,0 +1,69 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.process_host.worker_recycling (recycling limits)."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from libs.process_host.worker_recycling import (
+    RecycleSettings,
+    WorkerStats,
+    current_rss_mb,
+    peak_rss_mb,
+    recycle_reason,
+)
+
+# ── TestRecycleReason ───────────────────────────────────────────────────
+
+
+class TestRecycleReason:
+    """Message and memory limits."""
+
+    def test_disabled_by_default(self):
+        assert recycle_reason(RecycleSettings(), 10_000, 64_000.0) is None
+
+    def test_message_limit(self):
+        settings = RecycleSettings(max_messages=50)
+        assert recycle_reason(settings, 49, 100.0) is None
+        assert "50 messages" in recycle_reason(settings, 50, 100.0)
+
+    def test_memory_limit(self):
+        settings = RecycleSettings(max_rss_mb=1024)
+        assert recycle_reason(settings, 1, 1023.0) is None
+        assert "1024 MiB" in recycle_reason(settings, 1, 1100.0)
+
+    def test_idle_worker_is_kept(self):
+        settings = RecycleSettings(max_rss_mb=1)
+        assert recycle_reason(settings, 0, 500.0) is None
+
+    def test_rejects_negative_limits(self):
+        with pytest.raises(ValidationError):
+            RecycleSettings(max_messages=-1)
+
+
+# ── TestWorkerStats ─────────────────────────────────────────────────────
+
+
+class TestWorkerStats:
+    """Counters shared with the process host."""
+
+    def test_record_keeps_high_water(self):
+        stats = WorkerStats()
+        stats.record(1, 300.0)
+        stats.record(2, 200.0)
+        assert stats.messages == 2
+        assert stats.peak_rss_mb == 300.0
+
+
+# ── TestMemory ──────────────────────────────────────────────────────────
+
+
+class TestMemory:
+    """Resident set size of the current process."""
+
+    def test_current_within_peak(self):
+        current = current_rss_mb()
+        assert 0 < current <= peak_rss_mb() + 1
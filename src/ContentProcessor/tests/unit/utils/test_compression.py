@@ -0,0 +1,81 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.utils.compression (Content-Encoding helpers)."""
+
+from __future__ import annotations
+
+import gzip
+
+import pytest
+
+from libs.utils import compression
+from libs.utils.compression import (
+    compress,
+    decompress,
+    detect_content_encoding,
+    encoding_for,
+    parse_encoding_map,
+)
+
+_PAYLOAD = b'{"result": {"contents": [{"markdown": "Invoice 1"}]}}' * 20
+
+# ── TestCompress ────────────────────────────────────────────────────────
+
+
+class TestCompress:
+    """Round trips and pass-through of unencoded data."""
+
+    def test_gzip_round_trip(self):
+        encoded = compress(_PAYLOAD, "gzip")
+        assert len(encoded) < len(_PAYLOAD)
+        assert gzip.decompress(encoded) == _PAYLOAD
+        assert decompress(encoded, "gzip") == _PAYLOAD
+
+    def test_no_encoding_is_passthrough(self):
+        assert compress(_PAYLOAD, None) == _PAYLOAD
+        assert decompress(_PAYLOAD, None) == _PAYLOAD
+
+    def test_unknown_encoding_on_read_is_passthrough(self):
+        assert decompress(_PAYLOAD, "br") == _PAYLOAD
+
+    def test_unsupported_encoding_on_write(self):
+        with pytest.raises(ValueError, match="Unsupported content encoding"):
+            compress(_PAYLOAD, "br")
+
+    def test_zstd_requires_package(self, monkeypatch):
+        monkeypatch.setattr(compression, "zstandard", None)
+        with pytest.raises(ValueError, match="zstandard"):
+            compress(_PAYLOAD, "zstd")
+
+    def test_detect_content_encoding(self):
+        assert detect_content_encoding(compress(_PAYLOAD, "gzip")) == "gzip"
+        assert detect_content_encoding(b"\x28\xb5\x2f\xfd...") == "zstd"
+        assert detect_content_encoding(_PAYLOAD) is None
+
+
+# ── TestParseEncodingMap ────────────────────────────────────────────────
+
+
+class TestParseEncodingMap:
+    """Configuration parsing for per-artifact encodings."""
+
+    def test_single_encoding_applies_to_all(self):
+        encodings = parse_encoding_map("gzip")
+        assert encoding_for(encodings, "extracted_content") == "gzip"
+
+    def test_per_artifact_with_wildcard(self):
+        encodings = parse_encoding_map("extracted_content=zstd, *=gzip")
+        assert encoding_for(encodings, "extracted_content") == "zstd"
+        assert encoding_for(encodings, "schema_mapped_data") == "gzip"
+
+    def test_identity_overrides_wildcard(self):
+        encodings = parse_encoding_map("*=gzip,source_content=none")
+        assert encoding_for(encodings, "source_content") is None
+
+    def test_empty_disables_compression(self):
+        assert encoding_for(parse_encoding_map(""), "extracted_content") is None
+
+    def test_unsupported_encoding(self):
+        with pytest.raises(ValueError, match="Unsupported content encoding"):
+            parse_encoding_map("extracted_content=br")
@@ -0,0 +1,154 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.utils.metrics (pipeline instruments)."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from libs.utils import metrics
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    """Bind the pipeline instruments to an in-memory reader."""
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(metric_readers=[reader])
+    monkeypatch.setattr(
+        metrics, "_instruments", metrics._Instruments(provider.get_meter("test"))
+    )
+    return reader
+
+
+def _points(reader, name: str) -> list:
+    data = reader.get_metrics_data()
+    for resource_metrics in data.resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                if metric.name == name:
+                    return list(metric.data.data_points)
+    return []
+
+
+# ── TestStage ───────────────────────────────────────────────────────────
+
+
+class TestStage:
+    """Measurements are attributed to the current pipeline step."""
+
+    def test_stage_sets_and_restores_step(self):
+        assert metrics.current_step() == "unknown"
+        with metrics.stage("map"):
+            assert metrics.current_step() == "map"
+        assert metrics.current_step() == "unknown"
+
+
+# ── TestPhase ───────────────────────────────────────────────────────────
+
+
+class TestPhase:
+    """Phase durations recorded by context manager."""
+
+    def test_records_duration_with_step(self, reader):
+        with metrics.stage("extract"), metrics.phase("blob_download"):
+            pass
+        (point,) = _points(reader, "cps.pipeline.phase.duration")
+        assert point.count == 1
+        assert dict(point.attributes) == {
+            "step": "extract",
+            "phase": "blob_download",
+            "outcome": "success",
+        }
+
+    def test_records_error_outcome(self, reader):
+        with pytest.raises(RuntimeError):
+            with metrics.stage("map"), metrics.phase("llm"):
+                raise RuntimeError("boom")
+        (point,) = _points(reader, "cps.pipeline.phase.duration")
+        assert point.attributes["outcome"] == "error"
+
+
+# ── TestCounters ────────────────────────────────────────────────────────
+
+
+class TestCounters:
+    """Queue wait, messages, bytes, tokens and retries."""
+
+    def test_queue_wait(self, reader):
+        inserted_on = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+            seconds=30
+        )
+        with metrics.stage("save"):
+            metrics.record_queue_wait(inserted_on)
+            metrics.record_queue_wait(None)
+        (point,) = _points(reader, "cps.pipeline.queue.wait")
+        assert point.count == 1
+        assert 29 <= point.sum < 60
+
+    def test_message_throughput(self, reader):
+        with metrics.stage("evaluate"):
+            metrics.record_message("success", 1.5)
+            metrics.record_message("success", 0.5)
+        (point,) = _points(reader, "cps.pipeline.messages")
+        assert point.value == 2
+        (duration,) = _points(reader, "cps.pipeline.step.duration")
+        assert duration.sum == 2.0
+
+    def test_bytes_tokens_and_retries(self, reader):
+        with metrics.stage("map"):
+            metrics.record_bytes("upload", 100)
+            metrics.record_bytes("upload", 20)
+            metrics.record_tokens(1000, 200)
+            metrics.record_retry("openai")
+        (upload,) = _points(reader, "cps.pipeline.bytes")
+        assert upload.value == 120
+        tokens = {
+            p.attributes["type"]: p.value
+            for p in _points(reader, "cps.pipeline.tokens")
+        }
+        assert tokens == {"prompt": 1000, "completion": 200}
+        (retry,) = _points(reader, "cps.pipeline.retries")
+        assert retry.attributes["operation"] == "openai"
+
+
+# ── TestExporter ────────────────────────────────────────────────────────
+
+
+class TestExporter:
+    """Local Prometheus endpoint is opt-in."""
+
+    def test_disabled_without_port(self):
+        assert metrics.metric_readers(0) == []
+        assert metrics.serve(0) is None
+
+    def test_serve_binds_first_free_port(self, monkeypatch):
+        bound = []
+
+        def start_http_server(port):
+            if port < 9466:
+                raise OSError("in use")
+            bound.append(port)
+
+        monkeypatch.setattr(metrics, "start_http_server", start_http_server)
+        assert metrics.serve(9464) == 9466
+        assert bound == [9466]
+
+
+# ── TestQueueGauges ─────────────────────────────────────────────────────
+
+
+class TestQueueGauges:
+    """Queue backlog samples are observed on collection."""
+
+    def test_observes_latest_sample(self, reader, monkeypatch):
+        monkeypatch.setattr(metrics, "_queue_stats", {})
+        metrics.record_queue_stats("map", {"depth": 12, "drain_time": None})
+        (depth,) = _points(reader, "cps.queue.depth")
+        assert depth.value == 12
+        assert dict(depth.attributes) == {"step": "map"}
+        assert _points(reader, "cps.queue.drain_time") == []
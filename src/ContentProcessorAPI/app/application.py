@@ -11,16 +11,21 @@ application context used by request handlers.
 import logging
 import os
 import warnings
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.libs.azure.storage_blob.deletion_jobs import DeletionJobs
 from app.libs.base.application_base import Application_Base
 from app.libs.base.typed_fastapi import TypedFastAPI
+from app.libs.status_events.broker import StatusBroker
+from app.libs.status_events.pump import StatusEventPump
 from app.routers import claimprocessor, contentprocessor, schemasetvault, schemavault
 from app.routers.http_probes import router as http_probes
+from app.routers.logics.admission import AdmissionControl
 from app.routers.logics.claimbatchpocessor import (
     ClaimBatchProcessor,
     ClaimBatchProcessRepository,
@@ -90,10 +95,14 @@ class Application(Application_Base):
             1. Create a TypedFastAPI instance and bind the application context.
             2. Add CORS middleware with permissive defaults.
             3. Mount the health-probe router and all feature routers.
-            4. Register scoped service factories for dependency injection.
+            4. Register scoped service factories for dependency injection and
+               release the async ones on shutdown.
         """
         self.app = TypedFastAPI(
-            redirect_slashes=False, title="FastAPI Application", version="1.0.0"
+            redirect_slashes=False,
+            title="FastAPI Application",
+            version="1.0.0",
+            lifespan=self._lifespan,
         )
         self.app.set_app_context(self.application_context)
 
@@ -111,6 +120,13 @@ class Application(Application_Base):
         self._config_routers()
         self._configure_telemetry()
 
+    @asynccontextmanager
+    async def _lifespan(self, app: TypedFastAPI):
+        """Start the status-event pump; release the async services on shutdown."""
+        await self.application_context.get_service_async(StatusEventPump)
+        yield
+        await self.application_context.shutdown_async()
+
     def _config_routers(self):
         """Mount feature routers onto the FastAPI application."""
         routers = [
@@ -125,9 +141,23 @@ class Application(Application_Base):
 
     def _register_dependencies(self):
         """Register scoped service factories into the application context."""
-        self.application_context.add_singleton(
+        # Shares its Cosmos DB and Storage clients across requests; closed on shutdown.
+        self.application_context.add_async_singleton(
             ContentProcessor,
-            lambda: ContentProcessor(app_context=self.application_context),
+            lambda: ContentProcessor.create_async(self.application_context),
+        )
+        # Refuses submissions while the step queues are saturated.
+        self.application_context.add_async_singleton(
+            AdmissionControl,
+            lambda: AdmissionControl.create_async(self.application_context),
+        )
+        # Background folder deletions; cancelled on shutdown.
+        self.application_context.add_async_singleton(DeletionJobs)
+        # Status changes pushed to SSE / WebSocket / long-poll clients.
+        self.application_context.add_singleton(StatusBroker)
+        self.application_context.add_async_singleton(
+            StatusEventPump,
+            lambda: StatusEventPump.create_async(self.application_context),
         )
         self.application_context.add_singleton(
             Schemas, lambda: Schemas(app_context=self.application_context)
@@ -45,6 +45,28 @@ class AppConfiguration(ModelBaseSettings):
         app_cps_process_batch: Content-processing batch queue name.
         app_message_queue_extract: Extraction message-queue name.
         app_cps_max_filesize_mb: Maximum upload file size in megabytes.
+        app_cps_max_batch_files: Maximum number of files of a batch
+            submission.
+        app_priority_small_document_kb: Largest upload in KiB submitted
+            without a priority that is processed in the ``high`` lane
+            (0 disables promotion).
+        app_status_events_queue: Queue the pipeline publishes status
+            changes to (empty disables push notifications).
+        app_status_stream_reconcile_seconds: Seconds between the Cosmos DB
+            status reads of a status stream when no event arrives.
+        app_status_cache_ttl_seconds: Seconds a process status is served
+            from the in-memory status cache (0 disables it).
+        app_process_count_ttl_seconds: Seconds the approximate total of
+            the processed-contents list is served before it is refreshed in
+            the background (0 counts on every request).
+        app_admission_max_wait_seconds: Estimated pipeline wait above which
+            submissions are refused with ``429`` (0 disables admission
+            control).
+        app_admission_tenant_max_wait_seconds: Wait thresholds of given
+            callers (EasyAuth principal id or name), overriding the default
+            one; a JSON object such as ``{"bulk-loader": 1800}``.
+        app_admission_sample_seconds: Seconds the queue backlog sample is
+            served before the queues are read again.
         app_logging_level: Application log level.
         azure_package_logging_level: Log level for Azure SDK packages.
         azure_logging_packages: Comma-separated Azure package logger names.
@@ -63,6 +85,17 @@ class AppConfiguration(ModelBaseSettings):
     app_cps_process_batch: str = "process-batch"
     app_message_queue_extract: str
     app_cps_max_filesize_mb: int
+    app_cps_max_batch_files: int = Field(default=100, ge=1)
+    app_priority_small_document_kb: int = Field(default=512, ge=0)
+    app_status_events_queue: str = "status-events-queue"
+    app_status_stream_reconcile_seconds: int = Field(default=15, ge=1)
+    app_status_cache_ttl_seconds: float = Field(default=5, ge=0)
+    app_process_count_ttl_seconds: float = Field(default=60, ge=0)
+    app_admission_max_wait_seconds: float = Field(default=21600, ge=0)
+    app_admission_tenant_max_wait_seconds: dict[str, float] = Field(
+        default_factory=dict
+    )
+    app_admission_sample_seconds: float = Field(default=15, ge=1)
     app_logging_level: str
     azure_package_logging_level: str
     azure_logging_packages: str
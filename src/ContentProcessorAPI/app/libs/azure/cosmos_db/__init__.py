@@ -6,4 +6,6 @@
 Sub-modules:
     helper: CosmosMongDBHelper for CRUD operations against a
         Cosmos DB collection via the PyMongo driver.
+    async_helper: AsyncCosmosMongDBHelper for non-blocking CRUD operations
+        on a shared AsyncMongoClient.
 """
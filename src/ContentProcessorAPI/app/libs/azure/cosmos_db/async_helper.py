@@ -0,0 +1,141 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Non-blocking helper for Azure Cosmos DB (Mongo API) CRUD operations.
+
+Unlike ``CosmosMongDBHelper``, which opens a new PyMongo connection per
+instance, this helper runs on a shared ``AsyncMongoClient``: the client and
+its connection pool live as long as the application and are used by every
+request, and no call blocks the event loop.
+"""
+
+import asyncio
+import warnings
+from typing import Any, Dict, List, Optional
+
+import certifi
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+
+
+def create_async_mongo_client(connection_string: str) -> AsyncMongoClient:
+    """Create an ``AsyncMongoClient`` for Cosmos DB; it connects on first use."""
+    # Cosmos DB for MongoDB triggers a PyMongo supportability warning that
+    # is noisy but harmless; suppress it during client creation.
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            message=r"You appear to be connected to a CosmosDB cluster\..*",
+            category=UserWarning,
+        )
+        # certifi CA bundle is required inside containers that lack system certs.
+        return AsyncMongoClient(connection_string, tlsCAFile=certifi.where())
+
+
+class AsyncCosmosMongDBHelper:
+    """Async CRUD wrapper around a single collection of a shared client.
+
+    Responsibilities:
+        1. Create the target collection and optional indexes on first use.
+        2. Expose insert (single or many), find, count, update, and delete operations.
+
+    The helper does not own the client; closing it is up to its creator.
+
+    Attributes:
+        client: Shared AsyncMongoClient.
+        db_name: Database name.
+        container_name: Collection name (created if absent).
+        indexes: ``(field, order)`` tuples to index, or lists of them for
+            compound indexes.
+    """
+
+    def __init__(
+        self,
+        client: AsyncMongoClient,
+        db_name: str,
+        container_name: str,
+        indexes: list = None,
+    ):
+        self.client = client
+        self.db_name = db_name
+        self.container_name = container_name
+        self.indexes = indexes or []
+        self._container: Optional[AsyncCollection] = None
+        self._lock = asyncio.Lock()
+
+    async def _get_container(self) -> AsyncCollection:
+        """Return the collection, creating it and its indexes once."""
+        if self._container is not None:
+            return self._container
+        async with self._lock:
+            if self._container is None:
+                database = self.client[self.db_name]
+                if self.container_name not in await database.list_collection_names():
+                    await database.create_collection(self.container_name)
+                container = database[self.container_name]
+                existing_indexes = await container.index_information()
+                for index in self.indexes:
+                    keys = index if isinstance(index, list) else [index]
+                    name = "_".join(f"{field}_{order}" for field, order in keys)
+                    if name not in existing_indexes:
+                        await container.create_index(keys)
+                self._container = container
+        return self._container
+
+    async def insert_document(self, document: Dict[str, Any]):
+        """Insert a single document and return the insert result."""
+        container = await self._get_container()
+        return await container.insert_one(document)
+
+    async def insert_documents(self, documents: List[Dict[str, Any]]):
+        """Insert *documents* in one round trip and return the insert result.
+
+        The insert is unordered: a failing document does not stop the others.
+        """
+        container = await self._get_container()
+        return await container.insert_many(documents, ordered=False)
+
+    async def find_document(
+        self,
+        query: Dict[str, Any],
+        sort_fields: Optional[List[tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        projection: Optional[List[str]] = None,
+    ) -> list:
+        """Query documents with optional sort, pagination, and projection."""
+        container = await self._get_container()
+        cursor = container.find(query, projection)
+        if sort_fields:
+            cursor = cursor.sort(sort_fields)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list()
+
+    async def count_documents(self, query: Dict[str, Any] = None) -> int:
+        """Return the number of documents matching *query* (all if None)."""
+        container = await self._get_container()
+        return await container.count_documents(query or {})
+
+    async def estimate_document_count(self) -> int:
+        """Return the number of documents from the collection metadata.
+
+        Unlike ``count_documents`` it does not scan the collection, but
+        may be slightly off.
+        """
+        container = await self._get_container()
+        return await container.estimated_document_count()
+
+    async def update_document_by_query(
+        self, query: Dict[str, Any], update: Dict[str, Any]
+    ):
+        """Update the first document matching *query*."""
+        container = await self._get_container()
+        return await container.update_one(query, {"$set": update})
+
+    async def delete_document(self, item_id: str, field_name: str = None):
+        """Delete the document identified by *item_id* on *field_name* (default ``Id``)."""
+        container = await self._get_container()
+        return await container.delete_one({field_name or "Id": item_id})
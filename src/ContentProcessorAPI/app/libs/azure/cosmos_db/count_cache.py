@@ -0,0 +1,84 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Approximate document counts, refreshed in the background.
+
+Counting a collection of millions of documents is one of the slowest
+queries Cosmos DB serves, yet a list view only needs a rough total to
+size its pager. ``CountCache`` serves the last known count of each query
+and, once it is older than ``ttl_seconds``, refreshes it in a background
+task while the stale value keeps being served. Only the first request of
+a query waits for the count.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Seconds a count is served before it is refreshed.
+DEFAULT_TTL_SECONDS = 60.0
+# Counts kept before the least recently stored are evicted.
+DEFAULT_MAX_ENTRIES = 1_000
+
+
+class CountCache:
+    """Cache a document count per query, refreshing stale counts asynchronously.
+
+    Attributes:
+        ttl_seconds: Seconds a count is served before it is refreshed
+            (0 disables the cache).
+        max_entries: Counts kept before the oldest are evicted.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, load: Callable[[], Awaitable[int]]) -> int:
+        """Return the count of *key*, or ``load()`` it if none is known yet.
+
+        A count older than ``ttl_seconds`` is returned as is and refreshed
+        by a background ``load()``.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self.ttl_seconds <= 0:
+            return await self._load(key, load)
+
+        if entry[0] <= time.monotonic() and key not in self._refreshing:
+            task = asyncio.create_task(self._refresh(key, load))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return entry[1]
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[int]]) -> int:
+        count = await load()
+        if self.ttl_seconds > 0:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return count
+
+    async def _refresh(self, key: str, load: Callable[[], Awaitable[int]]):
+        """Reload the count of *key*; on failure the stale count is kept."""
+        try:
+            await self._load(key, load)
+        except Exception as e:
+            logger.warning("Unable to refresh the document count: %s", e)
+
+    async def close(self):
+        """Cancel the refreshes in progress."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -6,4 +6,8 @@
 Sub-modules:
     helper: StorageBlobHelper for uploading, downloading, and
         managing blobs and virtual folders in a storage account.
+    async_helper: AsyncStorageBlobHelper, the non-blocking counterpart
+        on the aio Storage SDK.
+    staged_upload: Bounded-memory uploads in concurrently staged blocks
+        that also compute the size and SHA-256 of the content.
 """
@@ -0,0 +1,284 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Non-blocking helper for Azure Blob Storage operations.
+
+Counterpart of ``StorageBlobHelper`` on the ``azure.storage.blob.aio`` SDK.
+One instance, and with it one HTTP connection pool, is shared by all
+requests of the application and closed on shutdown.
+"""
+
+import asyncio
+import urllib.parse
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import BlobProperties
+from azure.storage.blob.aio import (
+    BlobClient,
+    BlobServiceClient,
+    ContainerClient,
+    StorageStreamDownloader,
+)
+
+from app.libs.azure.storage_blob.batch_delete import delete_prefix_async
+from app.libs.azure.storage_blob.staged_upload import (
+    UploadedBlob,
+    upload_staged_async,
+)
+from app.utils.compression import decompress
+
+# Token scope that authorizes the source of a service-side copy.
+STORAGE_SCOPE = "https://storage.azure.com/.default"
+
+
+class AsyncStorageBlobHelper:
+    """Async wrapper around BlobServiceClient for a single container tree.
+
+    Responsibilities:
+        1. Create the root container on the first upload if it does not exist.
+        2. Expose upload (single-shot, block-staged or copied from another
+           blob of the account), download, and folder delete operations.
+
+    Attributes:
+        blob_service_client: Authenticated aio BlobServiceClient.
+        parent_container_name: Optional root container/virtual-folder prefix.
+    """
+
+    def __init__(self, account_url, container_name=None, credential=None):
+        """Create a helper bound to *account_url*.
+
+        Args:
+            account_url: Azure Blob Storage account URL.
+            container_name: Optional default container (may include a virtual-folder
+                path such as ``"mycontainer/subfolder"``).
+            credential: Async Azure credential; owned by the caller.
+        """
+        self.blob_service_client = BlobServiceClient(
+            account_url=account_url, credential=credential
+        )
+        self.parent_container_name = container_name
+        self.credential = credential
+        self._container_ready = container_name is None
+        self._lock = asyncio.Lock()
+
+    def _get_container_client(self, container_name=None) -> ContainerClient:
+        """Build a ContainerClient, optionally scoped to a sub-folder.
+
+        Raises:
+            ValueError: If no container name is available from either argument
+                or the instance default.
+        """
+        if container_name:
+            full_container_name = (
+                f"{self.parent_container_name}/{container_name}"
+                if self.parent_container_name
+                else container_name
+            )
+        elif self.parent_container_name is not None:
+            full_container_name = self.parent_container_name
+        else:
+            raise ValueError(
+                "Container name must be provided either during initialization or as a function argument."
+            )
+        return self.blob_service_client.get_container_client(full_container_name)
+
+    async def _ensure_container(self):
+        """Create the root container once if it does not already exist."""
+        if self._container_ready:
+            return
+        async with self._lock:
+            if not self._container_ready:
+                container_client = self.blob_service_client.get_container_client(
+                    self.parent_container_name.split("/")[0]
+                )
+                try:
+                    await container_client.create_container()
+                except ResourceExistsError:
+                    pass
+                self._container_ready = True
+
+    async def upload_blob(self, blob_name, file_stream, container_name=None):
+        """Upload *file_stream* as *blob_name*, overwriting if it exists."""
+        await self._ensure_container()
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        return await blob_client.upload_blob(file_stream, overwrite=True)
+
+    async def upload_blob_staged(
+        self, blob_name, file_stream, container_name=None, content_type=None
+    ) -> UploadedBlob:
+        """Upload *file_stream* in concurrently staged blocks (see ``staged_upload``).
+
+        Returns:
+            UploadedBlob: Size and SHA-256 of the uploaded content.
+        """
+        await self._ensure_container()
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        return await upload_staged_async(blob_client, file_stream, content_type)
+
+    def _get_blob_client_at_url(self, blob_url: str) -> BlobClient:
+        """Return a client of the blob at *blob_url*.
+
+        Raises:
+            ValueError: If *blob_url* is not a blob of this storage account;
+                other URLs are refused so callers cannot make the API fetch
+                arbitrary locations.
+        """
+        url = urllib.parse.urlparse(blob_url)
+        container_name, _, blob_name = (
+            urllib.parse.unquote(url.path).lstrip("/").partition("/")
+        )
+        if (
+            url.scheme != "https"
+            or url.netloc.lower() != self.blob_service_client.primary_hostname.lower()
+            or not container_name
+            or not blob_name
+        ):
+            raise ValueError(f"'{blob_url}' is not a blob of the storage account.")
+        return self.blob_service_client.get_blob_client(container_name, blob_name)
+
+    async def get_blob_properties_at_url(self, blob_url: str) -> BlobProperties:
+        """Return the properties of the blob at *blob_url* (see ``_get_blob_client_at_url``).
+
+        Raises:
+            ValueError: If the URL is refused or the blob does not exist.
+        """
+        try:
+            return await self._get_blob_client_at_url(blob_url).get_blob_properties()
+        except ResourceNotFoundError as e:
+            raise ValueError(f"Blob '{blob_url}' not found.") from e
+
+    async def read_blob_at_url(self, blob_url: str, length: int) -> bytes:
+        """Return the first *length* bytes of the non-empty blob at *blob_url*.
+
+        Raises:
+            ValueError: If the URL is refused or the blob does not exist.
+        """
+        try:
+            download_stream = await self._get_blob_client_at_url(
+                blob_url
+            ).download_blob(offset=0, length=length, decompress=False)
+        except ResourceNotFoundError as e:
+            raise ValueError(f"Blob '{blob_url}' not found.") from e
+        return await download_stream.readall()
+
+    async def copy_blob_from_url(self, blob_name, blob_url: str, container_name=None):
+        """Copy the blob at *blob_url* to *blob_name*, overwriting if it exists.
+
+        The copy is made by the storage service (Put Blob From URL): the
+        content does not pass through the API.
+
+        Raises:
+            ValueError: If *blob_url* is not a blob of this storage account.
+        """
+        source_url = self._get_blob_client_at_url(blob_url).url
+        source_authorization = None
+        if self.credential is not None and hasattr(self.credential, "get_token"):
+            token = await self.credential.get_token(STORAGE_SCOPE)
+            source_authorization = f"Bearer {token.token}"
+        await self._ensure_container()
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        return await blob_client.upload_blob_from_url(
+            source_url, overwrite=True, source_authorization=source_authorization
+        )
+
+    async def download_blob(self, blob_name, container_name=None) -> bytes:
+        """Download a blob's full contents as bytes.
+
+        Blobs written with a gzip / zstd ``Content-Encoding`` are decoded.
+
+        Raises:
+            ValueError: If the blob does not exist or is empty.
+        """
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        try:
+            download_stream = await blob_client.download_blob(decompress=False)
+        except ResourceNotFoundError as e:
+            raise ValueError(
+                f"Blob '{blob_name}' not found in container '{container_name}'."
+            ) from e
+
+        if download_stream.properties.size == 0:
+            raise ValueError(f"Blob '{blob_name}' is empty.")
+
+        return decompress(
+            await download_stream.readall(),
+            download_stream.properties.content_settings.content_encoding,
+        )
+
+    async def get_blob_properties(
+        self, blob_name, container_name=None
+    ) -> BlobProperties:
+        """Return the properties (size, content type, ETag) of a blob.
+
+        Raises:
+            ValueError: If the blob does not exist.
+        """
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        try:
+            return await blob_client.get_blob_properties()
+        except ResourceNotFoundError as e:
+            raise ValueError(
+                f"Blob '{blob_name}' not found in container '{container_name}'."
+            ) from e
+
+    async def open_blob(
+        self, blob_name, container_name=None, offset=None, length=None
+    ) -> StorageStreamDownloader:
+        """Start downloading a blob, or *length* bytes of it from *offset*.
+
+        The returned downloader carries the blob properties and yields the
+        content through ``chunks()`` without reading it all into memory.
+        The content is returned as stored (no ``Content-Encoding`` decoding).
+
+        Raises:
+            ValueError: If the blob does not exist.
+            azure.core.exceptions.HttpResponseError: With status 416 when
+                *offset* is beyond the end of the blob.
+        """
+        blob_client = self._get_container_client(container_name).get_blob_client(
+            blob_name
+        )
+        try:
+            return await blob_client.download_blob(
+                offset=offset, length=length, decompress=False
+            )
+        except ResourceNotFoundError as e:
+            raise ValueError(
+                f"Blob '{blob_name}' not found in container '{container_name}'."
+            ) from e
+
+    async def delete_folder(self, folder_name, container_name=None, on_progress=None):
+        """Delete all blobs under *folder_name* and the virtual folder marker.
+
+        Blobs are deleted in concurrent Blob Batch requests (see
+        ``batch_delete``); *on_progress* is called with the number of blobs
+        deleted so far after each batch.
+
+        Returns:
+            int: Number of blobs deleted under *folder_name*.
+        """
+        deleted = await delete_prefix_async(
+            self._get_container_client(container_name),
+            folder_name + "/",
+            on_progress=on_progress,
+        )
+        try:
+            await self._get_container_client().delete_blob(folder_name)
+        except ResourceNotFoundError:
+            # Flat-namespace accounts have no marker blob.
+            pass
+        return deleted
+
+    async def close(self):
+        """Close the underlying HTTP transport."""
+        await self.blob_service_client.close()
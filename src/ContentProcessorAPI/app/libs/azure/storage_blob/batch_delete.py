@@ -0,0 +1,143 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Batched deletion of the blobs under a prefix.
+
+Blob names are listed a page at a time and deleted through the Blob Batch
+API, ``BATCH_SIZE`` deletes (the service maximum) per request, with at
+most ``MAX_CONCURRENCY`` batches in flight while the next page is listed.
+A folder of a few thousand files is deleted in a handful of round-trips
+instead of one per blob. Blobs already gone are skipped; any other
+failed delete stops the deletion and raises.
+"""
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+
+from azure.core.exceptions import HttpResponseError
+from azure.storage.blob import ContainerClient
+from azure.storage.blob.aio import ContainerClient as AsyncContainerClient
+
+# Deletes per Blob Batch request (the service maximum).
+BATCH_SIZE = 256
+# Batch requests in flight per deletion.
+MAX_CONCURRENCY = 4
+
+# Called with the number of blobs deleted so far after each batch.
+ProgressCallback = Callable[[int], None]
+
+
+def count_deleted(responses: Iterable) -> int:
+    """Return the number of blobs the sub-responses of a batch deleted.
+
+    Raises:
+        HttpResponseError: If a delete failed for another reason than the
+            blob being already gone.
+    """
+    deleted = 0
+    for response in responses:
+        if response.status_code == 404:
+            continue
+        if response.status_code >= 300:
+            raise HttpResponseError(
+                message=f"Blob delete failed: {response.status_code} {response.reason}",
+                response=response,
+            )
+        deleted += 1
+    return deleted
+
+
+async def delete_prefix_async(
+    container_client: AsyncContainerClient,
+    prefix: str,
+    on_progress: Optional[ProgressCallback] = None,
+    batch_size: int = BATCH_SIZE,
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> int:
+    """Delete every blob of *container_client* whose name starts with *prefix*.
+
+    Returns:
+        int: Number of blobs deleted.
+    """
+    deleted = 0
+
+    async def delete_batch(names: list[str]) -> int:
+        responses = await container_client.delete_blobs(
+            *names, raise_on_any_failure=False
+        )
+        return count_deleted([response async for response in responses])
+
+    def collect(tasks):
+        nonlocal deleted
+        for task in tasks:
+            deleted += task.result()
+            if on_progress is not None:
+                on_progress(deleted)
+
+    pending: set[asyncio.Task] = set()
+    try:
+        pages = container_client.list_blob_names(
+            name_starts_with=prefix, results_per_page=batch_size
+        ).by_page()
+        async for page in pages:
+            names = [name async for name in page]
+            if not names:
+                continue
+            pending.add(asyncio.create_task(delete_batch(names)))
+            if len(pending) >= max_concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                collect(done)
+        if pending:
+            done, pending = await asyncio.wait(pending)
+            collect(done)
+    finally:
+        for task in pending:
+            task.cancel()
+    return deleted
+
+
+def delete_prefix(
+    container_client: ContainerClient,
+    prefix: str,
+    on_progress: Optional[ProgressCallback] = None,
+    batch_size: int = BATCH_SIZE,
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> int:
+    """Synchronous counterpart of ``delete_prefix_async`` on a thread pool."""
+    deleted = 0
+
+    def delete_batch(names: list[str]) -> int:
+        return count_deleted(
+            container_client.delete_blobs(*names, raise_on_any_failure=False)
+        )
+
+    def collect(futures):
+        nonlocal deleted
+        for future in futures:
+            deleted += future.result()
+            if on_progress is not None:
+                on_progress(deleted)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = set()
+        try:
+            pages = container_client.list_blob_names(
+                name_starts_with=prefix, results_per_page=batch_size
+            ).by_page()
+            for page in pages:
+                names = list(page)
+                if not names:
+                    continue
+                pending.add(executor.submit(delete_batch, names))
+                if len(pending) >= max_concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            done, pending = wait(pending)
+            collect(done)
+        finally:
+            for future in pending:
+                future.cancel()
+    return deleted
@@ -0,0 +1,142 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Background deletion of blob folders.
+
+Deleting a claim or process folder of many thousands of blobs can outlast
+an HTTP request. ``DeletionJobs`` runs such deletions as background tasks
+and tracks each one as a ``DeletionJob`` that clients poll by id. Jobs
+live in the memory of the API replica that started them and are
+forgotten ``retention_seconds`` after they finish.
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+import uuid
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+
+from pydantic import BaseModel
+
+from app.libs.azure.storage_blob.batch_delete import ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+# Seconds a finished job stays available to status requests.
+DEFAULT_RETENTION_SECONDS = 3600.0
+# Finished jobs kept before the oldest are forgotten.
+DEFAULT_MAX_JOBS = 1_000
+
+
+class DeletionJobStatus(str, Enum):
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+
+class DeletionJob(BaseModel):
+    """State of a background folder deletion.
+
+    Attributes:
+        job_id: Identifier to poll the job with.
+        folder: Folder (claim or process id) being deleted.
+        status: Running, Succeeded or Failed.
+        deleted: Blobs deleted so far.
+        error: Failure message of a failed job.
+        started_at: UTC time the job started.
+        finished_at: UTC time the job finished, if it has.
+    """
+
+    job_id: str
+    folder: str
+    status: DeletionJobStatus = DeletionJobStatus.RUNNING
+    deleted: int = 0
+    error: Optional[str] = None
+    started_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+
+
+class DeletionJobs:
+    """Run folder deletions in the background and report their progress.
+
+    Attributes:
+        retention_seconds: Seconds a finished job remains available.
+        max_jobs: Finished jobs kept before the oldest are forgotten.
+    """
+
+    def __init__(
+        self,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+    ):
+        self.retention_seconds = retention_seconds
+        self.max_jobs = max_jobs
+        self._jobs: dict[str, DeletionJob] = {}
+        self._expiry: dict[str, float] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def start(
+        self, folder: str, delete: Callable[[ProgressCallback], Awaitable[int]]
+    ) -> DeletionJob:
+        """Run ``delete(on_progress)`` in the background and return its job.
+
+        A deletion of *folder* already running is returned instead of
+        starting another one.
+        """
+        self._prune()
+        for job_id in self._tasks:
+            if self._jobs[job_id].folder == folder:
+                return self._jobs[job_id]
+
+        job = DeletionJob(
+            job_id=str(uuid.uuid4()),
+            folder=folder,
+            started_at=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self._jobs[job.job_id] = job
+        task = asyncio.create_task(self._run(job, delete))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        return job
+
+    def get(self, job_id: str) -> Optional[DeletionJob]:
+        """Return the job *job_id*, or None if it is unknown or forgotten."""
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def _run(
+        self, job: DeletionJob, delete: Callable[[ProgressCallback], Awaitable[int]]
+    ):
+        def on_progress(deleted: int):
+            job.deleted = deleted
+
+        try:
+            job.deleted = await delete(on_progress)
+            job.status = DeletionJobStatus.SUCCEEDED
+        except Exception as e:
+            logger.warning("Deletion of folder %s failed: %s", job.folder, e)
+            job.status = DeletionJobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.datetime.now(datetime.timezone.utc)
+            self._expiry[job.job_id] = time.monotonic() + self.retention_seconds
+
+    def _prune(self):
+        """Forget the finished jobs past their retention, then the oldest extra ones."""
+        now = time.monotonic()
+        for job_id, expiry in list(self._expiry.items()):
+            if expiry <= now:
+                del self._expiry[job_id]
+                del self._jobs[job_id]
+        for job_id in list(self._expiry)[: max(0, len(self._expiry) - self.max_jobs)]:
+            del self._expiry[job_id]
+            del self._jobs[job_id]
+
+    async def close(self):
+        """Cancel the deletions in progress."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -7,10 +7,14 @@ Used by the content-processing router to persist uploaded documents and
 retrieve them during downstream pipeline stages.
 """
 
+from azure.core import MatchConditions
 from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient
 
+from app.libs.azure.storage_blob.batch_delete import delete_prefix
+from app.libs.azure.storage_blob.staged_upload import UploadedBlob, upload_staged
 from app.utils.azure_credential_utils import get_azure_credential
+from app.utils.compression import decompress
 
 
 class StorageBlobHelper:
@@ -79,35 +83,76 @@ class StorageBlobHelper:
         if not container_client.exists():
             container_client.create_container()
 
-    def upload_blob(self, blob_name, file_stream, container_name=None):
-        """Upload *file_stream* as *blob_name*, overwriting if it exists."""
+    def upload_blob(self, blob_name, file_stream, container_name=None, etag=None):
+        """Upload *file_stream* as *blob_name*, overwriting if it exists.
+
+        With *etag*, the blob is only overwritten if it has not changed
+        since it was read with that ETag.
+
+        Raises:
+            azure.core.exceptions.ResourceModifiedError: If *etag* no longer
+                matches the blob.
+        """
         container_client = self._get_container_client(container_name)
         blob_client = container_client.get_blob_client(blob_name)
-        result = blob_client.upload_blob(file_stream, overwrite=True)
+        conditions = (
+            {"etag": etag, "match_condition": MatchConditions.IfNotModified}
+            if etag
+            else {}
+        )
+        result = blob_client.upload_blob(file_stream, overwrite=True, **conditions)
         return result
 
+    def upload_blob_staged(
+        self, blob_name, file_stream, container_name=None, content_type=None
+    ) -> UploadedBlob:
+        """Upload *file_stream* in concurrently staged blocks (see ``staged_upload``).
+
+        Returns:
+            UploadedBlob: Size and SHA-256 of the uploaded content.
+        """
+        container_client = self._get_container_client(container_name)
+        blob_client = container_client.get_blob_client(blob_name)
+        return upload_staged(blob_client, file_stream, content_type)
+
     def download_blob(self, blob_name, container_name=None):
         """Download a blob's full contents as bytes.
 
+        Blobs written with a gzip / zstd ``Content-Encoding`` are decoded.
+
         Raises:
             ValueError: If the blob does not exist or is empty.
         """
+        return self.download_blob_with_etag(blob_name, container_name)[0]
+
+    def download_blob_with_etag(self, blob_name, container_name=None):
+        """Like ``download_blob``, also returning the ETag of the downloaded version.
+
+        Returns:
+            tuple[bytes, str]: The content and the ETag to pass to
+            ``upload_blob`` for a conditional overwrite.
+        """
         container_client = self._get_container_client(container_name)
         blob_client = container_client.get_blob_client(blob_name)
 
+        # The download response carries the properties: one request, not three.
         try:
-            blob_client.get_blob_properties()
+            download_stream = blob_client.download_blob(decompress=False)
         except Exception as e:
             raise ValueError(
                 f"Blob '{blob_name}' not found in container '{container_name}'."
             ) from e
 
-        blob_properties = blob_client.get_blob_properties()
-        if blob_properties.size == 0:
+        if download_stream.properties.size == 0:
             raise ValueError(f"Blob '{blob_name}' is empty.")
 
-        download_stream = blob_client.download_blob()
-        return download_stream.readall()
+        return (
+            decompress(
+                download_stream.readall(),
+                download_stream.properties.content_settings.content_encoding,
+            ),
+            download_stream.properties.etag,
+        )
 
     def replace_blob(self, blob_name, file_stream, container_name=None):
         """Overwrite an existing blob (delegates to upload_blob)."""
@@ -136,21 +181,24 @@ class StorageBlobHelper:
             blob_client = container_client.get_blob_client(container_name)
             blob_client.delete_blob()
 
-    def delete_folder(self, folder_name, container_name=None):
-        """Delete all blobs under *folder_name* and the virtual folder marker."""
-        container_client = self._get_container_client(container_name)
+    def delete_folder(self, folder_name, container_name=None, on_progress=None):
+        """Delete all blobs under *folder_name* and the virtual folder marker.
 
-        blobs_to_delete = container_client.list_blobs(
-            name_starts_with=folder_name + "/"
-        )
+        Blobs are deleted in concurrent Blob Batch requests (see
+        ``batch_delete``); *on_progress* is called with the number of blobs
+        deleted so far after each batch.
 
-        for blob in blobs_to_delete:
-            blob_client = container_client.get_blob_client(blob.name)
-            blob_client.delete_blob()
-
-        blobs_to_delete = container_client.list_blobs()
-        files = [blob for blob in blobs_to_delete]
-        if files:
-            container_client = self._get_container_client()
-            blob_client = container_client.get_blob_client(folder_name)
-            blob_client.delete_blob()
+        Returns:
+            int: Number of blobs deleted under *folder_name*.
+        """
+        deleted = delete_prefix(
+            self._get_container_client(container_name),
+            folder_name + "/",
+            on_progress=on_progress,
+        )
+        try:
+            self._get_container_client().delete_blob(folder_name)
+        except ResourceNotFoundError:
+            # Flat-namespace accounts have no marker blob.
+            pass
+        return deleted
@@ -0,0 +1,142 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Block-staged uploads of file streams to Azure Blob Storage.
+
+A file is read in ``BLOCK_SIZE`` chunks; each chunk is hashed and staged
+as an uncommitted block while the next one is read, with at most
+``MAX_CONCURRENCY`` blocks in flight, so memory stays bounded whatever the
+file size. The block list is committed once the stream is exhausted,
+together with the content type and the SHA-256 of the whole file (blob
+metadata ``sha256``), which callers use to verify and de-duplicate
+uploads. Blocks of an upload that fails are never committed and are
+discarded by the service.
+"""
+
+import asyncio
+import base64
+import hashlib
+import inspect
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+from azure.storage.blob import BlobClient, ContentSettings
+from azure.storage.blob.aio import BlobClient as AsyncBlobClient
+from pydantic import BaseModel
+
+# Size of a staged block (the Storage SDK default block size).
+BLOCK_SIZE = 4 * 1024 * 1024
+# Blocks staged concurrently (and held in memory) per upload.
+MAX_CONCURRENCY = 4
+
+
+class UploadedBlob(BaseModel):
+    """Outcome of a staged upload.
+
+    Attributes:
+        size: Bytes uploaded.
+        sha256: Hex SHA-256 digest of the uploaded content.
+    """
+
+    size: int
+    sha256: str
+
+
+def block_id(index: int) -> str:
+    """Return the id of the *index*-th block (ids of a blob share one length)."""
+    return base64.b64encode(f"{index:08d}".encode()).decode()
+
+
+def _commit_settings(content_type: Optional[str], digest: str) -> dict:
+    return {
+        "content_settings": ContentSettings(content_type=content_type)
+        if content_type
+        else None,
+        "metadata": {"sha256": digest},
+    }
+
+
+async def upload_staged_async(
+    blob_client: AsyncBlobClient,
+    file_stream,
+    content_type: Optional[str] = None,
+    block_size: int = BLOCK_SIZE,
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> UploadedBlob:
+    """Upload *file_stream* to *blob_client* in concurrently staged blocks.
+
+    *file_stream* may have a synchronous ``read`` (file objects) or an
+    asynchronous one (``UploadFile``).
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    block_ids: list[str] = []
+    pending: set[asyncio.Task] = set()
+    try:
+        while True:
+            chunk = file_stream.read(block_size)
+            if inspect.isawaitable(chunk):
+                chunk = await chunk
+            if not chunk:
+                break
+            sha256.update(chunk)
+            size += len(chunk)
+            block_ids.append(block_id(len(block_ids)))
+            pending.add(
+                asyncio.create_task(blob_client.stage_block(block_ids[-1], chunk))
+            )
+            if len(pending) >= max_concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+        if pending:
+            await asyncio.gather(*pending)
+            pending = set()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    digest = sha256.hexdigest()
+    await blob_client.commit_block_list(
+        block_ids, **_commit_settings(content_type, digest)
+    )
+    return UploadedBlob(size=size, sha256=digest)
+
+
+def upload_staged(
+    blob_client: BlobClient,
+    file_stream,
+    content_type: Optional[str] = None,
+    block_size: int = BLOCK_SIZE,
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> UploadedBlob:
+    """Synchronous counterpart of ``upload_staged_async`` on a thread pool."""
+    sha256 = hashlib.sha256()
+    size = 0
+    block_ids: list[str] = []
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = set()
+        try:
+            while chunk := file_stream.read(block_size):
+                sha256.update(chunk)
+                size += len(chunk)
+                block_ids.append(block_id(len(block_ids)))
+                pending.add(
+                    executor.submit(blob_client.stage_block, block_ids[-1], chunk)
+                )
+                if len(pending) >= max_concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            for future in pending:
+                future.result()
+            pending = set()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    digest = sha256.hexdigest()
+    blob_client.commit_block_list(block_ids, **_commit_settings(content_type, digest))
+    return UploadedBlob(size=size, sha256=digest)
@@ -6,4 +6,6 @@
 Sub-modules:
     helper: StorageQueueHelper for sending messages to an Azure
         Storage Queue (used to trigger downstream pipeline stages).
+    async_helper: AsyncStorageQueueHelper, the non-blocking counterpart
+        on the aio Storage SDK.
 """
@@ -0,0 +1,87 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Non-blocking helper for sending messages to Azure Storage Queues.
+
+Counterpart of ``StorageQueueHelper`` on the ``azure.storage.queue.aio``
+SDK. A single instance serves any number of queues: the client of each
+queue is created, and its queue created if missing, on the first message
+and reused afterwards.
+"""
+
+import asyncio
+import datetime
+import logging
+from typing import Optional
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.queue.aio import QueueClient
+from pydantic import BaseModel
+
+
+class AsyncStorageQueueHelper:
+    """Send JSON messages to the queues of one storage account.
+
+    Attributes:
+        account_url: Azure Queue Storage account URL.
+        credential: Async Azure credential; owned by the caller.
+    """
+
+    def __init__(self, account_url, credential=None):
+        self.account_url = account_url
+        self.credential = credential
+        self._queue_clients: dict[str, QueueClient] = {}
+        self._lock = asyncio.Lock()
+
+    async def _get_queue_client(self, queue_name: str) -> QueueClient:
+        """Return the client of *queue_name*, creating the queue if needed."""
+        queue_client = self._queue_clients.get(queue_name)
+        if queue_client is not None:
+            return queue_client
+        async with self._lock:
+            if queue_name not in self._queue_clients:
+                queue_client = QueueClient(
+                    account_url=self.account_url,
+                    queue_name=queue_name,
+                    credential=self.credential,
+                )
+                try:
+                    await queue_client.get_queue_properties()
+                except ResourceNotFoundError:
+                    logging.info("Queue not found. Creating a new queue.")
+                    try:
+                        await queue_client.create_queue()
+                    except ResourceExistsError:
+                        pass
+                self._queue_clients[queue_name] = queue_client
+        return self._queue_clients[queue_name]
+
+    async def drop_message(self, queue_name: str, message_object: BaseModel):
+        """Serialize *message_object* to JSON and send it to *queue_name*."""
+        queue_client = await self._get_queue_client(queue_name)
+        await queue_client.send_message(content=message_object.model_dump_json())
+
+    async def get_queue_backlog(self, queue_name: str) -> tuple[int, Optional[float]]:
+        """Return the approximate depth of *queue_name* and the age of its oldest message.
+
+        The age, in seconds, is None when the queue is empty.
+        """
+        queue_client = await self._get_queue_client(queue_name)
+        depth = (await queue_client.get_queue_properties()).approximate_message_count
+        if depth:
+            peeked = await queue_client.peek_messages(max_messages=1)
+            if peeked and peeked[0].inserted_on is not None:
+                return depth, max(
+                    0.0,
+                    (
+                        datetime.datetime.now(datetime.timezone.utc)
+                        - peeked[0].inserted_on
+                    ).total_seconds(),
+                )
+        return depth, None
+
+    async def close(self):
+        """Close the clients of all queues."""
+        for queue_client in self._queue_clients.values():
+            await queue_client.close()
+        self._queue_clients.clear()
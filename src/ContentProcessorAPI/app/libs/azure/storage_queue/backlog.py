@@ -0,0 +1,162 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Estimated waiting time of the pipeline step queues.
+
+A step is fed by one queue per priority lane. Each sample reads the depth
+and the age of the oldest message of the lanes, and estimates, as the
+pipeline's own queue monitor does:
+
+- arrival rate, by Little's law: the messages waiting in a FIFO queue
+  arrived during the age of the oldest one, so ``depth / oldest_age``
+  summed over the lanes;
+- service rate, the arrival rate minus the change in depth since the
+  previous sample;
+- wait, the time the step needs to serve its backlog: the depth divided
+  by the service rate, or the age of the oldest message while no service
+  rate is known.
+
+``QueueBacklog`` serves the last samples and, once they are older than
+``ttl_seconds``, samples again in a background task while the previous
+estimate keeps being served. Only the first request waits for the queues.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.libs.azure.storage_queue.async_helper import AsyncStorageQueueHelper
+
+logger = logging.getLogger(__name__)
+
+# Seconds a sample is served before the queues are read again.
+DEFAULT_TTL_SECONDS = 15.0
+
+
+class StepBacklog(BaseModel):
+    """One backlog sample of a step.
+
+    Attributes:
+        depth: Approximate number of messages in the step's lanes.
+        oldest_message_age: Seconds the oldest message of any lane has waited.
+        service_rate: Estimated messages per second served (None on the first sample).
+        wait_seconds: Estimated seconds the step needs to serve its backlog.
+        sampled_at: Monotonic time of the sample.
+    """
+
+    depth: int
+    oldest_message_age: Optional[float] = None
+    service_rate: Optional[float] = None
+    wait_seconds: float = 0.0
+    sampled_at: float
+
+
+def estimate_wait(
+    lanes: list[tuple[int, Optional[float]]],
+    previous: Optional[StepBacklog],
+    now: float,
+) -> StepBacklog:
+    """Return the backlog sample of a step from the ``(depth, oldest_age)`` of its lanes.
+
+    Args:
+        lanes: Depth and oldest message age of each lane.
+        previous: The previous sample of the step, if any.
+        now: Monotonic time of the sample.
+    """
+    depth = sum(lane_depth for lane_depth, _ in lanes)
+    ages = [age for _, age in lanes if age is not None]
+    oldest_message_age = max(ages) if ages else None
+    arrival_rate = sum(
+        lane_depth / age for lane_depth, age in lanes if lane_depth and age
+    )
+
+    service_rate = None
+    elapsed = now - previous.sampled_at if previous is not None else 0.0
+    if elapsed > 0:
+        service_rate = max(0.0, arrival_rate - (depth - previous.depth) / elapsed)
+
+    wait_seconds = 0.0
+    if depth:
+        if service_rate:
+            wait_seconds = depth / service_rate
+        else:
+            wait_seconds = oldest_message_age or 0.0
+    return StepBacklog(
+        depth=depth,
+        oldest_message_age=oldest_message_age,
+        service_rate=service_rate,
+        wait_seconds=wait_seconds,
+        sampled_at=now,
+    )
+
+
+class QueueBacklog:
+    """Sample the lanes of the pipeline steps and estimate their wait.
+
+    Attributes:
+        steps: Queue names of the lanes of each step, by step name.
+        ttl_seconds: Seconds a sample is served before the queues are read again.
+        latest: Most recent sample per step.
+    """
+
+    def __init__(
+        self,
+        queue_helper: AsyncStorageQueueHelper,
+        steps: dict[str, list[str]],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.queue_helper = queue_helper
+        self.steps = steps
+        self.ttl_seconds = ttl_seconds
+        self.latest: dict[str, StepBacklog] = {}
+        self._sampled_at: Optional[float] = None
+        self._sampling: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def wait_seconds(self, steps: list[str]) -> float:
+        """Return the estimated seconds a new message waits through *steps*.
+
+        The first call samples the queues; later calls return the last
+        samples and refresh them in the background once they are stale.
+        """
+        if self._sampled_at is None:
+            async with self._lock:
+                if self._sampled_at is None:
+                    await self._sample()
+        elif (
+            self._sampled_at + self.ttl_seconds <= time.monotonic()
+            and self._sampling is None
+        ):
+            self._sampling = asyncio.create_task(self._sample())
+            self._sampling.add_done_callback(self._sampled)
+        return sum(
+            self.latest[step].wait_seconds for step in steps if step in self.latest
+        )
+
+    def _sampled(self, _):
+        self._sampling = None
+
+    async def _sample(self):
+        """Sample every step; steps whose queues cannot be read keep their previous sample."""
+        for step, queue_names in self.steps.items():
+            try:
+                lanes = await asyncio.gather(*[
+                    self.queue_helper.get_queue_backlog(queue_name)
+                    for queue_name in queue_names
+                ])
+            except Exception as e:
+                logger.warning("Unable to sample the queues of %s: %s", step, e)
+                continue
+            self.latest[step] = estimate_wait(
+                list(lanes), self.latest.get(step), time.monotonic()
+            )
+        self._sampled_at = time.monotonic()
+
+    async def close(self):
+        """Cancel the sampling in progress."""
+        if self._sampling is not None:
+            self._sampling.cancel()
+            await asyncio.gather(self._sampling, return_exceptions=True)
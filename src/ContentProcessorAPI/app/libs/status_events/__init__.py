@@ -0,0 +1,15 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Push delivery of process and claim status changes.
+
+Sub-modules:
+    broker: StatusEvent and the in-process StatusBroker that fans events
+        out to the requests following a process or claim.
+    cache: StatusCache, the short-lived process status cache the broker
+        invalidates.
+    pump: StatusEventPump, which feeds the broker from the status-events
+        queue the pipeline workers publish to.
+    stream: follow_status / wait_for_status_change, shared by the SSE,
+        WebSocket and long-poll endpoints.
+"""
@@ -0,0 +1,76 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""In-process publish/subscribe of status-change events.
+
+Every SSE, WebSocket or long-poll request subscribes to the process or
+claim it follows; ``StatusEventPump`` and the routers publish the changes
+they learn about. Subscriber queues are bounded: a slow client loses its
+oldest pending events, never blocks the publisher.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from pydantic import BaseModel
+
+# Pending events per subscriber before the oldest are dropped.
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+class StatusEvent(BaseModel):
+    """A status change of a content process or claim process.
+
+    Attributes:
+        kind: ``"process"`` or ``"claim"``.
+        id: Process ID or claim ID.
+        status: The new status.
+        time: When the status was written.
+    """
+
+    kind: str
+    id: str
+    status: str
+    time: Optional[datetime] = None
+
+
+class StatusBroker:
+    """Fan status events out to the subscribers of each process or claim."""
+
+    def __init__(self):
+        self._subscribers: dict[tuple[str, str], set[asyncio.Queue]] = {}
+        self._listeners: list[Callable[[StatusEvent], None]] = []
+
+    def add_listener(self, listener: Callable[[StatusEvent], None]):
+        """Call *listener* with every published event (e.g. to invalidate caches)."""
+        self._listeners.append(listener)
+
+    def publish(self, event: StatusEvent):
+        """Deliver *event* to every subscriber of its process or claim."""
+        for listener in self._listeners:
+            listener(event)
+        for queue in self._subscribers.get((event.kind, event.id), ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @contextmanager
+    def subscribe(self, kind: str, id: str) -> Iterator[asyncio.Queue]:
+        """Yield a queue receiving the events of *id* until the block exits."""
+        key = (kind, id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(key, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[key]
+
+    def subscriber_count(self) -> int:
+        """Return the number of open subscriptions."""
+        return sum(len(queues) for queues in self._subscribers.values())
@@ -0,0 +1,71 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Short-lived cache of process statuses.
+
+Most status reads return an unchanged ``processing`` value. The cache
+answers them for ``ttl_seconds`` without a Cosmos DB read; an entry is
+dropped as soon as a status event of its process arrives or the API
+itself writes the process. Events of changes made on another replica may
+not reach this one, so the TTL bounds how stale an entry can be.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.libs.status_events.broker import StatusEvent
+
+# Seconds a status is served from the cache.
+DEFAULT_TTL_SECONDS = 5.0
+# Entries kept before the least recently stored are evicted.
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class StatusCache:
+    """Cache the status record of each process for a few seconds.
+
+    Attributes:
+        ttl_seconds: Seconds an entry is served (0 disables the cache).
+        max_entries: Entries kept before the oldest are evicted.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(
+        self, process_id: str, load: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """Return the cached record of *process_id*, or ``load()`` it.
+
+        ``None`` (process not found) is not cached.
+        """
+        entry = self._entries.get(process_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        record = await load()
+        if record is None or self.ttl_seconds <= 0:
+            self._entries.pop(process_id, None)
+            return record
+
+        self._entries[process_id] = (time.monotonic() + self.ttl_seconds, record)
+        self._entries.move_to_end(process_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return record
+
+    def invalidate(self, process_id: str):
+        """Drop the entry of *process_id*."""
+        self._entries.pop(process_id, None)
+
+    def on_event(self, event: StatusEvent):
+        """Broker listener: drop the entry of the process whose status changed."""
+        if event.kind == "process":
+            self.invalidate(event.id)
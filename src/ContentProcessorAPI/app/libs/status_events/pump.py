@@ -0,0 +1,128 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Feed the status broker from the status-events queue.
+
+The content-processing workers and the claim workflow send an event to
+the status-events Storage Queue each time they write a new status. The
+pump receives those events in the background and publishes them to the
+``StatusBroker``.
+
+Storage Queue consumers compete for messages: with several API replicas
+each replica receives only part of the events. The status streams
+therefore also re-read the status from Cosmos DB every
+``app_status_stream_reconcile_seconds``, which bounds how late a client
+on another replica learns about a change.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from azure.core.exceptions import ResourceExistsError
+from azure.storage.queue.aio import QueueClient
+from pydantic import ValidationError
+
+from app.libs.application.application_context import AppContext
+from app.libs.status_events.broker import StatusBroker, StatusEvent
+from app.utils.azure_credential_utils import get_azure_credential_async
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before polling the queue again once it is empty.
+IDLE_SECONDS = 1.0
+# Seconds to wait after a failed receive before retrying.
+ERROR_BACKOFF_SECONDS = 10.0
+# Events received per request (the Storage Queue maximum).
+MESSAGES_PER_PAGE = 32
+
+
+class StatusEventPump:
+    """Receive status events from the queue and publish them to the broker.
+
+    Attributes:
+        broker: Broker the events are published to.
+        queue_client: aio client of the status-events queue, or ``None``
+            when no queue is configured.
+    """
+
+    def __init__(
+        self,
+        broker: StatusBroker,
+        account_url: str,
+        queue_name: str,
+        credential: Any = None,
+    ):
+        self.broker = broker
+        self.credential = credential
+        self.queue_client: Optional[QueueClient] = None
+        if account_url and queue_name:
+            self.queue_client = QueueClient(
+                account_url=account_url, queue_name=queue_name, credential=credential
+            )
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def create_async(cls, app_context: AppContext) -> "StatusEventPump":
+        """Create and start a pump authenticated with an async Azure credential."""
+        config = app_context.configuration
+        pump = cls(
+            broker=app_context.get_service(StatusBroker),
+            account_url=config.app_storage_queue_url,
+            queue_name=config.app_status_events_queue,
+            credential=await get_azure_credential_async(),
+        )
+        await pump.start()
+        return pump
+
+    async def start(self):
+        """Create the queue if needed and start receiving in the background."""
+        if self.queue_client is None or self._task is not None:
+            return
+        try:
+            await self.queue_client.create_queue()
+        except ResourceExistsError:
+            pass
+        except Exception as e:
+            # Streams still follow statuses through their Cosmos DB reads.
+            logger.warning("Unable to create the status-events queue: %s", e)
+        self._task = asyncio.create_task(self._run())
+
+    async def pump_once(self) -> int:
+        """Publish one page of queued events and return how many were received."""
+        received = 0
+        async for message in self.queue_client.receive_messages(
+            messages_per_page=MESSAGES_PER_PAGE, max_messages=MESSAGES_PER_PAGE
+        ):
+            received += 1
+            try:
+                self.broker.publish(StatusEvent.model_validate_json(message.content))
+            except ValidationError as e:
+                logger.warning("Discarding malformed status event: %s", e)
+            await self.queue_client.delete_message(message)
+        return received
+
+    async def _run(self):
+        while True:
+            try:
+                if not await self.pump_once():
+                    await asyncio.sleep(IDLE_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Unable to receive status events: %s", e)
+                await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+    async def close(self):
+        """Stop receiving and close the queue client and the credential."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.queue_client is not None:
+            await self.queue_client.close()
+        if self.credential is not None:
+            await self.credential.close()
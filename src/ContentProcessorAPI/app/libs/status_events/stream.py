@@ -0,0 +1,122 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Follow the status of a process or claim until it reaches a final state.
+
+Changes arrive from the ``StatusBroker``; between events the status is
+re-read from Cosmos DB every *reconcile_seconds*, so a change whose event
+was lost or delivered to another replica is still noticed. That read
+replaces the per-client polling of the status endpoints: one read per
+follower every *reconcile_seconds* instead of one every few seconds.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, Collection, Optional
+
+from app.libs.status_events.broker import StatusBroker
+
+# A stream ends after this many seconds; SSE and WebSocket clients reconnect.
+MAX_STREAM_SECONDS = 900
+
+ReadStatus = Callable[[], Awaitable[Optional[str]]]
+
+
+async def follow_status(
+    broker: StatusBroker,
+    kind: str,
+    id: str,
+    read_status: ReadStatus,
+    terminal: Collection[str],
+    last_status: Optional[str] = None,
+    reconcile_seconds: float = 15,
+    max_seconds: float = MAX_STREAM_SECONDS,
+) -> AsyncIterator[Optional[str]]:
+    """Yield each new status of *id*, starting with the current one.
+
+    ``None`` is yielded when a reconciliation read finds no change, so
+    callers can send a keep-alive. The iteration ends after a status in
+    *terminal*, when *read_status* returns ``None`` (the record is gone) or
+    after *max_seconds*.
+
+    Args:
+        broker: Broker delivering the status events.
+        kind: ``"process"`` or ``"claim"``.
+        id: Process ID or claim ID.
+        read_status: Reads the current status from Cosmos DB.
+        terminal: Statuses after which the status no longer changes.
+        last_status: Status the caller already knows; not yielded again.
+        reconcile_seconds: Seconds between reads when no event arrives.
+        max_seconds: Seconds after which the iteration ends.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    # Subscribe before the first read so no change slips in between.
+    with broker.subscribe(kind, id) as events:
+        status = await read_status()
+        reconciled = True
+        while status is not None:
+            if status != last_status:
+                last_status = status
+                yield status
+                if status in terminal:
+                    return
+            elif reconciled:
+                yield None
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(
+                    events.get(), timeout=min(reconcile_seconds, remaining)
+                )
+                status, reconciled = event.status, False
+            except asyncio.TimeoutError:
+                status, reconciled = await read_status(), True
+
+
+async def wait_for_status_change(
+    broker: StatusBroker,
+    kind: str,
+    id: str,
+    read_status: ReadStatus,
+    terminal: Collection[str],
+    last_status: str,
+    timeout: float,
+    reconcile_seconds: float = 15,
+) -> None:
+    """Return once the status of *id* differs from *last_status*.
+
+    Also returns when the record is gone or after *timeout* seconds; the
+    caller reads the status it responds with afterwards.
+    """
+    async for status in follow_status(
+        broker,
+        kind,
+        id,
+        read_status,
+        terminal,
+        last_status=last_status,
+        reconcile_seconds=reconcile_seconds,
+        max_seconds=timeout,
+    ):
+        if status is not None:
+            return
+
+
+# Response headers of a Server-Sent Events stream; disables proxy buffering.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+SSE_KEEP_ALIVE = ": keep-alive\n\n"
+
+
+async def sse_status_events(
+    statuses: AsyncIterator[Optional[str]], payload: Callable[[str], dict]
+) -> AsyncIterator[str]:
+    """Format the output of ``follow_status`` as Server-Sent Events."""
+    async for status in statuses:
+        if status is None:
+            yield SSE_KEEP_ALIVE
+        else:
+            yield f"event: status\ndata: {json.dumps(payload(status))}\n\n"
@@ -4,23 +4,50 @@
 """FastAPI router for claim batch lifecycle management.
 
 Exposes endpoints for creating claim containers, uploading files into them,
-submitting batches for processing, and querying/deleting claim results.
+submitting batches for processing, following their status (polling, long
+polling, Server-Sent Events or WebSocket), and querying/deleting claim
+results.
 Delegates business logic to ClaimBatchProcessor and persists state via
 ClaimBatchProcessRepository.
 """
 
+import asyncio
 import logging
 import uuid
 from enum import Enum
-
-from fastapi import APIRouter, Body, File, Request, UploadFile
-from fastapi.responses import JSONResponse
+from typing import Optional
+
+from azure.core.exceptions import ResourceModifiedError
+from fastapi import (
+    APIRouter,
+    Body,
+    File,
+    Query,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from opentelemetry import trace
 from sas.cosmosdb.base.repository_base import SortDirection
 from sas.cosmosdb.mongo.repository import SortField
 
+from app.libs.azure.storage_blob.deletion_jobs import DeletionJob, DeletionJobs
 from app.libs.base.typed_fastapi import TypedFastAPI
 from app.libs.logging.event_utils import track_event_if_configured
+from app.libs.status_events.broker import StatusBroker
+from app.libs.status_events.stream import (
+    SSE_HEADERS,
+    follow_status,
+    sse_status_events,
+    wait_for_status_change,
+)
+from app.routers.logics.admission import (
+    AdmissionControl,
+    caller_of,
+    too_many_requests,
+)
 from app.routers.logics.claimbatchpocessor import (
     ClaimBatchProcessor,
     ClaimBatchProcessRepository,
@@ -50,6 +77,9 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Claim statuses after which the workflow no longer changes the status.
+CLAIM_TERMINAL_STATUSES = (Claim_Steps.COMPLETED.value, Claim_Steps.FAILED.value)
+
 
 class claimprocessor_router_paths(str, Enum):
     create_claim = "/claims"
@@ -60,9 +90,12 @@ class claimprocessor_router_paths(str, Enum):
     start_process = "/claims"
     get_all_processed_batches = "/claims/processed"
     status = "/claims/{claim_id}/status"
+    status_events = "/claims/{claim_id}/status/events"
+    status_ws = "/claims/{claim_id}/status/ws"
     delete = "/claims/{claim_id}"
     add_comment = "/claims/{claim_id}/comment"
     retrieve_claim_details = "/claims/{claim_id}"
+    deletion_job = "/deletions/{job_id}"
 
 
 @router.put(
@@ -154,27 +187,50 @@ async def get_claim_manifest(claim_id: str, request: Request = None):
 
     ## Parameters
     - **claim_id** (path): Claim identifier.
+    - **background** (query, optional): When true, the container is deleted by a
+      background job; the response is `202 Accepted` with the job, followed at
+      `GET /claimprocessor/deletions/{job_id}`.
 
     ## Example Request Body
     Not applicable. This is a DELETE endpoint and does not accept a request body.
 
     Example request:
-    `DELETE /claimprocessor/claims/{claim_id}`
+    `DELETE /claimprocessor/claims/{claim_id}?background=true`
     """,
 )
-async def delete_claim_container(claim_id: str, request: Request = None):
+async def delete_claim_container(
+    claim_id: str,
+    background: bool = Query(
+        False, description="Delete the container in a background job."
+    ),
+    request: Request = None,
+):
     """Delete a claim container and its associated batch-process record."""
     app: TypedFastAPI = request.app  # type: ignore
 
     claim_processor: ClaimBatchProcessor = app.app_context.get_service(
         ClaimBatchProcessor
     )
-    try:
-        claim_processor.delete_claim_container(claim_id=claim_id)
-    except Exception as ex:
-        # Best-effort cleanup: continue deleting the claim-process record even if
-        # the backing claim container is already missing or cannot be deleted.
-        print(f"Failed to delete claim container for '{claim_id}': {ex}")
+    job = None
+    if background:
+        deletion_jobs: DeletionJobs = await app.app_context.get_service_async(
+            DeletionJobs
+        )
+        job = deletion_jobs.start(
+            claim_id,
+            lambda on_progress: asyncio.to_thread(
+                claim_processor.delete_claim_container, claim_id, on_progress
+            ),
+        )
+    else:
+        try:
+            await asyncio.to_thread(
+                claim_processor.delete_claim_container, claim_id=claim_id
+            )
+        except Exception as ex:
+            # Best-effort cleanup: continue deleting the claim-process record even if
+            # the backing claim container is already missing or cannot be deleted.
+            print(f"Failed to delete claim container for '{claim_id}': {ex}")
 
     batch_process_repository: ClaimBatchProcessRepository = app.app_context.get_service(
         ClaimBatchProcessRepository
@@ -191,6 +247,19 @@ async def delete_claim_container(claim_id: str, request: Request = None):
 
     await batch_process_repository.delete_async(key=claim_id)
 
+    if job is not None:
+        status_url = f"/claimprocessor/deletions/{job.job_id}"
+        return JSONResponse(
+            status_code=202,
+            headers={"Location": status_url},
+            content={
+                "status": "success",
+                "message": f"Claim process with ID : '{claim_id}' has been deleted; its container is being deleted.",
+                "status_url": status_url,
+                "deletion_job": job.model_dump(mode="json"),
+            },
+        )
+
     return JSONResponse(
         status_code=200,
         content={
@@ -200,6 +269,42 @@ async def delete_claim_container(claim_id: str, request: Request = None):
     )
 
 
+@router.get(
+    claimprocessor_router_paths.deletion_job,
+    response_model=DeletionJob,
+    summary="Get the status of a background claim deletion",
+    description="""
+    Returns the progress of a background container deletion started by
+    `DELETE /claimprocessor/claims/{claim_id}?background=true`.
+
+    Jobs are kept for an hour after they finish.
+
+    ## Parameters
+    - **job_id** (path): Deletion job ID.
+
+    ## Example Request Body
+    Not applicable. This is a GET endpoint and does not accept a request body.
+
+    Example request:
+    `GET /claimprocessor/deletions/{job_id}`
+    """,
+)
+async def get_deletion_job(job_id: str, request: Request = None):
+    """Return the deletion job *job_id*."""
+    app: TypedFastAPI = request.app  # type: ignore
+    deletion_jobs: DeletionJobs = await app.app_context.get_service_async(DeletionJobs)
+    job = deletion_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "failed",
+                "message": f"Deletion job '{job_id}' not found.",
+            },
+        )
+    return job
+
+
 @router.post(
     claimprocessor_router_paths.add_file_to_claim,
     summary="Upload a file to a claim",
@@ -207,6 +312,10 @@ async def delete_claim_container(claim_id: str, request: Request = None):
     Uploads a file into an existing claim container.
 
     The API reuses the same strict upload validation as the content processor submit endpoint.
+    The file is streamed to blob storage in concurrently staged blocks; the response reports
+    its size and SHA-256. Several files can be uploaded to the same claim in parallel: the
+    claim manifest is updated with ETag-conditional writes, so no file is lost. `409` is
+    returned in the unlikely case the manifest kept changing; the upload can then be retried.
     The request must be sent as `multipart/form-data` with:
     - a JSON part (named `data`) identifying the claim and schema/metadata IDs
     - a file part (named `file`)
@@ -254,38 +363,53 @@ async def add_file_to_claim(
             },
         )
 
-    safe_filename, expected_mime_type, size_bytes = validated
-    file_bytes = await file.read()
+    safe_filename, expected_mime_type, _ = validated
 
     batch_processor: ClaimBatchProcessor = app.app_context.get_service(
         ClaimBatchProcessor
     )
-    batch_processor.add_file_to_claim(
+    # Staged block uploads run on a worker thread, off the event loop.
+    uploaded = await asyncio.to_thread(
+        batch_processor.add_file_to_claim,
         claim_id=claim_id,
         file_name=safe_filename,
-        file_content=file_bytes,
+        file_stream=file.file,
+        content_type=expected_mime_type,
     )
 
-    batch_processor.add_claim_item(
-        claim_id=claim_id,
-        claim_item=ClaimItem(
-            id=str(uuid.uuid4()),
+    # Concurrent uploads to the claim retry the manifest update (ETag
+    # condition); the retries sleep, so they also run off the event loop.
+    try:
+        await asyncio.to_thread(
+            batch_processor.add_claim_item,
             claim_id=claim_id,
-            schema_id=data.Schema_Id,
-            metadata_id=data.Metadata_Id,
-            file_name=safe_filename,
-            size=size_bytes,
-            mime_type=expected_mime_type,
-        ),
-    )
+            claim_item=ClaimItem(
+                id=str(uuid.uuid4()),
+                claim_id=claim_id,
+                schema_id=data.Schema_Id,
+                metadata_id=data.Metadata_Id,
+                file_name=safe_filename,
+                size=uploaded.size,
+                mime_type=expected_mime_type,
+            ),
+        )
+    except ResourceModifiedError:
+        return JSONResponse(
+            status_code=409,
+            content={
+                "status": "failed",
+                "message": "The claim is being updated by too many uploads; retry the upload.",
+            },
+        )
 
     return JSONResponse(
         status_code=200,
         content={
             "batch_id": claim_id,
             "file_name": safe_filename,
-            "size": size_bytes,
+            "size": uploaded.size,
             "mime_type": expected_mime_type,
+            "sha256": uploaded.sha256,
         },
     )
 
@@ -297,6 +421,8 @@ async def add_file_to_claim(
     Submits a claim batch Id for processing to the Claim Processor.
 
     This validates the batch ID and enqueues a processing message.
+    While the estimated wait in the claim and processing queues is above the caller's
+    threshold, the request is refused with `429 Too Many Requests` and a `Retry-After` header.
 
     ## Parameters
     - **batch_process_id** (body): Batch process ID to enqueue for processing.
@@ -321,6 +447,13 @@ async def start_claim_process(
     """
     app: TypedFastAPI = request.app  # type: ignore
 
+    admission_control: AdmissionControl = await app.app_context.get_service_async(
+        AdmissionControl
+    )
+    admission = await admission_control.admit(caller_of(request), claim=True)
+    if not admission.admitted:
+        return too_many_requests(admission)
+
     batch_processor: ClaimBatchProcessor = app.app_context.get_service(
         ClaimBatchProcessor
     )
@@ -385,6 +518,11 @@ async def start_claim_process(
     This endpoint is designed for asynchronous processing. Submit a batch and poll this endpoint
     until processing completes.
 
+    Instead of polling, pass `wait` and `last_status` (long polling): the response is held until
+    the status differs from `last_status` or `wait` seconds elapse. Clients that can keep a
+    connection open should rather follow `/claimprocessor/claims/{claim_id}/status/events`
+    (Server-Sent Events) or `/claimprocessor/claims/{claim_id}/status/ws` (WebSocket).
+
     Common outcomes:
     - `200`: Still processing.
     - `304`: Completed.
@@ -392,21 +530,39 @@ async def start_claim_process(
 
     ## Parameters
     - **claim_id** (path): Claim batch process ID.
+    - **wait** (query, optional): Seconds (0-60) to wait for a status other than `last_status`.
+    - **last_status** (query, optional): Status the client already has; required by `wait`.
 
     ## Example Request Body
     Not applicable. This is a GET endpoint and does not accept a request body.
 
     Example request:
-    `GET /claimprocessor/claims/{claim_id}/status`
+    `GET /claimprocessor/claims/{claim_id}/status?wait=30&last_status=Summarizing`
     """,
 )
-async def get_claim_status(claim_id: str, request: Request = None):
+async def get_claim_status(
+    claim_id: str,
+    wait: int = Query(default=0, ge=0, le=60),
+    last_status: Optional[str] = None,
+    request: Request = None,
+):
     """Return the current processing status for a claim batch."""
     app: TypedFastAPI = request.app  # type: ignore
 
     claim_process_repository: ClaimBatchProcessRepository = app.app_context.get_service(
         ClaimBatchProcessRepository
     )
+    if wait and last_status:
+        await wait_for_status_change(
+            app.app_context.get_service(StatusBroker),
+            "claim",
+            claim_id,
+            _claim_status_reader(claim_process_repository, claim_id),
+            CLAIM_TERMINAL_STATUSES,
+            last_status=last_status,
+            timeout=wait,
+            reconcile_seconds=app.app_context.configuration.app_status_stream_reconcile_seconds,
+        )
     claim_process: Claim_Process = await claim_process_repository.get_async(claim_id)
     if not claim_process:
         return JSONResponse(
@@ -447,6 +603,107 @@ async def get_claim_status(claim_id: str, request: Request = None):
             )
 
 
+def _claim_status_reader(
+    claim_process_repository: ClaimBatchProcessRepository, claim_id: str
+):
+    """Return a reader of the current status of *claim_id*."""
+
+    async def read_status() -> Optional[str]:
+        claim_process = await claim_process_repository.get_async(claim_id)
+        return Claim_Steps(claim_process.status).value if claim_process else None
+
+    return read_status
+
+
+@router.get(
+    claimprocessor_router_paths.status_events,
+    summary="Stream claim batch processing status (Server-Sent Events)",
+    description="""
+    Streams the processing status of a claim batch as Server-Sent Events, so clients do not
+    need to poll `/claimprocessor/claims/{claim_id}/status`.
+
+    Each status change is sent as an `event: status` whose data is
+    `{"claim_id": "<claim_id>", "status": "<status>"}`, starting with the current status.
+    The stream ends after `Completed` or `Failed`, or after 15 minutes (`EventSource` clients
+    reconnect automatically). Comment lines (`: keep-alive`) are sent while nothing changes.
+
+    Returns `404` if the claim batch process ID is not found.
+
+    ## Parameters
+    - **claim_id** (path): Claim batch process ID.
+
+    Example request:
+    `GET /claimprocessor/claims/{claim_id}/status/events`
+    """,
+)
+async def stream_claim_status(claim_id: str, request: Request = None):
+    """Stream status changes of *claim_id* as Server-Sent Events."""
+    app: TypedFastAPI = request.app  # type: ignore
+
+    read_status = _claim_status_reader(
+        app.app_context.get_service(ClaimBatchProcessRepository), claim_id
+    )
+    if await read_status() is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "Not Found",
+                "message": f"Claim process with ID {claim_id} not found.",
+            },
+        )
+
+    statuses = follow_status(
+        app.app_context.get_service(StatusBroker),
+        "claim",
+        claim_id,
+        read_status,
+        CLAIM_TERMINAL_STATUSES,
+        reconcile_seconds=app.app_context.configuration.app_status_stream_reconcile_seconds,
+    )
+    return StreamingResponse(
+        sse_status_events(
+            statuses, lambda status: {"claim_id": claim_id, "status": status}
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.websocket(claimprocessor_router_paths.status_ws)
+async def claim_status_websocket(websocket: WebSocket, claim_id: str):
+    """Send status changes of *claim_id* over a WebSocket.
+
+    Each change is sent as ``{"claim_id": ..., "status": ...}``, starting
+    with the current status; the server closes the socket after
+    ``Completed`` or ``Failed``. An unknown claim ID is refused with close
+    code 4404.
+    """
+    app: TypedFastAPI = websocket.app  # type: ignore
+
+    read_status = _claim_status_reader(
+        app.app_context.get_service(ClaimBatchProcessRepository), claim_id
+    )
+    if await read_status() is None:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    try:
+        async for status in follow_status(
+            app.app_context.get_service(StatusBroker),
+            "claim",
+            claim_id,
+            read_status,
+            CLAIM_TERMINAL_STATUSES,
+            reconcile_seconds=app.app_context.configuration.app_status_stream_reconcile_seconds,
+        ):
+            if status is not None:
+                await websocket.send_json({"claim_id": claim_id, "status": status})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.delete(
     claimprocessor_router_paths.delete,
     summary="Delete claim batch process",
@@ -3,33 +3,68 @@
 
 """FastAPI router for single-file content processing.
 
-Exposes endpoints for submitting documents, polling processing status,
+Exposes endpoints for submitting documents (one at a time or in batches),
+following processing status
+(polling, long polling, Server-Sent Events or WebSocket),
 retrieving/updating/deleting processed results, and streaming the
-original uploaded file.  Persists state in Cosmos DB and Azure Blob Storage.
+original uploaded file.  Persists state in Cosmos DB and Azure Blob Storage
+through the non-blocking ``ContentProcessor`` singleton.
 """
 
+import asyncio
 import datetime
-import io
+import json
 import logging
 import urllib.parse
 import uuid
 from enum import Enum
-
-from fastapi import APIRouter, Body, File, HTTPException, Request, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from opentelemetry import trace
 from pymongo.results import UpdateResult
 
+from app.libs.azure.storage_blob.deletion_jobs import DeletionJob, DeletionJobs
 from app.libs.base.typed_fastapi import TypedFastAPI
 from app.libs.logging.event_utils import track_event_if_configured
+from app.libs.status_events.broker import StatusBroker
+from app.libs.status_events.stream import (
+    SSE_HEADERS,
+    follow_status,
+    sse_status_events,
+    wait_for_status_change,
+)
 from app.routers.logics.claimbatchpocessor import ClaimBatchProcessRepository
+from app.utils.http_cache import (
+    is_conditional,
+    is_not_modified,
+    not_modified,
+    validator_headers,
+)
+from app.utils.http_range import content_range, parse_range
 from app.utils.mime_types import MimeTypesDetection
 from app.utils.upload_validation import (
+    validate_file_for_processing,
     validate_upload_for_processing,
 )
 
+from .logics.admission import AdmissionControl, caller_of, too_many_requests
 from .logics.contentprocessor import (
+    PROCESS_TERMINAL_STATUSES,
     ContentProcessor,
+    process_validators,
+    resolve_priority,
 )
 from .models.contentprocessor.content_process import (
     ContentProcess as CosmosContentProcess,
@@ -41,17 +76,23 @@ from .models.contentprocessor.model import (
     ArtifactType,
     ContentCommentUpdate,
     ContentProcess,
+    ContentProcessorBatchRequest,
     ContentProcessorRequest,
     ContentResultDelete,
     ContentResultUpdate,
-    Paging,
     ProcessFile,
+    ProcessListRequest,
+    ReprocessBatchRequest,
+    ReprocessRequest,
     Status,
     Steps,
 )
 
 logger = logging.getLogger(__name__)
 
+# Files of a batch submission stored in blob storage at the same time.
+BATCH_CONCURRENCY = 8
+
 router = APIRouter(
     prefix="/contentprocessor",
     tags=["contentprocessor"],
@@ -61,7 +102,10 @@ router = APIRouter(
 
 class contentprocess_router_paths(str, Enum):
     submit = "/submit"
+    submit_batch = "/submit/batch"
     status = "/status/{process_id}"
+    status_events = "/status/{process_id}/events"
+    status_ws = "/status/{process_id}/ws"
     delete = "/delete"
     update = "/update"
     comment = "/comment"
@@ -72,6 +116,9 @@ class contentprocess_router_paths(str, Enum):
     processed_steps_content_by_process_id = "/processed/{process_id}/steps"
     processed_content_update_by_process_id = "/processed/{process_id}"
     processed_content_delete_by_process_id = "/processed/{process_id}"
+    reprocess_by_process_id = "/processed/{process_id}/reprocess"
+    reprocess = "/reprocess"
+    deletion_job = "/deletions/{job_id}"
 
 
 @router.post(
@@ -79,43 +126,106 @@ class contentprocess_router_paths(str, Enum):
     response_model=PaginatedResponse,
     summary="List processed contents (paginated)",
     description="""
-        Returns a list of processed content records with pagination support.
+        Returns a list of processed content records with pagination support, newest first.
 
         This endpoint is commonly used to build a “Processed Contents” list screen.
 
         ## Parameters
-        Pagination is provided in the request body.
+        Pagination and filters are provided in the request body.
 
         - **page_number**: The page number to retrieve (1-based index).
-        - **page_size**: The number of items per page.
-
-        Both fields are required and must be greater than 0.
+        - **page_size**: The number of items per page (greater than 0).
+        - **continuation_token** (optional): The `continuation_token` of the previous page.
+          The next page is then read right after it, in constant time at any depth;
+          `page_number` only labels the page. The last page has no token.
+        - **status**, **schema_id** (optional): Only list processes in this status / mapped
+          with this schema.
+        - **imported_from**, **imported_to** (optional): Only list processes imported in
+          this time range (`imported_to` excluded).
+
+        `total_count` and `total_pages` are approximate: the count is cached for a minute
+        and refreshed in the background. A token used with other filters than those of
+        its page is rejected with `400`.
 
         ## Example Request Body
         ```json
         {
-            "page_number": 1,
-            "page_size": 10
+            "page_number": 2,
+            "page_size": 10,
+            "status": "Completed",
+            "continuation_token": "<continuation_token of page 1>"
         }
         ```
     """,
 )
 async def get_all_processed_results(
-    page_request: Paging,
+    page_request: ProcessListRequest,
     request: Request = None,
 ) -> PaginatedResponse:
     """Return a paginated list of processed content records."""
     app: TypedFastAPI = request.app  # type: ignore
 
-    paged_cosmos_content_process = CosmosContentProcess.get_all_processes_from_cosmos(
-        connection_string=app.app_context.configuration.app_cosmos_connstr,
-        database_name=app.app_context.configuration.app_cosmos_database,
-        collection_name=app.app_context.configuration.app_cosmos_container_process,
-        page_number=page_request.page_number if page_request else 0,
-        page_size=page_request.page_size if page_request else 0,
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
     )
+    try:
+        return await content_processor.get_all_processes_from_cosmos(
+            page_number=page_request.page_number,
+            page_size=page_request.page_size,
+            continuation_token=page_request.continuation_token,
+            status=page_request.status,
+            schema_id=page_request.schema_id,
+            imported_from=page_request.imported_from,
+            imported_to=page_request.imported_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return paged_cosmos_content_process
+
+def _new_process_message(
+    process_id: str,
+    file_name: str,
+    size: int,
+    mime_type: str,
+    schema_id: str,
+    metadata_id: str,
+    priority: Optional[str],
+) -> ContentProcess:
+    """Return the extraction message of a newly submitted file."""
+    return ContentProcess(**{
+        "process_id": process_id,
+        "files": [
+            ProcessFile(**{
+                "process_id": process_id,
+                "id": str(uuid.uuid4()),
+                "name": file_name,
+                "size": size,
+                "mime_type": mime_type,
+                "artifact_type": ArtifactType.SourceContent,
+                "processed_by": "API",
+            }),
+        ],
+        "pipeline_status": Status(**{
+            "process_id": process_id,
+            "schema_id": schema_id,
+            "metadata_id": metadata_id,
+            "priority": priority,
+            "creation_time": datetime.datetime.now(datetime.timezone.utc),
+            "steps": [
+                Steps.Extract,
+                Steps.Mapping,
+                Steps.Evaluating,
+                Steps.Save,
+            ],
+            "remaining_steps": [
+                Steps.Extract,
+                Steps.Mapping,
+                Steps.Evaluating,
+                Steps.Save,
+            ],
+            "completed_steps": [],
+        }),
+    })
 
 
 @router.post(
@@ -125,7 +235,11 @@ async def get_all_processed_results(
     Submits a single file to the content processor.
 
     The API validates the upload (filename sanitization, MIME sniffing, Content-Type checks,
-    and size limits) before saving the file and enqueuing processing.
+    and size limits) before saving the file and enqueuing processing. The file is streamed to
+    blob storage in concurrently staged blocks; the response reports its SHA-256.
+
+    While the estimated wait in the processing queues is above the caller's threshold, the
+    request is refused with `429 Too Many Requests` and a `Retry-After` header.
 
     The request must be sent as `multipart/form-data` with:
     - a JSON part (named `data`) that contains schema/metadata IDs
@@ -134,6 +248,8 @@ async def get_all_processed_results(
     ## Parameters
     - **Schema_Id** (body): Registered schema ID (UUID string).
     - **Metadata_Id** (body): Metadata identifier for the request.
+    - **Priority** (body, optional): Processing lane, `high`, `normal` or `low`.
+      Small files without a priority are processed as `high`.
     - **file** (form): PDF or image file (JPEG, BMP, GIF, PNG, TIFF). Max size: 20 MB.
 
     ## Example Request Body
@@ -154,6 +270,13 @@ async def Submit_File_With_MetaData(
     before persisting to blob storage and enqueuing the processing message.
     """
     app: TypedFastAPI = request.app  # type: ignore
+    admission_control: AdmissionControl = await app.app_context.get_service_async(
+        AdmissionControl
+    )
+    admission = await admission_control.admit(caller_of(request))
+    if not admission.admitted:
+        return too_many_requests(admission)
+
     validated = await validate_upload_for_processing(
         upload=file,
         max_filesize_mb=app.app_context.configuration.app_cps_max_filesize_mb,
@@ -167,47 +290,35 @@ async def Submit_File_With_MetaData(
 
     schema_id = data.Schema_Id
     metadata_id = data.Metadata_Id
+    priority = resolve_priority(
+        data.Priority,
+        size_bytes,
+        app.app_context.configuration.app_priority_small_document_kb,
+    )
 
-    content_processor: ContentProcessor = app.app_context.get_service(ContentProcessor)
-    content_processor.save_file_to_blob(
-        process_id=process_id, file=file.file, file_name=safe_filename
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    uploaded = await content_processor.save_file_to_blob(
+        process_id=process_id,
+        file=file,
+        file_name=safe_filename,
+        content_type=expected_for_ext,
     )
 
-    submit_queue_message = ContentProcess(**{
-        "process_id": process_id,
-        "files": [
-            ProcessFile(**{
-                "process_id": process_id,
-                "id": str(uuid.uuid4()),
-                "name": safe_filename,
-                "size": size_bytes,
-                "mime_type": expected_for_ext,
-                "artifact_type": ArtifactType.SourceContent,
-                "processed_by": "API",
-            }),
-        ],
-        "pipeline_status": Status(**{
-            "process_id": process_id,
-            "schema_id": schema_id,
-            "metadata_id": metadata_id,
-            "creation_time": datetime.datetime.now(datetime.timezone.utc),
-            "steps": [
-                Steps.Extract,
-                Steps.Mapping,
-                Steps.Evaluating,
-                Steps.Save,
-            ],
-            "remaining_steps": [
-                Steps.Extract,
-                Steps.Mapping,
-                Steps.Evaluating,
-                Steps.Save,
-            ],
-            "completed_steps": [],
-        }),
-    })
+    submit_queue_message = _new_process_message(
+        process_id,
+        safe_filename,
+        uploaded.size,
+        expected_for_ext,
+        schema_id,
+        metadata_id,
+        priority.value if priority else None,
+    )
 
-    content_processor.enqueue_message(submit_queue_message)
+    await content_processor.enqueue_message(
+        submit_queue_message, priority.value if priority else None
+    )
 
     # Add process tracking to the current request span
     span = trace.get_current_span()
@@ -221,22 +332,21 @@ async def Submit_File_With_MetaData(
         "file_name": safe_filename,
         "schema_id": schema_id,
         "metadata_id": metadata_id,
-        "size_bytes": str(size_bytes),
+        "size_bytes": str(uploaded.size),
+        "sha256": uploaded.sha256,
     })
 
-    file_size_mb = size_bytes / (1024 * 1024)
+    file_size_mb = uploaded.size / (1024 * 1024)
 
     status_url = f"/contentprocessor/status/{process_id}"
 
-    CosmosContentProcess(
-        process_id=process_id,
-        processed_file_name=safe_filename,
-        status="processing",
-        imported_time=datetime.datetime.now(datetime.timezone.utc),
-    ).update_process_status_to_cosmos(
-        connection_string=app.app_context.configuration.app_cosmos_connstr,
-        database_name=app.app_context.configuration.app_cosmos_database,
-        collection_name=app.app_context.configuration.app_cosmos_container_process,
+    await content_processor.update_process_status_to_cosmos(
+        CosmosContentProcess(
+            process_id=process_id,
+            processed_file_name=safe_filename,
+            status="processing",
+            imported_time=datetime.datetime.now(datetime.timezone.utc),
+        )
     )
     return JSONResponse(
         status_code=202,
@@ -245,10 +355,263 @@ async def Submit_File_With_MetaData(
             "message": f"File '{safe_filename}' of size {file_size_mb:.2f} MB received with metadata: {data} \n The file is being processed.",
             "process_id": process_id,
             "status_url": status_url,
+            "sha256": uploaded.sha256,
         },
     )
 
 
+def _blob_url_file_name(blob_url: str) -> str:
+    """Return the file name of the blob at *blob_url*."""
+    return urllib.parse.unquote(urllib.parse.urlparse(blob_url).path).rsplit("/", 1)[-1]
+
+
+def _rejection(file_name: Optional[str], response: JSONResponse) -> dict:
+    """Return the entry of a file refused by a batch submission."""
+    return {
+        "file_name": file_name,
+        "status_code": response.status_code,
+        "reason": json.loads(response.body)["message"],
+    }
+
+
+async def _validate_blob_url(
+    content_processor: ContentProcessor, blob_url: str, max_filesize_mb: int
+) -> tuple[str, str, int] | JSONResponse:
+    """Validate the blob at *blob_url* as ``validate_upload_for_processing`` does an upload."""
+    file_name = _blob_url_file_name(blob_url)
+    try:
+        properties, header = await content_processor.read_source_blob(blob_url)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400, content={"message": str(e), "file_name": file_name}
+        )
+    return validate_file_for_processing(
+        filename=file_name,
+        header=header,
+        content_type=properties.content_settings.content_type
+        or "application/octet-stream",
+        size_bytes=properties.size,
+        max_filesize_mb=max_filesize_mb,
+    )
+
+
+@router.post(
+    contentprocess_router_paths.submit_batch,
+    summary="Submit many files for processing",
+    description="""
+    Submits many files to the content processor in one request.
+
+    The files are uploaded with the request, listed as URLs of blobs already in the storage
+    account, or both. All files are validated as by `/contentprocessor/submit`, concurrently;
+    the accepted ones are stored in blob storage in parallel (blobs are copied by the storage
+    service, not through the API), their process records are created with a single Cosmos DB
+    request and their processing messages are enqueued concurrently.
+
+    The request must be sent as `multipart/form-data` with:
+    - a JSON part (named `data`) that contains schema/metadata IDs and optional blob URLs
+    - zero or more file parts (named `files`)
+
+    ## Parameters
+    - **Schema_Id** (body): Registered schema ID (UUID string).
+    - **Metadata_Id** (body): Metadata identifier for the request.
+    - **Priority** (body, optional): Processing lane of every file, `high`, `normal` or `low`.
+    - **Blob_Urls** (body, optional): URLs of blobs of the storage account to process.
+    - **files** (form): PDF or image files (JPEG, PNG). Max size: 20 MB each.
+
+    At most 100 files (uploads and blobs together) are accepted per request by default.
+    The response lists a `process_id` and status URL per accepted file and, with a reason,
+    the rejected files.
+    While the processing queues are saturated, the whole batch is refused with
+    `429 Too Many Requests` and a `Retry-After` header.
+
+    ## Example Request Body
+    multipart/form-data
+    - `data`: `{ "Schema_Id": "<schema_uuid>", "Metadata_Id": "<metadata_id>",
+      "Blob_Urls": ["https://<account>.blob.core.windows.net/<container>/scan-001.pdf"] }`
+    - `files`: `<upload>`
+    - `files`: `<upload>`
+
+   """,
+)
+async def submit_files(
+    data: ContentProcessorBatchRequest = Body(...),
+    files: list[UploadFile] = File(default=[]),
+    request: Request = None,
+):
+    """Submit many uploaded files and/or stored blobs for processing."""
+    app: TypedFastAPI = request.app  # type: ignore
+    configuration = app.app_context.configuration
+    if not data.Schema_Id or not data.Metadata_Id:
+        return JSONResponse(
+            status_code=400,
+            content={"message": "Schema_Id and Metadata_Id are required."},
+        )
+    file_count = len(files) + len(data.Blob_Urls)
+    if file_count == 0:
+        return JSONResponse(
+            status_code=400, content={"message": "Provide files or Blob_Urls."}
+        )
+    if file_count > configuration.app_cps_max_batch_files:
+        return JSONResponse(
+            status_code=413,
+            content={
+                "message": f"A batch holds at most {configuration.app_cps_max_batch_files} files; {file_count} were submitted."
+            },
+        )
+
+    admission_control: AdmissionControl = await app.app_context.get_service_async(
+        AdmissionControl
+    )
+    admission = await admission_control.admit(caller_of(request))
+    if not admission.admitted:
+        return too_many_requests(admission)
+
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    max_filesize_mb = configuration.app_cps_max_filesize_mb
+    sources: list[UploadFile | str] = [*files, *data.Blob_Urls]
+    validations = await asyncio.gather(
+        *[
+            validate_upload_for_processing(upload=file, max_filesize_mb=max_filesize_mb)
+            for file in files
+        ],
+        *[
+            _validate_blob_url(content_processor, blob_url, max_filesize_mb)
+            for blob_url in data.Blob_Urls
+        ],
+    )
+
+    rejected: list[dict] = []
+    accepted: list[tuple[str, UploadFile | str, str, str, int]] = []
+    for source, validated in zip(sources, validations):
+        if isinstance(validated, JSONResponse):
+            file_name = (
+                _blob_url_file_name(source)
+                if isinstance(source, str)
+                else source.filename
+            )
+            rejected.append(_rejection(file_name, validated))
+        else:
+            accepted.append((str(uuid.uuid4()), source, *validated))
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def store(process_id, source, file_name, mime_type, size_bytes):
+        async with semaphore:
+            if isinstance(source, str):
+                await content_processor.copy_file_from_url(
+                    process_id, source, file_name
+                )
+                return None
+            return await content_processor.save_file_to_blob(
+                process_id=process_id,
+                file=source,
+                file_name=file_name,
+                content_type=mime_type,
+            )
+
+    stored = await asyncio.gather(
+        *[store(*item) for item in accepted], return_exceptions=True
+    )
+
+    submitted: list[tuple[tuple, Optional[str], ContentProcess]] = []
+    for item, uploaded in zip(accepted, stored):
+        process_id, _, file_name, mime_type, size_bytes = item
+        if isinstance(uploaded, Exception):
+            logger.error(
+                "Unable to store %s of %s: %s", file_name, process_id, uploaded
+            )
+            rejected.append({
+                "file_name": file_name,
+                "status_code": 500,
+                "reason": "Unable to store the file.",
+            })
+            continue
+        priority = resolve_priority(
+            data.Priority, size_bytes, configuration.app_priority_small_document_kb
+        )
+        submitted.append((
+            item,
+            uploaded.sha256 if uploaded else None,
+            _new_process_message(
+                process_id,
+                file_name,
+                uploaded.size if uploaded else size_bytes,
+                mime_type,
+                data.Schema_Id,
+                data.Metadata_Id,
+                priority.value if priority else None,
+            ),
+        ))
+
+    processes: list[dict] = []
+    if submitted:
+        # Records first: a worker that picks a message up finds its record.
+        imported_time = datetime.datetime.now(datetime.timezone.utc)
+        await content_processor.insert_processes([
+            CosmosContentProcess(
+                process_id=message.process_id,
+                processed_file_name=message.files[0].name,
+                status="processing",
+                imported_time=imported_time,
+            )
+            for _, _, message in submitted
+        ])
+        enqueued = await asyncio.gather(
+            *[
+                content_processor.enqueue_message(
+                    message, message.pipeline_status.priority
+                )
+                for _, _, message in submitted
+            ],
+            return_exceptions=True,
+        )
+
+        for (item, sha256, message), error in zip(submitted, enqueued):
+            process_id, _, file_name, _, _ = item
+            if isinstance(error, Exception):
+                logger.error("Unable to enqueue %s: %s", process_id, error)
+                await content_processor.update_process_status_to_cosmos(
+                    CosmosContentProcess(
+                        process_id=process_id,
+                        processed_file_name=file_name,
+                        status="Error",
+                    )
+                )
+                rejected.append({
+                    "file_name": file_name,
+                    "status_code": 500,
+                    "reason": "Unable to enqueue the file for processing.",
+                })
+                continue
+
+            track_event_if_configured("FileSubmitted", {
+                "process_id": process_id,
+                "file_name": file_name,
+                "schema_id": data.Schema_Id,
+                "metadata_id": data.Metadata_Id,
+                "size_bytes": str(message.files[0].size),
+                "sha256": sha256,
+            })
+            processes.append({
+                "process_id": process_id,
+                "file_name": file_name,
+                "status_url": f"/contentprocessor/status/{process_id}",
+                "sha256": sha256,
+            })
+
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute("batch_size", file_count)
+        span.set_attribute("schema_id", data.Schema_Id)
+
+    return JSONResponse(
+        status_code=202,
+        content={"processes": processes, "rejected": rejected},
+    )
+
+
 @router.get(
     contentprocess_router_paths.status,
     summary="Get file processing status",
@@ -261,6 +624,14 @@ async def Submit_File_With_MetaData(
     This endpoint is designed for async processing. After you submit a file via `/contentprocessor/submit`
     (which returns `202 Accepted`), you should poll this endpoint until you receive a terminal status.
 
+    Instead of polling, pass `wait` and `last_status` (long polling): the response is held until
+    the status differs from `last_status` or `wait` seconds elapse. Clients that can keep a
+    connection open should rather follow `/contentprocessor/status/{process_id}/events` (Server-Sent
+    Events) or `/contentprocessor/status/{process_id}/ws` (WebSocket).
+
+    Responses carry `ETag` and `Last-Modified`; a poll sending `If-None-Match` (or
+    `If-Modified-Since`) for an unchanged status is answered with `304 Not Modified`.
+
     The status can be one of the following:
 
     - `processing`: The file is being processed (`200`).
@@ -270,26 +641,42 @@ async def Submit_File_With_MetaData(
 
     ## Parameters
     - **process_id** (path): Process ID returned by the submit endpoint.
+    - **wait** (query, optional): Seconds (0-60) to wait for a status other than `last_status`.
+    - **last_status** (query, optional): Status the client already has; required by `wait`.
 
     ## Example Request Body
     Not applicable. This is a GET endpoint and does not accept a request body.
 
     Example request:
-    `GET /contentprocessor/status/{process_id}`
+    `GET /contentprocessor/status/{process_id}?wait=30&last_status=extract`
 
             """,
 )
 async def get_status(
     process_id: str,
+    wait: int = Query(default=0, ge=0, le=60),
+    last_status: Optional[str] = None,
     request: Request = None,
 ):
     """Return current processing status and redirect when complete."""
     app: TypedFastAPI = request.app  # type: ignore
-    process_status = CosmosContentProcess(process_id=process_id).get_status_from_cosmos(
-        connection_string=app.app_context.configuration.app_cosmos_connstr,
-        database_name=app.app_context.configuration.app_cosmos_database,
-        collection_name=app.app_context.configuration.app_cosmos_container_process,
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
     )
+    if wait and last_status:
+        await wait_for_status_change(
+            app.app_context.get_service(StatusBroker),
+            "process",
+            process_id,
+            _process_status_reader(content_processor, process_id),
+            PROCESS_TERMINAL_STATUSES,
+            last_status=last_status,
+            timeout=wait,
+            reconcile_seconds=app.app_context.configuration.app_status_stream_reconcile_seconds,
+        )
+        process_status = await content_processor.get_process_status(process_id)
+    else:
+        process_status = await content_processor.get_cached_process_status(process_id)
 
     track_event_if_configured("ProcessStatusQueried", {
         "process_id": process_id,
@@ -311,11 +698,16 @@ async def get_status(
             },
         )
 
+    headers = process_validators(process_status)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
+
     file_name = str(getattr(process_status, "processed_file_name", ""))
 
     if process_status.status == "Completed":
         return JSONResponse(
             status_code=302,
+            headers=headers,
             content={
                 "status": "completed",
                 "process_id": process_id,
@@ -327,6 +719,7 @@ async def get_status(
     elif process_status.status == "Error":
         return JSONResponse(
             status_code=500,
+            headers=headers,
             content={
                 "status": "failed",
                 "process_id": process_id,
@@ -337,6 +730,7 @@ async def get_status(
     else:
         return JSONResponse(
             status_code=200,
+            headers=headers,
             content={
                 "status": process_status.status,
                 "process_id": process_id,
@@ -346,6 +740,106 @@ async def get_status(
         )
 
 
+def _process_status_reader(content_processor: ContentProcessor, process_id: str):
+    """Return a reader of the current status of *process_id*."""
+
+    async def read_status() -> Optional[str]:
+        process = await content_processor.get_process_status(process_id)
+        return process.status if process else None
+
+    return read_status
+
+
+@router.get(
+    contentprocess_router_paths.status_events,
+    summary="Stream file processing status (Server-Sent Events)",
+    description="""
+    Streams the status of a file being processed as Server-Sent Events, so clients do not
+    need to poll `/contentprocessor/status/{process_id}`.
+
+    Each status change is sent as an `event: status` whose data is
+    `{"process_id": "<process_id>", "status": "<status>"}`, starting with the current status.
+    The stream ends after `Completed` or `Error`, or after 15 minutes (`EventSource` clients
+    reconnect automatically). Comment lines (`: keep-alive`) are sent while nothing changes.
+
+    Returns `404` if the process ID is not found.
+
+    ## Parameters
+    - **process_id** (path): Process ID returned by the submit endpoint.
+
+    Example request:
+    `GET /contentprocessor/status/{process_id}/events`
+            """,
+)
+async def stream_status(process_id: str, request: Request = None):
+    """Stream status changes of *process_id* as Server-Sent Events."""
+    app: TypedFastAPI = request.app  # type: ignore
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    read_status = _process_status_reader(content_processor, process_id)
+    if await read_status() is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "failed",
+                "process_id": process_id,
+                "message": f"Processing of file with Process ID '{process_id}' not found.",
+            },
+        )
+
+    statuses = follow_status(
+        app.app_context.get_service(StatusBroker),
+        "process",
+        process_id,
+        read_status,
+        PROCESS_TERMINAL_STATUSES,
+        reconcile_seconds=app.app_context.configuration.app_status_stream_reconcile_seconds,
+    )
+    return StreamingResponse(
+        sse_status_events(
+            statuses, lambda status: {"process_id": process_id, "status": status}
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.websocket(contentprocess_router_paths.status_ws)
+async def status_websocket(websocket: WebSocket, process_id: str):
+    """Send status changes of *process_id* over a WebSocket.
+
+    Each change is sent as ``{"process_id": ..., "status": ...}``, starting
+    with the current status; the server closes the socket after
+    ``Completed`` or ``Error``. An unknown process ID is refused with close
+    code 4404.
+    """
+    app: TypedFastAPI = websocket.app  # type: ignore
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    read_status = _process_status_reader(content_processor, process_id)
+    if await read_status() is None:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    try:
+        async for status in follow_status(
+            app.app_context.get_service(StatusBroker),
+            "process",
+            process_id,
+            read_status,
+            PROCESS_TERMINAL_STATUSES,
+            reconcile_seconds=app.app_context.configuration.app_status_stream_reconcile_seconds,
+        ):
+            if status is not None:
+                await websocket.send_json({"process_id": process_id, "status": status})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.get(
     contentprocess_router_paths.processed_content_by_process_id,
     response_model=CosmosContentProcess,
@@ -355,8 +849,17 @@ async def get_status(
 
     Use this endpoint to retrieve the complete processing result document (including step details).
 
+    Results saved in slim persistence mode carry only summary confidence scores and an
+    `evaluation_reference`; the per-field confidence and comparison data are loaded from
+    blob storage unless `hydrate=false`, in which case the reference is returned as is.
+
+    Once processing has ended (`Completed` or `Error`) the response carries `ETag` and
+    `Last-Modified`; a request sending `If-None-Match` (or `If-Modified-Since`) for an unchanged
+    result is answered with `304 Not Modified` without loading the document.
+
     ## Parameters
     - **process_id** (path): Process ID to retrieve.
+    - **hydrate** (query, optional): Resolve referenced evaluation data. Defaults to `true`.
 
     ## Example Request Body
     Not applicable. This is a GET endpoint and does not accept a request body.
@@ -367,16 +870,25 @@ async def get_status(
 )
 async def get_process(
     process_id: str,
+    hydrate: bool = True,
     request: Request = None,
+    response: Response = None,
 ):
     """Return the full processed content document for *process_id*."""
     app: TypedFastAPI = request.app  # type: ignore
 
-    process_status = CosmosContentProcess(process_id=process_id).get_status_from_cosmos(
-        connection_string=app.app_context.configuration.app_cosmos_connstr,
-        database_name=app.app_context.configuration.app_cosmos_database,
-        collection_name=app.app_context.configuration.app_cosmos_container_process,
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
     )
+    if is_conditional(request):
+        # Answer revalidations from the (cached) status record alone.
+        current = await content_processor.get_cached_process_status(process_id)
+        if current is not None and current.status in PROCESS_TERMINAL_STATUSES:
+            headers = process_validators(current, hydrate)
+            if is_not_modified(request, headers):
+                return not_modified(headers)
+
+    process_status = await content_processor.get_status_from_cosmos(process_id)
 
     if not process_status:
         return JSONResponse(
@@ -389,6 +901,12 @@ async def get_process(
             },
         )
 
+    if process_status.status in PROCESS_TERMINAL_STATUSES:
+        response.headers.update(process_validators(process_status, hydrate))
+
+    if hydrate:
+        await content_processor.hydrate_evaluation(process_status)
+
     return process_status
 
 
@@ -401,8 +919,16 @@ async def get_process(
     Some step outputs can be too large to include in the main processed result. Use this endpoint
     to fetch step outputs separately and reduce payload sizes in the UI.
 
+    Steps saved in slim persistence mode reference their payload blob; these are resolved
+    unless `hydrate=false`, in which case only the references (name, size, SHA-256) are returned.
+
+    Once processing has ended (`Completed` or `Error`) the response carries `ETag` and
+    `Last-Modified` and conditional requests for unchanged outputs are answered with
+    `304 Not Modified`.
+
     ## Parameters
     - **process_id** (path): Process ID to retrieve step outputs for.
+    - **hydrate** (query, optional): Resolve referenced step payloads. Defaults to `true`.
 
     ## Example Request Body
     Not applicable. This is a GET endpoint and does not accept a request body.
@@ -413,14 +939,25 @@ async def get_process(
 )
 async def get_process_steps(
     process_id: str,
+    hydrate: bool = True,
     request: Request = None,
+    response: Response = None,
 ):
     """Return per-step processing outputs from blob storage."""
     app: TypedFastAPI = request.app  # type: ignore
-    process_steps = CosmosContentProcess(process_id=process_id).get_status_from_blob(
-        connection_string=app.app_context.configuration.app_storage_blob_url,
-        blob_name="step_outputs.json",
-        container_name=f"{app.app_context.configuration.app_cps_processes}/{process_id}",
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    # Step outputs only change while the process runs.
+    headers = None
+    current = await content_processor.get_cached_process_status(process_id)
+    if current is not None and current.status in PROCESS_TERMINAL_STATUSES:
+        headers = process_validators(current, "steps", hydrate)
+        if is_not_modified(request, headers):
+            return not_modified(headers)
+
+    process_steps = await content_processor.get_status_from_blob(
+        process_id, hydrate=hydrate
     )
 
     if not process_steps:
@@ -434,6 +971,8 @@ async def get_process_steps(
             },
         )
 
+    if headers:
+        response.headers.update(headers)
     return process_steps
 
 
@@ -479,26 +1018,19 @@ async def update_process_result(
 ):
     """Update the processed result or attach a comment."""
     app: TypedFastAPI = request.app  # type: ignore
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
     update_response: UpdateResult = None
 
     if isinstance(content_update_request, ContentResultUpdate):
-        update_response = CosmosContentProcess(
-            process_id=process_id,
-        ).update_process_result(
-            connection_string=app.app_context.configuration.app_cosmos_connstr,
-            database_name=app.app_context.configuration.app_cosmos_database,
-            collection_name=app.app_context.configuration.app_cosmos_container_process,
-            process_result=content_update_request.modified_result,
+        update_response = await content_processor.update_process_result(
+            process_id, content_update_request.modified_result
         )
 
     if isinstance(content_update_request, ContentCommentUpdate):
-        update_response = CosmosContentProcess(
-            process_id=process_id,
-        ).update_process_comment(
-            connection_string=app.app_context.configuration.app_cosmos_connstr,
-            database_name=app.app_context.configuration.app_cosmos_database,
-            collection_name=app.app_context.configuration.app_cosmos_container_process,
-            comment=content_update_request.comment,
+        update_response = await content_processor.update_process_comment(
+            process_id, content_update_request.comment
         )
 
     if not update_response:
@@ -535,57 +1067,83 @@ async def update_process_result(
     description="""
     Streams the original uploaded file for a given process ID.
 
-    This endpoint is intended for inline viewing (e.g., in a document viewer). It returns a
-    streaming response with an appropriate content type.
+    This endpoint is intended for inline viewing (e.g., in a document viewer). The file is
+    streamed from blob storage as it is downloaded, never buffered whole in the API.
+
+    A single byte range can be requested with the `Range` header (e.g. `bytes=0-65535`) so
+    viewers such as PDF.js can fetch pages lazily: the response is then `206 Partial Content`
+    with a `Content-Range` header, or `416 Range Not Satisfiable` when the range starts past
+    the end of the file. Requests for several ranges receive the whole file.
 
     ## Parameters
     - **process_id** (path): Process ID of the original upload.
+    - **Range** (header, optional): Single byte range to return.
 
     ## Example Request Body
     Not applicable. This is a GET endpoint and does not accept a request body.
 
     Example request:
     `GET /contentprocessor/processed/files/{process_id}`
+    `Range: bytes=0-65535`
             """,
 )
 async def get_original_file(process_id: str, request: Request = None):
-    """Stream the originally uploaded file for inline viewing."""
+    """Stream the originally uploaded file, or a byte range of it."""
     app: TypedFastAPI = request.app  # type: ignore
-    process_status = CosmosContentProcess(process_id=process_id).get_status_from_cosmos(
-        connection_string=app.app_context.configuration.app_cosmos_connstr,
-        database_name=app.app_context.configuration.app_cosmos_database,
-        collection_name=app.app_context.configuration.app_cosmos_container_process,
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
     )
+    process_status = await content_processor.get_cached_process_status(process_id)
 
+    not_found = JSONResponse(
+        status_code=404,
+        content={
+            "status": "failed",
+            "message": f"Processing of file with Process ID '{process_id}' not found.",
+        },
+    )
     if process_status is None:
-        return JSONResponse(
-            status_code=404,
-            content={
-                "status": "failed",
-                "message": f"Processing of file with Process ID '{process_id}' not found.",
-            },
-        )
+        return not_found
 
-    if process_status is not None:
-        file_bytes = process_status.get_file_bytes_from_blob(
-            connection_string=app.app_context.configuration.app_storage_blob_url,
-            blob_name=process_status.processed_file_name,
-            container_name=f"{app.app_context.configuration.app_cps_processes}/{process_status.process_id}",
+    try:
+        download = await content_processor.open_file_from_blob(
+            process_status.process_id,
+            process_status.processed_file_name,
+            parse_range(request.headers.get("range")),
         )
-        file_stream = io.BytesIO(file_bytes)
+    except ValueError:
+        return not_found
 
-        encoded_filename = urllib.parse.quote(process_status.processed_file_name)
-        content_type_string = MimeTypesDetection.get_file_type(
-            process_status.processed_file_name
-        )
-        headers = {
-            "Content-Disposition": f"inline; filename*=UTF-8''{encoded_filename}",
-            "Content-Type": content_type_string,
-        }
+    headers = {"Accept-Ranges": "bytes"}
+    if download.etag:
+        headers.update(validator_headers(download.etag, download.last_modified))
 
-        return StreamingResponse(
-            file_stream, media_type=content_type_string, headers=headers
-        )
+    if download.downloader is None:
+        headers["Content-Range"] = f"bytes */{download.size}"
+        return Response(status_code=416, headers=headers)
+
+    encoded_filename = urllib.parse.quote(process_status.processed_file_name)
+    content_type_string = MimeTypesDetection.get_file_type(
+        process_status.processed_file_name
+    )
+    headers["Content-Disposition"] = f"inline; filename*=UTF-8''{encoded_filename}"
+    headers["Content-Type"] = content_type_string
+
+    status_code = 200
+    content_length = download.size
+    if download.byte_range is not None:
+        first, last = download.byte_range
+        status_code = 206
+        content_length = last - first + 1
+        headers["Content-Range"] = content_range(first, last, download.size)
+    headers["Content-Length"] = str(content_length)
+
+    return StreamingResponse(
+        download.downloader.chunks(),
+        status_code=status_code,
+        media_type=content_type_string,
+        headers=headers,
+    )
 
 
 @router.delete(
@@ -599,28 +1157,32 @@ async def get_original_file(process_id: str, request: Request = None):
 
     ## Parameters
     - **process_id** (path): Process ID to delete.
+    - **background** (query, optional): When true, the record is deleted at once
+      and the files are deleted by a background job; the response is `202 Accepted`
+      with the job, followed at `GET /contentprocessor/deletions/{job_id}`.
 
     ## Example Request Body
     Not applicable. This is a DELETE endpoint and does not accept a request body.
 
     Example request:
-    `DELETE /contentprocessor/processed/{process_id}`
+    `DELETE /contentprocessor/processed/{process_id}?background=true`
             """,
 )
 async def delete_processed_file(
-    process_id: str, request: Request = None
+    process_id: str,
+    background: bool = Query(
+        False, description="Delete the files in a background job."
+    ),
+    request: Request = None,
 ) -> ContentResultDelete:
     """Delete the processed content record and related artifacts."""
     app: TypedFastAPI = request.app  # type: ignore
     try:
-        deleted_file = CosmosContentProcess(
-            process_id=process_id
-        ).delete_processed_file(
-            connection_string=app.app_context.configuration.app_cosmos_connstr,
-            database_name=app.app_context.configuration.app_cosmos_database,
-            collection_name=app.app_context.configuration.app_cosmos_container_process,
-            storage_connection_string=app.app_context.configuration.app_storage_blob_url,
-            container_name=app.app_context.configuration.app_cps_processes,
+        content_processor: ContentProcessor = (
+            await app.app_context.get_service_async(ContentProcessor)
+        )
+        deleted_file = await content_processor.delete_processed_file(
+            process_id, delete_files=not background
         )
 
         claim_process_repository = app.app_context.get_service(
@@ -628,10 +1190,243 @@ async def delete_processed_file(
         )
         await claim_process_repository.delete_async(process_id)
 
+        if background:
+            deletion_jobs: DeletionJobs = await app.app_context.get_service_async(
+                DeletionJobs
+            )
+            job = deletion_jobs.start(
+                process_id,
+                lambda on_progress: content_processor.delete_process_files(
+                    process_id, on_progress
+                ),
+            )
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    return ContentResultDelete(
+    result = ContentResultDelete(
         status="Success" if deleted_file else "Failed",
         process_id=deleted_file.process_id if deleted_file else "",
         message="" if deleted_file else "This record no longer exists. Please refresh.",
     )
+    if not background:
+        return result
+
+    status_url = f"/contentprocessor/deletions/{job.job_id}"
+    return JSONResponse(
+        status_code=202,
+        headers={"Location": status_url},
+        content={
+            **result.model_dump(),
+            "status_url": status_url,
+            "deletion_job": job.model_dump(mode="json"),
+        },
+    )
+
+
+@router.get(
+    contentprocess_router_paths.deletion_job,
+    response_model=DeletionJob,
+    summary="Get the status of a background deletion",
+    description="""
+    Returns the progress of a background file deletion started by
+    `DELETE /contentprocessor/processed/{process_id}?background=true`.
+
+    Jobs are kept for an hour after they finish.
+
+    ## Parameters
+    - **job_id** (path): Deletion job ID.
+
+    ## Example Request Body
+    Not applicable. This is a GET endpoint and does not accept a request body.
+
+    Example request:
+    `GET /contentprocessor/deletions/{job_id}`
+            """,
+)
+async def get_deletion_job(job_id: str, request: Request = None) -> DeletionJob:
+    """Return the deletion job *job_id*."""
+    app: TypedFastAPI = request.app  # type: ignore
+    deletion_jobs: DeletionJobs = await app.app_context.get_service_async(DeletionJobs)
+    job = deletion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"Deletion job '{job_id}' not found."
+        )
+    return job
+
+
+async def _reprocess(
+    content_processor: ContentProcessor,
+    process_id: str,
+    reprocess_request: ReprocessRequest,
+) -> ContentProcess:
+    """Mark *process_id* processing and enqueue it from the requested step."""
+    from_step = reprocess_request.From_Step.value
+    message = await content_processor.load_resume_message(
+        process_id=process_id,
+        from_step=from_step,
+        schema_id=reprocess_request.Schema_Id,
+        priority=reprocess_request.Priority.value
+        if reprocess_request.Priority
+        else None,
+    )
+    file_name = message.files[0].name if message.files else None
+
+    # Record first: a worker that picks the message up finds it processing.
+    await content_processor.update_process_status_to_cosmos(
+        CosmosContentProcess(
+            process_id=process_id,
+            processed_file_name=file_name,
+            status="processing",
+        )
+    )
+    try:
+        await content_processor.enqueue_message(
+            message, message.pipeline_status.priority, from_step
+        )
+    except Exception:
+        await content_processor.update_process_status_to_cosmos(
+            CosmosContentProcess(
+                process_id=process_id,
+                processed_file_name=file_name,
+                status="Error",
+            )
+        )
+        raise
+
+    track_event_if_configured("ProcessReprocessed", {
+        "process_id": process_id,
+        "from_step": from_step,
+        "schema_id": message.pipeline_status.schema_id,
+    })
+    return message
+
+
+@router.post(
+    contentprocess_router_paths.reprocess_by_process_id,
+    summary="Reprocess an existing process from a step",
+    description="""
+    Runs an already processed file through the pipeline again, starting at a chosen step.
+
+    The outputs of the steps before that step are reused: reprocessing from `map` after a
+    schema or prompt change reruns only schema mapping, evaluation and save, not the
+    Content Understanding extraction. Poll the status endpoint as after a submission.
+
+    ## Parameters
+    - **process_id** (path): Process ID to reprocess.
+    - **From_Step** (body, optional): First step to run again (`extract`, `map`, `evaluate`
+      or `save`). Defaults to `map`.
+    - **Schema_Id** (body, optional): Schema to map with instead of the original one.
+    - **Priority** (body, optional): Processing lane (`high`, `normal` or `low`).
+
+    Returns `404` if the process has no stored pipeline and `409` if it is still running
+    or a step before `From_Step` has no output to reuse.
+
+    ## Example Request Body
+    ```json
+    {
+        "From_Step": "map",
+        "Schema_Id": "<schema_uuid>"
+    }
+    ```
+            """,
+)
+async def reprocess_process(
+    process_id: str,
+    reprocess_request: Optional[ReprocessRequest] = None,
+    request: Request = None,
+):
+    """Resume a process from a step, reusing the earlier steps' artifacts."""
+    app: TypedFastAPI = request.app  # type: ignore
+    reprocess_request = reprocess_request or ReprocessRequest()
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    try:
+        await _reprocess(content_processor, process_id, reprocess_request)
+    except LookupError as e:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "failed", "process_id": process_id, "message": str(e)},
+        )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=409,
+            content={"status": "failed", "process_id": process_id, "message": str(e)},
+        )
+
+    status_url = f"/contentprocessor/status/{process_id}"
+    return JSONResponse(
+        status_code=202,
+        headers={"Location": status_url},
+        content={
+            "message": f"Process '{process_id}' is being reprocessed from step '{reprocess_request.From_Step.value}'.",
+            "process_id": process_id,
+            "status_url": status_url,
+        },
+    )
+
+
+@router.post(
+    contentprocess_router_paths.reprocess,
+    summary="Reprocess many existing processes from a step",
+    description="""
+    Reprocesses a list of processes, or the processes selected by schema and/or status,
+    from a chosen step, reusing the outputs of the steps before it (see
+    `POST /contentprocessor/processed/{process_id}/reprocess`).
+
+    Use it to re-map every document of a schema after the schema changed without
+    extracting the documents again.
+
+    ## Parameters
+    - **Process_Ids** (body): Processes to reprocess, or
+    - **Filter_Schema_Id** / **Filter_Status** (body): Select the newest processes mapped
+      with this schema and/or in this status, at most **Limit** (default 100, max 1000).
+    - **From_Step**, **Schema_Id**, **Priority** (body, optional): As for a single process.
+
+    The response lists the accepted processes and, with a reason, the rejected ones.
+
+    ## Example Request Body
+    ```json
+    {
+        "Filter_Schema_Id": "<schema_uuid>",
+        "From_Step": "map",
+        "Priority": "low"
+    }
+    ```
+            """,
+)
+async def reprocess_processes(
+    reprocess_request: ReprocessBatchRequest,
+    request: Request = None,
+):
+    """Resume many processes from a step, reusing the earlier steps' artifacts."""
+    app: TypedFastAPI = request.app  # type: ignore
+    content_processor: ContentProcessor = await app.app_context.get_service_async(
+        ContentProcessor
+    )
+    process_ids = reprocess_request.Process_Ids or (
+        await content_processor.find_process_ids_in_cosmos(
+            schema_id=reprocess_request.Filter_Schema_Id,
+            status=reprocess_request.Filter_Status,
+            limit=reprocess_request.Limit,
+        )
+    )
+
+    accepted: list[str] = []
+    rejected: list[dict] = []
+    for process_id in process_ids[: reprocess_request.Limit]:
+        try:
+            await _reprocess(content_processor, process_id, reprocess_request)
+            accepted.append(process_id)
+        except (LookupError, ValueError) as e:
+            rejected.append({"process_id": process_id, "reason": str(e)})
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "from_step": reprocess_request.From_Step.value,
+            "accepted": accepted,
+            "rejected": rejected,
+        },
+    )
@@ -0,0 +1,158 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Queue-backlog admission control of the submit endpoints.
+
+When a pipeline step is saturated, accepted documents wait in its queue
+for hours, and some outlive the 7-day message TTL. Before accepting work,
+the submit and claim-start endpoints ask ``AdmissionControl`` for the
+estimated wait of a new message through the step queues (see
+``QueueBacklog``). Above the caller's threshold the request is refused
+with ``429 Too Many Requests`` and a ``Retry-After`` of the time the
+backlog needs to drain back under the threshold, so bulk clients back off
+while interactive users keep a predictable latency.
+"""
+
+import math
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.libs.application.application_context import AppContext
+from app.libs.azure.storage_queue.async_helper import AsyncStorageQueueHelper
+from app.libs.azure.storage_queue.backlog import QueueBacklog
+from app.routers.logics.claimbatchpocessor import CLAIM_PROCESS_QUEUE
+from app.routers.logics.contentprocessor import lane_queue_name, step_queue_name
+from app.routers.models.contentprocessor.model import ProcessPriority, Steps
+from app.utils.azure_credential_utils import get_azure_credential_async
+
+# Steps a submitted document goes through, in order.
+PIPELINE_STEPS = [Steps.Extract, Steps.Mapping, Steps.Evaluating, Steps.Save]
+# Backlog of the claim workflow queue, waited before the pipeline steps.
+CLAIM_STEP = "claim"
+# Longest Retry-After returned; the backlog is sampled again long before.
+MAX_RETRY_AFTER_SECONDS = 3600
+# Caller of requests without an EasyAuth principal.
+ANONYMOUS_CALLER = "anonymous"
+
+
+def caller_of(request: Request) -> str:
+    """Return the EasyAuth principal of *request*, as ``UserIdMiddleware`` reads it."""
+    return (
+        request.headers.get("X-MS-CLIENT-PRINCIPAL-NAME")
+        or request.headers.get("X-MS-CLIENT-PRINCIPAL-ID")
+        or ANONYMOUS_CALLER
+    )
+
+
+class Admission(BaseModel):
+    """Outcome of an admission check.
+
+    Attributes:
+        admitted: Whether the request may enqueue work.
+        wait_seconds: Estimated seconds a new message waits in the queues.
+        max_wait_seconds: Threshold of the caller (0 when disabled).
+        retry_after_seconds: Seconds to wait before retrying a refused request.
+    """
+
+    admitted: bool
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    retry_after_seconds: int = 0
+
+
+class AdmissionControl:
+    """Admit submissions while the estimated queue wait is under the caller's threshold.
+
+    Owns a queue client, shared by all requests and closed on shutdown.
+
+    Attributes:
+        max_wait_seconds: Default threshold (0 disables admission control).
+        tenant_max_wait_seconds: Thresholds of given callers.
+        backlog: Sampled backlog of the step queues and the claim queue.
+    """
+
+    def __init__(self, app_context: AppContext = None, credential: Any = None):
+        config = app_context.configuration
+        self.max_wait_seconds = config.app_admission_max_wait_seconds
+        self.tenant_max_wait_seconds = config.app_admission_tenant_max_wait_seconds
+        self.credential = credential
+        self.queueHelper = AsyncStorageQueueHelper(
+            config.app_storage_queue_url, credential=credential
+        )
+        steps = {
+            step.value: [
+                lane_queue_name(
+                    config.app_message_queue_extract
+                    if step == Steps.Extract
+                    else step_queue_name(step.value),
+                    priority,
+                )
+                for priority in ProcessPriority
+            ]
+            for step in PIPELINE_STEPS
+        }
+        steps[CLAIM_STEP] = [CLAIM_PROCESS_QUEUE]
+        self.backlog = QueueBacklog(
+            self.queueHelper, steps, ttl_seconds=config.app_admission_sample_seconds
+        )
+
+    @classmethod
+    async def create_async(cls, app_context: AppContext) -> "AdmissionControl":
+        """Create an instance authenticated with an async Azure credential."""
+        return cls(
+            app_context=app_context, credential=await get_azure_credential_async()
+        )
+
+    def max_wait_for(self, caller: str) -> float:
+        """Return the threshold of *caller* (0 when admission control is disabled)."""
+        return self.tenant_max_wait_seconds.get(caller, self.max_wait_seconds)
+
+    async def admit(self, caller: str, claim: bool = False) -> Admission:
+        """Check whether *caller* may submit a document, or a claim if *claim*."""
+        max_wait_seconds = self.max_wait_for(caller)
+        if max_wait_seconds <= 0:
+            return Admission(admitted=True)
+
+        steps = [step.value for step in PIPELINE_STEPS]
+        if claim:
+            steps.append(CLAIM_STEP)
+        wait_seconds = await self.backlog.wait_seconds(steps)
+        if wait_seconds <= max_wait_seconds:
+            return Admission(
+                admitted=True,
+                wait_seconds=wait_seconds,
+                max_wait_seconds=max_wait_seconds,
+            )
+        return Admission(
+            admitted=False,
+            wait_seconds=wait_seconds,
+            max_wait_seconds=max_wait_seconds,
+            retry_after_seconds=min(
+                MAX_RETRY_AFTER_SECONDS,
+                max(1, math.ceil(wait_seconds - max_wait_seconds)),
+            ),
+        )
+
+    async def close(self):
+        """Stop sampling and close the queue client and the credential."""
+        await self.backlog.close()
+        await self.queueHelper.close()
+        if self.credential is not None:
+            await self.credential.close()
+
+
+def too_many_requests(admission: Admission) -> JSONResponse:
+    """Return the ``429`` response of a refused *admission*."""
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(admission.retry_after_seconds)},
+        content={
+            "status": "failed",
+            "message": f"The processing queues are saturated (estimated wait {admission.wait_seconds:.0f}s); retry in {admission.retry_after_seconds}s.",
+            "estimated_wait_seconds": round(admission.wait_seconds),
+            "retry_after_seconds": admission.retry_after_seconds,
+        },
+    )
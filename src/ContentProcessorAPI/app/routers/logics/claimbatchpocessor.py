@@ -1,18 +1,29 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-"""Claim-batch processing logic: manifest CRUD, blob storage, and queue dispatch."""
+"""Claim-batch processing logic: manifest CRUD, blob storage, and queue dispatch.
+
+Files of a claim may be uploaded concurrently. Each one adds an item to
+the claim manifest with an optimistic read-modify-write: the manifest is
+only overwritten if its ETag is unchanged since it was read, and read,
+updated and written again otherwise, so no concurrent item is lost.
+"""
 
 import json
+import random
+import time
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
+from azure.core.exceptions import ResourceModifiedError
 from pydantic import BaseModel, ConfigDict, Field
 from sas.cosmosdb.mongo.repository import RepositoryBase, SortField
 
 from app.libs.application.application_configuration import AppConfiguration
 from app.libs.application.application_context import AppContext
+from app.libs.azure.storage_blob.batch_delete import ProgressCallback
 from app.libs.azure.storage_blob.helper import StorageBlobHelper
+from app.libs.azure.storage_blob.staged_upload import UploadedBlob
 from app.libs.azure.storage_queue.helper import StorageQueueHelper
 from app.routers.models.contentprocessor.claim_process import (
     Claim_Process,
@@ -22,6 +33,18 @@ from app.routers.models.contentprocessor.model import ClaimProcessRequest
 from ..models.contentprocessor.claim import ClaimItem, ClaimProcess
 
 
+MANIFEST_FILE_NAME = "manifest.json"
+# Queue the claim workflow consumes.
+CLAIM_PROCESS_QUEUE = "claim-process-queue"
+
+# Manifest writes that lost a race with another update are retried after
+# a random delay of up to MANIFEST_RETRY_BASE_SECONDS * 2**attempt (capped),
+# so that concurrent writers spread out instead of colliding again.
+MANIFEST_UPDATE_ATTEMPTS = 20
+MANIFEST_RETRY_BASE_SECONDS = 0.05
+MANIFEST_RETRY_MAX_SECONDS = 1.0
+
+
 class ClaimBatchProcessRepository(RepositoryBase[Claim_Process, str]):
     """Cosmos DB repository for claim-process records with pagination support."""
 
@@ -89,7 +112,7 @@ class ClaimBatchProcessor(BaseModel):
             self.config.app_storage_blob_url, self.config.app_cps_process_batch
         )
         self.queueHelper = StorageQueueHelper(
-            self.config.app_storage_queue_url, "claim-process-queue"
+            self.config.app_storage_queue_url, CLAIM_PROCESS_QUEUE
         )
 
     def create_claim_container(self, schemaset_id: str) -> ClaimProcess:
@@ -104,20 +127,16 @@ class ClaimBatchProcessor(BaseModel):
         claim_process = ClaimProcess(
             claim_id=new_claim_id, schema_collection_id=schemaset_id
         )
-        claim_process_manifest_file_name = "manifest.json"
         claim_process_manifest = json.dumps(claim_process.model_dump(mode="json"))
         self._save_manifest_to_blob(
-            claim_process_manifest, claim_process_manifest_file_name, new_claim_id
+            claim_process_manifest, MANIFEST_FILE_NAME, new_claim_id
         )
 
         return claim_process
 
     def get_claim_manifest(self, claim_id: str) -> ClaimProcess:
         """Load and parse `{claim_id}/manifest.json` into a `ClaimProcess`."""
-        claim_process_manifest_file_name = "manifest.json"
-        manifest_content = self.blobHelper.download_blob(
-            claim_process_manifest_file_name, claim_id
-        )
+        manifest_content = self.blobHelper.download_blob(MANIFEST_FILE_NAME, claim_id)
         manifest_dict = json.loads(manifest_content)
         claim_process = ClaimProcess(**manifest_dict)
         return claim_process
@@ -125,27 +144,72 @@ class ClaimBatchProcessor(BaseModel):
     def add_claim_item(self, claim_id: str, claim_item: ClaimItem):
         """Append a new `ClaimItem` to the claim manifest and re-save it.
 
+        Safe to call concurrently for the same claim (see ``update_manifest``).
         Note: assigns a new UUID into `claim_item.id` before persisting.
         """
-        claim_process = self.get_claim_manifest(claim_id=claim_id)
-
         claim_item.id = str(uuid.uuid4())
-        claim_process.items.append(claim_item)
-        claim_process_manifest_file_name = "manifest.json"
-        claim_process_manifest = json.dumps(claim_process.model_dump(mode="json"))
-        self._save_manifest_to_blob(
-            claim_process_manifest, claim_process_manifest_file_name, claim_id
+        return self.update_manifest(
+            claim_id, lambda claim_process: claim_process.items.append(claim_item)
         )
 
-        return claim_process
+    def update_manifest(
+        self, claim_id: str, update: Callable[[ClaimProcess], None]
+    ) -> ClaimProcess:
+        """Apply *update* to the claim manifest without losing concurrent updates.
 
-    def add_file_to_claim(self, claim_id: str, file_name: str, file_content: bytes):
-        """Upload a file blob under the claim prefix (`{claim_id}/{file_name}`)."""
-        self.blobHelper.upload_blob(file_name, file_content, claim_id)
+        The manifest is written only if unchanged since it was read (ETag
+        condition); otherwise it is read again and *update* re-applied.
 
-    def delete_claim_container(self, claim_id: str):
-        """Delete the claim manifest and attempt to clean up the claim prefix."""
-        self.blobHelper.delete_folder(folder_name=claim_id)
+        Raises:
+            azure.core.exceptions.ResourceModifiedError: If the manifest kept
+                changing for ``MANIFEST_UPDATE_ATTEMPTS`` attempts.
+        """
+        for attempt in range(MANIFEST_UPDATE_ATTEMPTS):
+            manifest_content, etag = self.blobHelper.download_blob_with_etag(
+                MANIFEST_FILE_NAME, claim_id
+            )
+            claim_process = ClaimProcess(**json.loads(manifest_content))
+            update(claim_process)
+            try:
+                self.blobHelper.upload_blob(
+                    MANIFEST_FILE_NAME,
+                    json.dumps(claim_process.model_dump(mode="json")),
+                    claim_id,
+                    etag=etag,
+                )
+                return claim_process
+            except ResourceModifiedError:
+                if attempt == MANIFEST_UPDATE_ATTEMPTS - 1:
+                    raise
+                time.sleep(
+                    random.uniform(
+                        0,
+                        min(
+                            MANIFEST_RETRY_BASE_SECONDS * 2**attempt,
+                            MANIFEST_RETRY_MAX_SECONDS,
+                        ),
+                    )
+                )
+
+    def add_file_to_claim(
+        self, claim_id: str, file_name: str, file_stream, content_type: str = None
+    ) -> UploadedBlob:
+        """Stream a file blob under the claim prefix (`{claim_id}/{file_name}`).
+
+        Returns:
+            Size and SHA-256 of the stored file.
+        """
+        return self.blobHelper.upload_blob_staged(
+            file_name, file_stream, claim_id, content_type=content_type
+        )
+
+    def delete_claim_container(
+        self, claim_id: str, on_progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """Delete the claim manifest and files; return how many blobs were deleted."""
+        return self.blobHelper.delete_folder(
+            folder_name=claim_id, on_progress=on_progress
+        )
 
     def _save_manifest_to_blob(self, content: str, file_name: str, claim_id: str):
         """Persist a manifest file under the claim prefix (`{claim_id}/{file_name}`)."""
@@ -1,41 +1,760 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-"""Content-processor logic: blob persistence and queue dispatch."""
+"""Content-processor logic: process persistence and queue dispatch.
 
+``ContentProcessor`` is the non-blocking data-access layer of the
+content-processor endpoints: it reads and writes process records in
+Cosmos DB, files in Blob Storage and messages in Queue Storage through
+async clients shared by all requests.
+
+Besides submitting new files, an existing process can be resumed from a
+later step: the pipeline persisted by the workers in
+``process-status.json`` is replayed with the steps before that step
+marked completed, so their artifacts (e.g. the Content Understanding
+extraction) are reused instead of produced again.
+
+Status reads are served from a short-lived ``StatusCache`` that status
+events and the writes made here invalidate; ``process_validators`` derives
+the ETag / Last-Modified headers of the status and result endpoints.
+"""
+
+import asyncio
+import datetime
+import json
+from typing import Any, Optional
+
+from azure.core.exceptions import HttpResponseError
 from pydantic import BaseModel, ConfigDict, Field
+from pymongo import AsyncMongoClient
 
 from app.libs.application.application_configuration import (
     AppConfiguration,
 )
 from app.libs.application.application_context import AppContext
-from app.libs.azure.storage_blob.helper import StorageBlobHelper
-from app.libs.azure.storage_queue.helper import StorageQueueHelper
+from app.libs.azure.cosmos_db.async_helper import (
+    AsyncCosmosMongDBHelper,
+    create_async_mongo_client,
+)
+from app.libs.azure.cosmos_db.count_cache import CountCache
+from app.libs.azure.storage_blob.async_helper import AsyncStorageBlobHelper
+from app.libs.azure.storage_blob.batch_delete import ProgressCallback
+from app.libs.azure.storage_blob.staged_upload import UploadedBlob
+from app.libs.azure.storage_queue.async_helper import AsyncStorageQueueHelper
+from app.libs.status_events.broker import StatusBroker
+from app.libs.status_events.cache import StatusCache
+from app.routers.models.contentprocessor.content_process import (
+    PROCESS_KEYSET_INDEXES,
+    PROCESS_LIST_INDEXES,
+    PROCESS_LIST_PROJECTION,
+    PROCESS_LIST_SORT,
+    PROCESS_STATUS_PROJECTION,
+    PaginatedResponse,
+    Step_Outputs,
+    user_edit,
+)
+from app.routers.models.contentprocessor.content_process import (
+    ContentProcess as CosmosContentProcess,
+)
+from app.routers.models.contentprocessor.model import (
+    ContentProcess,
+    ProcessFile,
+    ProcessPriority,
+    Status,
+)
+from app.utils.azure_credential_utils import get_azure_credential_async
+from app.utils.continuation_token import decode_token, encode_token
+from app.utils.http_cache import entity_tag, validator_headers
+from app.utils.http_range import resolve_range
+
+PROCESS_STATUS_BLOB = "process-status.json"
+STEP_OUTPUTS_BLOB = "step_outputs.json"
+
+# Process statuses after which the workers no longer change the status.
+PROCESS_TERMINAL_STATUSES = ("Completed", "Error")
+
+# Bytes of a submitted blob read to sniff its file type.
+SOURCE_HEADER_BYTES = 16
+
+# Step results recorded by the workers when a step fails.
+_FAILED_RESULTS = ("error", "moved to Dead Letter Queue")
+
+
+def process_validators(process: CosmosContentProcess, *variant) -> dict[str, str]:
+    """Return the ETag / Last-Modified headers of a representation of *process*.
+
+    The pipeline and user edits stamp ``last_modified_time`` on every
+    write, so it identifies a version of the process; *variant*
+    distinguishes representations of the same version (e.g. hydrated).
+    """
+    return validator_headers(
+        entity_tag(
+            process.process_id, process.status, process.last_modified_time, *variant
+        ),
+        process.last_modified_time,
+    )
+
+
+class FileDownload(BaseModel):
+    """A blob download opened for streaming to a client.
+
+    Attributes:
+        size: Total size of the blob in bytes.
+        byte_range: Inclusive ``(first, last)`` bytes being downloaded, or
+            None when the whole blob is.
+        etag: ETag of the blob.
+        last_modified: Last modification time of the blob.
+        downloader: ``StorageStreamDownloader`` yielding the content, or None
+            when the requested range is not satisfiable.
+    """
+
+    size: int
+    byte_range: Optional[tuple[int, int]] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime.datetime] = None
+    downloader: Optional[Any] = None
+
+
+def _blob_size(properties) -> int:
+    """Return the total size of a blob from the properties of a download.
+
+    For a ranged download ``size`` is that of the range; the total is the
+    ``*/total`` part of ``Content-Range``.
+    """
+    if properties.content_range:
+        return int(properties.content_range.rsplit("/", 1)[1])
+    return properties.size
+
+
+def process_list_query(
+    status: Optional[str] = None,
+    schema_id: Optional[str] = None,
+    imported_from: Optional[datetime.datetime] = None,
+    imported_to: Optional[datetime.datetime] = None,
+) -> dict:
+    """Return the Cosmos DB query of the processes matching the list filters."""
+    query: dict[str, Any] = {}
+    if status:
+        query["status"] = status
+    if schema_id:
+        query["target_schema.Id"] = schema_id
+    if imported_from or imported_to:
+        query["imported_time"] = {
+            **({"$gte": imported_from} if imported_from else {}),
+            **({"$lt": imported_to} if imported_to else {}),
+        }
+    return query
+
+
+def keyset_after(
+    imported_time: Optional[datetime.datetime], process_id: str
+) -> dict:
+    """Return the query of the processes listed after ``(imported_time, process_id)``.
+
+    Mirrors ``PROCESS_LIST_SORT`` (both fields descending). Records without
+    ``imported_time`` sort last.
+    """
+    if imported_time is None:
+        return {"imported_time": None, "process_id": {"$lt": process_id}}
+    return {
+        "$or": [
+            {"imported_time": {"$lt": imported_time}},
+            {"imported_time": imported_time, "process_id": {"$lt": process_id}},
+            {"imported_time": None},
+        ]
+    }
+
+
+def step_queue_name(step_name: str) -> str:
+    """Return the queue of a pipeline step, named as the workers name it."""
+    return f"content-pipeline-{step_name}-queue"
+
+
+def lane_queue_name(queue_name: str, priority: Optional[str]) -> str:
+    """Return the queue of the *priority* lane of *queue_name*.
+
+    The ``normal`` lane is the queue itself; the other lanes insert the
+    priority before the ``-queue`` suffix, as the pipeline workers expect
+    (``content-pipeline-extract-high-queue``).
+    """
+    if priority is None or priority == ProcessPriority.Normal:
+        return queue_name
+    return (
+        f"{queue_name.removesuffix('-queue')}-{ProcessPriority(priority).value}-queue"
+    )
+
+
+def resolve_priority(
+    requested: Optional[ProcessPriority], size_bytes: int, small_document_kb: int
+) -> Optional[ProcessPriority]:
+    """Return the lane of a submission.
+
+    An explicit priority is kept. Without one, documents of at most
+    *small_document_kb* KiB are processed as ``high``; larger ones stay
+    unset, so the extract step can still promote them by page count.
+    """
+    if requested is not None:
+        return requested
+    if small_document_kb and size_bytes <= small_document_kb * 1024:
+        return ProcessPriority.High
+    return None
+
+
+def _failed(step_result: dict) -> bool:
+    result = step_result.get("result")
+    return isinstance(result, dict) and result.get("result") in _FAILED_RESULTS
+
+
+def build_resume_message(
+    persisted: dict,
+    from_step: str,
+    schema_id: Optional[str] = None,
+    priority: Optional[str] = None,
+) -> ContentProcess:
+    """Build the queue message that reruns a process from *from_step*.
+
+    Args:
+        persisted: The pipeline persisted in ``process-status.json``.
+        from_step: The first step to run again.
+        schema_id: Schema to use instead of the process's schema.
+        priority: Lane to use instead of the process's lane.
+
+    Returns:
+        ContentProcess: The message for the queue of *from_step*. It keeps
+        the source file and the artifacts and results of the reused steps,
+        and has a new creation time, which marks a new attempt, so the
+        workers do not mistake earlier outputs of the rerun steps for
+        their own.
+
+    Raises:
+        ValueError: If *from_step* is not a step of the process, the process
+            is still running, or a step before *from_step* has no output
+            to reuse.
+    """
+    status = persisted.get("pipeline_status") or {}
+    steps = status.get("steps") or []
+    if from_step not in steps:
+        raise ValueError(f"'{from_step}' is not a step of this process ({steps}).")
+
+    results = {
+        result.get("step_name"): result
+        for result in status.get("process_results") or []
+    }
+    if not status.get("completed") and not any(
+        _failed(result) for result in results.values()
+    ):
+        raise ValueError("The process is still running.")
+
+    reused = steps[: steps.index(from_step)]
+    completed = status.get("completed_steps") or []
+    for step in reused:
+        if step not in completed or step not in results or _failed(results[step]):
+            raise ValueError(f"Step '{step}' has no output to reuse.")
+
+    return ContentProcess(
+        process_id=persisted["process_id"],
+        files=[
+            ProcessFile(**file)
+            for file in persisted.get("files") or []
+            if file.get("processed_by") == "API" or file.get("processed_by") in reused
+        ],
+        pipeline_status=Status(
+            process_id=persisted["process_id"],
+            schema_id=schema_id or status.get("schema_id"),
+            metadata_id=status.get("metadata_id"),
+            priority=priority or status.get("priority"),
+            creation_time=datetime.datetime.now(datetime.timezone.utc),
+            steps=steps,
+            remaining_steps=steps[len(reused) :],
+            completed_steps=reused,
+            process_results=[results[step] for step in reused],
+        ),
+    )
 
 
 class ContentProcessor(BaseModel):
-    """Thin wrapper around blob and queue helpers for single-file processing."""
+    """Non-blocking persistence of content processes.
+
+    Owns long-lived async clients for Cosmos DB, Blob Storage and Queue
+    Storage. The application registers one instance as an async singleton,
+    so every request shares the same connection pools, and closes it on
+    shutdown.
+    """
 
     config: AppConfiguration = Field(default=None)
-    blobHelper: StorageBlobHelper = Field(default=None)
-    queueHelper: StorageQueueHelper = Field(default=None)
+    credential: Any = Field(default=None)
+    mongoClient: AsyncMongoClient = Field(default=None)
+    processes: AsyncCosmosMongDBHelper = Field(default=None)
+    blobHelper: AsyncStorageBlobHelper = Field(default=None)
+    queueHelper: AsyncStorageQueueHelper = Field(default=None)
+    statusCache: StatusCache = Field(default=None)
+    countCache: CountCache = Field(default=None)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    def __init__(self, app_context: AppContext = None):
+    def __init__(
+        self,
+        app_context: AppContext = None,
+        credential: Any = None,
+        status_cache: StatusCache = None,
+        count_cache: CountCache = None,
+    ):
         super().__init__()
         self.config = app_context.configuration
-        self.blobHelper = StorageBlobHelper(
-            self.config.app_storage_blob_url, self.config.app_cps_processes
+        self.credential = credential
+        self.statusCache = status_cache or StatusCache()
+        self.countCache = count_cache or CountCache()
+        self.mongoClient = create_async_mongo_client(self.config.app_cosmos_connstr)
+        self.processes = AsyncCosmosMongDBHelper(
+            self.mongoClient,
+            self.config.app_cosmos_database,
+            self.config.app_cosmos_container_process,
+            indexes=[*PROCESS_LIST_INDEXES, *PROCESS_KEYSET_INDEXES],
+        )
+        self.blobHelper = AsyncStorageBlobHelper(
+            self.config.app_storage_blob_url,
+            self.config.app_cps_processes,
+            credential=credential,
+        )
+        self.queueHelper = AsyncStorageQueueHelper(
+            self.config.app_storage_queue_url, credential=credential
+        )
+
+    @classmethod
+    async def create_async(cls, app_context: AppContext) -> "ContentProcessor":
+        """Create an instance authenticated with an async Azure credential.
+
+        Its status cache is invalidated by the events of the ``StatusBroker``.
+        """
+        status_cache = StatusCache(
+            ttl_seconds=app_context.configuration.app_status_cache_ttl_seconds
         )
-        self.queueHelper = StorageQueueHelper(
-            self.config.app_storage_queue_url, self.config.app_message_queue_extract
+        app_context.get_service(StatusBroker).add_listener(status_cache.on_event)
+        return cls(
+            app_context=app_context,
+            credential=await get_azure_credential_async(),
+            status_cache=status_cache,
+            count_cache=CountCache(
+                ttl_seconds=app_context.configuration.app_process_count_ttl_seconds
+            ),
         )
 
-    def save_file_to_blob(self, process_id: str, file: bytes, file_name: str):
-        """Upload the submitted file into blob storage under *process_id*."""
-        self.blobHelper.upload_blob(file_name, file, process_id)
+    async def close(self):
+        """Close the clients and the credential."""
+        await self.countCache.close()
+        await self.queueHelper.close()
+        await self.blobHelper.close()
+        await self.mongoClient.close()
+        if self.credential is not None:
+            await self.credential.close()
+
+    async def save_file_to_blob(
+        self, process_id: str, file, file_name: str, content_type: str = None
+    ) -> UploadedBlob:
+        """Stream the submitted file into blob storage under *process_id*.
+
+        Returns:
+            UploadedBlob: Size and SHA-256 of the stored file.
+        """
+        return await self.blobHelper.upload_blob_staged(
+            file_name, file, process_id, content_type=content_type
+        )
+
+    async def copy_file_from_url(
+        self, process_id: str, blob_url: str, file_name: str
+    ) -> None:
+        """Copy the blob at *blob_url* into blob storage under *process_id*.
+
+        The storage service copies the content; it does not pass through the API.
+        """
+        await self.blobHelper.copy_blob_from_url(file_name, blob_url, process_id)
+
+    async def read_source_blob(self, blob_url: str) -> tuple[Any, bytes]:
+        """Return the properties and the first bytes of a blob to submit.
+
+        The first ``SOURCE_HEADER_BYTES`` bytes are enough to sniff the file type.
 
-    def enqueue_message(self, message_object: BaseModel):
-        """Serialize *message_object* and enqueue it for downstream processing."""
-        self.queueHelper.drop_message(message_object)
+        Raises:
+            ValueError: If *blob_url* is not a blob of the storage account or
+                does not exist.
+        """
+        properties = await self.blobHelper.get_blob_properties_at_url(blob_url)
+        header = b""
+        if properties.size:
+            header = await self.blobHelper.read_blob_at_url(
+                blob_url, SOURCE_HEADER_BYTES
+            )
+        return properties, header
+
+    async def enqueue_message(
+        self,
+        message_object: BaseModel,
+        priority: Optional[str] = None,
+        step_name: Optional[str] = None,
+    ):
+        """Serialize *message_object* and enqueue it in the *priority* lane.
+
+        The message goes to the extraction queue unless *step_name* names
+        another step.
+        """
+        queue_name = self.config.app_message_queue_extract
+        if step_name is not None and step_name != "extract":
+            queue_name = step_queue_name(step_name)
+        await self.queueHelper.drop_message(
+            lane_queue_name(queue_name, priority), message_object
+        )
+
+    async def load_pipeline(self, process_id: str) -> Optional[dict]:
+        """Return the pipeline the workers persisted for *process_id*, if any."""
+        try:
+            return json.loads(
+                await self.blobHelper.download_blob(PROCESS_STATUS_BLOB, process_id)
+            )
+        except ValueError:
+            return None
+
+    async def load_resume_message(
+        self,
+        process_id: str,
+        from_step: str,
+        schema_id: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> ContentProcess:
+        """Build the message resuming *process_id* from *from_step*.
+
+        The message reuses the earlier steps' output; enqueue it with
+        ``enqueue_message`` in the *from_step* queue.
+
+        Returns:
+            ContentProcess: The message to enqueue.
+
+        Raises:
+            LookupError: If the process has no persisted pipeline.
+            ValueError: If the process cannot be resumed from *from_step*.
+        """
+        persisted = await self.load_pipeline(process_id)
+        if persisted is None:
+            raise LookupError(f"Process '{process_id}' not found.")
+        return build_resume_message(persisted, from_step, schema_id, priority)
+
+    async def get_status_from_cosmos(
+        self, process_id: str
+    ) -> Optional[CosmosContentProcess]:
+        """Load the process record from Cosmos DB, or return ``None``."""
+        existing_process = await self.processes.find_document(
+            query={"process_id": process_id}, limit=1
+        )
+        if existing_process:
+            return CosmosContentProcess(**existing_process[0])
+        return None
+
+    async def get_process_status(
+        self, process_id: str
+    ) -> Optional[CosmosContentProcess]:
+        """Load only the status fields of the process record, or ``None``."""
+        existing_process = await self.processes.find_document(
+            query={"process_id": process_id},
+            limit=1,
+            projection=PROCESS_STATUS_PROJECTION,
+        )
+        if existing_process:
+            return CosmosContentProcess(**existing_process[0])
+        return None
+
+    async def get_cached_process_status(
+        self, process_id: str
+    ) -> Optional[CosmosContentProcess]:
+        """Like ``get_process_status``, served from the status cache when fresh."""
+        return await self.statusCache.get(
+            process_id, lambda: self.get_process_status(process_id)
+        )
+
+    async def get_all_processes_from_cosmos(
+        self,
+        page_size: int = 0,
+        page_number: int = 0,
+        continuation_token: Optional[str] = None,
+        status: Optional[str] = None,
+        schema_id: Optional[str] = None,
+        imported_from: Optional[datetime.datetime] = None,
+        imported_to: Optional[datetime.datetime] = None,
+    ) -> PaginatedResponse:
+        """Return a page of process records from Cosmos DB, newest first.
+
+        With *continuation_token* the page starts right after the last
+        record of the previous page (keyset pagination), which costs the
+        same at any depth; otherwise *page_number* skips the earlier pages.
+        The total count is approximate: it is served by the count cache.
+
+        Raises:
+            ValueError: If *continuation_token* is invalid or was issued for
+                other filters.
+        """
+        query = process_list_query(status, schema_id, imported_from, imported_to)
+        filters = entity_tag(json.dumps(query, default=str, sort_keys=True))
+
+        page_query, skip = query, 0
+        if continuation_token:
+            position = decode_token(continuation_token)
+            if position.get("filters") != filters:
+                raise ValueError(
+                    "The continuation token was issued for other filters."
+                )
+            try:
+                imported_time = position["imported_time"]
+                after = keyset_after(
+                    datetime.datetime.fromisoformat(imported_time)
+                    if imported_time is not None
+                    else None,
+                    str(position["process_id"]),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError("Invalid continuation token.") from e
+            page_query = {"$and": [query, after]} if query else after
+        elif page_number > 1:
+            skip = (page_number - 1) * page_size
+
+        items, total_count = await asyncio.gather(
+            self.processes.find_document(
+                query=page_query,
+                sort_fields=PROCESS_LIST_SORT,
+                skip=skip,
+                # One record more than the page tells whether a next page exists.
+                limit=page_size + 1 if page_size > 0 else 0,
+                projection=PROCESS_LIST_PROJECTION,
+            ),
+            self.countCache.get(filters, lambda: self._count_processes(query)),
+        )
+
+        next_token = None
+        if page_size > 0 and len(items) > page_size:
+            items = items[:page_size]
+            imported_time = items[-1].get("imported_time")
+            next_token = encode_token({
+                "imported_time": imported_time.isoformat() if imported_time else None,
+                "process_id": items[-1]["process_id"],
+                "filters": filters,
+            })
+
+        page = PaginatedResponse.of_page(
+            items, total_count, max(page_number, 1), page_size
+        )
+        page.continuation_token = next_token
+        return page
+
+    async def _count_processes(self, query: dict) -> int:
+        if not query:
+            return await self.processes.estimate_document_count()
+        return await self.processes.count_documents(query)
+
+    async def find_process_ids_in_cosmos(
+        self,
+        schema_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 0,
+    ) -> list[str]:
+        """Return the ids of the newest processes with *schema_id* and/or *status*."""
+        query = {}
+        if schema_id:
+            query["target_schema.Id"] = schema_id
+        if status:
+            query["status"] = status
+
+        items = await self.processes.find_document(
+            query=query,
+            sort_fields=[("imported_time", -1)],
+            limit=limit,
+            projection=["process_id"],
+        )
+        return [item["process_id"] for item in items]
+
+    async def update_process_status_to_cosmos(self, process: CosmosContentProcess):
+        """Upsert the status and file name of *process* into Cosmos DB."""
+        self.statusCache.invalidate(process.process_id)
+        result = await self.processes.update_document_by_query(
+            {"process_id": process.process_id},
+            {
+                "status": process.status,
+                "processed_file_name": process.processed_file_name,
+                "last_modified_time": process.last_modified_time,
+            },
+        )
+        if not result.matched_count:
+            await self.processes.insert_document(process.model_dump())
+
+    async def insert_processes(self, processes: list[CosmosContentProcess]):
+        """Insert the records of new processes into Cosmos DB in one request."""
+        await self.processes.insert_documents([
+            process.model_dump() for process in processes
+        ])
+
+    async def _update_process(self, process_id: str, update: dict):
+        self.statusCache.invalidate(process_id)
+        result = await self.processes.update_document_by_query(
+            {"process_id": process_id}, user_edit(update)
+        )
+        return result if result.matched_count else None
+
+    async def update_process_result(self, process_id: str, process_result: dict):
+        """Overwrite the extracted result of *process_id*; None if it does not exist."""
+        return await self._update_process(process_id, {"result": process_result})
+
+    async def update_process_comment(self, process_id: str, comment: str):
+        """Set the user comment of *process_id*; None if it does not exist."""
+        return await self._update_process(process_id, {"comment": comment})
+
+    async def delete_processed_file(
+        self, process_id: str, delete_files: bool = True
+    ) -> Optional[CosmosContentProcess]:
+        """Delete the process record from Cosmos DB and its blobs from storage.
+
+        Args:
+            process_id: Process to delete.
+            delete_files: False to leave the blobs to ``delete_process_files``
+                (run as a background deletion job).
+
+        Returns:
+            Optional[CosmosContentProcess]: The deleted record, or None if
+            there was none.
+        """
+        self.statusCache.invalidate(process_id)
+        existing_process = await self.get_status_from_cosmos(process_id)
+        if delete_files:
+            await self.delete_process_files(process_id)
+        if existing_process is None:
+            return None
+        await self.processes.delete_document(
+            item_id=process_id, field_name="process_id"
+        )
+        return existing_process
+
+    async def delete_process_files(
+        self, process_id: str, on_progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """Delete the blobs of *process_id*; return how many were deleted."""
+        return await self.blobHelper.delete_folder(
+            folder_name=process_id, on_progress=on_progress
+        )
+
+    async def get_file_bytes_from_blob(self, process_id: str, blob_name: str) -> bytes:
+        """Download a blob of the *process_id* folder and return its raw bytes."""
+        return await self.blobHelper.download_blob(blob_name, process_id)
+
+    async def open_file_from_blob(
+        self,
+        process_id: str,
+        blob_name: str,
+        byte_range: Optional[tuple[Optional[int], Optional[int]]] = None,
+    ) -> FileDownload:
+        """Open a blob of the *process_id* folder for streaming.
+
+        The download request itself returns the blob properties, so no
+        separate metadata call is made, except for a suffix range
+        (``bytes=-N``) whose start depends on the blob size.
+
+        Args:
+            byte_range: ``(first, last)`` as returned by ``parse_range``;
+                None downloads the whole blob.
+
+        Raises:
+            ValueError: If the blob does not exist.
+        """
+        offset = length = None
+        if byte_range is not None:
+            first, last = byte_range
+            if first is None:
+                properties = await self.blobHelper.get_blob_properties(
+                    blob_name, process_id
+                )
+                resolved = resolve_range(byte_range, properties.size)
+                if resolved is None:
+                    return FileDownload(
+                        size=properties.size,
+                        etag=properties.etag,
+                        last_modified=properties.last_modified,
+                    )
+                first, last = resolved
+            offset = first
+            length = None if last is None else last - first + 1
+
+        try:
+            downloader = await self.blobHelper.open_blob(
+                blob_name, process_id, offset=offset, length=length
+            )
+        except HttpResponseError as e:
+            if e.status_code != 416:
+                raise
+            properties = await self.blobHelper.get_blob_properties(
+                blob_name, process_id
+            )
+            return FileDownload(
+                size=properties.size,
+                etag=properties.etag,
+                last_modified=properties.last_modified,
+            )
+
+        properties = downloader.properties
+        size = _blob_size(properties)
+        return FileDownload(
+            size=size,
+            byte_range=None if byte_range is None else resolve_range(byte_range, size),
+            etag=properties.etag,
+            last_modified=properties.last_modified,
+            downloader=downloader,
+        )
+
+    async def _download_json(self, process_id: str, blob_name: str):
+        return json.loads(
+            (await self.get_file_bytes_from_blob(process_id, blob_name)).decode("utf-8")
+        )
+
+    async def get_status_from_blob(
+        self, process_id: str, hydrate: bool = True
+    ) -> list[Step_Outputs]:
+        """Return the step outputs of *process_id*, or ``[]`` if there are none.
+
+        Steps stored as references are resolved, concurrently, when
+        *hydrate* is set.
+        """
+        try:
+            step_outputs = [
+                Step_Outputs.model_validate(item)
+                for item in await self._download_json(process_id, STEP_OUTPUTS_BLOB)
+            ]
+        except Exception:
+            return []
+
+        if hydrate:
+            referenced = [
+                step_output
+                for step_output in step_outputs
+                if step_output.step_result is None
+                and step_output.step_result_reference is not None
+            ]
+            results = await asyncio.gather(
+                *[
+                    self._download_json(
+                        process_id, step_output.step_result_reference.blob_name
+                    )
+                    for step_output in referenced
+                ]
+            )
+            for step_output, result in zip(referenced, results):
+                step_output.step_result = result
+
+        return step_outputs
+
+    async def hydrate_evaluation(
+        self, process: CosmosContentProcess
+    ) -> CosmosContentProcess:
+        """Load the referenced per-field confidence and comparison rows of *process*.
+
+        Records saved with inline evaluation data are left unchanged.
+        """
+        if process.evaluation_reference is None:
+            return process
+        return process.apply_evaluation(
+            await self._download_json(
+                process.process_id, process.evaluation_reference.blob_name
+            )
+        )
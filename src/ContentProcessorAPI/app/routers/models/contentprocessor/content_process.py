@@ -1,10 +1,13 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-"""ContentProcess (aka CosmosContentProcess) domain model with Cosmos DB and Blob Storage persistence."""
+"""ContentProcess (aka CosmosContentProcess) domain model stored in Cosmos DB and Blob Storage.
+
+Persistence goes through the async ``ContentProcessor`` in
+``app.routers.logics.contentprocessor``.
+"""
 
 import datetime
-import json
 from typing import Any, List, Optional
 
 from pydantic import (
@@ -16,10 +19,56 @@ from pydantic import (
     model_validator,
 )
 
-from app.libs.azure.cosmos_db.helper import CosmosMongDBHelper
-from app.libs.azure.storage_blob.helper import StorageBlobHelper
 from app.routers.models.schmavault.model import Schema
 
+PROCESS_LIST_INDEXES = [("process_id", 1), ("imported_time", -1)]
+
+# Sort key of the paginated list; process_id breaks ties of imported_time
+# so that the key identifies a position in the list.
+PROCESS_LIST_SORT = [("imported_time", -1), ("process_id", -1)]
+
+# Compound indexes serving the list sort, unfiltered and filtered by
+# status or schema (Cosmos DB needs one to sort on several fields).
+PROCESS_KEYSET_INDEXES = [
+    PROCESS_LIST_SORT,
+    [("status", 1), *PROCESS_LIST_SORT],
+    [("target_schema.Id", 1), *PROCESS_LIST_SORT],
+]
+
+# Fields of a process returned by the paginated list.
+PROCESS_LIST_PROJECTION = [
+    "process_id",
+    "processed_file_name",
+    "processed_file_mime_type",
+    "processed_time",
+    "imported_time",
+    "last_modified_time",
+    "last_modified_by",
+    "status",
+    "entity_score",
+    "min_extracted_entity_score",
+    "schema_score",
+    "prompt_tokens",
+    "completion_tokens",
+]
+
+# Fields of a process read by the status endpoints and streams.
+PROCESS_STATUS_PROJECTION = [
+    "process_id",
+    "processed_file_name",
+    "status",
+    "last_modified_time",
+]
+
+
+def user_edit(update: dict) -> dict:
+    """Return *update* stamped as a modification by the user."""
+    return {
+        **update,
+        "last_modified_time": datetime.datetime.now(datetime.UTC),
+        "last_modified_by": "user",
+    }
+
 
 class ExtractionComparisonItem(BaseModel):
     """Single row of an extraction-vs-schema comparison report.
@@ -59,18 +108,36 @@ class ExtractionComparisonData(BaseModel):
         return self.model_dump_json(indent=4)
 
 
+class ArtifactReference(BaseModel):
+    """Pointer to a step artifact stored in the process blob folder.
+
+    Attributes:
+        blob_name: Blob name relative to the process folder.
+        size: Size of the artifact in bytes.
+        sha256: Hex SHA-256 digest of the artifact content.
+    """
+
+    blob_name: str
+    size: int
+    sha256: str
+
+
 class Step_Outputs(BaseModel):
     """Output payload from a single pipeline step, stored in blob storage.
 
     Attributes:
         step_name: Pipeline step that produced this output.
         processed_time: ISO timestamp of when the step completed.
-        step_result: Arbitrary result payload (validation skipped).
+        step_result: Arbitrary result payload (validation skipped); None when
+            only referenced.
+        step_result_reference: Blob holding the payload when the worker runs
+            in slim persistence mode.
     """
 
     step_name: str
     processed_time: Optional[str] = None
-    step_result: SkipValidation[Any]
+    step_result: SkipValidation[Any] = None
+    step_result_reference: Optional[ArtifactReference] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -84,6 +151,7 @@ class PaginatedResponse(BaseModel):
         current_page: Current 1-based page number.
         page_size: Number of items per page.
         items: Records on the current page.
+        continuation_token: Token of the next page, or None on the last one.
     """
 
     total_count: int
@@ -91,6 +159,25 @@ class PaginatedResponse(BaseModel):
     current_page: int
     page_size: int
     items: List["ContentProcess"]
+    continuation_token: Optional[str] = None
+
+    @classmethod
+    def of_page(
+        cls, items: list, total_count: int, page_number: int, page_size: int
+    ) -> "PaginatedResponse":
+        """Wrap one page of *items* out of *total_count* records."""
+        if not items:
+            return cls(
+                total_count=0, total_pages=0, current_page=0, page_size=0, items=[]
+            )
+        total_pages = (total_count + page_size - 1) // page_size if page_size > 0 else 1
+        return cls(
+            total_count=total_count,
+            total_pages=total_pages,
+            current_page=page_number,
+            page_size=page_size,
+            items=items,
+        )
 
 
 class ContentProcess(BaseModel):
@@ -116,6 +203,8 @@ class ContentProcess(BaseModel):
         completion_tokens: LLM completion tokens consumed.
         process_output: Per-step output payloads.
         extracted_comparison_data: Extraction-vs-schema comparison rows.
+        evaluation_reference: Blob holding the full evaluation result when
+            only summary scores are stored inline.
         comment: User-supplied comment.
     """
 
@@ -145,6 +234,7 @@ class ContentProcess(BaseModel):
 
     process_output: list[Step_Outputs] = Field(default_factory=list)
     extracted_comparison_data: Optional[ExtractionComparisonData] = None
+    evaluation_reference: Optional[ArtifactReference] = None
 
     comment: Optional[str] = None
 
@@ -168,256 +258,11 @@ class ContentProcess(BaseModel):
             self.id = self.process_id
         return self
 
-    def update_process_status_to_cosmos(
-        self,
-        connection_string: str,
-        database_name: str,
-        collection_name: str,
-    ):
-        """Upsert the current process status into Cosmos DB."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1)],
-        )
-
-        existing_process = mongo_helper.find_document(
-            query={"process_id": self.process_id}
-        )
-        if existing_process:
-            mongo_helper.update_document_by_query(
-                {"process_id": self.process_id},
-                {
-                    "status": self.status,
-                    "processed_file_name": self.processed_file_name,
-                },
+    def apply_evaluation(self, evaluation: dict):
+        """Set the confidence and comparison rows of a loaded evaluation blob."""
+        self.confidence = evaluation.get("confidence")
+        if evaluation.get("comparison_result") is not None:
+            self.extracted_comparison_data = ExtractionComparisonData.model_validate(
+                evaluation["comparison_result"]
             )
-        else:
-            mongo_helper.insert_document(self.model_dump())
-
-    def update_status_to_cosmos(
-        self, connection_string: str, database_name: str, collection_name: str
-    ):
-        """Upsert the full process document into Cosmos DB."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1)],
-        )
-
-        existing_process = mongo_helper.find_document({"process_id": self.process_id})
-        if existing_process:
-            mongo_helper.update_document_by_query(
-                {"process_id": self.process_id}, self.model_dump()
-            )
-        else:
-            mongo_helper.insert_document(self.model_dump())
-
-    def get_status_from_blob(
-        self,
-        connection_string: str,
-        container_name: str,
-        blob_name: str,
-    ) -> list[Step_Outputs]:
-        """Download step outputs from blob storage and return as a list."""
-        blob_helper = StorageBlobHelper(
-            account_url=connection_string, container_name=container_name
-        )
-
-        try:
-            blob_steps_list = blob_helper.download_blob(blob_name=blob_name).decode(
-                "utf-8"
-            )
-        except Exception:
-            return []
-
-        blob_content_list = json.loads(blob_steps_list)
-
-        step_outputs_list: List[Step_Outputs] = [
-            Step_Outputs.model_validate(item) for item in blob_content_list
-        ]
-
-        return step_outputs_list
-
-    def get_status_from_cosmos(
-        self,
-        connection_string: str,
-        database_name: str,
-        collection_name: str,
-    ):
-        """Load the process record from Cosmos DB, or return ``None``."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1)],
-        )
-
-        existing_process = mongo_helper.find_document(
-            query={"process_id": self.process_id}
-        )
-        if existing_process:
-            return ContentProcess(**existing_process[0])
-        else:
-            return None
-
-    def delete_processed_file(
-        self,
-        connection_string: str,
-        database_name: str,
-        collection_name: str,
-        storage_connection_string: str,
-        container_name: str,
-    ):
-        """Delete the process record from Cosmos DB and its blobs from storage."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1)],
-        )
-
-        blob_helper = StorageBlobHelper(
-            account_url=storage_connection_string, container_name=container_name
-        )
-
-        existing_process = mongo_helper.find_document(
-            query={"process_id": self.process_id}
-        )
-
-        blob_helper.delete_folder(folder_name=self.process_id)
-
-        if existing_process:
-            mongo_helper.delete_document(
-                item_id=self.process_id, field_name="process_id"
-            )
-            return ContentProcess(**existing_process[0])
-        else:
-            return None
-
-    def update_process_result(
-        self,
-        connection_string: str,
-        database_name: str,
-        collection_name: str,
-        process_result: dict,
-    ):
-        """Overwrite the extracted result dict for this process in Cosmos DB."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1)],
-        )
-        existing_process = mongo_helper.find_document(
-            query={"process_id": self.process_id}
-        )
-        if existing_process:
-            return mongo_helper.update_document_by_query(
-                {"process_id": self.process_id},
-                {
-                    "result": process_result,
-                    "last_modified_time": datetime.datetime.now(datetime.UTC),
-                    "last_modified_by": "user",
-                },
-            )
-        else:
-            return None
-
-    def update_process_comment(
-        self,
-        connection_string: str,
-        database_name: str,
-        collection_name: str,
-        comment: str,
-    ):
-        """Set the user comment for this process in Cosmos DB."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1)],
-        )
-        existing_process = mongo_helper.find_document(
-            query={"process_id": self.process_id}
-        )
-        if existing_process:
-            return mongo_helper.update_document_by_query(
-                {"process_id": self.process_id},
-                {
-                    "comment": comment,
-                    "last_modified_time": datetime.datetime.now(datetime.UTC),
-                    "last_modified_by": "user",
-                },
-            )
-        else:
-            return None
-
-    @staticmethod
-    def get_all_processes_from_cosmos(
-        connection_string: str,
-        database_name: str,
-        collection_name: str,
-        page_size: int = 0,
-        page_number: int = 0,
-    ) -> PaginatedResponse:
-        """Return a paginated list of process records from Cosmos DB."""
-        mongo_helper = CosmosMongDBHelper(
-            connection_string=connection_string,
-            db_name=database_name,
-            container_name=collection_name,
-            indexes=[("process_id", 1), ("imported_time", -1)],
-        )
-
-        total_count = mongo_helper.count_documents()
-        total_pages = (total_count + page_size - 1) // page_size if page_size > 0 else 1
-
-        items = mongo_helper.find_document(
-            query={},
-            sort_fields=[("imported_time", -1)],
-            skip=(page_number - 1) * page_size,
-            limit=page_size,
-            projection=[
-                "process_id",
-                "processed_file_name",
-                "processed_file_mime_type",
-                "processed_time",
-                "imported_time",
-                "last_modified_time",
-                "last_modified_by",
-                "status",
-                "entity_score",
-                "min_extracted_entity_score",
-                "schema_score",
-                "prompt_tokens",
-                "completion_tokens",
-            ],
-        )
-
-        if items:
-            return PaginatedResponse(
-                total_count=total_count,
-                total_pages=total_pages,
-                current_page=page_number,
-                page_size=page_size,
-                items=items,
-            )
-        else:
-            return PaginatedResponse(
-                total_count=0, total_pages=0, current_page=0, page_size=0, items=[]
-            )
-
-    def get_file_bytes_from_blob(
-        self,
-        connection_string: str,
-        container_name: str,
-        blob_name: str,
-    ) -> bytes:
-        """Download a blob and return its raw bytes."""
-        blob_helper = StorageBlobHelper(
-            account_url=connection_string, container_name=container_name
-        )
-
-        return blob_helper.download_blob(blob_name=blob_name)
+        return self
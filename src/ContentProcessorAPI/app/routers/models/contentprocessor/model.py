@@ -32,16 +32,33 @@ class ContentProcessorBatchFileAddRequest(BaseModel):
         return value
 
 
+class ProcessPriority(str, Enum):
+    """Processing lane of a document in the pipeline queues.
+
+    Members:
+        High: Interactive documents, served most often.
+        Normal: Default lane.
+        Low: Bulk uploads, served least often.
+    """
+
+    High = "high"
+    Normal = "normal"
+    Low = "low"
+
+
 class ContentProcessorRequest(BaseModel):
     """Request body for single-file content processing submission.
 
     Attributes:
         Metadata_Id: Optional metadata identifier.
         Schema_Id: Optional schema identifier.
+        Priority: Optional processing lane; small documents without one
+            are processed as ``high``.
     """
 
     Metadata_Id: Optional[str] = None
     Schema_Id: Optional[str] = None
+    Priority: Optional[ProcessPriority] = None
 
     @model_validator(mode="before")
     @classmethod
@@ -51,6 +68,19 @@ class ContentProcessorRequest(BaseModel):
         return value
 
 
+class ContentProcessorBatchRequest(ContentProcessorRequest):
+    """Request body for submitting many files for content processing.
+
+    The files are either uploaded alongside the request or already stored
+    in the storage account and listed in ``Blob_Urls``; both can be mixed.
+
+    Attributes:
+        Blob_Urls: URLs of blobs of the storage account to process.
+    """
+
+    Blob_Urls: list[str] = Field(default_factory=list)
+
+
 class ClaimProcessRequest(BaseModel):
     """Request body for triggering claim processing.
 
@@ -82,6 +112,7 @@ class ArtifactType(str, Enum):
         ScoreMergedData: Merged scored extraction data.
         SourceContent: Original uploaded file.
         SavedContent: Final persisted result.
+        Profile: cProfile statistics of a sampled pipeline step.
     """
 
     Undefined = "undefined"
@@ -91,6 +122,7 @@ class ArtifactType(str, Enum):
     ScoreMergedData = "score_merged_data"
     SourceContent = "source_content"
     SavedContent = "saved_content"
+    Profile = "profile"
 
 
 class Steps(str, Enum):
@@ -111,6 +143,48 @@ class Steps(str, Enum):
     Save = "save"
 
 
+class ReprocessRequest(BaseModel):
+    """Request body for reprocessing an existing process from a step.
+
+    Attributes:
+        From_Step: First step to run again; the artifacts of the steps
+            before it are reused.
+        Schema_Id: Schema to map with instead of the process's schema.
+        Priority: Processing lane; defaults to the process's lane.
+    """
+
+    From_Step: Steps = Steps.Mapping
+    Schema_Id: Optional[str] = None
+    Priority: Optional[ProcessPriority] = None
+
+
+class ReprocessBatchRequest(ReprocessRequest):
+    """Request body for reprocessing many existing processes from a step.
+
+    The processes are either listed in ``Process_Ids`` or selected by the
+    schema they were processed with and/or their status.
+
+    Attributes:
+        Process_Ids: Processes to reprocess.
+        Filter_Schema_Id: Select the processes mapped with this schema.
+        Filter_Status: Select the processes with this status.
+        Limit: Maximum number of selected processes.
+    """
+
+    Process_Ids: list[str] = Field(default_factory=list)
+    Filter_Schema_Id: Optional[str] = None
+    Filter_Status: Optional[str] = None
+    Limit: int = Field(default=100, gt=0, le=1000)
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        if not self.Process_Ids and not (self.Filter_Schema_Id or self.Filter_Status):
+            raise ValueError(
+                "Provide Process_Ids or at least one of Filter_Schema_Id and Filter_Status."
+            )
+        return self
+
+
 class ContentProcessorResponse(BaseModel):
     """Response returned after successful file submission.
 
@@ -139,8 +213,8 @@ class ProcessFile(BaseModel):
     process_id: str
     id: str
     name: str
-    size: int
-    mime_type: str
+    size: Optional[int] = None
+    mime_type: Optional[str] = None
     artifact_type: ArtifactType
     processed_by: str
 
@@ -157,6 +231,28 @@ class Paging(BaseModel):
     page_size: int = Field(default=0, gt=0)
 
 
+class ProcessListRequest(Paging):
+    """Pagination and filters of the processed-contents list.
+
+    Pages are reached either by ``page_number`` or, in constant time at any
+    depth, by the ``continuation_token`` returned with the previous page;
+    ``page_number`` then only labels the page.
+
+    Attributes:
+        continuation_token: Token of the page to return.
+        status: Only list processes in this status.
+        schema_id: Only list processes mapped with this schema.
+        imported_from: Only list processes imported at or after this time.
+        imported_to: Only list processes imported before this time.
+    """
+
+    continuation_token: Optional[str] = None
+    status: Optional[str] = None
+    schema_id: Optional[str] = None
+    imported_from: Optional[datetime] = None
+    imported_to: Optional[datetime] = None
+
+
 class ContentResultUpdate(BaseModel):
     """Request body for overwriting the processed result.
 
@@ -208,11 +304,14 @@ class Status(BaseModel):
         steps: Ordered list of all pipeline step names.
         remaining_steps: Steps not yet executed.
         completed_steps: Steps already finished.
+        priority: Processing lane of the document.
+        process_results: Results of the completed steps.
     """
 
     process_id: str
     schema_id: str
     metadata_id: str
+    priority: Optional[str] = Field(default=None)
 
     completed: Optional[bool] = Field(default=False)
     creation_time: datetime
@@ -220,6 +319,7 @@ class Status(BaseModel):
     steps: list[str] = Field(default_factory=list)
     remaining_steps: Optional[list[str]] = Field(default_factory=list)
     completed_steps: Optional[list[str]] = Field(default_factory=list)
+    process_results: Optional[list[dict]] = Field(default_factory=list)
 
 
 class ContentProcess(BaseModel):
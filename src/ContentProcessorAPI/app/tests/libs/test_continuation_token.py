@@ -0,0 +1,25 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for app.utils.continuation_token."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.utils.continuation_token import decode_token, encode_token
+
+
+def test_round_trip_is_url_safe():
+    payload = {"imported_time": "2024-01-08T00:00:00", "process_id": "p8?/+"}
+
+    token = encode_token(payload)
+
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert decode_token(token) == payload
+
+
+@pytest.mark.parametrize("token", ["not a token", "", "WzFd", "bm90IGpzb24"])
+def test_invalid_tokens(token):
+    with pytest.raises(ValueError):
+        decode_token(token)
@@ -1,15 +1,18 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-"""Unit tests for CosmosMongDBHelper."""
+"""Unit tests for CosmosMongDBHelper and AsyncCosmosMongDBHelper."""
 
 from __future__ import annotations
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
 
+from app.libs.azure.cosmos_db.async_helper import AsyncCosmosMongDBHelper
 from app.libs.azure.cosmos_db.helper import CosmosMongDBHelper
 
 
@@ -200,3 +203,96 @@ def test_create_indexes_skips_existing(
     )
     # Only field_b should be created
     mock_collection.create_index.assert_called_once_with([("field_b", -1)])
+
+
+@pytest.fixture
+def async_collection():
+    collection = MagicMock()
+    collection.index_information = AsyncMock(return_value={})
+    collection.create_index = AsyncMock()
+    collection.count_documents = AsyncMock(return_value=2)
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[{"process_id": "p1"}])
+    collection.find.return_value = cursor
+    return collection
+
+
+@pytest.fixture
+def async_helper(async_collection):
+    database = MagicMock()
+    database.list_collection_names = AsyncMock(return_value=[])
+    database.create_collection = AsyncMock()
+    database.__getitem__.return_value = async_collection
+    client = MagicMock()
+    client.__getitem__.return_value = database
+    return AsyncCosmosMongDBHelper(
+        client, "db", "processes", indexes=[("process_id", 1)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_helper_prepares_collection_once(async_helper, async_collection):
+    await async_helper.count_documents()
+    await async_helper.count_documents({"status": "Completed"})
+
+    database = async_helper.client["db"]
+    database.create_collection.assert_awaited_once_with("processes")
+    async_collection.create_index.assert_awaited_once_with([("process_id", 1)])
+    assert async_collection.count_documents.await_args.args == (
+        {"status": "Completed"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_helper_find_document(async_helper, async_collection):
+    items = await async_helper.find_document(
+        {"status": "Completed"}, sort_fields=[("imported_time", -1)], limit=5
+    )
+
+    assert items == [{"process_id": "p1"}]
+    async_collection.find.assert_called_once_with({"status": "Completed"}, None)
+    cursor = async_collection.find.return_value
+    cursor.sort.assert_called_once_with([("imported_time", -1)])
+    cursor.limit.assert_called_once_with(5)
+
+
+@pytest.mark.asyncio
+async def test_async_helper_insert_documents(async_helper, async_collection):
+    async_collection.insert_many = AsyncMock()
+
+    await async_helper.insert_documents([{"process_id": "p1"}, {"process_id": "p2"}])
+
+    async_collection.insert_many.assert_awaited_once_with(
+        [{"process_id": "p1"}, {"process_id": "p2"}], ordered=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_helper_creates_compound_indexes(async_collection):
+    database = MagicMock()
+    database.list_collection_names = AsyncMock(return_value=["processes"])
+    database.__getitem__.return_value = async_collection
+    client = MagicMock()
+    client.__getitem__.return_value = database
+    async_collection.index_information = AsyncMock(
+        return_value={"imported_time_-1_process_id_-1": {}}
+    )
+    async_collection.estimated_document_count = AsyncMock(return_value=7)
+    helper = AsyncCosmosMongDBHelper(
+        client,
+        "db",
+        "processes",
+        indexes=[
+            [("imported_time", -1), ("process_id", -1)],
+            [("status", 1), ("imported_time", -1), ("process_id", -1)],
+        ],
+    )
+
+    assert await helper.estimate_document_count() == 7
+    async_collection.create_index.assert_awaited_once_with([
+        ("status", 1),
+        ("imported_time", -1),
+        ("process_id", -1),
+    ])
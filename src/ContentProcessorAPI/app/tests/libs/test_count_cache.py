@@ -0,0 +1,70 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for app.libs.azure.cosmos_db.count_cache (approximate counts)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.libs.azure.cosmos_db.count_cache import CountCache
+
+
+@pytest.mark.asyncio
+async def test_first_count_is_loaded_then_cached():
+    cache = CountCache(ttl_seconds=60)
+    load = AsyncMock(return_value=42)
+
+    assert await cache.get("all", load) == 42
+    assert await cache.get("all", load) == 42
+    load.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_count_is_served_while_refreshed():
+    cache = CountCache(ttl_seconds=0.01)
+    assert await cache.get("all", AsyncMock(return_value=1)) == 1
+    await asyncio.sleep(0.02)
+
+    load = AsyncMock(return_value=2)
+    assert await cache.get("all", load) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    load.assert_awaited_once()
+    assert await cache.get("all", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_count():
+    cache = CountCache(ttl_seconds=0.01)
+    await cache.get("all", AsyncMock(return_value=1))
+    await asyncio.sleep(0.02)
+
+    assert await cache.get("all", AsyncMock(side_effect=RuntimeError("busy"))) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert await cache.get("all", AsyncMock(return_value=3)) == 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_counts_every_time():
+    cache = CountCache(ttl_seconds=0)
+    load = AsyncMock(side_effect=[1, 2])
+
+    assert await cache.get("all", load) == 1
+    assert await cache.get("all", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_keys_are_counted_separately_and_evicted():
+    cache = CountCache(ttl_seconds=60, max_entries=1)
+
+    assert await cache.get("a", AsyncMock(return_value=1)) == 1
+    assert await cache.get("b", AsyncMock(return_value=2)) == 2
+    assert await cache.get("a", AsyncMock(return_value=3)) == 3
@@ -0,0 +1,111 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for app.libs.azure.storage_blob.deletion_jobs (background deletions)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.libs.azure.storage_blob.deletion_jobs import DeletionJobs, DeletionJobStatus
+
+
+@pytest.mark.asyncio
+async def test_job_reports_progress_and_success():
+    jobs = DeletionJobs()
+    release = asyncio.Event()
+
+    async def delete(on_progress):
+        on_progress(256)
+        await release.wait()
+        return 300
+
+    job = jobs.start("c1", delete)
+    await asyncio.sleep(0)
+
+    assert jobs.get(job.job_id).status == DeletionJobStatus.RUNNING
+    assert jobs.get(job.job_id).deleted == 256
+
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    done = jobs.get(job.job_id)
+    assert done.status == DeletionJobStatus.SUCCEEDED
+    assert done.deleted == 300
+    assert done.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_job_keeps_error():
+    jobs = DeletionJobs()
+
+    async def delete(on_progress):
+        raise RuntimeError("forbidden")
+
+    job = jobs.start("c1", delete)
+    await asyncio.sleep(0)
+
+    assert jobs.get(job.job_id).status == DeletionJobStatus.FAILED
+    assert jobs.get(job.job_id).error == "forbidden"
+
+
+@pytest.mark.asyncio
+async def test_running_deletion_of_a_folder_is_reused():
+    jobs = DeletionJobs()
+    release = asyncio.Event()
+
+    async def delete(on_progress):
+        await release.wait()
+        return 0
+
+    first = jobs.start("c1", delete)
+    assert jobs.start("c1", delete) is first
+    assert jobs.start("c2", delete) is not first
+
+    release.set()
+    await jobs.close()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_forgotten_after_retention():
+    jobs = DeletionJobs(retention_seconds=0)
+
+    async def delete(on_progress):
+        return 1
+
+    job = jobs.start("c1", delete)
+    await asyncio.sleep(0)
+
+    assert jobs.get(job.job_id) is None
+
+
+@pytest.mark.asyncio
+async def test_oldest_finished_jobs_are_evicted():
+    jobs = DeletionJobs(max_jobs=1)
+
+    async def delete(on_progress):
+        return 1
+
+    first = jobs.start("c1", delete)
+    second = jobs.start("c2", delete)
+    await asyncio.sleep(0)
+
+    assert jobs.get(first.job_id) is None
+    assert jobs.get(second.job_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_running_jobs():
+    jobs = DeletionJobs()
+
+    async def delete(on_progress):
+        await asyncio.Event().wait()
+
+    jobs.start("c1", delete)
+    await asyncio.sleep(0)
+    await jobs.close()
+
+    assert jobs._tasks == {}
@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for app.utils.http_cache (ETag / Last-Modified validators)."""
+
+from __future__ import annotations
+
+import datetime
+from types import SimpleNamespace
+
+from app.utils.http_cache import (
+    entity_tag,
+    is_conditional,
+    is_not_modified,
+    validator_headers,
+)
+
+MODIFIED = datetime.datetime(2025, 3, 13, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def _request(**headers):
+    return SimpleNamespace(headers=headers)
+
+
+def test_entity_tag_is_quoted_and_stable():
+    assert entity_tag("p1", "Completed") == entity_tag("p1", "Completed")
+    assert entity_tag("p1", "Completed") != entity_tag("p1", "Error")
+    assert entity_tag("p1").startswith('"') and entity_tag("p1").endswith('"')
+
+
+def test_validator_headers():
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert headers["ETag"] == '"abc"'
+    assert headers["Last-Modified"] == "Thu, 13 Mar 2025 12:00:00 GMT"
+    assert headers["Cache-Control"] == "no-cache"
+
+
+def test_validator_headers_treats_naive_time_as_utc():
+    headers = validator_headers('"abc"', MODIFIED.replace(tzinfo=None))
+
+    assert headers["Last-Modified"] == "Thu, 13 Mar 2025 12:00:00 GMT"
+
+
+def test_is_conditional():
+    assert is_conditional(_request(**{"if-none-match": '"abc"'}))
+    assert not is_conditional(_request())
+
+
+def test_if_none_match():
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert is_not_modified(_request(**{"if-none-match": '"x", W/"abc"'}), headers)
+    assert is_not_modified(_request(**{"if-none-match": "*"}), headers)
+    assert not is_not_modified(_request(**{"if-none-match": '"x"'}), headers)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = validator_headers('"abc"', MODIFIED)
+    request = _request(**{
+        "if-none-match": '"x"',
+        "if-modified-since": "Fri, 14 Mar 2025 12:00:00 GMT",
+    })
+
+    assert not is_not_modified(request, headers)
+
+
+def test_if_modified_since():
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert is_not_modified(
+        _request(**{"if-modified-since": "Thu, 13 Mar 2025 12:00:00 GMT"}), headers
+    )
+    assert not is_not_modified(
+        _request(**{"if-modified-since": "Wed, 12 Mar 2025 12:00:00 GMT"}), headers
+    )
+    assert not is_not_modified(_request(**{"if-modified-since": "garbage"}), headers)
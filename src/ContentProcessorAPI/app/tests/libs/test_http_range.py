@@ -0,0 +1,50 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for app.utils.http_range (Range header parsing)."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.utils.http_range import content_range, parse_range, resolve_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, None)),
+        ("bytes=-500", (None, 500)),
+        (" Bytes = 5 - 9 ", (5, 9)),
+        (None, None),
+        ("", None),
+        ("bytes=9-5", None),
+        ("bytes=-", None),
+        ("bytes=-0", None),
+        ("bytes=0-1,5-9", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header) == expected
+
+
+@pytest.mark.parametrize(
+    "byte_range, size, expected",
+    [
+        ((0, 99), 1000, (0, 99)),
+        ((900, 1099), 1000, (900, 999)),
+        ((100, None), 1000, (100, 999)),
+        ((None, 200), 1000, (800, 999)),
+        ((None, 5000), 1000, (0, 999)),
+        ((1000, None), 1000, None),
+        ((None, 10), 0, None),
+    ],
+)
+def test_resolve_range(byte_range, size, expected):
+    assert resolve_range(byte_range, size) == expected
+
+
+def test_content_range():
+    assert content_range(0, 99, 1000) == "bytes 0-99/1000"
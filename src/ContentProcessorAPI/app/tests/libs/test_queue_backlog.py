@@ -0,0 +1,104 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for app.libs.azure.storage_queue.backlog (queue wait estimates)."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.libs.azure.storage_queue.backlog import (
+    QueueBacklog,
+    StepBacklog,
+    estimate_wait,
+)
+
+
+def test_empty_step_has_no_wait():
+    sample = estimate_wait([(0, None), (0, None)], None, now=10.0)
+
+    assert sample.depth == 0
+    assert sample.wait_seconds == 0.0
+
+
+def test_first_sample_waits_the_oldest_message_age():
+    sample = estimate_wait([(100, 300.0), (20, 60.0)], None, now=10.0)
+
+    assert sample.depth == 120
+    assert sample.service_rate is None
+    assert sample.wait_seconds == 300.0
+
+
+def test_wait_is_depth_over_service_rate():
+    previous = StepBacklog(depth=1200, sampled_at=0.0)
+
+    # Arrivals: 1000 / 500 s = 2/s; depth fell by 200 in 100 s, so 4/s are served.
+    sample = estimate_wait([(1000, 500.0)], previous, now=100.0)
+
+    assert sample.service_rate == pytest.approx(4.0)
+    assert sample.wait_seconds == pytest.approx(250.0)
+
+
+def test_stalled_step_waits_the_oldest_message_age():
+    previous = StepBacklog(depth=100, sampled_at=0.0)
+
+    # Depth grows as fast as messages arrive: nothing is served.
+    sample = estimate_wait([(200, 200.0)], previous, now=100.0)
+
+    assert sample.service_rate == 0.0
+    assert sample.wait_seconds == 200.0
+
+
+def _queue_helper(backlogs: dict[str, tuple[int, float | None]]):
+    helper = MagicMock()
+    helper.get_queue_backlog = AsyncMock(side_effect=lambda name: backlogs[name])
+    return helper
+
+
+@pytest.mark.asyncio
+async def test_wait_sums_the_requested_steps():
+    helper = _queue_helper({
+        "extract-high": (0, None),
+        "extract": (10, 100.0),
+        "map": (50, 400.0),
+        "claim": (3, 30.0),
+    })
+    backlog = QueueBacklog(
+        helper,
+        {"extract": ["extract-high", "extract"], "map": ["map"], "claim": ["claim"]},
+    )
+
+    assert await backlog.wait_seconds(["extract", "map"]) == 500.0
+    assert await backlog.wait_seconds(["extract", "map", "claim"]) == 530.0
+    assert helper.get_queue_backlog.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_stale_samples_are_served_while_refreshed():
+    backlogs = {"map": (50, 400.0)}
+    helper = _queue_helper(backlogs)
+    backlog = QueueBacklog(helper, {"map": ["map"]}, ttl_seconds=0)
+
+    assert await backlog.wait_seconds(["map"]) == 400.0
+    backlogs["map"] = (0, None)
+
+    assert await backlog.wait_seconds(["map"]) == 400.0
+    await backlog._sampling
+    assert await backlog.wait_seconds(["map"]) == 0.0
+    await backlog.close()
+
+
+@pytest.mark.asyncio
+async def test_unreadable_step_keeps_its_previous_sample():
+    helper = _queue_helper({"map": (50, 400.0)})
+    backlog = QueueBacklog(helper, {"map": ["map"]}, ttl_seconds=0)
+    await backlog.wait_seconds(["map"])
+
+    helper.get_queue_backlog.side_effect = RuntimeError("unavailable")
+    await backlog.wait_seconds(["map"])
+    await backlog._sampling
+
+    assert await backlog.wait_seconds(["map"]) == 400.0
+    await backlog.close()
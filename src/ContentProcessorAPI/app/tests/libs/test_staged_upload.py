@@ -0,0 +1,130 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for block-staged blob uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.libs.azure.storage_blob.staged_upload import (
+    block_id,
+    upload_staged,
+    upload_staged_async,
+)
+
+CONTENT = bytes(range(256)) * 41  # 10,496 bytes
+
+
+class _AsyncBlobClient:
+    """Records staged blocks and the peak number staged concurrently."""
+
+    def __init__(self, fail_at: int = -1):
+        self.blocks: dict[str, bytes] = {}
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_at = fail_at
+        self.committed = None
+
+    async def stage_block(self, block_id, data):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if len(self.blocks) == self.fail_at:
+            raise RuntimeError("stage failed")
+        self.blocks[block_id] = data
+
+    async def commit_block_list(self, block_list, **kwargs):
+        self.committed = (block_list, kwargs)
+
+
+class _AsyncReader:
+    """Mimics UploadFile: an asynchronous ``read``."""
+
+    def __init__(self, content: bytes):
+        self._stream = io.BytesIO(content)
+
+    async def read(self, size: int) -> bytes:
+        return self._stream.read(size)
+
+
+def test_block_ids_share_one_length():
+    assert len(block_id(0)) == len(block_id(12345))
+    assert block_id(0) != block_id(1)
+
+
+@pytest.mark.asyncio
+async def test_upload_staged_async_stages_and_commits_in_order():
+    blob_client = _AsyncBlobClient()
+
+    uploaded = await upload_staged_async(
+        blob_client,
+        _AsyncReader(CONTENT),
+        "application/pdf",
+        block_size=1024,
+        max_concurrency=3,
+    )
+
+    assert uploaded.size == len(CONTENT)
+    assert uploaded.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    block_list, kwargs = blob_client.committed
+    assert block_list == [block_id(i) for i in range(11)]
+    assert b"".join(blob_client.blocks[i] for i in block_list) == CONTENT
+    assert kwargs["metadata"] == {"sha256": uploaded.sha256}
+    assert kwargs["content_settings"].content_type == "application/pdf"
+    assert 1 < blob_client.peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_upload_staged_async_accepts_sync_streams():
+    blob_client = _AsyncBlobClient()
+
+    uploaded = await upload_staged_async(blob_client, io.BytesIO(b"%PDF-1.7"))
+
+    assert uploaded.size == 8
+    assert blob_client.committed[1]["content_settings"] is None
+
+
+@pytest.mark.asyncio
+async def test_upload_staged_async_does_not_commit_after_failure():
+    blob_client = _AsyncBlobClient(fail_at=2)
+
+    with pytest.raises(RuntimeError):
+        await upload_staged_async(
+            blob_client, io.BytesIO(CONTENT), block_size=1024, max_concurrency=2
+        )
+
+    assert blob_client.committed is None
+
+
+def test_upload_staged_sync():
+    blob_client = MagicMock()
+
+    uploaded = upload_staged(
+        blob_client, io.BytesIO(CONTENT), block_size=4096, max_concurrency=2
+    )
+
+    assert uploaded.size == len(CONTENT)
+    assert uploaded.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert blob_client.stage_block.call_count == 3
+    block_list = blob_client.commit_block_list.call_args.args[0]
+    assert block_list == [block_id(0), block_id(1), block_id(2)]
+    assert blob_client.commit_block_list.call_args.kwargs["metadata"] == {
+        "sha256": uploaded.sha256
+    }
+
+
+def test_upload_staged_sync_does_not_commit_after_failure():
+    blob_client = MagicMock()
+    blob_client.stage_block.side_effect = RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError):
+        upload_staged(blob_client, io.BytesIO(CONTENT), block_size=4096)
+
+    blob_client.commit_block_list.assert_not_called()
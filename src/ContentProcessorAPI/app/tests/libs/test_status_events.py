@@ -0,0 +1,239 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for the status-event broker, cache, pump and status streams."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.libs.status_events import broker as broker_module
+from app.libs.status_events.broker import StatusBroker, StatusEvent
+from app.libs.status_events.cache import StatusCache
+from app.libs.status_events.pump import StatusEventPump
+from app.libs.status_events.stream import (
+    SSE_KEEP_ALIVE,
+    follow_status,
+    sse_status_events,
+    wait_for_status_change,
+)
+
+TERMINAL = ("Completed", "Error")
+
+
+def _reader(*statuses):
+    """Return a status reader returning *statuses* in turn, then the last one."""
+    remaining = list(statuses)
+
+    async def read_status():
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return read_status
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_to_subscribers_of_the_id():
+    broker = StatusBroker()
+    with (
+        broker.subscribe("process", "p1") as p1,
+        broker.subscribe("process", "p2") as p2,
+    ):
+        broker.publish(StatusEvent(kind="process", id="p1", status="map"))
+
+        assert (await p1.get()).status == "map"
+        assert p2.empty()
+        assert broker.subscriber_count() == 2
+    assert broker.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_broker_drops_oldest_event_of_slow_subscriber(monkeypatch):
+    monkeypatch.setattr(broker_module, "SUBSCRIBER_QUEUE_SIZE", 2)
+    broker = StatusBroker()
+    with broker.subscribe("claim", "c1") as events:
+        for status in ("Pending", "Summarizing", "Completed"):
+            broker.publish(StatusEvent(kind="claim", id="c1", status=status))
+
+        assert [events.get_nowait().status for _ in range(2)] == [
+            "Summarizing",
+            "Completed",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_follow_status_yields_events_until_terminal():
+    broker = StatusBroker()
+
+    async def publish():
+        await asyncio.sleep(0.01)
+        for status in ("map", "map", "Completed"):
+            broker.publish(StatusEvent(kind="process", id="p1", status=status))
+
+    task = asyncio.create_task(publish())
+    statuses = await _collect(
+        follow_status(broker, "process", "p1", _reader("extract"), TERMINAL)
+    )
+    await task
+
+    assert statuses == ["extract", "map", "Completed"]
+
+
+@pytest.mark.asyncio
+async def test_follow_status_reconciles_and_keeps_alive():
+    statuses = await _collect(
+        follow_status(
+            StatusBroker(),
+            "process",
+            "p1",
+            _reader("extract", "extract", "Error"),
+            TERMINAL,
+            reconcile_seconds=0.01,
+        )
+    )
+
+    assert statuses == ["extract", None, "Error"]
+
+
+@pytest.mark.asyncio
+async def test_follow_status_ends_when_record_is_gone():
+    statuses = await _collect(
+        follow_status(
+            StatusBroker(),
+            "process",
+            "p1",
+            _reader("extract", None),
+            TERMINAL,
+            reconcile_seconds=0.01,
+        )
+    )
+
+    assert statuses == ["extract"]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_status_change_times_out():
+    read_status = AsyncMock(return_value="extract")
+
+    await wait_for_status_change(
+        StatusBroker(),
+        "process",
+        "p1",
+        read_status,
+        TERMINAL,
+        last_status="extract",
+        timeout=0.05,
+        reconcile_seconds=0.01,
+    )
+
+    assert read_status.await_count > 1
+
+
+@pytest.mark.asyncio
+async def test_sse_status_events_format():
+    async def statuses():
+        yield "map"
+        yield None
+
+    frames = await _collect(
+        sse_status_events(statuses(), lambda status: {"id": "p1", "status": status})
+    )
+
+    assert frames == [
+        'event: status\ndata: {"id": "p1", "status": "map"}\n\n',
+        SSE_KEEP_ALIVE,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pump_once_publishes_and_deletes_messages():
+    broker = StatusBroker()
+    messages = [
+        SimpleNamespace(content='{"kind": "process", "id": "p1", "status": "map"}'),
+        SimpleNamespace(content="not json"),
+    ]
+
+    async def receive_messages(**kwargs):
+        for message in messages:
+            yield message
+
+    pump = StatusEventPump(broker, "", "")
+    pump.queue_client = MagicMock()
+    pump.queue_client.receive_messages = receive_messages
+    pump.queue_client.delete_message = AsyncMock()
+
+    with broker.subscribe("process", "p1") as events:
+        assert await pump.pump_once() == 2
+        assert events.get_nowait().status == "map"
+    assert pump.queue_client.delete_message.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pump_without_queue_is_disabled():
+    pump = StatusEventPump(StatusBroker(), "https://q", "")
+
+    await pump.start()
+    await pump.close()
+
+    assert pump.queue_client is None
+
+
+@pytest.mark.asyncio
+async def test_status_cache_serves_fresh_entries():
+    cache = StatusCache(ttl_seconds=60)
+    load = AsyncMock(return_value="record")
+
+    assert await cache.get("p1", load) == "record"
+    assert await cache.get("p1", load) == "record"
+    load.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_status_cache_is_invalidated_by_events():
+    broker = StatusBroker()
+    cache = StatusCache(ttl_seconds=60)
+    broker.add_listener(cache.on_event)
+    load = AsyncMock(return_value="record")
+    await cache.get("p1", load)
+
+    broker.publish(StatusEvent(kind="claim", id="p1", status="Completed"))
+    await cache.get("p1", load)
+    broker.publish(StatusEvent(kind="process", id="p1", status="Completed"))
+    await cache.get("p1", load)
+
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_status_cache_does_not_keep_missing_or_disabled_entries():
+    load = AsyncMock(return_value=None)
+    cache = StatusCache(ttl_seconds=60)
+    await cache.get("p1", load)
+    await cache.get("p1", load)
+
+    disabled = StatusCache(ttl_seconds=0)
+    other = AsyncMock(return_value="record")
+    await disabled.get("p1", other)
+    await disabled.get("p1", other)
+
+    assert load.await_count == 2
+    assert other.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_status_cache_evicts_oldest_entry():
+    cache = StatusCache(ttl_seconds=60, max_entries=2)
+    for process_id in ("p1", "p2", "p3"):
+        await cache.get(process_id, AsyncMock(return_value=process_id))
+
+    load = AsyncMock(return_value="p1")
+    await cache.get("p1", load)
+
+    load.assert_awaited_once()
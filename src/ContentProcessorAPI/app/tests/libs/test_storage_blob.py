@@ -1,13 +1,16 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-"""Unit tests for StorageBlobHelper."""
+"""Unit tests for StorageBlobHelper and AsyncStorageBlobHelper."""
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import gzip
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from azure.core import MatchConditions
 from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import BlobClient, BlobServiceClient, ContainerClient
 
@@ -15,6 +18,7 @@ from azure.storage.blob import BlobClient, BlobServiceClient, ContainerClient
 with patch("app.utils.azure_credential_utils.get_azure_credential") as mock_cred:
     mock_cred.return_value = MagicMock()
     from app.libs.azure.storage_blob.helper import StorageBlobHelper
+from app.libs.azure.storage_blob.async_helper import AsyncStorageBlobHelper
 
 
 @pytest.fixture
@@ -55,6 +59,26 @@ def test_upload_blob(storage_blob_helper, mock_container_client, mock_blob_clien
     assert result == mock_blob_client.upload_blob.return_value
 
 
+def test_upload_blob_if_unchanged(storage_blob_helper, mock_blob_client):
+    storage_blob_helper.upload_blob("manifest.json", b"{}", "c1", etag='"e1"')
+    mock_blob_client.upload_blob.assert_called_once_with(
+        b"{}", overwrite=True, etag='"e1"', match_condition=MatchConditions.IfNotModified
+    )
+
+
+def test_download_blob_with_etag(storage_blob_helper, mock_blob_client):
+    download_stream = mock_blob_client.download_blob.return_value
+    download_stream.readall.return_value = b"{}"
+    download_stream.properties.size = 2
+    download_stream.properties.content_settings.content_encoding = None
+    download_stream.properties.etag = '"e1"'
+
+    assert storage_blob_helper.download_blob_with_etag("manifest.json", "c1") == (
+        b"{}",
+        '"e1"',
+    )
+
+
 def test_download_blob(storage_blob_helper, mock_container_client, mock_blob_client):
     mock_blob_client.download_blob.return_value.readall.return_value = b"dummy content"
     result = storage_blob_helper.download_blob("test-blob")
@@ -63,10 +87,25 @@ def test_download_blob(storage_blob_helper, mock_container_client, mock_blob_cli
     assert result == b"dummy content"
 
 
+def test_download_blob_decodes_gzip(
+    storage_blob_helper, mock_container_client, mock_blob_client
+):
+    props = MagicMock()
+    props.content_settings.content_encoding = "gzip"
+    mock_blob_client.download_blob.return_value.properties = props
+    mock_blob_client.download_blob.return_value.readall.return_value = gzip.compress(
+        b'{"a": 1}'
+    )
+    result = storage_blob_helper.download_blob("step_outputs.json")
+    mock_blob_client.download_blob.assert_called_once_with(decompress=False)
+    mock_blob_client.get_blob_properties.assert_not_called()
+    assert result == b'{"a": 1}'
+
+
 def test_download_blob_not_found(
     storage_blob_helper, mock_container_client, mock_blob_client
 ):
-    mock_blob_client.get_blob_properties.side_effect = ResourceNotFoundError
+    mock_blob_client.download_blob.side_effect = ResourceNotFoundError
     with pytest.raises(
         ValueError, match="Blob 'test-blob' not found in container 'test-container'."
     ):
@@ -93,7 +132,7 @@ def test_download_blob_empty_raises(
 ):
     props = MagicMock()
     props.size = 0
-    mock_blob_client.get_blob_properties.return_value = props
+    mock_blob_client.download_blob.return_value.properties = props
     with pytest.raises(ValueError, match="is empty"):
         storage_blob_helper.download_blob("empty-blob")
 
@@ -163,19 +202,158 @@ def test_delete_blob_and_cleanup_suppresses_delete_error(
 def test_delete_folder(
     storage_blob_helper,
     mock_container_client,
-    mock_blob_client,
     mock_blob_service_client,
 ):
-    blob1 = MagicMock()
-    blob1.name = "folder/a.pdf"
-    blob2 = MagicMock()
-    blob2.name = "folder/b.pdf"
-    mock_container_client.list_blobs.side_effect = [
-        [blob1, blob2],  # first call: blobs under folder/
-        [MagicMock()],  # second call: remaining blobs in container
+    mock_container_client.list_blob_names.return_value.by_page.return_value = [
+        ["folder/a.pdf", "folder/b.pdf"]
     ]
-    mock_container_client.get_blob_client.return_value = mock_blob_client
-    mock_blob_service_client.get_container_client.return_value = mock_container_client
+    mock_container_client.delete_blobs.return_value = [
+        MagicMock(status_code=202),
+        MagicMock(status_code=202),
+    ]
+    mock_container_client.delete_blob.side_effect = ResourceNotFoundError("no marker")
+
+    assert storage_blob_helper.delete_folder("folder") == 2
+
+    mock_container_client.list_blob_names.assert_called_once_with(
+        name_starts_with="folder/", results_per_page=256
+    )
+    mock_container_client.delete_blobs.assert_called_once_with(
+        "folder/a.pdf", "folder/b.pdf", raise_on_any_failure=False
+    )
+    mock_container_client.delete_blob.assert_called_once_with("folder")
+    mock_container_client.list_blobs.assert_not_called()
+
+
+@pytest.fixture
+def async_blob_client(mocker):
+    blob_client = mocker.MagicMock()
+    service_client = mocker.patch(
+        "app.libs.azure.storage_blob.async_helper.BlobServiceClient"
+    ).return_value
+    service_client.get_container_client.return_value.get_blob_client.return_value = (
+        blob_client
+    )
+    service_client.get_container_client.return_value.create_container = AsyncMock()
+    return blob_client
+
+
+def _download(data: bytes, content_encoding=None):
+    stream = MagicMock()
+    stream.properties.size = len(data)
+    stream.properties.content_settings.content_encoding = content_encoding
+    stream.readall = AsyncMock(return_value=data)
+    return stream
+
 
-    storage_blob_helper.delete_folder("folder")
-    assert mock_blob_client.delete_blob.call_count >= 2
+@pytest.mark.asyncio
+async def test_async_download_blob_decodes_gzip(async_blob_client):
+    async_blob_client.download_blob = AsyncMock(
+        return_value=_download(gzip.compress(b"payload"), "gzip")
+    )
+    helper = AsyncStorageBlobHelper("https://example.blob", "processes")
+
+    assert await helper.download_blob("a.json", "p1") == b"payload"
+    async_blob_client.download_blob.assert_awaited_once_with(decompress=False)
+
+
+@pytest.mark.asyncio
+async def test_async_download_blob_not_found(async_blob_client):
+    async_blob_client.download_blob = AsyncMock(
+        side_effect=ResourceNotFoundError("missing")
+    )
+    helper = AsyncStorageBlobHelper("https://example.blob", "processes")
+
+    with pytest.raises(ValueError):
+        await helper.download_blob("a.json", "p1")
+
+
+@pytest.mark.asyncio
+async def test_async_upload_blob_creates_container_once(async_blob_client):
+    async_blob_client.upload_blob = AsyncMock()
+    helper = AsyncStorageBlobHelper("https://example.blob", "processes")
+
+    await helper.upload_blob("a.pdf", b"1", "p1")
+    await helper.upload_blob("b.pdf", b"2", "p1")
+
+    container_client = helper.blob_service_client.get_container_client.return_value
+    container_client.create_container.assert_awaited_once()
+    assert async_blob_client.upload_blob.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_upload_blob_staged(async_blob_client):
+    async_blob_client.stage_block = AsyncMock()
+    async_blob_client.commit_block_list = AsyncMock()
+    helper = AsyncStorageBlobHelper("https://example.blob", "processes")
+
+    uploaded = await helper.upload_blob_staged(
+        "a.pdf", io.BytesIO(b"%PDF-1.7"), "p1", content_type="application/pdf"
+    )
+
+    assert uploaded.size == 8
+    async_blob_client.stage_block.assert_awaited_once()
+    async_blob_client.commit_block_list.assert_awaited_once()
+    container_client = helper.blob_service_client.get_container_client.return_value
+    container_client.create_container.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_copy_blob_from_url_authorizes_source(async_blob_client):
+    async_blob_client.upload_blob_from_url = AsyncMock()
+    credential = MagicMock()
+    credential.get_token = AsyncMock(return_value=MagicMock(token="t0ken"))
+    helper = AsyncStorageBlobHelper(
+        "https://acct.blob.core.windows.net", "processes", credential
+    )
+    service_client = helper.blob_service_client
+    service_client.primary_hostname = "acct.blob.core.windows.net"
+    service_client.get_blob_client.return_value.url = "https://source"
+
+    await helper.copy_blob_from_url(
+        "scan.pdf", "https://acct.blob.core.windows.net/inbox/2024/scan%201.pdf", "p1"
+    )
+
+    service_client.get_blob_client.assert_called_once_with("inbox", "2024/scan 1.pdf")
+    async_blob_client.upload_blob_from_url.assert_awaited_once_with(
+        "https://source", overwrite=True, source_authorization="Bearer t0ken"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "blob_url",
+    [
+        "https://other.blob.core.windows.net/inbox/scan.pdf",
+        "http://acct.blob.core.windows.net/inbox/scan.pdf",
+        "https://acct.blob.core.windows.net/inbox",
+    ],
+)
+async def test_async_blob_at_url_refuses_foreign_urls(async_blob_client, blob_url):
+    helper = AsyncStorageBlobHelper("https://acct.blob.core.windows.net", "processes")
+    helper.blob_service_client.primary_hostname = "acct.blob.core.windows.net"
+
+    with pytest.raises(ValueError):
+        await helper.get_blob_properties_at_url(blob_url)
+
+
+@pytest.mark.asyncio
+async def test_async_delete_folder(mocker):
+    service_client = mocker.patch(
+        "app.libs.azure.storage_blob.async_helper.BlobServiceClient"
+    ).return_value
+    container_client = service_client.get_container_client.return_value
+    delete_prefix = mocker.patch(
+        "app.libs.azure.storage_blob.async_helper.delete_prefix_async",
+        AsyncMock(return_value=3),
+    )
+    container_client.delete_blob = AsyncMock(side_effect=ResourceNotFoundError("none"))
+    helper = AsyncStorageBlobHelper("https://acct.blob.core.windows.net", "processes")
+    on_progress = MagicMock()
+
+    assert await helper.delete_folder("p1", on_progress=on_progress) == 3
+
+    delete_prefix.assert_awaited_once_with(
+        container_client, "p1/", on_progress=on_progress
+    )
+    container_client.delete_blob.assert_awaited_once_with("p1")
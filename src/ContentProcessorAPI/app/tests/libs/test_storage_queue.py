@@ -1,11 +1,12 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-"""Unit tests for StorageQueueHelper."""
+"""Unit tests for StorageQueueHelper and AsyncStorageQueueHelper."""
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from azure.core.exceptions import ResourceNotFoundError
@@ -14,6 +15,7 @@ from azure.storage.queue import QueueClient
 with patch("app.utils.azure_credential_utils.get_azure_credential") as mock_cred:
     mock_cred.return_value = MagicMock()
     from app.libs.azure.storage_queue.helper import StorageQueueHelper
+from app.libs.azure.storage_queue.async_helper import AsyncStorageQueueHelper
 
 
 @pytest.fixture
@@ -76,3 +78,76 @@ def test_create_or_get_queue_client(storage_queue_helper, mock_queue_client, moc
         credential=mock_credential,
     )
     assert result == new_client
+
+
+@pytest.mark.asyncio
+async def test_async_drop_message_creates_queue_once(mocker):
+    queue_client = mocker.MagicMock()
+    queue_client.get_queue_properties = AsyncMock(
+        side_effect=ResourceNotFoundError("Queue not found")
+    )
+    queue_client.create_queue = AsyncMock()
+    queue_client.send_message = AsyncMock()
+    queue_client.close = AsyncMock()
+    MockQueueClient = mocker.patch(
+        "app.libs.azure.storage_queue.async_helper.QueueClient",
+        return_value=queue_client,
+    )
+    message = MagicMock()
+    message.model_dump_json.return_value = '{"key":"value"}'
+
+    helper = AsyncStorageQueueHelper("https://example.queue.core.windows.net")
+    await helper.drop_message("test-queue", message)
+    await helper.drop_message("test-queue", message)
+    await helper.close()
+
+    MockQueueClient.assert_called_once()
+    assert MockQueueClient.call_args.kwargs["queue_name"] == "test-queue"
+    queue_client.create_queue.assert_awaited_once()
+    assert queue_client.send_message.await_count == 2
+    queue_client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_get_queue_backlog(mocker):
+    queue_client = mocker.MagicMock()
+    queue_client.get_queue_properties = AsyncMock(
+        return_value=MagicMock(approximate_message_count=7)
+    )
+    queue_client.peek_messages = AsyncMock(
+        return_value=[
+            MagicMock(
+                inserted_on=datetime.datetime.now(datetime.timezone.utc)
+                - datetime.timedelta(seconds=90)
+            )
+        ]
+    )
+    mocker.patch(
+        "app.libs.azure.storage_queue.async_helper.QueueClient",
+        return_value=queue_client,
+    )
+
+    helper = AsyncStorageQueueHelper("https://example.queue.core.windows.net")
+    depth, oldest_message_age = await helper.get_queue_backlog("test-queue")
+
+    assert depth == 7
+    assert 89 <= oldest_message_age < 100
+    queue_client.peek_messages.assert_awaited_once_with(max_messages=1)
+
+
+@pytest.mark.asyncio
+async def test_async_get_queue_backlog_of_empty_queue(mocker):
+    queue_client = mocker.MagicMock()
+    queue_client.get_queue_properties = AsyncMock(
+        return_value=MagicMock(approximate_message_count=0)
+    )
+    queue_client.peek_messages = AsyncMock()
+    mocker.patch(
+        "app.libs.azure.storage_queue.async_helper.QueueClient",
+        return_value=queue_client,
+    )
+
+    helper = AsyncStorageQueueHelper("https://example.queue.core.windows.net")
+
+    assert await helper.get_queue_backlog("test-queue") == (0, None)
+    queue_client.peek_messages.assert_not_awaited()
@@ -14,6 +14,7 @@ from app.utils.upload_validation import (
     get_upload_size_bytes,
     sanitize_filename,
     sniff_mime_type_from_magic,
+    validate_file_for_processing,
     validate_upload_for_processing,
 )
 
@@ -259,3 +260,40 @@ class TestValidateUploadForProcessing:
         assert isinstance(result, tuple)
         assert result[0] == "image.png"
         assert result[1] == "image/png"
+
+
+# ---------------------------------------------------------------------------
+# validate_file_for_processing
+# ---------------------------------------------------------------------------
+
+
+class TestValidateFileForProcessing:
+    def test_valid_blob(self):
+        result = validate_file_for_processing(
+            filename="inbox/scan 1.pdf",
+            header=b"%PDF-1.7",
+            content_type="application/octet-stream",
+            size_bytes=1000,
+            max_filesize_mb=20,
+        )
+        assert result == ("scan 1.pdf", "application/pdf", 1000)
+
+    def test_empty_blob(self):
+        result = validate_file_for_processing(
+            filename="scan.pdf",
+            header=b"",
+            content_type="application/pdf",
+            size_bytes=0,
+            max_filesize_mb=20,
+        )
+        assert result.status_code == 415
+
+    def test_too_large(self):
+        result = validate_file_for_processing(
+            filename="scan.pdf",
+            header=b"%PDF-1.7",
+            content_type="application/pdf",
+            size_bytes=21 * 1024 * 1024,
+            max_filesize_mb=20,
+        )
+        assert result.status_code == 413
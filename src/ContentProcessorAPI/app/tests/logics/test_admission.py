@@ -0,0 +1,133 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for app.routers.logics.admission (queue-backlog admission control)."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.routers.logics.admission import (
+    CLAIM_STEP,
+    MAX_RETRY_AFTER_SECONDS,
+    Admission,
+    AdmissionControl,
+    caller_of,
+    too_many_requests,
+)
+
+
+def _admission_control(max_wait_seconds=3600, tenants=None, wait_seconds=0.0):
+    configuration = SimpleNamespace(
+        app_storage_queue_url="https://example.queue.core.windows.net",
+        app_message_queue_extract="content-pipeline-extract-queue",
+        app_admission_max_wait_seconds=max_wait_seconds,
+        app_admission_tenant_max_wait_seconds=tenants or {},
+        app_admission_sample_seconds=15,
+    )
+    control = AdmissionControl(app_context=SimpleNamespace(configuration=configuration))
+    control.backlog.wait_seconds = AsyncMock(return_value=wait_seconds)
+    return control
+
+
+def test_backlog_covers_the_lanes_of_every_step():
+    control = _admission_control()
+
+    assert control.backlog.steps["extract"] == [
+        "content-pipeline-extract-high-queue",
+        "content-pipeline-extract-queue",
+        "content-pipeline-extract-low-queue",
+    ]
+    assert control.backlog.steps["map"][1] == "content-pipeline-map-queue"
+    assert control.backlog.steps[CLAIM_STEP] == ["claim-process-queue"]
+
+
+@pytest.mark.asyncio
+async def test_admits_under_the_threshold():
+    control = _admission_control(wait_seconds=600)
+
+    admission = await control.admit("anonymous")
+
+    assert admission.admitted
+    assert admission.wait_seconds == 600
+    control.backlog.wait_seconds.assert_awaited_once_with([
+        "extract",
+        "map",
+        "evaluate",
+        "save",
+    ])
+
+
+@pytest.mark.asyncio
+async def test_refuses_above_the_threshold_until_the_backlog_drains():
+    control = _admission_control(wait_seconds=4000.2)
+
+    admission = await control.admit("anonymous")
+
+    assert not admission.admitted
+    assert admission.retry_after_seconds == 401
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_capped():
+    control = _admission_control(wait_seconds=10 * 24 * 3600)
+
+    admission = await control.admit("anonymous")
+
+    assert admission.retry_after_seconds == MAX_RETRY_AFTER_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_claims_wait_for_the_claim_queue_too():
+    control = _admission_control()
+
+    await control.admit("anonymous", claim=True)
+
+    assert CLAIM_STEP in control.backlog.wait_seconds.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_tenant_thresholds_override_the_default():
+    control = _admission_control(
+        tenants={"bulk-loader": 1800, "portal": 0}, wait_seconds=2400
+    )
+
+    assert not (await control.admit("bulk-loader")).admitted
+    assert (await control.admit("someone")).admitted
+    assert (await control.admit("portal")).admitted
+
+
+@pytest.mark.asyncio
+async def test_disabled_admission_control_reads_no_queue():
+    control = _admission_control(max_wait_seconds=0, wait_seconds=10**6)
+
+    assert (await control.admit("anonymous")).admitted
+    control.backlog.wait_seconds.assert_not_awaited()
+
+
+def test_caller_of_reads_the_easyauth_principal():
+    request = MagicMock()
+    request.headers = {"X-MS-CLIENT-PRINCIPAL-ID": "id-1"}
+    assert caller_of(request) == "id-1"
+
+    request.headers = {}
+    assert caller_of(request) == "anonymous"
+
+
+def test_too_many_requests_sets_retry_after():
+    response = too_many_requests(
+        Admission(
+            admitted=False,
+            wait_seconds=7300.4,
+            max_wait_seconds=7200,
+            retry_after_seconds=101,
+        )
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "101"
+    assert json.loads(response.body)["estimated_wait_seconds"] == 7300
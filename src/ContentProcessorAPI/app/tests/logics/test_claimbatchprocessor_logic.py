@@ -6,9 +6,12 @@
 from __future__ import annotations
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
+from azure.core.exceptions import ResourceModifiedError
 
 from app.routers.models.contentprocessor.claim import ClaimItem, ClaimProcess
 from app.routers.models.contentprocessor.model import ClaimProcessRequest
@@ -68,7 +71,10 @@ def test_add_claim_item(MockBlob, MockQueue, mock_app_context):
         "items": [],
     }
     mock_blob_inst = MockBlob.return_value
-    mock_blob_inst.download_blob.return_value = json.dumps(manifest).encode()
+    mock_blob_inst.download_blob_with_etag.return_value = (
+        json.dumps(manifest).encode(),
+        '"etag-1"',
+    )
 
     from app.routers.logics.claimbatchpocessor import ClaimBatchProcessor
 
@@ -81,6 +87,92 @@ def test_add_claim_item(MockBlob, MockQueue, mock_app_context):
     assert len(result.items) == 1
     assert result.items[0].id is not None  # UUID assigned
     assert mock_blob_inst.upload_blob.call_count == 1  # manifest re-saved
+    # The manifest is only overwritten if unchanged since it was read.
+    assert mock_blob_inst.upload_blob.call_args.kwargs["etag"] == '"etag-1"'
+
+
+class _ManifestStore:
+    """In-memory manifest blob with ETag-conditional writes."""
+
+    def __init__(self, manifest: dict):
+        self.content = json.dumps(manifest).encode()
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def download_blob_with_etag(self, blob_name, container_name=None):
+        with self.lock:
+            return self.content, str(self.version)
+
+    def upload_blob(self, blob_name, content, container_name=None, etag=None):
+        with self.lock:
+            if etag != str(self.version):
+                raise ResourceModifiedError("Condition not met")
+            self.content = content.encode()
+            self.version += 1
+
+
+@patch("app.routers.logics.claimbatchpocessor.MANIFEST_RETRY_BASE_SECONDS", 0.001)
+@patch("app.routers.logics.claimbatchpocessor.StorageQueueHelper")
+@patch("app.routers.logics.claimbatchpocessor.StorageBlobHelper")
+def test_add_claim_item_concurrently_loses_no_item(
+    MockBlob, MockQueue, mock_app_context
+):
+    store = _ManifestStore({"claim_id": "c1", "schema_collection_id": "ss1"})
+
+    from app.routers.logics.claimbatchpocessor import ClaimBatchProcessor
+
+    bp = ClaimBatchProcessor(app_context=mock_app_context)
+    bp.blobHelper = store
+
+    def add(index):
+        bp.add_claim_item(
+            "c1",
+            ClaimItem(
+                claim_id="c1",
+                schema_id="s1",
+                metadata_id="m1",
+                file_name=f"photo-{index}.jpg",
+            ),
+        )
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(add, range(10)))
+
+    manifest = ClaimProcess(**json.loads(store.content))
+    assert sorted(item.file_name for item in manifest.items) == sorted(
+        f"photo-{index}.jpg" for index in range(10)
+    )
+
+
+@patch("app.routers.logics.claimbatchpocessor.time.sleep")
+@patch("app.routers.logics.claimbatchpocessor.StorageQueueHelper")
+@patch("app.routers.logics.claimbatchpocessor.StorageBlobHelper")
+def test_add_claim_item_gives_up_after_max_attempts(
+    MockBlob, MockQueue, sleep, mock_app_context
+):
+    mock_blob_inst = MockBlob.return_value
+    mock_blob_inst.download_blob_with_etag.return_value = (
+        json.dumps({"claim_id": "c1", "schema_collection_id": "ss1"}).encode(),
+        '"etag-1"',
+    )
+    mock_blob_inst.upload_blob.side_effect = ResourceModifiedError("Condition not met")
+
+    from app.routers.logics.claimbatchpocessor import (
+        MANIFEST_UPDATE_ATTEMPTS,
+        ClaimBatchProcessor,
+    )
+
+    bp = ClaimBatchProcessor(app_context=mock_app_context)
+    with pytest.raises(ResourceModifiedError):
+        bp.add_claim_item(
+            "c1",
+            ClaimItem(
+                claim_id="c1", schema_id="s1", metadata_id="m1", file_name="a.pdf"
+            ),
+        )
+
+    assert mock_blob_inst.upload_blob.call_count == MANIFEST_UPDATE_ATTEMPTS
+    assert sleep.call_count == MANIFEST_UPDATE_ATTEMPTS - 1
 
 
 @patch("app.routers.logics.claimbatchpocessor.StorageQueueHelper")
@@ -91,9 +183,13 @@ def test_add_file_to_claim(MockBlob, MockQueue, mock_app_context):
     from app.routers.logics.claimbatchpocessor import ClaimBatchProcessor
 
     bp = ClaimBatchProcessor(app_context=mock_app_context)
-    bp.add_file_to_claim("c1", "doc.pdf", b"content")
+    stream = MagicMock()
+    uploaded = bp.add_file_to_claim("c1", "doc.pdf", stream, "application/pdf")
 
-    mock_blob_inst.upload_blob.assert_called_once_with("doc.pdf", b"content", "c1")
+    mock_blob_inst.upload_blob_staged.assert_called_once_with(
+        "doc.pdf", stream, "c1", content_type="application/pdf"
+    )
+    assert uploaded == mock_blob_inst.upload_blob_staged.return_value
 
 
 @patch("app.routers.logics.claimbatchpocessor.StorageQueueHelper")
@@ -106,7 +202,9 @@ def test_delete_claim_container(MockBlob, MockQueue, mock_app_context):
     bp = ClaimBatchProcessor(app_context=mock_app_context)
     bp.delete_claim_container("c1")
 
-    mock_blob_inst.delete_folder.assert_called_once_with(folder_name="c1")
+    mock_blob_inst.delete_folder.assert_called_once_with(
+        folder_name="c1", on_progress=None
+    )
 
 
 @patch("app.routers.logics.claimbatchpocessor.StorageQueueHelper")
@@ -5,11 +5,26 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import datetime
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from azure.core.exceptions import HttpResponseError
 
-from app.routers.logics.contentprocessor import ContentProcessor
+from app.routers.logics.contentprocessor import (
+    ContentProcessor,
+    build_resume_message,
+    keyset_after,
+    lane_queue_name,
+    process_list_query,
+    resolve_priority,
+)
+from app.routers.models.contentprocessor.content_process import (
+    ContentProcess as CosmosContentProcess,
+)
+from app.routers.models.contentprocessor.model import ProcessPriority
 
 
 @pytest.fixture
@@ -18,28 +33,595 @@ def mock_app_context():
     ctx.configuration.app_storage_blob_url = "https://blob.example.com"
     ctx.configuration.app_cps_processes = "processes"
     ctx.configuration.app_storage_queue_url = "https://queue.example.com"
-    ctx.configuration.app_message_queue_extract = "extract-queue"
+    ctx.configuration.app_message_queue_extract = "content-pipeline-extract-queue"
+    ctx.configuration.app_cosmos_connstr = "mongodb://localhost"
+    ctx.configuration.app_cosmos_database = "db"
+    ctx.configuration.app_cosmos_container_process = "processes"
     return ctx
 
 
-@patch("app.routers.logics.contentprocessor.StorageQueueHelper")
-@patch("app.routers.logics.contentprocessor.StorageBlobHelper")
-def test_save_file_to_blob(MockBlob, MockQueue, mock_app_context):
-    mock_blob = MockBlob.return_value
+@pytest.fixture
+def content_processor(mock_app_context):
+    with (
+        patch(
+            "app.routers.logics.contentprocessor.AsyncStorageBlobHelper", autospec=True
+        ),
+        patch(
+            "app.routers.logics.contentprocessor.AsyncStorageQueueHelper", autospec=True
+        ),
+        patch(
+            "app.routers.logics.contentprocessor.AsyncCosmosMongDBHelper", autospec=True
+        ),
+        patch("app.routers.logics.contentprocessor.create_async_mongo_client"),
+    ):
+        yield ContentProcessor(app_context=mock_app_context)
+
+
+def _update_result(matched_count: int):
+    return SimpleNamespace(matched_count=matched_count)
+
+
+@pytest.mark.asyncio
+async def test_save_file_to_blob(content_processor):
+    file = MagicMock()
+    uploaded = await content_processor.save_file_to_blob(
+        "process-1", file, "doc.pdf", "application/pdf"
+    )
+
+    content_processor.blobHelper.upload_blob_staged.assert_awaited_once_with(
+        "doc.pdf", file, "process-1", content_type="application/pdf"
+    )
+    assert uploaded == content_processor.blobHelper.upload_blob_staged.return_value
+
+
+@pytest.mark.asyncio
+async def test_read_source_blob(content_processor):
+    blob_helper = content_processor.blobHelper
+    blob_helper.get_blob_properties_at_url.return_value = SimpleNamespace(size=1000)
+    blob_helper.read_blob_at_url.return_value = b"%PDF-1.7"
+
+    properties, header = await content_processor.read_source_blob("https://b/c/x.pdf")
+
+    assert properties.size == 1000
+    assert header == b"%PDF-1.7"
+    blob_helper.read_blob_at_url.assert_awaited_once_with("https://b/c/x.pdf", 16)
+
+
+@pytest.mark.asyncio
+async def test_read_source_blob_empty(content_processor):
+    content_processor.blobHelper.get_blob_properties_at_url.return_value = (
+        SimpleNamespace(size=0)
+    )
+
+    _, header = await content_processor.read_source_blob("https://b/c/x.pdf")
+
+    assert header == b""
+    content_processor.blobHelper.read_blob_at_url.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_copy_file_from_url(content_processor):
+    await content_processor.copy_file_from_url("p1", "https://b/c/x.pdf", "x.pdf")
 
-    cp = ContentProcessor(app_context=mock_app_context)
-    cp.save_file_to_blob("process-1", b"file bytes", "doc.pdf")
+    content_processor.blobHelper.copy_blob_from_url.assert_awaited_once_with(
+        "x.pdf", "https://b/c/x.pdf", "p1"
+    )
 
-    mock_blob.upload_blob.assert_called_once_with("doc.pdf", b"file bytes", "process-1")
 
+@pytest.mark.asyncio
+async def test_insert_processes(content_processor):
+    await content_processor.insert_processes([
+        CosmosContentProcess(process_id="p1", status="processing"),
+        CosmosContentProcess(process_id="p2", status="processing"),
+    ])
 
-@patch("app.routers.logics.contentprocessor.StorageQueueHelper")
-@patch("app.routers.logics.contentprocessor.StorageBlobHelper")
-def test_enqueue_message(MockBlob, MockQueue, mock_app_context):
-    mock_queue = MockQueue.return_value
+    documents = content_processor.processes.insert_documents.await_args.args[0]
+    assert [document["process_id"] for document in documents] == ["p1", "p2"]
 
-    cp = ContentProcessor(app_context=mock_app_context)
+
+@pytest.mark.asyncio
+async def test_enqueue_message(content_processor):
+    message = MagicMock()
+    await content_processor.enqueue_message(message)
+
+    content_processor.queueHelper.drop_message.assert_awaited_once_with(
+        "content-pipeline-extract-queue", message
+    )
+
+
+@pytest.mark.asyncio
+async def test_enqueue_message_to_priority_lane(content_processor):
     message = MagicMock()
-    cp.enqueue_message(message)
+    await content_processor.enqueue_message(message, "high")
+
+    content_processor.queueHelper.drop_message.assert_awaited_once_with(
+        "content-pipeline-extract-high-queue", message
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_status_from_cosmos(content_processor):
+    content_processor.processes.find_document.return_value = [
+        {"process_id": "p1", "status": "Completed"}
+    ]
+
+    process = await content_processor.get_status_from_cosmos("p1")
+
+    assert process.process_id == "p1"
+    assert process.status == "Completed"
+    content_processor.processes.find_document.assert_awaited_once_with(
+        query={"process_id": "p1"}, limit=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_status_from_cosmos_not_found(content_processor):
+    content_processor.processes.find_document.return_value = []
+
+    assert await content_processor.get_status_from_cosmos("p1") is None
+
+
+@pytest.mark.asyncio
+async def test_get_all_processes_from_cosmos(content_processor):
+    content_processor.processes.find_document.return_value = [{"process_id": "p3"}]
+    content_processor.processes.estimate_document_count.return_value = 3
+
+    page = await content_processor.get_all_processes_from_cosmos(
+        page_size=2, page_number=2
+    )
+
+    assert page.total_count == 3
+    assert page.total_pages == 2
+    assert page.current_page == 2
+    assert page.continuation_token is None
+    assert [item.process_id for item in page.items] == ["p3"]
+    kwargs = content_processor.processes.find_document.call_args.kwargs
+    assert kwargs["query"] == {}
+    assert kwargs["skip"] == 2
+    assert kwargs["limit"] == 3
+    content_processor.processes.count_documents.assert_not_called()
+
+
+def _listed(process_id, day):
+    return {
+        "process_id": process_id,
+        "imported_time": datetime.datetime(2024, 1, day),
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_all_processes_from_cosmos_keyset(content_processor):
+    processes = content_processor.processes
+    processes.find_document.return_value = [
+        _listed("p9", 9),
+        _listed("p8", 8),
+        _listed("p7", 7),
+    ]
+    processes.count_documents.return_value = 30
+
+    first = await content_processor.get_all_processes_from_cosmos(
+        page_size=2, page_number=1, status="Completed"
+    )
+
+    assert [item.process_id for item in first.items] == ["p9", "p8"]
+    assert first.continuation_token
+    assert processes.find_document.call_args.kwargs["query"] == {
+        "status": "Completed"
+    }
+
+    processes.find_document.return_value = [_listed("p7", 7)]
+    second = await content_processor.get_all_processes_from_cosmos(
+        page_size=2,
+        page_number=2,
+        continuation_token=first.continuation_token,
+        status="Completed",
+    )
+
+    kwargs = processes.find_document.call_args.kwargs
+    assert kwargs["skip"] == 0
+    assert kwargs["query"] == {
+        "$and": [
+            {"status": "Completed"},
+            keyset_after(datetime.datetime(2024, 1, 8), "p8"),
+        ]
+    }
+    assert second.continuation_token is None
+    assert second.total_count == 30
+    # The count of the filters is served from the count cache.
+    processes.count_documents.assert_awaited_once_with({"status": "Completed"})
+
+
+@pytest.mark.asyncio
+async def test_get_all_processes_from_cosmos_rejects_foreign_token(content_processor):
+    content_processor.processes.find_document.return_value = [
+        _listed("p9", 9),
+        _listed("p8", 8),
+    ]
+    content_processor.processes.estimate_document_count.return_value = 2
+    first = await content_processor.get_all_processes_from_cosmos(
+        page_size=1, page_number=1
+    )
+
+    with pytest.raises(ValueError):
+        await content_processor.get_all_processes_from_cosmos(
+            page_size=1, continuation_token=first.continuation_token, status="Error"
+        )
+    with pytest.raises(ValueError):
+        await content_processor.get_all_processes_from_cosmos(
+            page_size=1, continuation_token="not-a-token"
+        )
+
+
+def test_process_list_query():
+    assert process_list_query() == {}
+    assert process_list_query(
+        status="Completed",
+        schema_id="s1",
+        imported_from=datetime.datetime(2024, 1, 1),
+    ) == {
+        "status": "Completed",
+        "target_schema.Id": "s1",
+        "imported_time": {"$gte": datetime.datetime(2024, 1, 1)},
+    }
+
+
+@pytest.mark.asyncio
+async def test_update_process_status_inserts_new_process(content_processor):
+    content_processor.processes.update_document_by_query.return_value = _update_result(
+        0
+    )
+
+    await content_processor.update_process_status_to_cosmos(
+        CosmosContentProcess(process_id="p1", status="processing")
+    )
+
+    inserted = content_processor.processes.insert_document.call_args.args[0]
+    assert inserted["process_id"] == "p1"
+    assert inserted["status"] == "processing"
+
+
+@pytest.mark.asyncio
+async def test_update_process_status_updates_existing_process(content_processor):
+    content_processor.processes.update_document_by_query.return_value = _update_result(
+        1
+    )
+
+    await content_processor.update_process_status_to_cosmos(
+        CosmosContentProcess(process_id="p1", status="processing")
+    )
+
+    content_processor.processes.insert_document.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cached_process_status_is_invalidated_by_writes(content_processor):
+    content_processor.processes.find_document.return_value = [
+        {"process_id": "p1", "status": "extract"}
+    ]
+    content_processor.processes.update_document_by_query.return_value = _update_result(
+        1
+    )
+
+    await content_processor.get_cached_process_status("p1")
+    await content_processor.get_cached_process_status("p1")
+    assert content_processor.processes.find_document.await_count == 1
+
+    await content_processor.update_process_comment("p1", "checked")
+    await content_processor.get_cached_process_status("p1")
+    assert content_processor.processes.find_document.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_process_comment(content_processor):
+    content_processor.processes.update_document_by_query.return_value = _update_result(
+        1
+    )
+
+    assert await content_processor.update_process_comment("p1", "checked")
+    query, update = content_processor.processes.update_document_by_query.call_args.args
+    assert query == {"process_id": "p1"}
+    assert update["comment"] == "checked"
+    assert update["last_modified_by"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_update_process_result_not_found(content_processor):
+    content_processor.processes.update_document_by_query.return_value = _update_result(
+        0
+    )
+
+    assert await content_processor.update_process_result("p1", {"a": 1}) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_processed_file(content_processor):
+    content_processor.processes.find_document.return_value = [{"process_id": "p1"}]
+
+    deleted = await content_processor.delete_processed_file("p1")
+
+    assert deleted.process_id == "p1"
+    content_processor.blobHelper.delete_folder.assert_awaited_once_with(
+        folder_name="p1", on_progress=None
+    )
+    content_processor.processes.delete_document.assert_awaited_once_with(
+        item_id="p1", field_name="process_id"
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_processed_file_leaves_files_to_a_deletion_job(
+    content_processor,
+):
+    content_processor.processes.find_document.return_value = [{"process_id": "p1"}]
+
+    deleted = await content_processor.delete_processed_file("p1", delete_files=False)
+
+    assert deleted.process_id == "p1"
+    content_processor.blobHelper.delete_folder.assert_not_awaited()
+    content_processor.processes.delete_document.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_status_from_blob_hydrates_references(content_processor):
+    blobs = {
+        "step_outputs.json": [
+            {"step_name": "extract", "step_result": {"inline": True}},
+            {
+                "step_name": "map",
+                "step_result_reference": {
+                    "blob_name": "map-result.json",
+                    "size": 12,
+                    "sha256": "00",
+                },
+            },
+        ],
+        "map-result.json": {"fields": 3},
+    }
+    content_processor.blobHelper.download_blob.side_effect = (
+        lambda blob_name, process_id: json.dumps(blobs[blob_name]).encode()
+    )
+
+    steps = await content_processor.get_status_from_blob("p1")
+
+    assert [step.step_result for step in steps] == [{"inline": True}, {"fields": 3}]
+
+
+@pytest.mark.asyncio
+async def test_get_status_from_blob_missing(content_processor):
+    content_processor.blobHelper.download_blob.side_effect = ValueError("not found")
+
+    assert await content_processor.get_status_from_blob("p1") == []
+
+
+def _downloader(content_range, size):
+    downloader = MagicMock()
+    downloader.properties = SimpleNamespace(
+        size=size, content_range=content_range, etag='"e"', last_modified=None
+    )
+    return downloader
+
+
+@pytest.mark.asyncio
+async def test_open_file_from_blob_whole(content_processor):
+    downloader = _downloader("bytes 0-999/1000", 1000)
+    content_processor.blobHelper.open_blob.return_value = downloader
+
+    download = await content_processor.open_file_from_blob("p1", "doc.pdf")
+
+    content_processor.blobHelper.open_blob.assert_awaited_once_with(
+        "doc.pdf", "p1", offset=None, length=None
+    )
+    content_processor.blobHelper.get_blob_properties.assert_not_called()
+    assert download.size == 1000
+    assert download.byte_range is None
+    assert download.downloader is downloader
+
+
+@pytest.mark.asyncio
+async def test_open_file_from_blob_range(content_processor):
+    content_processor.blobHelper.open_blob.return_value = _downloader(
+        "bytes 900-1099/1000", 100
+    )
+
+    download = await content_processor.open_file_from_blob(
+        "p1", "doc.pdf", (900, 1099)
+    )
+
+    content_processor.blobHelper.open_blob.assert_awaited_once_with(
+        "doc.pdf", "p1", offset=900, length=200
+    )
+    content_processor.blobHelper.get_blob_properties.assert_not_called()
+    assert download.size == 1000
+    assert download.byte_range == (900, 999)
+
+
+@pytest.mark.asyncio
+async def test_open_file_from_blob_suffix_range(content_processor):
+    content_processor.blobHelper.get_blob_properties.return_value = SimpleNamespace(
+        size=1000, etag='"e"', last_modified=None
+    )
+    content_processor.blobHelper.open_blob.return_value = _downloader(
+        "bytes 800-999/1000", 200
+    )
+
+    download = await content_processor.open_file_from_blob(
+        "p1", "doc.pdf", (None, 200)
+    )
+
+    content_processor.blobHelper.open_blob.assert_awaited_once_with(
+        "doc.pdf", "p1", offset=800, length=200
+    )
+    assert download.byte_range == (800, 999)
+
+
+@pytest.mark.asyncio
+async def test_open_file_from_blob_range_not_satisfiable(content_processor):
+    error = HttpResponseError(message="InvalidRange")
+    error.status_code = 416
+    content_processor.blobHelper.open_blob.side_effect = error
+    content_processor.blobHelper.get_blob_properties.return_value = SimpleNamespace(
+        size=1000, etag='"e"', last_modified=None
+    )
+
+    download = await content_processor.open_file_from_blob(
+        "p1", "doc.pdf", (5000, None)
+    )
+
+    assert download.size == 1000
+    assert download.downloader is None
+
+
+@pytest.mark.asyncio
+async def test_close_releases_clients(content_processor):
+    content_processor.mongoClient.close = AsyncMock()
+
+    await content_processor.close()
+
+    content_processor.queueHelper.close.assert_awaited_once()
+    content_processor.blobHelper.close.assert_awaited_once()
+    content_processor.mongoClient.close.assert_awaited_once()
+
+
+def test_lane_queue_name():
+    queue = "content-pipeline-extract-queue"
+    assert lane_queue_name(queue, None) == queue
+    assert lane_queue_name(queue, "normal") == queue
+    assert lane_queue_name(queue, "low") == "content-pipeline-extract-low-queue"
+
+
+def test_resolve_priority():
+    assert resolve_priority(ProcessPriority.Low, 10, 512) == ProcessPriority.Low
+    assert resolve_priority(None, 512 * 1024, 512) == ProcessPriority.High
+    assert resolve_priority(None, 512 * 1024 + 1, 512) is None
+    assert resolve_priority(None, 10, 0) is None
+
+
+def _persisted(completed=("extract", "map", "evaluate", "save"), results=None):
+    steps = ["extract", "map", "evaluate", "save"]
+    results = results or {step: {"result": "success"} for step in completed}
+    return {
+        "process_id": "p1",
+        "files": [
+            {
+                "process_id": "p1",
+                "id": "f1",
+                "name": "doc.pdf",
+                "size": 10,
+                "mime_type": "application/pdf",
+                "artifact_type": "source_content",
+                "processed_by": "API",
+            },
+            {
+                "process_id": "p1",
+                "id": "f2",
+                "name": "content_understanding_output.json",
+                "mime_type": "application/json",
+                "artifact_type": "extracted_content",
+                "processed_by": "extract",
+                "log_entries": [],
+            },
+            {
+                "process_id": "p1",
+                "id": "f3",
+                "name": "gpt_output.json",
+                "mime_type": "application/json",
+                "artifact_type": "schema_mapped_data",
+                "processed_by": "map",
+            },
+        ],
+        "pipeline_status": {
+            "completed": len(completed) == len(steps),
+            "process_id": "p1",
+            "metadata_id": "m1",
+            "schema_id": "s1",
+            "creation_time": "2025-01-01T00:00:00.000000Z",
+            "steps": steps,
+            "remaining_steps": [s for s in steps if s not in completed],
+            "completed_steps": list(completed),
+            "process_results": [
+                {"process_id": "p1", "step_name": step, "result": result}
+                for step, result in results.items()
+            ],
+            "priority": "low",
+        },
+    }
+
+
+def test_build_resume_message_reuses_earlier_steps():
+    message = build_resume_message(_persisted(), "map", schema_id="s2")
+
+    assert [f.name for f in message.files] == [
+        "doc.pdf",
+        "content_understanding_output.json",
+    ]
+    status = message.pipeline_status
+    assert status.schema_id == "s2"
+    assert status.priority == "low"
+    assert status.completed_steps == ["extract"]
+    assert status.remaining_steps == ["map", "evaluate", "save"]
+    assert [r["step_name"] for r in status.process_results] == ["extract"]
+    assert status.creation_time.year > 2025
+
+
+def test_build_resume_message_after_failed_step():
+    persisted = _persisted(
+        completed=("extract",),
+        results={"extract": {"result": "success"}, "map": {"result": "error"}},
+    )
+    message = build_resume_message(persisted, "map")
+    assert message.pipeline_status.schema_id == "s1"
+
+
+def test_build_resume_message_rejects_unknown_step():
+    with pytest.raises(ValueError, match="not a step"):
+        build_resume_message(_persisted(), "transform")
+
+
+def test_build_resume_message_rejects_running_process():
+    with pytest.raises(ValueError, match="still running"):
+        build_resume_message(_persisted(completed=("extract",)), "map")
+
+
+def test_build_resume_message_rejects_failed_upstream_step():
+    persisted = _persisted(completed=(), results={"extract": {"result": "error"}})
+    with pytest.raises(ValueError, match="no output to reuse"):
+        build_resume_message(persisted, "map")
+
+
+@pytest.mark.asyncio
+async def test_load_resume_message(content_processor):
+    content_processor.blobHelper.download_blob.return_value = json.dumps(
+        _persisted()
+    ).encode()
+
+    message = await content_processor.load_resume_message("p1", "map")
+
+    content_processor.blobHelper.download_blob.assert_awaited_once_with(
+        "process-status.json", "p1"
+    )
+    assert message.process_id == "p1"
+    content_processor.queueHelper.drop_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_message_to_step_lane(content_processor):
+    content_processor.blobHelper.download_blob.return_value = json.dumps(
+        _persisted()
+    ).encode()
+    message = await content_processor.load_resume_message("p1", "map")
+
+    await content_processor.enqueue_message(
+        message, message.pipeline_status.priority, "map"
+    )
+
+    content_processor.queueHelper.drop_message.assert_awaited_once_with(
+        "content-pipeline-map-low-queue", message
+    )
+
+
+@pytest.mark.asyncio
+async def test_load_resume_message_unknown_process(content_processor):
+    content_processor.blobHelper.download_blob.side_effect = ValueError("not found")
 
-    mock_queue.drop_message.assert_called_once_with(message)
+    with pytest.raises(LookupError):
+        await content_processor.load_resume_message("p1", "map")
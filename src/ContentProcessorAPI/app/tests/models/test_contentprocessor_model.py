@@ -7,9 +7,13 @@ from __future__ import annotations
 
 import json
 
+import pytest
+from pydantic import ValidationError
+
 from app.routers.models.contentprocessor.model import (
     ContentProcessorBatchFileAddRequest,
     ContentProcessorRequest,
+    ProcessPriority,
 )
 
 
@@ -38,3 +42,13 @@ class TestContentProcessorRequest:
         req = ContentProcessorRequest()
         assert req.Schema_Id is None
         assert req.Metadata_Id is None
+        assert req.Priority is None
+
+    def test_priority(self):
+        raw = json.dumps({"Schema_Id": "s1", "Priority": "low"})
+        req = ContentProcessorRequest.model_validate_json(raw)
+        assert req.Priority == ProcessPriority.Low
+
+    def test_rejects_unknown_priority(self):
+        with pytest.raises(ValidationError):
+            ContentProcessorRequest(Priority="urgent")
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import datetime
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -13,61 +14,59 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from app.routers.contentprocessor import router
-from app.routers.logics.contentprocessor import ContentProcessor
+from app.libs.azure.storage_blob.deletion_jobs import DeletionJobs
+from app.libs.status_events.broker import StatusBroker
+from app.routers.logics.claimbatchpocessor import ClaimBatchProcessRepository
+from app.routers.logics.contentprocessor import ContentProcessor, FileDownload
+from app.routers.models.contentprocessor.content_process import (
+    ContentProcess as CosmosContentProcess,
+)
 
 
-class _FakeScope:
-    def __init__(self, content_processor: ContentProcessor):
-        self._content_processor = content_processor
+class _FakeAppContext:
+    def __init__(self, configuration, content_processor: ContentProcessor):
+        self.configuration = configuration
+        self.content_processor = content_processor
+        self.claim_process_repository = MagicMock()
+        self.claim_process_repository.delete_async = AsyncMock(return_value=None)
+        self.status_broker = StatusBroker()
+        self.deletion_jobs = DeletionJobs()
 
-    def get_service(self, service_type):
+    async def get_service_async(self, service_type):
         if service_type is ContentProcessor:
-            return self._content_processor
+            return self.content_processor
+        if service_type is DeletionJobs:
+            return self.deletion_jobs
         raise KeyError(service_type)
 
+    def get_service(self, service_type):
+        if service_type is ClaimBatchProcessRepository:
+            return self.claim_process_repository
+        if service_type is StatusBroker:
+            return self.status_broker
+        raise KeyError(service_type)
 
-class _FakeScopeContextManager:
-    def __init__(self, scope: _FakeScope):
-        self._scope = scope
-
-    async def __aenter__(self):
-        return self._scope
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-
-class _FakeAppContext:
-    def __init__(self, configuration, content_processor: ContentProcessor):
-        self.configuration = configuration
-        self._content_processor = content_processor
 
-    def create_scope(self):
-        return _FakeScopeContextManager(_FakeScope(self._content_processor))
+@pytest.fixture
+def content_processor():
+    return MagicMock(spec=ContentProcessor)
 
 
 @pytest.fixture
-def client():
+def client(content_processor):
     app = FastAPI()
     app.include_router(router)
     configuration = SimpleNamespace(
-        app_cosmos_connstr="test_connection_string",
-        app_cosmos_database="test_database",
-        app_cosmos_container_process="test_container",
-        app_cosmos_container_batches="test_batches",
         app_cps_max_filesize_mb=20,
-        app_storage_blob_url="test_blob_url",
-        app_cps_processes="mock_cps_processes",
+        app_priority_small_document_kb=512,
+        app_status_stream_reconcile_seconds=0.01,
     )
-    app.app_context = _FakeAppContext(configuration, MagicMock(spec=ContentProcessor))  # type: ignore[attr-defined]
+    app.app_context = _FakeAppContext(configuration, content_processor)  # type: ignore[attr-defined]
     return TestClient(app)
 
 
-@patch(
-    "app.routers.contentprocessor.CosmosContentProcess.get_all_processes_from_cosmos"
-)
-def test_get_all_processed_results(mock_get_all_processes, client):
-    mock_get_all_processes.return_value = {
+def test_get_all_processed_results(content_processor, client):
+    content_processor.get_all_processes_from_cosmos.return_value = {
         "items": [],
         "total_count": 0,
         "total_pages": 0,
@@ -85,12 +84,54 @@ def test_get_all_processed_results(mock_get_all_processes, client):
         "page_size": 10,
         "total_count": 0,
         "total_pages": 0,
+        "continuation_token": None,
     }
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_status_processing(mock_get_status, client):
-    mock_get_status.return_value = MagicMock(status="processing")
+def test_get_all_processed_results_with_token_and_filters(content_processor, client):
+    content_processor.get_all_processes_from_cosmos.return_value = {
+        "items": [],
+        "total_count": 0,
+        "total_pages": 0,
+        "current_page": 0,
+        "page_size": 0,
+    }
+
+    response = client.post(
+        "/contentprocessor/processed",
+        json={
+            "page_number": 3,
+            "page_size": 10,
+            "continuation_token": "abc",
+            "status": "Completed",
+            "imported_from": "2024-01-01T00:00:00Z",
+        },
+    )
+    assert response.status_code == 200
+    kwargs = content_processor.get_all_processes_from_cosmos.await_args.kwargs
+    assert kwargs["continuation_token"] == "abc"
+    assert kwargs["status"] == "Completed"
+    assert kwargs["imported_from"] == datetime.datetime(
+        2024, 1, 1, tzinfo=datetime.timezone.utc
+    )
+
+
+def test_get_all_processed_results_invalid_token(content_processor, client):
+    content_processor.get_all_processes_from_cosmos.side_effect = ValueError(
+        "Invalid continuation token."
+    )
+
+    response = client.post(
+        "/contentprocessor/processed",
+        json={"page_number": 2, "page_size": 10, "continuation_token": "zz"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_status_processing(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="processing"
+    )
 
     response = client.get("/contentprocessor/status/test_process_id")
     assert response.status_code == 200
@@ -98,9 +139,10 @@ def test_get_status_processing(mock_get_status, client):
     assert "still in progress" in response.json()["message"]
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_status_completed(mock_get_status, client):
-    mock_get_status.return_value = MagicMock(status="Completed")
+def test_get_status_completed(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="Completed"
+    )
 
     response = client.get("/contentprocessor/status/test_process_id")
     assert response.status_code == 302
@@ -108,9 +150,8 @@ def test_get_status_completed(mock_get_status, client):
     assert "is completed" in response.json()["message"]
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_status_failed(mock_get_status, client):
-    mock_get_status.return_value = None
+def test_get_status_failed(content_processor, client):
+    content_processor.get_cached_process_status.return_value = None
 
     response = client.get("/contentprocessor/status/test_process_id")
     assert response.status_code == 404
@@ -118,13 +159,13 @@ def test_get_status_failed(mock_get_status, client):
     assert "not found" in response.json()["message"]
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_process(mock_get_status, client):
-    mock_get_status.return_value = MagicMock(
+def test_get_process(content_processor, client):
+    content_processor.get_status_from_cosmos.return_value = MagicMock(
         process_id="test_process_id",
         processed_file_name="test.pdf",
         processed_file_mime_type="application/pdf",
         processed_time="2025-03-13T12:00:00Z",
+        last_modified_time=datetime.datetime(2025, 3, 13, 12, tzinfo=datetime.UTC),
         last_modified_by="user",
         status="Completed",
         result={},
@@ -137,42 +178,54 @@ def test_get_process(mock_get_status, client):
             "ContentType": "content_type",
         },
         comment="test comment",
+        evaluation_reference=None,
+    )
+
+    response = client.get("/contentprocessor/processed/test_process_id")
+    assert response.status_code == 200
+
+
+def test_get_process_hydrate(content_processor, client):
+    content_processor.get_status_from_cosmos.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="Completed"
     )
 
+    response = client.get("/contentprocessor/processed/test_process_id?hydrate=false")
+    assert response.status_code == 200
+    content_processor.hydrate_evaluation.assert_not_called()
+
     response = client.get("/contentprocessor/processed/test_process_id")
     assert response.status_code == 200
+    content_processor.hydrate_evaluation.assert_called_once()
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_process_not_found(mock_get_status, client):
-    mock_get_status.return_value = None
+def test_get_process_not_found(content_processor, client):
+    content_processor.get_status_from_cosmos.return_value = None
 
     response = client.get("/contentprocessor/processed/test_process_id")
     assert response.status_code == 404
     assert response.json()["status"] == "failed"
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_blob")
-def test_get_process_steps(mock_get_steps, client):
-    mock_get_steps.return_value = {"steps": []}
+def test_get_process_steps(content_processor, client):
+    content_processor.get_status_from_blob.return_value = {"steps": []}
 
     response = client.get("/contentprocessor/processed/test_process_id/steps")
     assert response.status_code == 200
     assert response.json() == {"steps": []}
+    assert content_processor.get_status_from_blob.call_args.kwargs["hydrate"] is True
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_blob")
-def test_get_process_steps_not_found(mock_get_steps, client):
-    mock_get_steps.return_value = None
+def test_get_process_steps_not_found(content_processor, client):
+    content_processor.get_status_from_blob.return_value = None
 
     response = client.get("/contentprocessor/processed/test_process_id/steps")
     assert response.status_code == 404
     assert response.json()["status"] == "failed"
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.update_process_result")
-def test_update_process_result(mock_update_result, client):
-    mock_update_result.return_value = MagicMock()
+def test_update_process_result(content_processor, client):
+    content_processor.update_process_result.return_value = MagicMock()
 
     data = {"process_id": "test_process_id", "modified_result": {"key": "value"}}
     response = client.put("/contentprocessor/processed/test_process_id", json=data)
@@ -180,9 +233,8 @@ def test_update_process_result(mock_update_result, client):
     assert response.json()["status"] == "success"
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.update_process_comment")
-def test_update_process_comment(mock_update_comment, client):
-    mock_update_comment.return_value = MagicMock()
+def test_update_process_comment(content_processor, client):
+    content_processor.update_process_comment.return_value = MagicMock()
 
     data = {"process_id": "test_process_id", "comment": "new comment"}
     response = client.put("/contentprocessor/processed/test_process_id", json=data)
@@ -190,50 +242,110 @@ def test_update_process_comment(mock_update_comment, client):
     assert response.json()["status"] == "success"
 
 
-def test_get_original_file_success(client):
-    with (
-        patch(
-            "app.routers.contentprocessor.CosmosContentProcess",
-            autospec=True,
-        ) as mock_cosmos_content_process,
-        patch(
-            "app.routers.contentprocessor.MimeTypesDetection",
-            autospec=True,
-        ) as mock_mime_types_detection,
-    ):
-        # Mocking the process status
-        mock_process_status = MagicMock()
-        mock_process_status.processed_file_name = "testfile.txt"
-        mock_process_status.process_id = "123"
-        mock_process_status.get_file_bytes_from_blob.return_value = b"file content"
-        mock_cosmos_content_process.return_value.get_status_from_cosmos.return_value = (
-            mock_process_status
-        )
-
-        # Mocking the MIME type detection
-        mock_mime_types_detection.get_file_type.return_value = "text/plain"
-
-        response = client.get("/contentprocessor/processed/files/123")
-        assert response.status_code == 200
-        assert response.headers["Content-Type"] == "text/plain"
-        assert (
-            response.headers["Content-Disposition"]
-            == "inline; filename*=UTF-8''testfile.txt"
-        )
-
-
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_original_file_not_found(mock_get_status, client):
-    mock_get_status.return_value = None
+class _FakeDownloader:
+    def __init__(self, *parts: bytes):
+        self.parts = parts
+
+    async def chunks(self):
+        for part in self.parts:
+            yield part
+
+
+def _file_download(size, byte_range=None, downloader=None):
+    return FileDownload(
+        size=size,
+        byte_range=byte_range,
+        etag='"0x8DC0FFEE"',
+        last_modified=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+        downloader=downloader,
+    )
+
+
+@patch("app.routers.contentprocessor.MimeTypesDetection", autospec=True)
+def test_get_original_file_success(
+    mock_mime_types_detection, content_processor, client
+):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="123", processed_file_name="testfile.txt"
+    )
+    content_processor.open_file_from_blob.return_value = _file_download(
+        12, downloader=_FakeDownloader(b"file ", b"content")
+    )
+    mock_mime_types_detection.get_file_type.return_value = "text/plain"
+
+    response = client.get("/contentprocessor/processed/files/123")
+    assert response.status_code == 200
+    assert response.content == b"file content"
+    assert response.headers["Content-Type"] == "text/plain"
+    assert response.headers["Content-Length"] == "12"
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["ETag"] == '"0x8DC0FFEE"'
+    assert "Content-Range" not in response.headers
+    assert (
+        response.headers["Content-Disposition"]
+        == "inline; filename*=UTF-8''testfile.txt"
+    )
+    content_processor.open_file_from_blob.assert_awaited_once_with(
+        "123", "testfile.txt", None
+    )
+
+
+def test_get_original_file_range(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="123", processed_file_name="doc.pdf"
+    )
+    content_processor.open_file_from_blob.return_value = _file_download(
+        1000, byte_range=(100, 199), downloader=_FakeDownloader(b"x" * 100)
+    )
+
+    response = client.get(
+        "/contentprocessor/processed/files/123", headers={"Range": "bytes=100-199"}
+    )
+    assert response.status_code == 206
+    assert response.content == b"x" * 100
+    assert response.headers["Content-Range"] == "bytes 100-199/1000"
+    assert response.headers["Content-Length"] == "100"
+    content_processor.open_file_from_blob.assert_awaited_once_with(
+        "123", "doc.pdf", (100, 199)
+    )
+
+
+def test_get_original_file_range_not_satisfiable(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="123", processed_file_name="doc.pdf"
+    )
+    content_processor.open_file_from_blob.return_value = _file_download(1000)
+
+    response = client.get(
+        "/contentprocessor/processed/files/123", headers={"Range": "bytes=5000-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == "bytes */1000"
+
+
+def test_get_original_file_not_found(content_processor, client):
+    content_processor.get_cached_process_status.return_value = None
 
     response = client.get("/contentprocessor/processed/files/test_process_id")
     assert response.status_code == 404
     assert response.json()["status"] == "failed"
+    content_processor.open_file_from_blob.assert_not_called()
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.get_status_from_cosmos")
-def test_get_status_error(mock_get_status, client):
-    mock_get_status.return_value = MagicMock(status="Error")
+def test_get_original_file_blob_missing(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="123", processed_file_name="doc.pdf"
+    )
+    content_processor.open_file_from_blob.side_effect = ValueError("missing")
+
+    response = client.get("/contentprocessor/processed/files/123")
+    assert response.status_code == 404
+
+
+def test_get_status_error(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="Error"
+    )
 
     response = client.get("/contentprocessor/status/test_process_id")
     assert response.status_code == 500
@@ -241,51 +353,124 @@ def test_get_status_error(mock_get_status, client):
     assert "has failed" in response.json()["message"]
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.delete_processed_file")
-def test_delete_processed_file_success(mock_delete, client):
-    mock_deleted = MagicMock()
-    mock_deleted.process_id = "test_process_id"
-    mock_delete.return_value = mock_deleted
-
-    mock_repo = MagicMock()
-    mock_repo.delete_async = AsyncMock(return_value=None)
-
-    from app.routers.logics.claimbatchpocessor import ClaimBatchProcessRepository
+def test_delete_processed_file_success(content_processor, client):
+    content_processor.delete_processed_file.return_value = CosmosContentProcess(
+        process_id="test_process_id"
+    )
 
-    orig_create = client.app.app_context.create_scope
+    response = client.delete("/contentprocessor/processed/test_process_id")
+    assert response.status_code == 200
+    assert response.json()["status"] == "Success"
+    client.app.app_context.claim_process_repository.delete_async.assert_awaited_once_with(
+        "test_process_id"
+    )
 
-    class _WrappedScope:
-        def __init__(self, inner):
-            self._inner = inner
 
-        def get_service(self, svc):
-            if svc is ClaimBatchProcessRepository:
-                return mock_repo
-            return self._inner.get_service(svc)
+def test_delete_processed_file_in_background(content_processor, client):
+    content_processor.delete_processed_file.return_value = CosmosContentProcess(
+        process_id="p1"
+    )
+    content_processor.delete_process_files.return_value = 1200
 
-    class _WrappedCtx:
-        def __init__(self):
-            self._real = orig_create()
+    response = client.delete("/contentprocessor/processed/p1?background=true")
 
-        async def __aenter__(self):
-            self._scope = await self._real.__aenter__()
-            return _WrappedScope(self._scope)
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "Success"
+    job_id = body["deletion_job"]["job_id"]
+    assert response.headers["Location"] == f"/contentprocessor/deletions/{job_id}"
+    content_processor.delete_processed_file.assert_awaited_once_with(
+        "p1", delete_files=False
+    )
 
-        async def __aexit__(self, *a):
-            return await self._real.__aexit__(*a)
+    job = client.get(f"/contentprocessor/deletions/{job_id}")
+    assert job.status_code == 200
+    assert job.json()["folder"] == "p1"
 
-    client.app.app_context.create_scope = lambda: _WrappedCtx()
 
-    response = client.delete("/contentprocessor/processed/test_process_id")
-    assert response.status_code == 200
-    assert response.json()["status"] == "Success"
+def test_get_deletion_job_not_found(client):
+    response = client.get("/contentprocessor/deletions/missing")
+    assert response.status_code == 404
 
 
-@patch("app.routers.contentprocessor.CosmosContentProcess.update_process_result")
-def test_update_process_result_not_found(mock_update_result, client):
-    mock_update_result.return_value = None
+def test_update_process_result_not_found(content_processor, client):
+    content_processor.update_process_result.return_value = None
 
     data = {"process_id": "missing", "modified_result": {"key": "value"}}
     response = client.put("/contentprocessor/processed/missing", json=data)
     assert response.status_code == 404
     assert response.json()["status"] == "failed"
+
+
+def test_get_status_not_modified(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="extract"
+    )
+    etag = client.get("/contentprocessor/status/test_process_id").headers["ETag"]
+
+    response = client.get(
+        "/contentprocessor/status/test_process_id", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_get_status_etag_changes_with_status(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="extract"
+    )
+    etag = client.get("/contentprocessor/status/test_process_id").headers["ETag"]
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="map"
+    )
+
+    response = client.get(
+        "/contentprocessor/status/test_process_id", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_get_process_not_modified_skips_document_read(content_processor, client):
+    process = CosmosContentProcess(process_id="test_process_id", status="Completed")
+    content_processor.get_status_from_cosmos.return_value = process
+    content_processor.get_cached_process_status.return_value = process
+    response = client.get("/contentprocessor/processed/test_process_id")
+    content_processor.get_status_from_cosmos.reset_mock()
+
+    revalidated = client.get(
+        "/contentprocessor/processed/test_process_id",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+
+    assert revalidated.status_code == 304
+    content_processor.get_status_from_cosmos.assert_not_called()
+
+
+def test_get_process_in_progress_has_no_etag(content_processor, client):
+    content_processor.get_status_from_cosmos.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="map"
+    )
+
+    response = client.get("/contentprocessor/processed/test_process_id")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_get_process_steps_not_modified(content_processor, client):
+    content_processor.get_cached_process_status.return_value = CosmosContentProcess(
+        process_id="test_process_id", status="Completed"
+    )
+    content_processor.get_status_from_blob.return_value = [{"step_name": "extract"}]
+    response = client.get("/contentprocessor/processed/test_process_id/steps")
+
+    revalidated = client.get(
+        "/contentprocessor/processed/test_process_id/steps",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+
+    assert revalidated.status_code == 304
+    content_processor.get_status_from_blob.assert_awaited_once()
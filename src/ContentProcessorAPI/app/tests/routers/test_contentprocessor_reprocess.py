@@ -0,0 +1,158 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for the contentprocessor reprocess endpoints."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.contentprocessor import router
+from app.routers.logics.contentprocessor import ContentProcessor
+from app.routers.models.contentprocessor.model import ContentProcess
+
+
+@pytest.fixture
+def client_and_cp():
+    app = FastAPI()
+    app.include_router(router)
+
+    mock_cp = MagicMock(spec=ContentProcessor)
+    mock_cp.load_resume_message.return_value = ContentProcess.model_construct(
+        process_id="p1",
+        files=[],
+        pipeline_status=SimpleNamespace(schema_id="s1", priority="normal"),
+    )
+    app.app_context = SimpleNamespace(  # type: ignore[attr-defined]
+        configuration=SimpleNamespace(),
+        get_service_async=AsyncMock(return_value=mock_cp),
+    )
+    return TestClient(app), mock_cp
+
+
+def test_reprocess_defaults_to_map(client_and_cp):
+    client, mock_cp = client_and_cp
+
+    response = client.post("/contentprocessor/processed/p1/reprocess")
+
+    assert response.status_code == 202
+    assert response.headers["Location"] == "/contentprocessor/status/p1"
+    mock_cp.load_resume_message.assert_called_once_with(
+        process_id="p1", from_step="map", schema_id=None, priority=None
+    )
+    assert mock_cp.update_process_status_to_cosmos.call_args.args[0].status == (
+        "processing"
+    )
+    mock_cp.enqueue_message.assert_called_once_with(
+        mock_cp.load_resume_message.return_value, "normal", "map"
+    )
+
+
+def test_reprocess_records_status_before_enqueue(client_and_cp):
+    client, mock_cp = client_and_cp
+    calls = []
+    mock_cp.update_process_status_to_cosmos.side_effect = (
+        lambda process: calls.append(process.status)
+    )
+    mock_cp.enqueue_message.side_effect = lambda *args: calls.append("enqueued")
+
+    client.post("/contentprocessor/processed/p1/reprocess")
+
+    assert calls == ["processing", "enqueued"]
+
+
+def test_reprocess_enqueue_failure_marks_error(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.enqueue_message.side_effect = RuntimeError("queue unavailable")
+
+    with pytest.raises(RuntimeError):
+        client.post("/contentprocessor/processed/p1/reprocess")
+
+    statuses = [
+        call.args[0].status
+        for call in mock_cp.update_process_status_to_cosmos.call_args_list
+    ]
+    assert statuses == ["processing", "Error"]
+
+
+def test_reprocess_with_new_schema(client_and_cp):
+    client, mock_cp = client_and_cp
+
+    response = client.post(
+        "/contentprocessor/processed/p1/reprocess",
+        json={"From_Step": "evaluate", "Schema_Id": "s2", "Priority": "low"},
+    )
+
+    assert response.status_code == 202
+    mock_cp.load_resume_message.assert_called_once_with(
+        process_id="p1", from_step="evaluate", schema_id="s2", priority="low"
+    )
+
+
+def test_reprocess_not_found(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.load_resume_message.side_effect = LookupError("Process 'p1' not found.")
+
+    response = client.post("/contentprocessor/processed/p1/reprocess")
+
+    assert response.status_code == 404
+    mock_cp.update_process_status_to_cosmos.assert_not_called()
+    mock_cp.enqueue_message.assert_not_called()
+
+
+def test_reprocess_conflict(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.load_resume_message.side_effect = ValueError("The process is still running.")
+
+    response = client.post("/contentprocessor/processed/p1/reprocess")
+
+    assert response.status_code == 409
+    assert response.json()["message"] == "The process is still running."
+
+
+def test_reprocess_batch_by_ids(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.load_resume_message.side_effect = [
+        mock_cp.load_resume_message.return_value,
+        ValueError("Step 'extract' has no output to reuse."),
+    ]
+
+    response = client.post(
+        "/contentprocessor/reprocess", json={"Process_Ids": ["p1", "p2"]}
+    )
+
+    assert response.status_code == 202
+    assert response.json() == {
+        "from_step": "map",
+        "accepted": ["p1"],
+        "rejected": [
+            {"process_id": "p2", "reason": "Step 'extract' has no output to reuse."}
+        ],
+    }
+
+
+def test_reprocess_batch_by_schema(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.find_process_ids_in_cosmos.return_value = ["p1", "p3"]
+
+    response = client.post(
+        "/contentprocessor/reprocess", json={"Filter_Schema_Id": "s1", "Limit": 5}
+    )
+
+    assert response.status_code == 202
+    assert response.json()["accepted"] == ["p1", "p3"]
+    assert mock_cp.find_process_ids_in_cosmos.call_args.kwargs["schema_id"] == "s1"
+    assert mock_cp.find_process_ids_in_cosmos.call_args.kwargs["limit"] == 5
+
+
+def test_reprocess_batch_requires_selection(client_and_cp):
+    client, _ = client_and_cp
+
+    response = client.post("/contentprocessor/reprocess", json={"From_Step": "map"})
+
+    assert response.status_code == 422
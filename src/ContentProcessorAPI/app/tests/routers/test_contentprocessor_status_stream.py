@@ -0,0 +1,101 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for the push-based status endpoints of the contentprocessor router."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.libs.status_events.broker import StatusBroker
+from app.routers.contentprocessor import router
+from app.routers.logics.contentprocessor import ContentProcessor
+from app.routers.models.contentprocessor.content_process import (
+    ContentProcess as CosmosContentProcess,
+)
+
+
+@pytest.fixture
+def content_processor():
+    return MagicMock(spec=ContentProcessor)
+
+
+@pytest.fixture
+def client(content_processor):
+    app = FastAPI()
+    app.include_router(router)
+    broker = StatusBroker()
+    app.app_context = SimpleNamespace(  # type: ignore[attr-defined]
+        configuration=SimpleNamespace(app_status_stream_reconcile_seconds=0.01),
+        get_service_async=AsyncMock(return_value=content_processor),
+        get_service=MagicMock(return_value=broker),
+    )
+    return TestClient(app)
+
+
+def _statuses(*statuses):
+    return [CosmosContentProcess(process_id="p1", status=status) for status in statuses]
+
+
+def test_stream_status_sends_changes_until_completed(content_processor, client):
+    content_processor.get_process_status.side_effect = _statuses(
+        "extract", "extract", "map", "Completed"
+    )
+
+    response = client.get("/contentprocessor/status/p1/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.count("event: status") == 3
+    assert '"status": "Completed"' in response.text
+
+
+def test_stream_status_not_found(content_processor, client):
+    content_processor.get_process_status.return_value = None
+
+    response = client.get("/contentprocessor/status/p1/events")
+
+    assert response.status_code == 404
+
+
+def test_get_status_long_poll_returns_on_change(content_processor, client):
+    content_processor.get_process_status.side_effect = _statuses(
+        "extract", "map", "map"
+    )
+
+    response = client.get(
+        "/contentprocessor/status/p1", params={"wait": 30, "last_status": "extract"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "map"
+
+
+def test_get_status_rejects_long_wait(client):
+    response = client.get("/contentprocessor/status/p1", params={"wait": 61})
+
+    assert response.status_code == 422
+
+
+def test_status_websocket_sends_changes(content_processor, client):
+    content_processor.get_process_status.side_effect = _statuses("map", "map", "Error")
+
+    with client.websocket_connect("/contentprocessor/status/p1/ws") as websocket:
+        assert websocket.receive_json() == {"process_id": "p1", "status": "map"}
+        assert websocket.receive_json() == {"process_id": "p1", "status": "Error"}
+
+
+def test_status_websocket_not_found(content_processor, client):
+    content_processor.get_process_status.return_value = None
+
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/contentprocessor/status/p1/ws"):
+            pass
+
+    assert exc_info.value.code == 4404
@@ -7,84 +7,44 @@ from __future__ import annotations
 
 import json
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app.libs.azure.storage_blob.staged_upload import UploadedBlob
 from app.routers.contentprocessor import router
+from app.routers.logics.admission import Admission, AdmissionControl
 from app.routers.logics.contentprocessor import ContentProcessor
 
 
-class _FakeScope:
-    def __init__(self, content_processor: ContentProcessor):
-        self._content_processor = content_processor
-
-    def get_service(self, service_type):
-        if service_type is ContentProcessor:
-            return self._content_processor
-        raise KeyError(service_type)
-
-
-class _FakeScopeContextManager:
-    def __init__(self, scope: _FakeScope):
-        self._scope = scope
-
-    async def __aenter__(self):
-        return self._scope
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-
-class _FakeAppContext:
-    def __init__(self, configuration, content_processor: ContentProcessor):
-        self.configuration = configuration
-        self._content_processor = content_processor
-
-    def create_scope(self):
-        return _FakeScopeContextManager(_FakeScope(self._content_processor))
-
-
 @pytest.fixture
 def client_and_cp():
     app = FastAPI()
     app.include_router(router)
 
     mock_cp = MagicMock(spec=ContentProcessor)
-    mock_cp.save_file_to_blob = MagicMock()
-    mock_cp.enqueue_message = MagicMock()
-    # Used by batch submission code path.
-    mock_cp.config = SimpleNamespace(
-        app_cosmos_connstr="test_conn",
-        app_cosmos_database="test_db",
-        app_cosmos_container_process="test_container",
-    )
-
+    mock_cp.save_file_to_blob.return_value = UploadedBlob(size=42, sha256="ab12")
     configuration = SimpleNamespace(
         app_cps_max_filesize_mb=20,
-        app_cosmos_connstr="test_conn",
-        app_cosmos_database="test_db",
-        app_cosmos_container_process="test_container",
-        app_cosmos_container_batches="test_batches",
+        app_cps_max_batch_files=3,
+        app_priority_small_document_kb=512,
     )
 
-    app.app_context = _FakeAppContext(configuration, mock_cp)  # type: ignore[attr-defined]
-    return TestClient(app), mock_cp
+    admission_control = MagicMock(spec=AdmissionControl)
+    admission_control.admit.return_value = Admission(admitted=True)
+    services = {ContentProcessor: mock_cp, AdmissionControl: admission_control}
 
-
-@pytest.fixture
-def mock_cosmos_update():
-    with patch(
-        "app.routers.contentprocessor.CosmosContentProcess.update_process_status_to_cosmos",
-        autospec=True,
-        return_value=None,
-    ) as mock:
-        yield mock
+    app.app_context = SimpleNamespace(  # type: ignore[attr-defined]
+        configuration=configuration,
+        get_service_async=AsyncMock(side_effect=services.get),
+        admission_control=admission_control,
+    )
+    return TestClient(app), mock_cp
 
 
-def test_submit_pdf_ok_sanitizes_filename(client_and_cp, mock_cosmos_update):
+def test_submit_pdf_ok_sanitizes_filename(client_and_cp):
     client, mock_cp = client_and_cp
 
     pdf_bytes = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<<>>\nendobj\n"
@@ -107,9 +67,46 @@ def test_submit_pdf_ok_sanitizes_filename(client_and_cp, mock_cosmos_update):
     # Blob name should not include client path components
     assert mock_cp.save_file_to_blob.call_count == 1
     assert mock_cp.save_file_to_blob.call_args.kwargs["file_name"] == "test.pdf"
+    assert response.json()["sha256"] == "ab12"
+    mock_cp.enqueue_message.assert_awaited_once()
+    assert mock_cp.update_process_status_to_cosmos.call_args.args[0].status == (
+        "processing"
+    )
+
 
+def test_submit_refused_while_queues_are_saturated(client_and_cp):
+    client, mock_cp = client_and_cp
+    client.app.app_context.admission_control.admit.return_value = Admission(
+        admitted=False,
+        wait_seconds=30000,
+        max_wait_seconds=21600,
+        retry_after_seconds=3600,
+    )
+    files = {
+        "file": ("test.pdf", b"%PDF-1.7\n", "application/pdf"),
+        "data": (
+            None,
+            json.dumps({"Schema_Id": "schema", "Metadata_Id": "meta"}),
+            "application/json",
+        ),
+    }
 
-def test_submit_rejects_mismatched_magic(client_and_cp, mock_cosmos_update):
+    response = client.post(
+        "/contentprocessor/submit",
+        files=files,
+        headers={"X-MS-CLIENT-PRINCIPAL-NAME": "bulk-loader"},
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3600"
+    client.app.app_context.admission_control.admit.assert_awaited_once_with(
+        "bulk-loader"
+    )
+    mock_cp.save_file_to_blob.assert_not_called()
+    mock_cp.enqueue_message.assert_not_called()
+
+
+def test_submit_rejects_mismatched_magic(client_and_cp):
     client, mock_cp = client_and_cp
 
     png_bytes = b"\x89PNG\r\n\x1a\n" + b"0" * 32
@@ -127,7 +124,7 @@ def test_submit_rejects_mismatched_magic(client_and_cp, mock_cosmos_update):
     assert mock_cp.save_file_to_blob.call_count == 0
 
 
-def test_submit_rejects_too_long_filename(client_and_cp, mock_cosmos_update):
+def test_submit_rejects_too_long_filename(client_and_cp):
     client, mock_cp = client_and_cp
 
     pdf_bytes = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
@@ -145,3 +142,167 @@ def test_submit_rejects_too_long_filename(client_and_cp, mock_cosmos_update):
     response = client.post("/contentprocessor/submit", files=files)
     assert response.status_code == 400
     assert mock_cp.save_file_to_blob.call_count == 0
+
+
+_PDF_BYTES = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<<>>\nendobj\n"
+_BATCH_DATA = json.dumps({"Schema_Id": "schema", "Metadata_Id": "meta"})
+
+
+def _blob(size=1000, content_type="application/pdf", header=b"%PDF-1.7"):
+    properties = SimpleNamespace(
+        size=size, content_settings=SimpleNamespace(content_type=content_type)
+    )
+    return properties, header
+
+
+def test_submit_batch_uploads_and_blobs(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.read_source_blob.return_value = _blob()
+    blob_url = "https://acct.blob.core.windows.net/inbox/scan%201.pdf"
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[
+            ("files", ("a.pdf", _PDF_BYTES, "application/pdf")),
+            ("files", ("b.pdf", _PDF_BYTES, "application/pdf")),
+            (
+                "data",
+                (
+                    None,
+                    json.dumps({
+                        "Schema_Id": "schema",
+                        "Metadata_Id": "meta",
+                        "Blob_Urls": [blob_url],
+                    }),
+                    "application/json",
+                ),
+            ),
+        ],
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["rejected"] == []
+    assert [p["file_name"] for p in body["processes"]] == [
+        "a.pdf",
+        "b.pdf",
+        "scan 1.pdf",
+    ]
+    assert len({p["process_id"] for p in body["processes"]}) == 3
+    assert body["processes"][0]["sha256"] == "ab12"
+    assert body["processes"][2]["sha256"] is None
+
+    assert mock_cp.save_file_to_blob.await_count == 2
+    mock_cp.copy_file_from_url.assert_awaited_once_with(
+        body["processes"][2]["process_id"], blob_url, "scan 1.pdf"
+    )
+    # One Cosmos DB request for all records, then one message per file.
+    mock_cp.insert_processes.assert_awaited_once()
+    records = mock_cp.insert_processes.await_args.args[0]
+    assert [r.status for r in records] == ["processing"] * 3
+    assert mock_cp.enqueue_message.await_count == 3
+    mock_cp.update_process_status_to_cosmos.assert_not_called()
+
+
+def test_submit_batch_reports_rejected_files(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.read_source_blob.side_effect = ValueError("not a blob of the account")
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[
+            ("files", ("a.pdf", _PDF_BYTES, "application/pdf")),
+            ("files", ("b.pdf", b"\x89PNG\r\n\x1a\n" + b"0" * 32, "application/pdf")),
+            (
+                "data",
+                (
+                    None,
+                    json.dumps({
+                        "Schema_Id": "schema",
+                        "Metadata_Id": "meta",
+                        "Blob_Urls": ["https://evil.example/x.pdf"],
+                    }),
+                    "application/json",
+                ),
+            ),
+        ],
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert [p["file_name"] for p in body["processes"]] == ["a.pdf"]
+    assert {(r["file_name"], r["status_code"]) for r in body["rejected"]} == {
+        ("b.pdf", 415),
+        ("x.pdf", 400),
+    }
+    assert len(mock_cp.insert_processes.await_args.args[0]) == 1
+
+
+def test_submit_batch_marks_unqueued_files_failed(client_and_cp):
+    client, mock_cp = client_and_cp
+    mock_cp.enqueue_message.side_effect = RuntimeError("queue unavailable")
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[
+            ("files", ("a.pdf", _PDF_BYTES, "application/pdf")),
+            ("data", (None, _BATCH_DATA, "application/json")),
+        ],
+    )
+
+    body = response.json()
+    assert body["processes"] == []
+    assert body["rejected"][0]["status_code"] == 500
+    assert mock_cp.update_process_status_to_cosmos.await_args.args[0].status == "Error"
+
+
+def test_submit_batch_rejects_empty_and_oversized_batches(client_and_cp):
+    client, mock_cp = client_and_cp
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[
+            ("files", ("a.pdf", _PDF_BYTES, "application/pdf")),
+            ("data", (None, json.dumps({"Schema_Id": "schema"}), "application/json")),
+        ],
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[("data", (None, _BATCH_DATA, "application/json"))],
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[
+            *[("files", (f"{i}.pdf", _PDF_BYTES, "application/pdf")) for i in range(4)],
+            ("data", (None, _BATCH_DATA, "application/json")),
+        ],
+    )
+    assert response.status_code == 413
+    mock_cp.save_file_to_blob.assert_not_called()
+
+
+def test_submit_batch_refused_while_queues_are_saturated(client_and_cp):
+    client, mock_cp = client_and_cp
+    client.app.app_context.admission_control.admit.return_value = Admission(
+        admitted=False,
+        wait_seconds=22000,
+        max_wait_seconds=21600,
+        retry_after_seconds=400,
+    )
+
+    response = client.post(
+        "/contentprocessor/submit/batch",
+        files=[
+            ("files", ("a.pdf", _PDF_BYTES, "application/pdf")),
+            ("data", (None, _BATCH_DATA, "application/json")),
+        ],
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "400"
+    mock_cp.save_file_to_blob.assert_not_called()
+    mock_cp.insert_processes.assert_not_called()
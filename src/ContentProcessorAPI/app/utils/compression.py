@@ -0,0 +1,37 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Decoding of gzip / zstd encoded pipeline artifacts.
+
+The content-processing worker may store its JSON artifacts compressed and
+tagged with a ``Content-Encoding``. ``zstd`` requires the optional
+``zstandard`` package; blobs with any other encoding are returned unchanged.
+"""
+
+import gzip
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for zstd
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+def decompress(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """Decode *data* stored with *content_encoding*.
+
+    Raises:
+        ValueError: If the blob is zstd encoded and ``zstandard`` is not installed.
+    """
+    if content_encoding == GZIP:
+        return gzip.decompress(data)
+    if content_encoding == ZSTD:
+        if zstandard is None:
+            raise ValueError(
+                "zstd content encoding requires the 'zstandard' package to be installed."
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
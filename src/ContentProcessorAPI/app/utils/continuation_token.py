@@ -0,0 +1,37 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Opaque continuation tokens of keyset-paginated listings.
+
+A token carries the sort key of the last item of a page, so the next
+page starts right after it whatever its depth. Clients must treat it as
+opaque; it is not signed, as it only positions a query the server builds.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+
+def encode_token(payload: dict) -> str:
+    """Return the URL-safe token of *payload* (JSON-serializable values)."""
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> dict:
+    """Return the payload of *token*.
+
+    Raises:
+        ValueError: If *token* was not produced by ``encode_token``.
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid continuation token.") from e
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid continuation token.")
+    return payload
@@ -0,0 +1,74 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""HTTP validators (ETag / Last-Modified) and conditional GET handling."""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def entity_tag(*parts: object) -> str:
+    """Return a strong ETag derived from *parts*."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime.datetime] = None
+) -> dict[str, str]:
+    """Return the ETag / Last-Modified headers of a response.
+
+    ``Cache-Control: no-cache`` lets clients keep the response but makes
+    them revalidate it on every use.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(datetime.timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_conditional(request: Request) -> bool:
+    """Return whether *request* carries If-None-Match or If-Modified-Since."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """Return whether the client's copy described by *headers* is current.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = headers["ETag"]
+        return any(
+            tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Return a ``304 Not Modified`` response carrying *headers*."""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,53 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""HTTP ``Range`` request parsing (single byte ranges, RFC 9110 14)."""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+_BYTE_RANGE_RE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+def parse_range(header: Optional[str]) -> Optional[tuple[Optional[int], Optional[int]]]:
+    """Parse a single-range ``Range`` header into ``(first, last)``.
+
+    ``bytes=100-199`` gives ``(100, 199)``, ``bytes=100-`` gives
+    ``(100, None)`` and the suffix range ``bytes=-500`` gives
+    ``(None, 500)``. Returns ``None`` when the header is absent, invalid or
+    asks for several ranges; the whole representation is then served, as
+    RFC 9110 allows.
+    """
+    if not header:
+        return None
+    match = _BYTE_RANGE_RE.match(header)
+    if match is None:
+        return None
+    first, last = (int(group) if group else None for group in match.groups())
+    if first is None and not last:
+        return None
+    if first is not None and last is not None and last < first:
+        return None
+    return first, last
+
+
+def resolve_range(
+    byte_range: tuple[Optional[int], Optional[int]], size: int
+) -> Optional[tuple[int, int]]:
+    """Return the inclusive ``(first, last)`` of *byte_range* within *size* bytes.
+
+    Returns ``None`` when the range is not satisfiable.
+    """
+    first, last = byte_range
+    if first is None:
+        return (max(size - last, 0), size - 1) if size else None
+    if first >= size:
+        return None
+    return first, min(last if last is not None else size - 1, size - 1)
+
+
+def content_range(first: int, last: int, size: int) -> str:
+    """Return the ``Content-Range`` value of a partial response."""
+    return f"bytes {first}-{last}/{size}"
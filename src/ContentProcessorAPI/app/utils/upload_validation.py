@@ -126,16 +126,37 @@ def sniff_mime_type_from_magic(header: bytes) -> Optional[str]:
     return None
 
 
-async def validate_upload_for_processing(
+def _safe_filename_or_error(filename: Optional[str]) -> str | JSONResponse:
+    """Return the sanitized *filename*, or a 400 response if it is unusable."""
+    if not filename:
+        return JSONResponse(
+            status_code=400,
+            content={"message": "Missing filename."},
+        )
+
+    # Industry-standard hardening: treat client filename/content-type as untrusted.
+    try:
+        return sanitize_filename(filename)
+    except ValueError:
+        return JSONResponse(
+            status_code=400,
+            content={"message": "Filename is too long."},
+        )
+
+
+def validate_file_for_processing(
     *,
-    upload: UploadFile,
+    filename: Optional[str],
+    header: bytes,
+    content_type: Optional[str],
+    size_bytes: Optional[int],
     max_filesize_mb: int,
 ) -> tuple[str, str, int] | JSONResponse:
-    """Validate an uploaded file for ContentProcessor endpoints.
+    """Validate a file for ContentProcessor endpoints from its name and first bytes.
 
     Performs:
     - filename sanitization
-    - extension + magic-byte MIME sniff validation
+    - extension + magic-byte MIME sniff validation of *header*
     - Content-Type validation (allows application/octet-stream)
     - max file size validation
 
@@ -144,27 +165,12 @@ async def validate_upload_for_processing(
         with an appropriate HTTP status code.
     """
 
-    if not upload.filename:
-        return JSONResponse(
-            status_code=400,
-            content={"message": "Missing filename."},
-        )
-
-    # Industry-standard hardening: treat client filename/content-type as untrusted.
-    try:
-        safe_filename = sanitize_filename(upload.filename)
-    except ValueError:
-        return JSONResponse(
-            status_code=400,
-            content={"message": "Filename is too long."},
-        )
+    safe_filename = _safe_filename_or_error(filename)
+    if isinstance(safe_filename, JSONResponse):
+        return safe_filename
 
     extension = os.path.splitext(safe_filename)[1].lower()
 
-    # Read a small header for magic-byte sniffing (then rewind for downstream consumers).
-    header = await upload.read(16)
-    await upload.seek(0)
-
     sniffed = sniff_mime_type_from_magic(header)
     allowed_by_ext = {
         ".pdf": MimeTypes.Pdf,
@@ -184,16 +190,15 @@ async def validate_upload_for_processing(
         )
 
     # Some clients may send application/octet-stream; accept if magic bytes+extension validate.
-    if upload.content_type not in {expected_for_ext, "application/octet-stream"}:
+    if content_type not in {expected_for_ext, "application/octet-stream"}:
         return JSONResponse(
             status_code=415,
             content={
-                "message": f"Unsupported Content-Type: {upload.content_type}. Expected {expected_for_ext}.",
+                "message": f"Unsupported Content-Type: {content_type}. Expected {expected_for_ext}.",
                 "file_name": safe_filename,
             },
         )
 
-    size_bytes = get_upload_size_bytes(upload)
     if size_bytes is None:
         return JSONResponse(
             status_code=400,
@@ -214,3 +219,34 @@ async def validate_upload_for_processing(
         )
 
     return safe_filename, cast(str, expected_for_ext), size_bytes
+
+
+async def validate_upload_for_processing(
+    *,
+    upload: UploadFile,
+    max_filesize_mb: int,
+) -> tuple[str, str, int] | JSONResponse:
+    """Validate an uploaded file for ContentProcessor endpoints.
+
+    See ``validate_file_for_processing`` for the checks performed.
+
+    Returns:
+        (safe_filename, expected_mime_type, size_bytes) on success, otherwise a JSONResponse
+        with an appropriate HTTP status code.
+    """
+
+    safe_filename = _safe_filename_or_error(upload.filename)
+    if isinstance(safe_filename, JSONResponse):
+        return safe_filename
+
+    # Read a small header for magic-byte sniffing (then rewind for downstream consumers).
+    header = await upload.read(16)
+    await upload.seek(0)
+
+    return validate_file_for_processing(
+        filename=safe_filename,
+        header=header,
+        content_type=upload.content_type,
+        size_bytes=get_upload_size_bytes(upload),
+        max_filesize_mb=max_filesize_mb,
+    )
@@ -108,7 +108,8 @@ class Configuration(_configuration_base):
         Storage / Queues
             ``storage_queue_account``, ``storage_queue_name``,
             ``storage_account_process_queue`` — Azure Storage Queue
-            identifiers used by ``QueueService``.
+            identifiers used by ``QueueService``; ``app_status_events_queue``
+            — queue of the claim status-change events read by the API.
         Content Processing
             ``app_cps_content_process_endpoint``,
             ``app_cps_poll_interval_seconds`` — HTTP endpoint and timing
@@ -166,6 +167,12 @@ class Configuration(_configuration_base):
         default="content-pipeline-extract-queue", alias="APP_MESSAGE_QUEUE_EXTRACT"
     )
 
+    app_status_events_queue: str = Field(
+        default="status-events-queue",
+        alias="APP_STATUS_EVENTS_QUEUE",
+        description="Queue of the claim status-change events for the API (empty disables them)",
+    )
+
     app_cps_content_process_endpoint: str = Field(
         default="http://localhost:8000/", alias="APP_CPS_CONTENT_PROCESS_ENDPOINT"
     )
@@ -36,6 +36,7 @@ from services.queue_service import (
     ClaimProcessingQueueService,
     QueueServiceConfig,
 )
+from services.status_events import StatusEventPublisher
 from steps.claim_processor import ClaimProcessor
 from utils.credential_util import get_azure_credential
 from utils.logging_utils import configure_application_logging
@@ -163,6 +164,14 @@ class ClaimsQueueWorkerService(ApplicationBase):
                     container_name=self.application_context.configuration.app_cosmos_container_batch_process,
                 ),
             )
+            .add_singleton(
+                StatusEventPublisher,
+                lambda: StatusEventPublisher(
+                    account_url=self.application_context.configuration.app_storage_queue_url,
+                    queue_name=self.application_context.configuration.app_status_events_queue,
+                    credential=get_azure_credential(),
+                ),
+            )
             .add_singleton(
                 ContentProcessService,
                 lambda: ContentProcessService(
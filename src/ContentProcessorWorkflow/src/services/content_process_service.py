@@ -23,6 +23,7 @@ from sas.cosmosdb.mongo.repository import RepositoryBase
 from sas.storage import StorageBlobHelper
 
 from libs.application.application_configuration import Configuration
+from utils.compression import decompress_artifact
 
 from .content_process_models import (
     ArtifactType,
@@ -239,6 +240,10 @@ class ContentProcessService:
     async def get_steps(self, process_id: str) -> list | None:
         """Download step_outputs.json from blob storage.
 
+        Steps that only carry a ``step_result_reference`` (slim persistence
+        mode) have their payload downloaded from the referenced blob.
+        Compressed artifacts are decoded transparently.
+
         Args:
             process_id: The content process identifier.
 
@@ -254,7 +259,19 @@ class ContentProcessService:
                 container_name=container_name,
                 blob_name=blob_name,
             )
-            return json.loads(data.decode("utf-8"))
+            steps = json.loads(decompress_artifact(data).decode("utf-8"))
+            for step in steps:
+                reference = step.get("step_result_reference")
+                if step.get("step_result") is None and reference:
+                    payload = await asyncio.to_thread(
+                        blob_helper.download_blob,
+                        container_name=container_name,
+                        blob_name=f"{process_id}/{reference['blob_name']}",
+                    )
+                    step["step_result"] = json.loads(
+                        decompress_artifact(payload).decode("utf-8")
+                    )
+            return steps
         except Exception:
             logger.debug("step_outputs.json not found for process %s", process_id)
             return None
@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Status-change events of claim processes.
+
+The workflow sends an event to the status-events queue each time it
+writes a new claim status. The ContentProcessorAPI consumes the queue
+and pushes the change to clients that follow the claim (Server-Sent
+Events, WebSocket or long polling) instead of polling Cosmos DB.
+
+Events are best effort: they expire after ``EVENT_TTL_SECONDS`` and a
+failed send is logged, never raised; Cosmos DB stays the source of truth.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+
+from azure.core.exceptions import ResourceExistsError
+from azure.identity import DefaultAzureCredential
+from azure.storage.queue import QueueClient
+
+logger = logging.getLogger(__name__)
+
+# Events older than this are of no use to a client that follows a claim.
+EVENT_TTL_SECONDS = 600
+
+
+def claim_status_event(claim_id: str, status: str) -> str:
+    """Return the event payload of a claim status change."""
+    return json.dumps({
+        "kind": "claim",
+        "id": claim_id,
+        "status": status,
+        "time": datetime.now(timezone.utc).isoformat(),
+    })
+
+
+class StatusEventPublisher:
+    """Send claim status-change events to the status-events queue.
+
+    Publishing is disabled when *queue_name* or *account_url* is empty.
+    """
+
+    def __init__(
+        self, account_url: str, queue_name: str, credential: DefaultAzureCredential
+    ):
+        self._account_url = account_url
+        self._queue_name = queue_name
+        self._credential = credential
+        # Queue — lazy-init on first use
+        self._queue_client: QueueClient | None = None
+
+    def _get_queue_client(self) -> QueueClient:
+        """Return the Storage Queue client, creating the queue if needed."""
+        if self._queue_client is None:
+            queue_client = QueueClient(
+                account_url=self._account_url,
+                queue_name=self._queue_name,
+                credential=self._credential,
+            )
+            try:
+                queue_client.create_queue()
+            except ResourceExistsError:
+                pass
+            self._queue_client = queue_client
+        return self._queue_client
+
+    def _send(self, content: str):
+        self._get_queue_client().send_message(
+            content, time_to_live=EVENT_TTL_SECONDS
+        )
+
+    async def publish_claim_status(self, claim_id: str, status: str):
+        """Announce the new *status* of *claim_id*."""
+        if not self._queue_name or not self._account_url:
+            return
+        try:
+            await asyncio.to_thread(self._send, claim_status_event(claim_id, status))
+        except Exception as e:
+            logger.warning("Unable to publish status event of %s: %s", claim_id, e)
@@ -20,7 +20,8 @@ Pipeline order:
 
 Key behaviours:
     * Each executor invocation updates the ``Claim_Process`` status in
-      Cosmos DB so the API layer can report real-time progress.
+      Cosmos DB and publishes a status-change event, so the API layer can
+      push real-time progress to its clients.
     * On failure the status is set to ``FAILED`` and the error message
       is persisted in ``process_comment``.
     * Elapsed wall-clock time is recorded in ``processed_time`` once
@@ -43,6 +44,7 @@ from art import text2art
 from libs.application.application_context import AppContext
 from repositories.claim_processes import Claim_Processes
 from repositories.model.claim_process import Claim_Steps
+from services.status_events import StatusEventPublisher
 
 from .document_process.executor.document_process_executor import DocumentProcessExecutor
 from .gap_analysis.executor.gap_executor import GapExecutor
@@ -176,6 +178,20 @@ class ClaimProcessor:
 
         return workflow
 
+    async def _update_status(
+        self,
+        claim_process_repository: Claim_Processes,
+        process_id: str,
+        new_status: Claim_Steps,
+    ):
+        """Persist the claim status and announce the change to the API."""
+        await claim_process_repository.Update_Claim_Process_Status(
+            process_id=process_id, new_status=new_status
+        )
+        await self.app_context.get_service(StatusEventPublisher).publish_claim_status(
+            process_id, new_status.value
+        )
+
     async def run(self, input_data: str) -> Any:
         """Run the migration workflow.
 
@@ -218,8 +234,8 @@ class ClaimProcessor:
                     claim_process_repository = self.app_context.get_service(
                         Claim_Processes
                     )
-                    await claim_process_repository.Update_Claim_Process_Status(
-                        process_id=input_data, new_status=Claim_Steps.COMPLETED
+                    await self._update_status(
+                        claim_process_repository, input_data, Claim_Steps.COMPLETED
                     )
                     return event.data
                 elif event.type == "executor_failed":
@@ -235,8 +251,8 @@ class ClaimProcessor:
                     claim_process_repository = self.app_context.get_service(
                         Claim_Processes
                     )
-                    await claim_process_repository.Update_Claim_Process_Status(
-                        process_id=batch_id, new_status=Claim_Steps.FAILED
+                    await self._update_status(
+                        claim_process_repository, batch_id, Claim_Steps.FAILED
                     )
                     await claim_process_repository.Update_Claim_Process_Comment(
                         process_id=batch_id,
@@ -262,8 +278,8 @@ class ClaimProcessor:
                         new_status = None
 
                     if new_status is not None:
-                        await claim_process_repository.Update_Claim_Process_Status(
-                            process_id=input_data, new_status=new_status
+                        await self._update_status(
+                            claim_process_repository, input_data, new_status
                         )
                 elif event.type == "executor_completed":
                     pass
@@ -4,6 +4,7 @@
 """Shared utility helpers for the Content Processing Workflow.
 
 Sub-modules:
+    compression       -- Decoding of gzip / zstd compressed artifacts.
     credential_util   -- Azure credential selection (sync and async).
     http_request      -- Async HTTP client with retries, OAuth, and polling.
     logging_utils     -- Application-wide logging configuration and helpers.
@@ -0,0 +1,37 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Decoding of gzip / zstd encoded pipeline artifacts.
+
+The content-processing worker may store its JSON artifacts compressed.
+The blob helper returns raw bytes without blob properties, so the
+encoding is recognised from the payload's magic bytes. ``zstd`` requires
+the optional ``zstandard`` package.
+"""
+
+import gzip
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for zstd
+    zstandard = None
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def decompress_artifact(data: bytes) -> bytes:
+    """Return *data* decoded if it is gzip / zstd compressed, otherwise unchanged.
+
+    Raises:
+        ValueError: If the data is zstd compressed and ``zstandard`` is not installed.
+    """
+    if data[:2] == _GZIP_MAGIC:
+        return gzip.decompress(data)
+    if data[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError(
+                "zstd content encoding requires the 'zstandard' package to be installed."
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from services.content_process_service import ContentProcessService
@@ -105,6 +106,71 @@ class TestGetProcessed:
         asyncio.run(_run())
 
 
+# ── get_steps ───────────────────────────────────────────────────────────
+
+
+class TestGetSteps:
+    def test_returns_embedded_steps(self):
+        async def _run():
+            svc = _make_service()
+            svc._blob_helper = MagicMock()
+            svc._blob_helper.download_blob.return_value = (
+                b'[{"step_name": "map", "step_result": {"k": 1}}]'
+            )
+
+            result = await svc.get_steps("p1")
+            assert result == [{"step_name": "map", "step_result": {"k": 1}}]
+            svc._blob_helper.download_blob.assert_called_once_with(
+                container_name="cps-processes", blob_name="p1/step_outputs.json"
+            )
+
+        asyncio.run(_run())
+
+    def test_resolves_step_result_reference(self):
+        async def _run():
+            svc = _make_service()
+            blobs = {
+                "p1/step_outputs.json": (
+                    b'[{"step_name": "map", "step_result": null, '
+                    b'"step_result_reference": {"blob_name": "map_output.json", '
+                    b'"size": 8, "sha256": "x"}}]'
+                ),
+                "p1/map_output.json": b'{"k": 1}',
+            }
+            svc._blob_helper = MagicMock()
+            svc._blob_helper.download_blob.side_effect = (
+                lambda container_name, blob_name: blobs[blob_name]
+            )
+
+            result = await svc.get_steps("p1")
+            assert result[0]["step_result"] == {"k": 1}
+
+        asyncio.run(_run())
+
+    def test_decodes_gzip_artifacts(self):
+        async def _run():
+            svc = _make_service()
+            svc._blob_helper = MagicMock()
+            svc._blob_helper.download_blob.return_value = gzip.compress(
+                b'[{"step_name": "map", "step_result": {"k": 1}}]'
+            )
+
+            result = await svc.get_steps("p1")
+            assert result == [{"step_name": "map", "step_result": {"k": 1}}]
+
+        asyncio.run(_run())
+
+    def test_returns_none_when_missing(self):
+        async def _run():
+            svc = _make_service()
+            svc._blob_helper = MagicMock()
+            svc._blob_helper.download_blob.side_effect = ValueError("missing")
+
+            assert await svc.get_steps("p1") is None
+
+        asyncio.run(_run())
+
+
 # ── poll_status ─────────────────────────────────────────────────────────
 
 
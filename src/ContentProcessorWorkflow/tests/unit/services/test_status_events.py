@@ -0,0 +1,61 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for services.status_events (claim status-change events)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+from azure.core.exceptions import ResourceExistsError
+
+from services.status_events import (
+    EVENT_TTL_SECONDS,
+    StatusEventPublisher,
+    claim_status_event,
+)
+
+
+def test_claim_status_event_payload():
+    event = json.loads(claim_status_event("c1", "Summarizing"))
+
+    assert event["kind"] == "claim"
+    assert event["id"] == "c1"
+    assert event["status"] == "Summarizing"
+
+
+def test_publish_claim_status_sends_event():
+    queue_client = MagicMock()
+    queue_client.create_queue.side_effect = ResourceExistsError("exists")
+    with patch(
+        "services.status_events.QueueClient", return_value=queue_client
+    ) as MockQueueClient:
+        publisher = StatusEventPublisher("https://q", "events", MagicMock())
+        asyncio.run(publisher.publish_claim_status("c1", "Completed"))
+        asyncio.run(publisher.publish_claim_status("c1", "Completed"))
+
+    MockQueueClient.assert_called_once()
+    content = queue_client.send_message.call_args.args[0]
+    assert json.loads(content)["status"] == "Completed"
+    assert (
+        queue_client.send_message.call_args.kwargs["time_to_live"]
+        == EVENT_TTL_SECONDS
+    )
+
+
+def test_publish_claim_status_disabled_without_queue():
+    with patch("services.status_events.QueueClient") as MockQueueClient:
+        publisher = StatusEventPublisher("https://q", "", MagicMock())
+        asyncio.run(publisher.publish_claim_status("c1", "Completed"))
+
+    MockQueueClient.assert_not_called()
+
+
+def test_publish_claim_status_swallows_errors():
+    queue_client = MagicMock()
+    queue_client.send_message.side_effect = RuntimeError("unavailable")
+    with patch("services.status_events.QueueClient", return_value=queue_client):
+        publisher = StatusEventPublisher("https://q", "events", MagicMock())
+        asyncio.run(publisher.publish_claim_status("c1", "Failed"))
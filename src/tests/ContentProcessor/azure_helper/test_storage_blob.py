@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import gzip
 from io import BytesIO
 from unittest.mock import MagicMock, patch
 
@@ -97,10 +98,21 @@ class TestStorageBlobHelper:
 
     def test_download_text(self, storage_blob_helper, mock_blob_service_client, mocker):
         mock = _blob_client(mock_blob_service_client, mocker)
-        mock.download_blob.return_value.content_as_text.return_value = "test text"
+        mock.download_blob.return_value.readall.return_value = b"test text"
         text = storage_blob_helper.download_text("testcontainer", "testblob")
         assert text == "test text"
 
+    def test_download_text_decodes_gzip(
+        self, storage_blob_helper, mock_blob_service_client, mocker
+    ):
+        mock = _blob_client(mock_blob_service_client, mocker)
+        downloader = mock.download_blob.return_value
+        downloader.readall.return_value = gzip.compress("test text é".encode("utf-8"))
+        downloader.properties.content_settings.content_encoding = "gzip"
+        text = storage_blob_helper.download_text("testcontainer", "testblob")
+        assert text == "test text é"
+        mock.download_blob.assert_called_once_with(decompress=False)
+
     def test_delete_blob(self, storage_blob_helper, mock_blob_service_client, mocker):
         mock = _blob_client(mock_blob_service_client, mocker)
         storage_blob_helper.delete_blob("testcontainer", "testblob")
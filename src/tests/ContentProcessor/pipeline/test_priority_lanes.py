@@ -0,0 +1,106 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.pipeline.priority_lanes (lane scheduling and promotion)."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from libs.pipeline.entities.pipeline_status import PipelineStatus
+from libs.pipeline.priority_lanes import (
+    DEFAULT_LANE_WEIGHTS,
+    LaneScheduler,
+    Priority,
+    parse_lane_weights,
+    priority_of,
+    promote_small_document,
+)
+
+# ── TestParseLaneWeights ────────────────────────────────────────────────
+
+
+class TestParseLaneWeights:
+    """Parsing ``lane=weight`` pairs."""
+
+    def test_default_weights(self):
+        assert parse_lane_weights(DEFAULT_LANE_WEIGHTS) == {
+            Priority.High: 6,
+            Priority.Normal: 3,
+            Priority.Low: 1,
+        }
+
+    def test_missing_lanes_get_weight_one(self):
+        assert parse_lane_weights("high=4") == {
+            Priority.High: 4,
+            Priority.Normal: 1,
+            Priority.Low: 1,
+        }
+        assert parse_lane_weights("") == {priority: 1 for priority in Priority}
+
+    @pytest.mark.parametrize("spec", ["urgent=2", "high=x", "high=0", "high"])
+    def test_rejects_invalid_entries(self, spec):
+        with pytest.raises(ValueError, match="Invalid lane weight"):
+            parse_lane_weights(spec)
+
+
+# ── TestLaneScheduler ───────────────────────────────────────────────────
+
+
+class TestLaneScheduler:
+    """Smooth weighted round-robin over the lanes."""
+
+    def test_picks_follow_weights(self):
+        scheduler = LaneScheduler(parse_lane_weights(DEFAULT_LANE_WEIGHTS))
+        picks = Counter(scheduler.order()[0] for _ in range(10))
+        assert picks == {Priority.High: 6, Priority.Normal: 3, Priority.Low: 1}
+
+    def test_picks_are_interleaved(self):
+        scheduler = LaneScheduler(parse_lane_weights(DEFAULT_LANE_WEIGHTS))
+        picks = [scheduler.order()[0] for _ in range(10)]
+        assert Priority.Normal in picks[:4]
+
+    def test_order_lists_every_lane_once(self):
+        scheduler = LaneScheduler(parse_lane_weights("high=1,normal=5,low=2"))
+        order = scheduler.order()
+        assert order == [Priority.Normal, Priority.Low, Priority.High]
+
+
+# ── TestPriority ────────────────────────────────────────────────────────
+
+
+def _status(priority: str | None = None) -> PipelineStatus:
+    return PipelineStatus(process_id="proc-1", priority=priority)
+
+
+class TestPriority:
+    """Priority of a pipeline and small-document promotion."""
+
+    def test_priority_of(self):
+        assert priority_of(_status("low")) == Priority.Low
+        assert priority_of(_status()) == Priority.Normal
+        assert priority_of(_status("urgent")) == Priority.Normal
+
+    def test_priority_round_trips_by_alias(self):
+        status = PipelineStatus(**_status("high").model_dump(by_alias=True))
+        assert status.priority == "high"
+
+    def test_promotes_small_document(self):
+        status = _status()
+        assert promote_small_document(status, pages=2, max_pages=2) == Priority.High
+        assert status.priority == "high"
+
+    def test_keeps_large_document(self):
+        status = _status()
+        assert promote_small_document(status, pages=3, max_pages=2) is None
+        assert status.priority is None
+
+    def test_keeps_explicit_priority(self):
+        status = _status("low")
+        assert promote_small_document(status, pages=1, max_pages=2) is None
+        assert status.priority == "low"
+
+    def test_promotion_disabled(self):
+        assert promote_small_document(_status(), pages=1, max_pages=0) is None
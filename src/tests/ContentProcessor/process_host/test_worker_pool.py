@@ -0,0 +1,110 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.process_host.worker_pool (pool bounds and scaling rules)."""
+
+from __future__ import annotations
+
+import pytest
+
+from libs.process_host import worker_pool
+from libs.process_host.worker_pool import (
+    AutoscaleSettings,
+    WorkerPoolSettings,
+    desired_worker_count,
+    has_resource_headroom,
+    parse_worker_pools,
+    pool_for,
+    restart_delay,
+)
+
+_ELASTIC = WorkerPoolSettings(min_workers=1, max_workers=8)
+_AUTOSCALE = AutoscaleSettings(interval_seconds=10, messages_per_worker=5)
+
+# ── TestParseWorkerPools ────────────────────────────────────────────────
+
+
+class TestParseWorkerPools:
+    """Configuration parsing for per-step worker pools."""
+
+    def test_min_max_target(self):
+        pools = parse_worker_pools("map=1:8:2, save=1:1")
+        assert pools["map"] == WorkerPoolSettings(
+            min_workers=1, max_workers=8, target_workers=2
+        )
+        assert pools["save"].target_workers == 1
+        assert pools["map"].is_elastic
+        assert not pools["save"].is_elastic
+
+    def test_wildcard_and_default(self):
+        pools = parse_worker_pools("*=2:4")
+        assert pool_for(pools, "extract").min_workers == 2
+        assert pool_for({}, "extract") == WorkerPoolSettings()
+
+    @pytest.mark.parametrize("value", ["map=4:2", "map=1", "map", "map=a:b"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_worker_pools(value)
+
+
+# ── TestDesiredWorkerCount ──────────────────────────────────────────────
+
+
+class TestDesiredWorkerCount:
+    """Backlog-driven pool sizing."""
+
+    def test_grows_with_backlog(self):
+        assert desired_worker_count(_ELASTIC, 1, 23, 0.0, _AUTOSCALE) == 5
+
+    def test_capped_at_max(self):
+        assert desired_worker_count(_ELASTIC, 1, 500, 0.0, _AUTOSCALE) == 8
+
+    def test_holds_when_draining_fast_enough(self):
+        assert desired_worker_count(_ELASTIC, 2, 20, 5.0, _AUTOSCALE) == 2
+
+    def test_shrinks_one_at_a_time(self):
+        assert desired_worker_count(_ELASTIC, 6, 0, 0.0, _AUTOSCALE) == 5
+
+    def test_keeps_min(self):
+        assert desired_worker_count(_ELASTIC, 1, 0, 0.0, _AUTOSCALE) == 1
+
+
+# ── TestRestartDelay ────────────────────────────────────────────────────
+
+
+class TestRestartDelay:
+    """Exponential restart backoff."""
+
+    def test_doubles_and_caps(self):
+        autoscale = AutoscaleSettings(
+            restart_backoff_seconds=1, restart_backoff_max_seconds=5
+        )
+        assert [restart_delay(n, autoscale) for n in range(5)] == [
+            0.0,
+            1,
+            2,
+            4,
+            5,
+        ]
+
+
+# ── TestHasResourceHeadroom ─────────────────────────────────────────────
+
+
+class TestHasResourceHeadroom:
+    """CPU and memory limits gate scale-up."""
+
+    def test_without_psutil(self, monkeypatch):
+        monkeypatch.setattr(worker_pool, "psutil", None)
+        assert has_resource_headroom(_AUTOSCALE) is True
+
+    def test_cpu_limit(self, mocker):
+        psutil = mocker.patch.object(worker_pool, "psutil")
+        psutil.cpu_percent.return_value = 95.0
+        assert has_resource_headroom(_AUTOSCALE) is False
+
+    def test_memory_limit(self, mocker):
+        psutil = mocker.patch.object(worker_pool, "psutil")
+        psutil.cpu_percent.return_value = 10.0
+        psutil.virtual_memory.return_value.available = 100 * 1024 * 1024
+        assert has_resource_headroom(_AUTOSCALE) is False
@@ -0,0 +1,83 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tests for libs.utils.profiling (sampled cProfile hooks)."""
+
+from __future__ import annotations
+
+import pstats
+
+import pytest
+
+from libs.utils.profiling import (
+    ProfilingSettings,
+    parse_targets,
+    profiled,
+    should_profile,
+    summary,
+    to_bytes,
+)
+
+
+def _work():
+    return sum(i * i for i in range(1000))
+
+
+# ── TestShouldProfile ───────────────────────────────────────────────────
+
+
+class TestShouldProfile:
+    """Targeting by step and schema, and sampling."""
+
+    def test_targets_step(self):
+        settings = ProfilingSettings(steps=["map"], sample_rate=1.0)
+        assert should_profile(settings, "map", "invoice")
+        assert not should_profile(settings, "save", "invoice")
+
+    def test_targets_schema_in_any_step(self):
+        settings = ProfilingSettings(schema_ids=["invoice"], sample_rate=1.0)
+        assert should_profile(settings, "save", "invoice")
+        assert not should_profile(settings, "save", "receipt")
+        assert not should_profile(settings, "save", None)
+
+    def test_wildcard_step(self):
+        settings = ProfilingSettings(steps=["*"], sample_rate=1.0)
+        assert should_profile(settings, "evaluate", None)
+
+    def test_sample_rate(self):
+        settings = ProfilingSettings(steps=["map"], sample_rate=0.25)
+        assert should_profile(settings, "map", None, draw=lambda: 0.2)
+        assert not should_profile(settings, "map", None, draw=lambda: 0.3)
+
+    def test_disabled_without_targets(self):
+        assert not should_profile(ProfilingSettings(sample_rate=1.0), "map", None)
+
+    def test_rejects_invalid_rate(self):
+        with pytest.raises(ValueError):
+            ProfilingSettings(steps=["map"], sample_rate=1.5)
+
+    def test_parse_targets(self):
+        assert parse_targets(" map,, evaluate ") == ["map", "evaluate"]
+        assert parse_targets("") == []
+
+
+# ── TestProfiled ────────────────────────────────────────────────────────
+
+
+class TestProfiled:
+    """Profile capture and serialization."""
+
+    def test_disabled_yields_none(self):
+        with profiled(False) as profiler:
+            _work()
+        assert profiler is None
+
+    def test_profile_is_readable_by_pstats(self, tmp_path):
+        with profiled(True) as profiler:
+            _work()
+
+        path = tmp_path / "map_profile.prof"
+        path.write_bytes(to_bytes(profiler))
+        functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+        assert "_work" in functions
+        assert "_work" in summary(profiler)
@@ -0,0 +1,30 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for the opaque list continuation tokens."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "ContentProcessorAPI")))
+
+from app.utils.continuation_token import decode_token, encode_token  # noqa: E402
+
+
+def test_round_trip_is_url_safe():
+    """A token decodes to its payload and needs no URL escaping."""
+    payload = {"imported_time": "2024-01-08T00:00:00", "process_id": "p8?/+"}
+
+    token = encode_token(payload)
+
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert decode_token(token) == payload
+
+
+@pytest.mark.parametrize("token", ["not a token", "", "WzFd", "bm90IGpzb24"])
+def test_invalid_tokens(token):
+    """Malformed, non-JSON and non-object tokens raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_token(token)
@@ -0,0 +1,86 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for the ETag / Last-Modified cache validators."""
+
+import datetime
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "ContentProcessorAPI")))
+
+from app.utils.http_cache import (  # noqa: E402
+    entity_tag,
+    is_conditional,
+    is_not_modified,
+    validator_headers,
+)
+
+MODIFIED = datetime.datetime(2025, 3, 13, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def _request(**headers):
+    return SimpleNamespace(headers=headers)
+
+
+def test_entity_tag_is_quoted_and_stable():
+    """The ETag is a quoted digest of the process id and status."""
+    assert entity_tag("p1", "Completed") == entity_tag("p1", "Completed")
+    assert entity_tag("p1", "Completed") != entity_tag("p1", "Error")
+    assert entity_tag("p1").startswith('"') and entity_tag("p1").endswith('"')
+
+
+def test_validator_headers():
+    """ETag, Last-Modified and Cache-Control are set."""
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert headers["ETag"] == '"abc"'
+    assert headers["Last-Modified"] == "Thu, 13 Mar 2025 12:00:00 GMT"
+    assert headers["Cache-Control"] == "no-cache"
+
+
+def test_validator_headers_treats_naive_time_as_utc():
+    """A naive modification time is formatted as UTC."""
+    headers = validator_headers('"abc"', MODIFIED.replace(tzinfo=None))
+
+    assert headers["Last-Modified"] == "Thu, 13 Mar 2025 12:00:00 GMT"
+
+
+def test_is_conditional():
+    """Requests with a validator header are conditional."""
+    assert is_conditional(_request(**{"if-none-match": '"abc"'}))
+    assert not is_conditional(_request())
+
+
+def test_if_none_match():
+    """If-None-Match matches weak, listed and wildcard tags."""
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert is_not_modified(_request(**{"if-none-match": '"x", W/"abc"'}), headers)
+    assert is_not_modified(_request(**{"if-none-match": "*"}), headers)
+    assert not is_not_modified(_request(**{"if-none-match": '"x"'}), headers)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    """If-Modified-Since is ignored when If-None-Match is present."""
+    headers = validator_headers('"abc"', MODIFIED)
+    request = _request(**{
+        "if-none-match": '"x"',
+        "if-modified-since": "Fri, 14 Mar 2025 12:00:00 GMT",
+    })
+
+    assert not is_not_modified(request, headers)
+
+
+def test_if_modified_since():
+    """If-Modified-Since compares against Last-Modified; unparsable dates never match."""
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert is_not_modified(
+        _request(**{"if-modified-since": "Thu, 13 Mar 2025 12:00:00 GMT"}), headers
+    )
+    assert not is_not_modified(
+        _request(**{"if-modified-since": "Wed, 12 Mar 2025 12:00:00 GMT"}), headers
+    )
+    assert not is_not_modified(_request(**{"if-modified-since": "garbage"}), headers)
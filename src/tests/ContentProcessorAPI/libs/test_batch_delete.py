@@ -0,0 +1,176 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Unit tests for the Blob Batch deletion of a prefix."""
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "ContentProcessorAPI")))
+
+from app.libs.azure.storage_blob.batch_delete import (  # noqa: E402
+    count_deleted,
+    delete_prefix,
+    delete_prefix_async,
+)
+
+
+def _response(status_code: int):
+    return SimpleNamespace(status_code=status_code, reason="Reason")
+
+
+class _Pages:
+    def __init__(self, pages):
+        self._pages = pages
+
+    def by_page(self):
+        return iter(self._pages)
+
+
+class _AsyncPage:
+    def __init__(self, names):
+        self._names = iter(names)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._names)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncPages:
+    def __init__(self, pages):
+        self._pages = iter(pages)
+
+    def by_page(self):
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return _AsyncPage(next(self._pages))
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _FakeContainer:
+    """Container of *names*, listed in pages of ``results_per_page``."""
+
+    def __init__(self, names, missing=(), failing=()):
+        self.names = list(names)
+        self.missing = set(missing)
+        self.failing = set(failing)
+        self.batches: list[tuple[str, ...]] = []
+        self._lock = threading.Lock()
+
+    def _pages(self, name_starts_with, results_per_page):
+        names = [name for name in self.names if name.startswith(name_starts_with)]
+        return [
+            names[i : i + results_per_page]
+            for i in range(0, len(names), results_per_page)
+        ]
+
+    def _delete(self, names, raise_on_any_failure):
+        assert raise_on_any_failure is False
+        with self._lock:
+            self.batches.append(names)
+        return [
+            _response(404)
+            if name in self.missing
+            else _response(500)
+            if name in self.failing
+            else _response(202)
+            for name in names
+        ]
+
+    def list_blob_names(self, name_starts_with, results_per_page):
+        return _Pages(self._pages(name_starts_with, results_per_page))
+
+    def delete_blobs(self, *names, raise_on_any_failure=True):
+        return self._delete(names, raise_on_any_failure)
+
+
+class _FakeAsyncContainer(_FakeContainer):
+    def list_blob_names(self, name_starts_with, results_per_page):
+        return _AsyncPages(self._pages(name_starts_with, results_per_page))
+
+    async def delete_blobs(self, *names, raise_on_any_failure=True):
+        return _AsyncPage(self._delete(names, raise_on_any_failure))
+
+
+def test_count_deleted_skips_missing_blobs():
+    """Blobs already gone are not counted."""
+    assert count_deleted([_response(202), _response(404), _response(202)]) == 2
+
+
+def test_count_deleted_raises_on_failed_delete():
+    """Any other failed sub-response raises."""
+    with pytest.raises(HttpResponseError):
+        count_deleted([_response(202), _response(403)])
+
+
+def test_delete_prefix_batches_and_reports_progress():
+    """Only the prefix is deleted, 256 blobs per batch, with increasing progress."""
+    names = [f"claim/{i:04d}.pdf" for i in range(600)] + ["other/x.pdf"]
+    container = _FakeContainer(names, missing={"claim/0001.pdf"})
+    progress = []
+
+    deleted = delete_prefix(container, "claim/", on_progress=progress.append)
+
+    assert deleted == 599
+    assert sorted(len(batch) for batch in container.batches) == [88, 256, 256]
+    assert "other/x.pdf" not in {n for batch in container.batches for n in batch}
+    assert progress[-1] == 599
+    assert progress == sorted(progress)
+
+
+def test_delete_prefix_raises_on_failed_delete():
+    """A failed delete stops the synchronous deletion."""
+    container = _FakeContainer(["claim/a.pdf"], failing={"claim/a.pdf"})
+
+    with pytest.raises(HttpResponseError):
+        delete_prefix(container, "claim/")
+
+
+@pytest.mark.asyncio
+async def test_delete_prefix_async_batches_concurrently():
+    """The async deletion sends every page as one batch."""
+    names = [f"p1/{i:04d}.json" for i in range(1000)]
+    container = _FakeAsyncContainer(names)
+    progress = []
+
+    deleted = await delete_prefix_async(
+        container, "p1/", on_progress=progress.append, max_concurrency=2
+    )
+
+    assert deleted == 1000
+    assert [len(batch) for batch in container.batches] == [256, 256, 256, 232]
+    assert progress[-1] == 1000
+
+
+@pytest.mark.asyncio
+async def test_delete_prefix_async_empty_folder():
+    """An empty prefix sends no batch."""
+    container = _FakeAsyncContainer(["other/a.pdf"])
+
+    assert await delete_prefix_async(container, "p1/") == 0
+    assert container.batches == []
+
+
+@pytest.mark.asyncio
+async def test_delete_prefix_async_raises_on_failed_delete():
+    """A failed delete stops the async deletion."""
+    container = _FakeAsyncContainer(["p1/a.pdf"], failing={"p1/a.pdf"})
+
+    with pytest.raises(HttpResponseError):
+        await delete_prefix_async(container, "p1/")
@@ -148,7 +148,7 @@ def test_download_blob_not_found(mock_blob_service, mock_get_credential):
     mock_container_client.exists.return_value = True
     mock_blob_client = MagicMock()
     mock_container_client.get_blob_client.return_value = mock_blob_client
-    mock_blob_client.get_blob_properties.side_effect = Exception("Not found")
+    mock_blob_client.download_blob.side_effect = Exception("Not found")
 
     helper = StorageBlobHelper("https://test.blob.core.windows.net", "test-container")
 
@@ -170,9 +170,9 @@ def test_download_blob_empty(mock_blob_service, mock_get_credential):
     mock_blob_client = MagicMock()
     mock_container_client.get_blob_client.return_value = mock_blob_client
 
-    mock_properties = MagicMock()
-    mock_properties.size = 0
-    mock_blob_client.get_blob_properties.return_value = mock_properties
+    mock_download_stream = MagicMock()
+    mock_download_stream.properties.size = 0
+    mock_blob_client.download_blob.return_value = mock_download_stream
 
     helper = StorageBlobHelper("https://test.blob.core.windows.net", "test-container")
 
@@ -183,7 +183,7 @@ def test_download_blob_empty(mock_blob_service, mock_get_credential):
 @patch("app.libs.azure.storage_blob.helper.get_azure_credential")
 @patch("app.libs.azure.storage_blob.helper.BlobServiceClient")
 def test_delete_folder(mock_blob_service, mock_get_credential):
-    """Test delete_folder method."""
+    """Test delete_folder deletes the folder's blobs in batches and then the folder marker."""
     mock_credential = MagicMock()
     mock_get_credential.return_value = mock_credential
     mock_service_client = MagicMock()
@@ -192,19 +192,25 @@ def test_delete_folder(mock_blob_service, mock_get_credential):
     mock_service_client.get_container_client.return_value = mock_container_client
     mock_container_client.exists.return_value = True
 
-    mock_blob1 = MagicMock()
-    mock_blob1.name = "folder/file1.txt"
-    mock_blob2 = MagicMock()
-    mock_blob2.name = "folder/file2.txt"
-    mock_container_client.list_blobs.side_effect = [[mock_blob1, mock_blob2], []]
-
-    mock_blob_client = MagicMock()
-    mock_container_client.get_blob_client.return_value = mock_blob_client
+    mock_container_client.list_blob_names.return_value.by_page.return_value = [
+        ["folder/file1.txt", "folder/file2.txt"],
+        [],
+    ]
+    mock_deleted = MagicMock()
+    mock_deleted.status_code = 202
+    mock_container_client.delete_blobs.return_value = [mock_deleted, mock_deleted]
 
     helper = StorageBlobHelper("https://test.blob.core.windows.net", "test-container")
-    helper.delete_folder("folder")
+    deleted = helper.delete_folder("folder")
 
-    assert mock_blob_client.delete_blob.call_count >= 2
+    assert deleted == 2
+    mock_container_client.list_blob_names.assert_called_once_with(
+        name_starts_with="folder/", results_per_page=256
+    )
+    mock_container_client.delete_blobs.assert_called_once_with(
+        "folder/file1.txt", "folder/file2.txt", raise_on_any_failure=False
+    )
+    mock_container_client.delete_blob.assert_called_once_with("folder")
 
 
 @patch("app.libs.azure.storage_blob.helper.get_azure_credential")
@@ -304,8 +310,10 @@ def test_delete_blob_and_cleanup_not_found(mock_blob_service, mock_get_credentia
 
 @patch("app.libs.azure.storage_blob.helper.get_azure_credential")
 @patch("app.libs.azure.storage_blob.helper.BlobServiceClient")
-def test_delete_folder_with_remaining_files(mock_blob_service, mock_get_credential):
-    """Test delete_folder cleans up folder marker when files remain at root."""
+def test_delete_folder_without_folder_marker(mock_blob_service, mock_get_credential):
+    """Test delete_folder skips blobs already gone and a missing folder marker."""
+    from azure.core.exceptions import ResourceNotFoundError
+
     mock_credential = MagicMock()
     mock_get_credential.return_value = mock_credential
     mock_service_client = MagicMock()
@@ -314,19 +322,20 @@ def test_delete_folder_with_remaining_files(mock_blob_service, mock_get_credenti
     mock_service_client.get_container_client.return_value = mock_container_client
     mock_container_client.exists.return_value = True
 
-    mock_blob_in_folder = MagicMock()
-    mock_blob_in_folder.name = "folder/file1.txt"
-    mock_remaining_blob = MagicMock()
-    # First call: blobs in folder, second call: remaining blobs at root
-    mock_container_client.list_blobs.side_effect = [
-        [mock_blob_in_folder],
-        [mock_remaining_blob],
+    mock_container_client.list_blob_names.return_value.by_page.return_value = [
+        ["folder/file1.txt", "folder/file2.txt"],
     ]
-    mock_blob_client = MagicMock()
-    mock_container_client.get_blob_client.return_value = mock_blob_client
+    mock_deleted = MagicMock()
+    mock_deleted.status_code = 202
+    mock_gone = MagicMock()
+    mock_gone.status_code = 404
+    mock_container_client.delete_blobs.return_value = [mock_deleted, mock_gone]
+    mock_container_client.delete_blob.side_effect = ResourceNotFoundError("not found")
 
     helper = StorageBlobHelper("https://test.blob.core.windows.net", "test-container")
-    helper.delete_folder("folder")
+    progress = []
+    deleted = helper.delete_folder("folder", on_progress=progress.append)
 
-    # Should delete folder blobs and then the folder marker
-    assert mock_blob_client.delete_blob.call_count >= 2
+    assert deleted == 1
+    assert progress == [1]
+    mock_container_client.delete_blob.assert_called_once_with("folder")